@@ -9,6 +9,8 @@ import json
 from collections import defaultdict, Counter
 from pathlib import Path
 
+from cascades import analyze_errors
+
 def parse_stage2_errors(error_file):
     """Parse TypeScript errors from Stage 2 and categorize them"""
     
@@ -28,6 +30,7 @@ def parse_stage2_errors(error_file):
     errors = re.findall(error_pattern, content, re.DOTALL)
     
     categorized_errors = defaultdict(list)
+    all_errors = []
     error_counts = Counter()
     file_counts = Counter()
     
@@ -43,14 +46,19 @@ def parse_stage2_errors(error_file):
         }
         
         categorized_errors[error_code].append(error_info)
+        all_errors.append(error_info)
         error_counts[error_code] += 1
         file_counts[file_path] += 1
     
+    # Missing modules, exports and members reported once per importer/use
+    cascades, _ = analyze_errors(all_errors)
+    
     return {
         'errors': dict(categorized_errors),
         'counts': dict(error_counts),
         'file_counts': dict(file_counts),
-        'total_errors': len(errors)
+        'total_errors': len(errors),
+        'root_causes': [cascade.as_dict() for cascade in cascades.values() if cascade.diagnostics > 1]
     }
 
 def categorize_by_priority(error_data):
@@ -113,6 +121,19 @@ def generate_stage2_report(error_data, priority_data):
         report.append(f"- **{error_code}**: {count} errors")
     report.append("")
     
+    root_causes = error_data.get('root_causes', [])
+    if root_causes:
+        report.append("## Root Causes")
+        report.append("")
+        report.append(f"{len(root_causes)} root causes account for "
+                      f"{sum(cause['diagnostics'] for cause in root_causes)} errors; "
+                      f"fixing one clears all of its errors.")
+        report.append("")
+        for cause in root_causes[:15]:
+            codes = ', '.join(cause['codes'])
+            report.append(f"- **{cause['label']}**: {cause['diagnostics']} errors in {cause['files']} files ({codes})")
+        report.append("")
+    
     report.append("## Prioritized Fix Plan")
     report.append("")
     
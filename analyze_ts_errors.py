@@ -7,53 +7,14 @@ import re
 import json
 from collections import defaultdict
 
+from error_buckets import OVERVIEW, classify_records, compile_scheme
+
 def categorize_error(file_path, error_code, error_message):
-    """Categorize TypeScript error into buckets based on patterns."""
-    
-    # Category 1: Component prop interface mismatches
-    if ('not assignable to type' in error_message and 'Props' in error_message) or \
-       ('Property' in error_message and 'does not exist on type' in error_message and 'Props' in error_message):
-        return "component_props"
-    
-    # Category 2: User type issues (subscriptionTier vs subscription)
-    if 'subscriptionTier' in error_message or ('subscription' in error_message.lower() and 'User' in error_message):
-        return "user_types"
-    
-    # Category 3: PersonaAnalytics / PersonaDetectionData missing properties
-    if 'PersonaDetectionData' in error_message or 'PersonaAnalytics' in file_path:
-        return "persona_analytics"
-    
-    # Category 4: Cloudflare runtime types
-    if any(cf_type in error_message for cf_type in ['D1Database', 'KVNamespace', 'DurableObjectNamespace']):
-        return "cloudflare_types"
-    
-    # Category 5: WakeUpMood enum issues
-    if 'WakeUpMood' in error_message:
-        return "wakeup_mood"
-    
-    # Category 6: Timeout type conflicts
-    if 'Timeout' in error_message and ('not assignable to type' in error_message):
-        return "timeout_types"
-    
-    # Category 7: Import/export mismatches
-    if 'has no exported member' in error_message or 'has no default export' in error_message:
-        return "import_exports"
-    
-    # Category 8: Duplicate style properties
-    if 'is specified more than once' in error_message and 'style' in error_message:
-        return "duplicate_styles"
-    
-    # Other categories
-    if 'used before its declaration' in error_message or 'used before being assigned' in error_message:
-        return "hoisting_issues"
-    
-    if 'implicitly has an \'any\' type' in error_message:
-        return "implicit_any"
-    
-    if 'Cannot find name' in error_message:
-        return "missing_imports"
-    
-    return "other"
+    """Categorize TypeScript error into buckets based on patterns.
+
+    The patterns are the OVERVIEW scheme in error_buckets.py.
+    """
+    return compile_scheme(OVERVIEW).classify(file_path, error_code, error_message)
 
 def parse_ts_errors(file_path):
     """Parse TypeScript errors from file."""
@@ -85,8 +46,7 @@ def main():
     # Categorize errors
     buckets = defaultdict(list)
     
-    for error in errors:
-        category = categorize_error(error['file'], error['code'], error['message'])
+    for error, category in zip(errors, classify_records(OVERVIEW, errors)):
         buckets[category].append(error)
     
     # Save buckets as JSON
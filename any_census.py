@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Token-level census of `any` types in the TypeScript sources.
+
+Unlike grep -c '\\bany\\b', only `any` name tokens in type positions are
+counted: words in comments, strings, JSX text and member accesses such as
+expect.any(...) are not. Each occurrence is classified by the construct
+that introduces its type:
+
+    parameter        (x: any) => ...
+    return           function f(): any / () => any
+    generic          Record<string, any>, useState<any>(), <T = any>
+    cast             value as any
+    array            any[]
+    index-signature  { [key: string]: any }
+    annotation       const x: any, { prop: any }
+    other            type aliases, tuples, conditional types ...
+
+Per-file counts are cached with each file's size and mtime, so a run only
+re-lexes files that changed since the last one; callers that edit buffers
+in memory (any_reduction.py) update just those files with update().
+
+    python3 any_census.py [--root DIR] [--top 10] [--target 1500] [--rebuild]
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+
+from ts_lexer import NAME, is_jsx_path, strip_comments, tokenize
+
+BASE_PATH = '/project/workspace/Coolhgg/Relife'
+DEFAULT_CACHE = 'ci/step-outputs/any-census.json'
+TARGET = 1500
+
+KINDS = ('parameter', 'return', 'generic', 'cast', 'array', 'index-signature', 'annotation', 'other')
+
+_LOOKBACK = 200  # tokens searched backwards for the construct introducing a type
+_STOPS = frozenset([':', '=>', ',', '=', ';', '?', 'as', 'satisfies', 'extends', 'is', 'keyof', 'typeof'])
+_OPENERS = frozenset(['(', '[', '{', '<'])
+_CLOSERS = frozenset([')', ']', '}'])
+_NOT_A_TYPE_AFTER = frozenset(['.', '?.', 'const', 'let', 'var', 'function', 'class', 'interface', 'type'])
+_NOT_A_TYPE_BEFORE = frozenset([':', '(', '.', '?.', '`'])
+
+
+def _walk_back(tokens, pairs, i, stops):
+    """Index of the first token before i, at the same nesting level, that is
+    in stops or an unmatched opener; -1 if there is none nearby."""
+    angle = 0
+    j = i - 1
+    limit = max(i - _LOOKBACK, -1)
+    while j > limit:
+        value = tokens[j].value
+        if value in _CLOSERS:
+            j = pairs.get(j, j) - 1
+            continue
+        if value in ('>', '>>', '>>>'):
+            angle += len(value)
+        elif value == '<':
+            if not angle:
+                return j
+            angle -= 1
+        elif not angle and (value in _OPENERS or value in stops):
+            return j
+        elif value == ';':
+            return -1
+        j -= 1
+    return -1
+
+
+def _annotation_kind(tokens, pairs, colon):
+    """Kind of a type annotation introduced by the ':' at colon."""
+    before = tokens[colon - 1].value if colon else ''
+    if before == ')':
+        return 'return'
+    if before == ']':
+        start = pairs.get(colon - 1)
+        if start is not None and any(tok.value == ':' for tok in tokens[start + 1:colon - 1]):
+            return 'index-signature'
+    opener = _walk_back(tokens, pairs, colon, ())
+    if opener >= 0 and tokens[opener].value == '(':
+        return 'parameter'
+    return 'annotation'
+
+
+def classify(tokens, pairs, i):
+    """Kind of the `any` token at i, or None where it is not a type."""
+    n = len(tokens)
+    previous = tokens[i - 1].value if i else ''
+    following = tokens[i + 1].value if i + 1 < n else ''
+    if previous in _NOT_A_TYPE_AFTER or following in _NOT_A_TYPE_BEFORE:
+        return None
+    if following == '[' and i + 2 < n and tokens[i + 2].value == ']':
+        return 'array'
+    stop = _walk_back(tokens, pairs, i, _STOPS)
+    if stop < 0:
+        return 'other'
+    value = tokens[stop].value
+    if value in ('as', 'satisfies'):
+        return 'cast'
+    if value == '=>':
+        return 'return'
+    if value == ':':
+        return _annotation_kind(tokens, pairs, stop)
+    if value == '<':
+        return 'generic'
+    if value in (',', '='):
+        # Later type arguments, and type parameter defaults: <T = any>
+        opener = _walk_back(tokens, pairs, stop, ())
+        if opener >= 0 and tokens[opener].value == '<':
+            return 'generic'
+    return 'other'
+
+
+def count_kinds(text, path=''):
+    """Counter of `any` kinds in one file's text."""
+    counts = Counter()
+    if 'any' not in text:
+        return counts
+    tokens, pairs = strip_comments(tokenize(text, jsx=is_jsx_path(path) if path else True))
+    for i, token in enumerate(tokens):
+        if token.kind == NAME and token.value == 'any':
+            kind = classify(tokens, pairs, i)
+            if kind:
+                counts[kind] += 1
+    return counts
+
+
+def source_files(root):
+    """Relative paths of the .ts/.tsx files under root/src."""
+    paths = []
+    for directory, dirs, files in os.walk(os.path.join(root, 'src')):
+        # Skip node_modules and other irrelevant directories
+        dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
+        for file in files:
+            if file.endswith(('.ts', '.tsx')):
+                paths.append(os.path.relpath(os.path.join(directory, file), root))
+    return paths
+
+
+class Census:
+    """Per-file `any` kind counts for a tree, cached between runs."""
+
+    def __init__(self, root=BASE_PATH, cache_path=DEFAULT_CACHE):
+        self.root = root
+        self.cache_path = cache_path
+        self.files = {}        # path -> {'size', 'mtime_ns', 'kinds'}
+        self.rescanned = []    # paths counted (not taken from the cache) this run
+        self._unsaved = set()  # paths updated in memory; their stat is taken on save
+        if cache_path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get('root') == os.path.abspath(self.root):
+            self.files = cache.get('files', {})
+
+    def _stat(self, path):
+        st = os.stat(os.path.join(self.root, path))
+        return st.st_size, st.st_mtime_ns
+
+    def refresh(self, paths=None, texts=None):
+        """Recount the files whose size or mtime changed; drop deleted ones.
+
+        texts optionally maps paths to contents the caller has already read.
+        """
+        paths = source_files(self.root) if paths is None else paths
+        for path in set(self.files) - set(paths):
+            del self.files[path]
+        for path in paths:
+            try:
+                size, mtime_ns = self._stat(path)
+            except OSError:
+                self.files.pop(path, None)
+                continue
+            entry = self.files.get(path)
+            if entry and entry['size'] == size and entry['mtime_ns'] == mtime_ns:
+                continue
+            text = texts.get(path) if texts else None
+            if text is None:
+                try:
+                    with open(os.path.join(self.root, path), 'r', encoding='utf-8') as f:
+                        text = f.read()
+                except (OSError, UnicodeDecodeError) as e:
+                    print(f"⚠️  Could not read {path}: {e}")
+                    continue
+            self.files[path] = {'size': size, 'mtime_ns': mtime_ns, 'kinds': dict(count_kinds(text, path))}
+            self.rescanned.append(path)
+        return self
+
+    def update(self, path, text):
+        """Recount a buffer edited in memory (its stat is recorded on save)."""
+        self.files[path] = {'size': None, 'mtime_ns': None, 'kinds': dict(count_kinds(text, path))}
+        self._unsaved.add(path)
+
+    def count(self, path):
+        entry = self.files.get(path)
+        return sum(entry['kinds'].values()) if entry else 0
+
+    @property
+    def total(self):
+        return sum(sum(entry['kinds'].values()) for entry in self.files.values())
+
+    def kinds(self):
+        totals = Counter()
+        for entry in self.files.values():
+            totals.update(entry['kinds'])
+        return totals
+
+    def top(self, limit=10):
+        """(path, count) of the files with the most `any`, most first."""
+        counts = [(path, self.count(path)) for path in self.files]
+        counts = [item for item in counts if item[1]]
+        counts.sort(key=lambda item: -item[1])
+        return counts[:limit]
+
+    def save(self):
+        """Write the cache; files updated in memory must be on disk by now."""
+        for path in self._unsaved:
+            if path in self.files:
+                self.files[path]['size'], self.files[path]['mtime_ns'] = self._stat(path)
+        self._unsaved.clear()
+        if not self.cache_path:
+            return None
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'root': os.path.abspath(self.root), 'total': self.total,
+                       'kinds': dict(self.kinds()), 'files': self.files}, f, indent=1)
+        return self.cache_path
+
+    def print_summary(self, target=TARGET, top=10):
+        total = self.total
+        print(f"📊 any types: {total} in {sum(1 for path in self.files if self.count(path))} files")
+        kinds = self.kinds()
+        for kind in KINDS:
+            if kinds[kind]:
+                print(f"   {kind:<16} {kinds[kind]:>6} ({kinds[kind] / total:.0%})")
+        if target:
+            if total < target:
+                print(f"🎉 Below the target of {target:,} by {target - total}")
+            else:
+                print(f"📈 {total - target} more to reach < {target:,}")
+        if top:
+            print(f"\n🔝 Top {top} files with any usage:")
+            for path, n in self.top(top):
+                print(f"   {path}: {n}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count any types by kind')
+    parser.add_argument('--root', default=BASE_PATH, help='Project root containing src/')
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help='Per-file count cache')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cache and recount every file')
+    parser.add_argument('--target', type=int, default=TARGET)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    census = Census(args.root, args.cache)
+    if args.rebuild:
+        census.files = {}
+    census.refresh()
+    print(f"Counted {len(census.rescanned)} changed files ({len(census.files)} in the cache)\n")
+    census.print_summary(args.target, args.top)
+    print(f"\nCensus saved to: {census.save()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Staged any-type reduction in a single pass over the tree.
+
+Runs the four reduction rounds (reduce-any-types.py, -round2, -round3 and
+final-any-reduction.py) as stages of one pipeline. Every .ts/.tsx file
+under src/ is read once; the stages run in order over the in-memory
+buffers, the common-types imports a stage needs are added to the same
+buffer, and each changed file is written once at the end. Remaining any
+types are counted by any_census.py: unchanged files come from its cache
+and only edited buffers are recounted, so round3's choice of files and the
+final stage's stop at the target need no rescans. Files with no 'any' left
+are skipped outright.
+
+With --dry-run [PATCH] nothing is written: the changed files are streamed
+as a patch relative to --root (see dry_run.py) and no checkpoint is saved.
+Otherwise the counts and changed files of each stage are saved to a
+checkpoint when the tree is written. --stop-after stops (and writes) after a stage,
+--only runs a single stage and --resume skips the stages the checkpoint
+records as done, so a run stopped after round2 can be finished later.
+
+Each file gets the rules its path and --safety allow (see rule_dsl.select):
+JSX-scoped rules only run on .tsx/.jsx files, and --safety review (or safe)
+leaves out the rules marked unsafe, which run by default. Matches inside
+comments, strings and JSX text are never rewritten.
+
+    python3 any_reduction.py [--stop-after round2 | --only final] [--resume]
+                             [--target 1500] [--safety review] [--dry-run [PATCH]]
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+import any_census
+import any_rules
+import dry_run
+import rule_profile
+import rule_watchdog
+from codemod_writer import GuardedWriter
+from import_index import NAMED, ImportIndex
+from rule_dsl import SAFETY_LEVELS, UNSAFE, RuleSpec, compile_table, select
+from ts_lexer import is_jsx_path, strip_comments, tokenize
+
+writer = GuardedWriter()
+
+BASE_PATH = '/project/workspace/Coolhgg/Relife'
+CHECKPOINT = 'ci/step-outputs/any-reduction-checkpoint.json'
+COMMON_TYPES = 'src/types/common-types'
+TARGET = 1500
+
+# Files with highest any usage (from our analysis)
+ROUND1_FILES = [
+    'src/__tests__/mocks/supabase.mock.ts',
+    'src/__tests__/providers/service-providers.tsx',
+    'src/types/domain-service-interfaces.ts',
+    'src/types/realtime-service.ts',
+    'src/services/advanced-analytics.ts',
+    'src/__tests__/setup/after-env-setup.ts',
+    'src/__tests__/mocks/enhanced-service-mocks.ts',
+    'src/__tests__/factories/factories.test.ts',
+    'src/__tests__/mocks/platform-service-mocks.ts',
+]
+
+# Additional high-usage files from analysis
+ROUND2_FILES = [
+    'src/components/AdvancedAlarmScheduling.tsx',
+    'src/__tests__/factories/factories.test.ts',
+    'src/types/utility-types.ts',
+    'src/types/service-architecture.ts',
+    'src/services/voice-smart-integration.ts',
+    'src/types/service-interfaces.ts',
+    'src/services/__tests__/alarm.test.ts',
+    'src/backend/cloudflare-functions.ts',
+    'src/services/typed-realtime-service.ts',
+    'src/hooks/__tests__/usePWA.test.ts',
+    'src/__tests__/performance/performance-testing-utilities.ts',
+    'src/components/AccessibilityDashboard.tsx',
+    'src/backend/performance-monitoring.ts',
+    'src/__tests__/api/enhanced-msw-handlers.ts',
+    'src/services/offline-manager.ts',
+    'src/hooks/usePushNotifications.ts',
+    'src/__tests__/utils/render-helpers.ts',
+    'src/services/alarm-api-security.ts',
+]
+
+ROUND3_TOP_FILES = 30
+
+
+class Tree:
+    """The .ts/.tsx files under src/, read once and written once."""
+
+    def __init__(self, base_path, census_cache=any_census.DEFAULT_CACHE):
+        self.base_path = base_path
+        self.paths = []       # relative to base_path, in walk order
+        self.text = {}
+        self.original = {}
+        self.rules = defaultdict(Counter)  # path -> edits by rule since the last write
+        for path in any_census.source_files(base_path):
+            try:
+                with open(os.path.join(base_path, path), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"⚠️  Could not read {path}: {e}")
+                continue
+            self.paths.append(path)
+            self.text[path] = self.original[path] = text
+        self.census = any_census.Census(base_path, census_cache).refresh(self.paths, self.text)
+
+    @property
+    def total_any(self):
+        return self.census.total
+
+    def update(self, path, text, counts=None):
+        self.text[path] = text
+        self.census.update(path, text)
+        if counts:
+            self.rules[path].update(counts)
+
+    def changed(self):
+        return [path for path in self.paths if self.text[path] != self.original[path]]
+
+    def write(self):
+        """Write every changed buffer (or stream its diff); returns the paths written.
+
+        A buffer the parse gate rejects goes back to the file's content, and
+        its census entry is recounted from that.
+        """
+        written = []
+        for path in self.changed():
+            if writer.commit(os.path.join(self.base_path, path), self.original[path], self.text[path],
+                             self.rules.pop(path, None)):
+                self.original[path] = self.text[path]
+                written.append(path)
+            else:
+                self.update(path, self.original[path])
+        return written
+
+
+class Pass(NamedTuple):
+    rules: Sequence[RuleSpec]
+    flags: int = 0
+    sequential: bool = False       # one re.subn per rule in table order instead of one scan
+    skip_if: Optional[str] = None  # the pass is skipped for buffers containing this
+
+
+class Stage(NamedTuple):
+    name: str
+    title: str
+    targets: Callable[[Tree], list]            # files to process, in order
+    passes: Callable[[str], Sequence[Pass]]    # passes for a path
+    imports: Dict[str, Tuple[str, ...]] = {}   # rule name -> common-types names it needs
+    stop_at_target: bool = False
+
+
+def _listed(paths):
+    def targets(tree):
+        found = []
+        for path in paths:
+            if path in tree.text:
+                found.append(path)
+            else:
+                print(f"⚠️  File not found: {path}")
+        return found
+    return targets
+
+
+def _most_any(tree):
+    return [path for path, _ in tree.census.top(ROUND3_TOP_FILES)]
+
+
+def _largest_first(tree):
+    # Sort by file size (larger files first) for maximum impact
+    return sorted(tree.paths, key=lambda path: -len(tree.text[path].encode('utf-8')))
+
+
+def _final_passes(path):
+    # Sequential: several aggressive rules rewrite what an earlier one produced
+    passes = [Pass(any_rules.AGGRESSIVE_RULES, re.MULTILINE, sequential=True)]
+    if any_rules.is_test_or_mock(path):
+        passes.append(Pass(any_rules.TEST_ANY_RULES, re.MULTILINE, sequential=True,
+                           skip_if='expect.any'))
+    return passes
+
+
+STAGES = [
+    Stage('round1', 'Round 1: highest-usage mocks and services', _listed(ROUND1_FILES),
+          lambda path: [Pass(any_rules.ROUND1_RULES, sequential=True)],
+          imports=any_rules.ROUND1_IMPORTS),
+    Stage('round2', 'Round 2: additional high-usage files', _listed(ROUND2_FILES),
+          # Sequential: the parameter rules share the commas between parameters
+          lambda path: [Pass(any_rules.round2_rules(path), sequential=True)],
+          imports=any_rules.ROUND2_IMPORTS),
+    Stage('round3', f'Round 3: top {ROUND3_TOP_FILES} files by remaining usage', _most_any,
+          lambda path: [Pass(any_rules.ROUND3_RULES, sequential=True)]),
+    Stage('final', 'Final: aggressive sweep over every file', _largest_first, _final_passes,
+          stop_at_target=True),
+]
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+_tables = {}  # the combined-scan RuleSets used, for the prefilter report
+
+
+def apply_pass(text, rules_pass, counts, path=None, max_safety=UNSAFE):
+    """Apply the pass's rules that suit path at max_safety to one buffer."""
+    specs = select(rules_pass.rules, max_safety, path)
+    jsx = is_jsx_path(path) if path else True
+    if rules_pass.skip_if and rules_pass.skip_if in text:
+        for spec in specs:
+            rule_profile.skipped(spec.name, text)
+        return text
+    if not rules_pass.sequential:
+        rules = compile_table(specs, flags=rules_pass.flags, jsx=jsx)
+        _tables[id(rules)] = rules
+        text, _ = rules.apply(text, counts)
+        return text
+    for spec in specs:
+        rule = spec.bind(jsx)
+        new, n = rule_profile.subn(rule.pattern, rule.replacement, text,
+                                   flags=rules_pass.flags, rule=spec.name)
+        if new != text:
+            counts[spec.name] += n
+            text = new
+    return text
+
+
+def common_types_path(path):
+    """Import specifier of src/types/common-types from path."""
+    relative = os.path.relpath(COMMON_TYPES, os.path.dirname(path)).replace(os.sep, '/')
+    return relative if relative.startswith('.') else './' + relative
+
+
+def add_imports(text, path, names):
+    """Import names from common-types in the buffer, unless already imported.
+
+    Merges into an existing named import from common-types, otherwise adds
+    a statement after the last import (or before the first statement).
+    """
+    lexed = tokenize(text, jsx=is_jsx_path(path))
+    index = ImportIndex(text, path, lexed=lexed)
+    missing = sorted(set(names) - {binding.name for binding in index.bindings})
+    if not missing:
+        return text
+    for statement in index.statements:
+        named = [b for b in statement.bindings if b.kind == NAMED]
+        if named and not statement.type_only and (statement.module or '').endswith('common-types'):
+            at = max(b.start + len(b.name) for b in named)
+            return text[:at] + ''.join(f", {name}" for name in missing) + text[at:]
+    line = f"import {{ {', '.join(missing)} }} from '{common_types_path(path)}';\n"
+    if index.statements:
+        at = index.statements[-1].end
+        return text[:at] + '\n' + line.rstrip('\n') + text[at:]
+    tokens, _ = strip_comments(lexed)
+    at = text.rfind('\n', 0, tokens[0].start) + 1 if tokens else 0
+    return text[:at] + line + text[at:]
+
+
+def run_stage(tree, stage, target, max_safety=UNSAFE):
+    """Run one stage over the buffers; returns its checkpoint record."""
+    print(f"\n🚀 {stage.title}")
+    targets = stage.targets(tree)
+    print(f"Processing {len(targets)} files...")
+    stage_counts = Counter()
+    changed = []
+    skipped = 0
+    for path in targets:
+        if stage.stop_at_target and target and tree.total_any < target:
+            print(f"🎉 Reached target: {tree.total_any} any types left")
+            break
+        text = original = tree.text[path]
+        if 'any' not in text:
+            skipped += 1
+            continue
+        counts = Counter()
+        try:
+            with rule_watchdog.file_budget(os.path.join(tree.base_path, path)):
+                for rules_pass in stage.passes(path):
+                    text = apply_pass(text, rules_pass, counts, path, max_safety)
+        except rule_watchdog.RuleTimeout as e:
+            print(f"  ⏰ Skipped {path}: {e}")
+            continue
+        if text == original:
+            continue
+        names = {name for rule in counts for name in stage.imports.get(rule, ())}
+        if names:
+            text = add_imports(text, path, names)
+        tree.update(path, text, counts)
+        stage_counts.update(counts)
+        changed.append(path)
+        print(f"  ✅ {path}: {sum(counts.values())} type improvements")
+
+    changes = sum(stage_counts.values())
+    print(f"✅ {stage.name}: {changes} type improvements in {len(changed)} files "
+          f"({skipped} without any skipped); {tree.total_any} any types left")
+    for rule, n in stage_counts.most_common(5):
+        print(f"   {rule}: {n}")
+    return {
+        'stage': stage.name,
+        'changes': changes,
+        'rules': dict(stage_counts.most_common()),
+        'files_changed': changed,
+        'remaining_any': tree.total_any,
+    }
+
+
+def load_checkpoint(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'stages': []}
+
+
+def save_checkpoint(path, checkpoint):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Staged any-type reduction')
+    parser.add_argument('--root', default=BASE_PATH, help='Project root containing src/')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--stop-after', choices=STAGE_NAMES, help='Stop after this stage')
+    group.add_argument('--only', choices=STAGE_NAMES, help='Run just this stage')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip the stages the checkpoint records as done')
+    parser.add_argument('--target', type=int, default=TARGET,
+                        help='Final stage stops below this many any lines (0 = never)')
+    parser.add_argument('--safety', choices=SAFETY_LEVELS, default=UNSAFE,
+                        help='Most invasive rules to run (default: %(default)s)')
+    parser.add_argument('--checkpoint', default=CHECKPOINT)
+    parser.add_argument('--census-cache', default=any_census.DEFAULT_CACHE)
+    args, _ = parser.parse_known_args(argv)
+    profiler = rule_profile.from_argv(argv)
+    rule_watchdog.from_argv(argv)
+    dry_run_sink = dry_run.from_argv(argv, root=args.root)
+
+    if args.only:
+        stages = [stage for stage in STAGES if stage.name == args.only]
+    else:
+        last = STAGE_NAMES.index(args.stop_after) if args.stop_after else len(STAGES) - 1
+        stages = STAGES[:last + 1]
+    checkpoint = load_checkpoint(args.checkpoint) if args.resume else {'stages': []}
+    done = {record['stage'] for record in checkpoint['stages']}
+    if done:
+        print(f"⏭️  Resuming: skipping {', '.join(s.name for s in stages if s.name in done)}")
+        stages = [stage for stage in stages if stage.name not in done]
+
+    print("🔍 Reading all TypeScript files...")
+    tree = Tree(args.root, args.census_cache)
+    print(f"{len(tree.paths)} files, {tree.total_any} any types "
+          f"({len(tree.census.rescanned)} files recounted)")
+
+    records = [run_stage(tree, stage, args.target, args.safety) for stage in stages]
+    written = tree.write()
+    if dry_run_sink:
+        print(f"\n✅ Completed! {len(written)} files would change (dry run)")
+    else:
+        checkpoint['stages'].extend(records)
+        save_checkpoint(args.checkpoint, checkpoint)
+        tree.census.save()
+        print(f"\n✅ Completed! Wrote {len(written)} changed files")
+        print(f"Checkpoint saved to: {args.checkpoint}")
+    for rules in _tables.values():
+        rules.print_prefilter_stats()
+    rule_watchdog.report()
+    if profiler:
+        profiler.finish()
+    writer.print_summary()
+    dry_run.finish()
+    print()
+    tree.census.print_summary(args.target)
+
+
+if __name__ == '__main__':
+    main()
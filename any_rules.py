@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Rule tables of the any-type reduction stages (see any_reduction.py).
+
+One table (or set of tables) per historical round, in the order the rounds
+ran: ROUND1 for the highest-usage mocks and services, ROUND2 with per-file
+tables plus COMMON_RULES, ROUND3 for the remaining high-usage files and
+AGGRESSIVE_RULES for the final sweep over every file. Rules whose
+replacement refers to a type from common-types are listed in the stage's
+*_IMPORTS table.
+"""
+
+from rule_dsl import JSX, REVIEW, UNSAFE, RuleSpec, validate
+
+
+def _any_rule(name, pattern, replacement):
+    return RuleSpec(name, pattern, replacement, safety=REVIEW)
+
+
+# -- round 1: mocks, analytics and service interfaces ---------------------------------
+
+ROUND1_RULES = [
+    # Mock data and test patterns
+    RuleSpec('mock-store-record', r'Record<string,\s*any\[\]>', 'MockDataStore'),
+    RuleSpec('mock-record-array', r':\s*any\[\]', ': MockDataRecord[]', safety=UNSAFE),
+    RuleSpec('mock-find-item', r'\.find\(\s*\(\s*item:\s*any\s*\)', '.find((item: MockDataRecord)'),
+    RuleSpec('mock-sort-pair', r'\.sort\(\s*\(\s*a:\s*any,\s*b:\s*any\s*\)',
+             '.sort((a: MockDataRecord, b: MockDataRecord)'),
+    RuleSpec('null-user-as-any', r'user:\s*null\s+as\s+any', 'user: null'),
+    RuleSpec('null-session-as-any', r'session:\s*null\s+as\s+any', 'session: null'),
+
+    # Function parameters with any
+    RuleSpec('only-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r'(\1: unknown)'),
+    RuleSpec('first-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r'(\1: unknown,'),
+    RuleSpec('last-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r', \1: unknown)'),
+    RuleSpec('middle-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r', \1: unknown,'),
+
+    # Event handler patterns
+    RuleSpec('jest-fn-param-any', r'\.fn\(\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)',
+             r'.fn((\1: unknown)'),
+    RuleSpec('mocked-function-param-any', r'MockedFunction<\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)',
+             r'MockedFunction<(\1: unknown)'),
+
+    # Analytics and tracking patterns
+    RuleSpec('analytics-track', r'track:\s*[^,]*\(\s*[^,]*,\s*properties\?\s*:\s*any\s*\)',
+             'track: jest.MockedFunction<(event: string, properties?: AnalyticsProperties) => void>',
+             safety=UNSAFE),
+    RuleSpec('analytics-identify', r'identify:\s*[^,]*\(\s*[^,]*,\s*traits\?\s*:\s*any\s*\)',
+             'identify: jest.MockedFunction<(userId: string, traits?: AnalyticsTraits) => void>',
+             safety=UNSAFE),
+    RuleSpec('analytics-page', r'page:\s*[^,]*\(\s*[^,]*,\s*properties\?\s*:\s*any\s*\)',
+             'page: jest.MockedFunction<(name: string, properties?: AnalyticsProperties) => void>',
+             safety=UNSAFE),
+
+    # Service method patterns
+    RuleSpec('create-alarm', r'createAlarm:\s*[^,]*\(\s*alarm:\s*any\s*\)',
+             'createAlarm: jest.MockedFunction<(alarm: AlarmData) => Promise<AlarmData>>', safety=UNSAFE),
+    RuleSpec('update-alarm', r'updateAlarm:\s*[^,]*\(\s*[^,]*,\s*updates:\s*any\s*\)',
+             'updateAlarm: jest.MockedFunction<(id: string, updates: Partial<AlarmData>) => Promise<AlarmData>>',
+             safety=UNSAFE),
+    RuleSpec('get-alarms', r'getAlarms:\s*[^,]*\(\s*\)\s*=>\s*Promise<any\[\]>',
+             'getAlarms: jest.MockedFunction<() => Promise<AlarmData[]>>', safety=UNSAFE),
+    RuleSpec('get-alarm', r'getAlarm:\s*[^,]*\(\s*[^,]*\)\s*=>\s*Promise<any\s*\|\s*null>',
+             'getAlarm: jest.MockedFunction<(id: string) => Promise<AlarmData | null>>', safety=UNSAFE),
+
+    # Battle and gaming patterns
+    RuleSpec('create-battle', r'createBattle:\s*[^,]*\(\s*_config:\s*any\s*\)',
+             'createBattle: jest.MockedFunction<(config: BattleConfig) => Promise<Battle>>', safety=UNSAFE),
+    RuleSpec('get-battles', r'getBattles:\s*[^,]*\(\s*[^,]*\)\s*=>\s*Promise<any\[\]>',
+             'getBattles: jest.MockedFunction<(status?: string) => Promise<Battle[]>>', safety=UNSAFE),
+    RuleSpec('get-battle', r'getBattle:\s*[^,]*\(\s*[^,]*\)\s*=>\s*Promise<any\s*\|\s*null>',
+             'getBattle: jest.MockedFunction<(id: string) => Promise<Battle | null>>', safety=UNSAFE),
+
+    # Reward system patterns
+    RuleSpec('reward-conditions', r'conditions:\s*any\[\]', 'conditions: RewardCondition[]'),
+    RuleSpec('create-reward', r'createReward\([^)]*\):\s*Promise<any>',
+             'createReward(reward: Omit<RewardData, "id" | "created_at" | "updated_at">): Promise<RewardData>',
+             safety=UNSAFE),
+    RuleSpec('get-user-rewards', r'getUserRewards\([^)]*\):\s*Promise<any\[\]>',
+             'getUserRewards(userId: string): Promise<UserReward[]>', safety=UNSAFE),
+    RuleSpec('check-achievements', r'checkAchievements\([^)]*\):\s*Promise<any\[\]>',
+             'checkAchievements(userId: string, context: string, data: Record<string, unknown>): Promise<RewardData[]>',
+             safety=UNSAFE),
+    RuleSpec('get-point-history', r'getPointHistory\([^)]*\):\s*Promise<any\[\]>',
+             'getPointHistory(userId: string, limit?: number): Promise<PointTransaction[]>', safety=UNSAFE),
+
+    # Generic service patterns
+    RuleSpec('call-log-type', r':\s*Array<\{\s*method:\s*string;\s*args:\s*any\[\];',
+             ': Array<{ method: string; args: unknown[];'),
+    RuleSpec('log-call-args', r'logCall\(\s*method:\s*string,\s*args:\s*any\[\]\)',
+             'logCall(method: string, args: unknown[])'),
+    RuleSpec('call-history-type', r'getCallHistory\(\):\s*Array<\{\s*method:\s*string;\s*args:\s*any\[\];',
+             'getCallHistory(): Array<{ method: string; args: unknown[];'),
+
+    # Common any usage left after the specific patterns
+    RuleSpec('arrow-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)\s*=>', r'(\1: unknown) =>'),
+    RuleSpec('function-param-any', r'function\s*\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)',
+             r'function(\1: unknown)'),
+    RuleSpec('any-array', r':\s*any\[\](?!\s*=)', ': unknown[]'),
+    RuleSpec('record-any', r':\s*Record<string,\s*any>', ': Record<string, unknown>'),
+    RuleSpec('as-any', r'\s+as\s+any\b', ' as unknown'),
+]
+
+# Types from common-types each replacement group refers to
+_ROUND1_TYPE_GROUPS = [
+    (('MockDataStore', 'MockDataRecord'), ('MockDataStore', 'MockDataRecord')),
+    (('AnalyticsProperties', 'AnalyticsTraits'), ('AnalyticsProperties', 'AnalyticsTraits')),
+    (('AlarmData',), ('AlarmData',)),
+    (('BattleConfig', 'Battle'), ('BattleConfig', 'Battle')),
+    (('RewardCondition', 'RewardData'), ('RewardCondition', 'RewardData', 'UserReward', 'PointTransaction')),
+]
+
+
+def _round1_imports(replacement):
+    names = []
+    for markers, imports in _ROUND1_TYPE_GROUPS:
+        if any(marker in replacement for marker in markers):
+            names.extend(imports)
+    return tuple(names)
+
+
+# -- round 2: per-file tables plus common rules --------------------------------------
+
+# Component-specific replacements (AdvancedAlarmScheduling.tsx)
+COMPONENT_RULES = [
+    RuleSpec('component-const-any', r'const\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*[^;]*:\s*any',
+             r'const \1 = ... as unknown', safety=UNSAFE),
+    RuleSpec('component-usestate-any', r'useState<any>', 'useState<unknown>'),
+    RuleSpec('component-react-fc-any', r'React\.FC<any>', 'React.FC<Record<string, unknown>>'),
+    RuleSpec('component-onvaluechange-any', r'onValueChange=\{\([^)]*:\s*any\)',
+             r'onValueChange={(...args: unknown[])', scope=JSX, safety=UNSAFE),
+    RuleSpec('component-onchange-any', r'onChange=\{\([^)]*:\s*any\)',
+             r'onChange={(...args: unknown[])', scope=JSX, safety=UNSAFE),
+]
+
+# Type definition file replacements
+TYPE_DEFINITION_RULES = [
+    RuleSpec('typedef-alias-any', r'export\s+type\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*any',
+             r'export type \1 = unknown'),
+    RuleSpec('typedef-interface-any', r'export\s+interface\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\{[^}]*:\s*any',
+             r'export interface \1 { [key: string]: unknown', safety=UNSAFE),
+    RuleSpec('typedef-member-any', r':\s*any\s*;', ': unknown;'),
+    RuleSpec('typedef-generic-any', r'<any>', '<unknown>'),
+]
+
+# Test file replacements
+TEST_RULES = [
+    RuleSpec('test-jest-fn-as-any', r'jest\.fn\(\)\s*as\s*any',
+             'jest.fn() as jest.MockedFunction<(...args: unknown[]) => unknown>'),
+    RuleSpec('test-mock-implementation-any', r'mockImplementation\(\([^)]*:\s*any\)',
+             r'mockImplementation((...args: unknown[])', safety=UNSAFE),
+    RuleSpec('test-expect-any', r'expect\.any\(Object\)', 'expect.any(Object)'),  # Keep this one
+    RuleSpec('test-mock-any', r'mock[a-zA-Z]*\s*:\s*any', r'mock: unknown', safety=UNSAFE),
+]
+
+# Backend service file replacements
+BACKEND_RULES = [
+    RuleSpec('backend-request-any', r'Request<any>', 'Request<Record<string, unknown>>'),
+    RuleSpec('backend-response-any', r'Response<any>', 'Response<Record<string, unknown>>'),
+    RuleSpec('backend-context-any', r'context:\s*any', 'context: Record<string, unknown>'),
+    RuleSpec('backend-env-any', r'env:\s*any', 'env: Record<string, unknown>'),
+    RuleSpec('backend-event-any', r'event:\s*any', 'event: Record<string, unknown>'),
+]
+
+# Component file replacements (AccessibilityDashboard.tsx)
+DASHBOARD_RULES = [
+    RuleSpec('dashboard-props-any', r'props:\s*any', 'props: Record<string, unknown>'),
+    RuleSpec('dashboard-component-type-any', r'React\.ComponentType<any>',
+             'React.ComponentType<Record<string, unknown>>'),
+    RuleSpec('dashboard-usecallback-as-any', r'useCallback\([^,]*,\s*\[[^]]*\]\s*\)\s*as\s*any',
+             'useCallback(...) as EventHandler', safety=UNSAFE),
+]
+
+# (file name markers, rules) - the first match wins
+FILE_RULES = [
+    (('AdvancedAlarmScheduling.tsx',), COMPONENT_RULES),
+    (('utility-types.ts', 'service-architecture.ts'), TYPE_DEFINITION_RULES),
+    (('.test.ts',), TEST_RULES),
+    (('cloudflare-functions.ts', 'performance-monitoring.ts'), BACKEND_RULES),
+    (('AccessibilityDashboard.tsx',), DASHBOARD_RULES),
+]
+
+# Common replacements for all round 2 files
+COMMON_RULES = [
+    # Function parameters and return types
+    RuleSpec('only-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r'(\1: unknown)'),
+    RuleSpec('first-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r'(\1: unknown,'),
+    RuleSpec('last-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r', \1: unknown)'),
+    RuleSpec('middle-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r', \1: unknown,'),
+
+    # Variable declarations
+    RuleSpec('initialized-any', r':\s*any\s*=', ': unknown ='),
+    RuleSpec('declared-any', r':\s*any\s*;', ': unknown;'),
+    RuleSpec('any-array', r':\s*any\[\]', ': unknown[]'),
+
+    # Generic type parameters
+    RuleSpec('generic-any', r'<any>', '<unknown>'),
+    RuleSpec('array-generic-any', r'Array<any>', 'Array<unknown>'),
+    RuleSpec('record-any', r'Record<string,\s*any>', 'Record<string, unknown>'),
+
+    # As any casts
+    RuleSpec('as-any', r'\s+as\s+any\b', ' as unknown'),
+]
+
+
+def round2_rules(path):
+    """The round 2 table for a path: its file-specific rules, then COMMON_RULES."""
+    for markers, rules in FILE_RULES:
+        if any(marker in path for marker in markers):
+            return rules + COMMON_RULES
+    return COMMON_RULES
+
+
+# -- round 3: remaining high-usage files --------------------------------------------
+
+ROUND3_RULES = [
+    # Generic function parameters
+    RuleSpec('only-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r'(\1: unknown)'),
+    RuleSpec('first-param-any', r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r'(\1: unknown,'),
+    RuleSpec('last-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r', \1: unknown)'),
+    RuleSpec('middle-param-any', r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r', \1: unknown,'),
+
+    # Variable and property declarations
+    RuleSpec('initialized-any', r':\s*any\s*=', ': unknown ='),
+    RuleSpec('declared-any', r':\s*any\s*;', ': unknown;'),
+    RuleSpec('union-first-any', r':\s*any\s*\|', ': unknown |'),
+    RuleSpec('union-last-any', r'\|\s*any\s*;', '| unknown;'),
+    RuleSpec('union-last-any-paren', r'\|\s*any\s*\)', '| unknown)'),
+
+    # Array and object types
+    RuleSpec('any-array', r':\s*any\[\]', ': unknown[]'),
+    RuleSpec('array-generic-any', r'Array<any>', 'Array<unknown>'),
+    RuleSpec('record-any', r'Record<string,\s*any>', 'Record<string, unknown>'),
+    RuleSpec('keyed-record-any', r'Record<[^,]+,\s*any>', 'Record<string, unknown>'),
+
+    # Generic type parameters
+    RuleSpec('generic-any', r'<any>', '<unknown>'),
+    RuleSpec('generic-any-first', r'<any,', '<unknown,'),
+    RuleSpec('generic-any-last', r',\s*any>', ', unknown>'),
+
+    # Casts and assertions
+    RuleSpec('as-any', r'\s+as\s+any\b', ' as unknown'),
+    RuleSpec('as-any-paren', r'\s+as\s+any\s*\)', ' as unknown)'),
+    RuleSpec('as-any-semicolon', r'\s+as\s+any\s*;', ' as unknown;'),
+
+    # React and JSX specific
+    RuleSpec('react-fc-any', r'React\.FC<any>', 'React.FC<Record<string, unknown>>'),
+    RuleSpec('component-type-any', r'React\.ComponentType<any>',
+             'React.ComponentType<Record<string, unknown>>'),
+    RuleSpec('props-any', r'props:\s*any', 'props: Record<string, unknown>'),
+
+    # Event handlers
+    RuleSpec('onchange-handler-any', r'onChange=\{[^}]*:\s*any[^}]*\}',
+             'onChange={(event: unknown) => {}}', scope=JSX, safety=UNSAFE),
+    RuleSpec('onclick-handler-any', r'onClick=\{[^}]*:\s*any[^}]*\}',
+             'onClick={(event: unknown) => {}}', scope=JSX, safety=UNSAFE),
+    RuleSpec('onsubmit-handler-any', r'onSubmit=\{[^}]*:\s*any[^}]*\}',
+             'onSubmit={(event: unknown) => {}}', scope=JSX, safety=UNSAFE),
+
+    # Promise and async patterns
+    RuleSpec('promise-any', r'Promise<any>', 'Promise<unknown>'),
+    RuleSpec('async-params-any', r'async\s+\([^)]*:\s*any\)', 'async (...args: unknown[])', safety=UNSAFE),
+
+    # Mock and test specific
+    RuleSpec('jest-fn-as-any', r'jest\.fn\(\)\s*as\s*any',
+             'jest.fn() as jest.MockedFunction<(...args: unknown[]) => unknown>'),
+    RuleSpec('mock-implementation-any', r'mockImplementation\([^)]*:\s*any\)',
+             'mockImplementation((...args: unknown[]) => unknown)', safety=UNSAFE),
+    RuleSpec('expect-any', r'expect\.any\(([^)]+)\)', r'expect.any(\1)'),  # Keep this pattern as is
+
+    # Service and API patterns
+    RuleSpec('config-any', r'config:\s*any', 'config: Record<string, unknown>'),
+    RuleSpec('options-any', r'options:\s*any', 'options: Record<string, unknown>'),
+    RuleSpec('params-any', r'params:\s*any', 'params: Record<string, unknown>'),
+    RuleSpec('data-any', r'data:\s*any', 'data: unknown'),
+    RuleSpec('response-any', r'response:\s*any', 'response: unknown'),
+    RuleSpec('request-any', r'request:\s*any', 'request: unknown'),
+
+    # Error handling
+    RuleSpec('error-any', r'error:\s*any', 'error: Error | unknown'),
+    RuleSpec('catch-param-any', r'catch\s*\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)',
+             r'catch (\1: Error | unknown)'),
+
+    # Object property access
+    RuleSpec('member-any', r'\.([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any', r'.\1: unknown'),
+
+    # Function return types
+    RuleSpec('returns-any', r'=>\s*any\b', '=> unknown'),
+    RuleSpec('thunk-returns-any', r':\s*\(\) =>\s*any', ': () => unknown'),
+    RuleSpec('function-type-returns-any', r':\s*\([^)]*\) =>\s*any',
+             ': (...args: unknown[]) => unknown', safety=UNSAFE),
+]
+
+
+# -- final sweep: every file --------------------------------------------------------
+
+# Most aggressive patterns - replace every single 'any' that's safe to replace
+AGGRESSIVE_RULES = [
+    # All parameter types
+    _any_rule('annotated-name', r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\b', r'\1: unknown'),
+
+    # All array types
+    _any_rule('any-array', r'\bany\[\]', 'unknown[]'),
+
+    # All generic types
+    _any_rule('generic-any', r'<any>', '<unknown>'),
+    _any_rule('generic-any-first', r'<any,', '<unknown,'),
+    _any_rule('generic-any-last', r',\s*any>', ', unknown>'),
+    _any_rule('generic-any-middle', r',\s*any,', ', unknown,'),
+
+    # All object types
+    _any_rule('record-any', r'Record<[^,>]+,\s*any>', 'Record<string, unknown>'),
+    _any_rule('index-signature-any', r':\s*\{\s*\[key:\s*string\]:\s*any\s*\}', ': Record<string, unknown>'),
+
+    # All return types
+    _any_rule('annotation-before-terminator', r':\s*any\s*(?=\s*[=;,\)])', ': unknown'),
+    _any_rule('promise-any', r'Promise<any>', 'Promise<unknown>'),
+    _any_rule('array-generic-any', r'Array<any>', 'Array<unknown>'),
+
+    # All casts and assertions
+    _any_rule('as-any', r'\bas\s+any\b', 'as unknown'),
+
+    # Function types
+    _any_rule('function-any', r'Function:\s*any', 'Function: (...args: unknown[]) => unknown'),
+    _any_rule('returns-any', r'=>\s*any\b', '=> unknown'),
+
+    # Property declarations
+    _any_rule('property-any', r':\s*any(?=\s*[;,\}])', ': unknown'),
+
+    # Callback and event handler types
+    _any_rule('callback-any', r'callback:\s*any', 'callback: (...args: unknown[]) => unknown'),
+    _any_rule('handler-any', r'handler:\s*any', 'handler: (...args: unknown[]) => unknown'),
+    _any_rule('listener-any', r'listener:\s*any', 'listener: (...args: unknown[]) => unknown'),
+
+    # React specific
+    _any_rule('react-fc-any', r'React\.FC<any>', 'React.FC<Record<string, unknown>>'),
+    _any_rule('component-any', r'Component<any>', 'Component<Record<string, unknown>>'),
+
+    # Test and mock specific (but preserve expect.any)
+    _any_rule('jest-fn-as-any', r'jest\.fn\(\)\s*as\s*any', 'jest.fn() as jest.MockedFunction<(...args: unknown[]) => unknown>'),
+
+    # Service and configuration
+    _any_rule('config-any', r'config:\s*any', 'config: Record<string, unknown>'),
+    _any_rule('options-any', r'options:\s*any', 'options: Record<string, unknown>'),
+    _any_rule('settings-any', r'settings:\s*any', 'settings: Record<string, unknown>'),
+    _any_rule('params-any', r'params:\s*any', 'params: Record<string, unknown>'),
+    _any_rule('metadata-any', r'metadata:\s*any', 'metadata: Record<string, unknown>'),
+
+    # Error handling
+    _any_rule('error-any', r'error:\s*any', 'error: Error | unknown'),
+    _any_rule('catch-param-any', r'catch\s*\(\s*([^)]+):\s*any\s*\)', r'catch (\1: Error | unknown)'),
+
+    # Event and DOM
+    _any_rule('event-any', r'event:\s*any', 'event: Event | unknown'),
+    _any_rule('target-any', r'target:\s*any', 'target: EventTarget | unknown'),
+
+    # Data and response types
+    _any_rule('data-any', r'data:\s*any', 'data: unknown'),
+    _any_rule('response-any', r'response:\s*any', 'response: unknown'),
+    _any_rule('result-any', r'result:\s*any', 'result: unknown'),
+    _any_rule('payload-any', r'payload:\s*any', 'payload: unknown'),
+    _any_rule('body-any', r'body:\s*any', 'body: unknown'),
+
+    # Utility and helper types
+    _any_rule('value-any', r'value:\s*any', 'value: unknown'),
+    _any_rule('item-any', r'item:\s*any', 'item: unknown'),
+    _any_rule('element-any', r'element:\s*any', 'element: unknown'),
+    _any_rule('node-any', r'node:\s*any', 'node: unknown'),
+]
+
+# Test and mock files: every standalone 'any' except calls like any(Object);
+# skipped for files using expect.any
+TEST_ANY_RULES = [
+    RuleSpec('test-standalone-any', r'\bany\b(?!\s*\()', 'unknown', safety=UNSAFE),
+]
+
+
+def is_test_or_mock(path):
+    return '.test.ts' in path or 'mock' in path.lower()
+
+
+# Types from common-types each rule's replacement needs, per stage
+ROUND1_IMPORTS = {
+    spec.name: _round1_imports(spec.replacement) for spec in ROUND1_RULES
+    if _round1_imports(spec.replacement)
+}
+ROUND2_IMPORTS = {'dashboard-usecallback-as-any': ('EventHandler',)}
+
+validate(ROUND1_RULES)
+for _markers, _rules in FILE_RULES:
+    validate(_rules + COMMON_RULES)
+validate(ROUND3_RULES)
+validate(AGGRESSIVE_RULES)
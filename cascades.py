@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Root causes of cascading tsc errors.
+
+One missing export or module is reported again by every file that imports
+it, and one missing member by every file that uses it, so a single fix can
+clear hundreds of errors. This links each diagnostic to what it references
+and collapses each cascade into one root cause with its blast radius:
+
+    module:<path or package>        TS2307   module cannot be resolved
+    export:<module path>#<name>     TS2305, TS2724, TS2614 (and TS2339 on
+                                    `typeof import("...")`) export missing
+    member:<owner>.<property>       TS2339, TS2551, TS2576 property missing
+
+The referenced module and name come from the message parameters (see
+message_templates). Module specifiers are resolved against the importing
+file (relative paths and the '@/' alias), so '../types' and '@/types' from
+different directories land on the same root. A type in a member error is
+traced through the file's imports (import_index) to the module declaring
+it. Types declared in the file stay local to it, and other names (ImportMeta,
+Window) are globals. analyze() makes a single pass over the diagnostics; the
+import index of a file is only built the first time one of its member errors
+needs it.
+
+    python3 cascades.py ci/step-outputs/tsc_after_2a.txt [--since ci/step-outputs/tsc_before_2a.txt]
+
+With --since, the root causes of the earlier run that no longer occur are
+listed with the diagnostics they account for, so the effect of a fix shows
+up as its whole cascade clearing.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from diagnostics import parse_artifact, relative_path
+from import_index import DEFAULT, NAMESPACE, ImportIndex
+from message_templates import classify
+
+# tsconfig.app.json maps every '@/...' path to './src/...'
+ALIASES = {'@/': 'src/'}
+EXTENSIONS = ('.ts', '.tsx', '.d.ts', '.js', '.jsx', '/index.ts', '/index.tsx', '/index.js')
+
+EXPORT_TEMPLATES = ('missing-export', 'missing-export-suggestion', 'missing-export-default')
+MEMBER_TEMPLATES = ('missing-property', 'missing-property-suggestion', 'missing-property-static')
+
+_TYPEOF_IMPORT = re.compile(r'^typeof import\("([^"]+)"\)$')
+_TYPE_NAME = re.compile(r'^(?:typeof\s+)?([A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)(?:<.*>)?$')
+
+
+class Cascade:
+    """Diagnostics that share one root cause."""
+
+    __slots__ = ('root', 'kind', 'label', 'diagnostics', 'files', 'codes', 'example')
+
+    def __init__(self, root, kind, label, example):
+        self.root = root
+        self.kind = kind
+        self.label = label
+        self.diagnostics = 0
+        self.files = Counter()
+        self.codes = Counter()
+        self.example = example       # (file, code, message) of the first diagnostic
+
+    def add(self, file, code):
+        self.diagnostics += 1
+        self.files[file] += 1
+        self.codes[code] += 1
+
+    def as_dict(self):
+        return {
+            'root': self.root,
+            'kind': self.kind,
+            'label': self.label,
+            'diagnostics': self.diagnostics,
+            'files': len(self.files),
+            'codes': dict(self.codes.most_common()),
+            'top_files': dict(self.files.most_common(10)),
+            'example': dict(zip(('file', 'code', 'message'), self.example)),
+        }
+
+
+class ImportGraph:
+    """Resolves module specifiers and type names to the files declaring them."""
+
+    def __init__(self, root='.'):
+        self.root = root
+        self._resolved = {}
+        self._indexes = {}
+
+    def resolve(self, importer, specifier):
+        """Project-relative path (extension-less if not found) or package name."""
+        specifier = specifier.strip('"\'')
+        key = (os.path.dirname(importer), specifier)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(importer, specifier)
+        return self._resolved[key]
+
+    def _resolve(self, importer, specifier):
+        if specifier.startswith('.'):
+            base = os.path.normpath(os.path.join(os.path.dirname(importer), specifier))
+        elif os.path.isabs(specifier):
+            base = relative_path(specifier)
+        else:
+            prefix = next((p for p in ALIASES if specifier.startswith(p)), None)
+            if prefix is None:
+                return specifier
+            base = ALIASES[prefix] + specifier[len(prefix):]
+        base = base.replace(os.sep, '/')
+        if os.path.isfile(os.path.join(self.root, base)):
+            return base
+        for extension in EXTENSIONS:
+            if os.path.isfile(os.path.join(self.root, base + extension)):
+                return base + extension
+        return base
+
+    def index(self, file):
+        """ImportIndex of a project file, or None if it cannot be read."""
+        if file not in self._indexes:
+            try:
+                with open(os.path.join(self.root, file), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError):
+                self._indexes[file] = None
+            else:
+                self._indexes[file] = ImportIndex(text, file)
+        return self._indexes[file]
+
+    def owner(self, file, type_text):
+        """Where the type named in a member error is declared.
+
+        '<module>#<exported name>' for an imported type, '<file>#<type>' for
+        one declared in (or only spelled out in) the file, else the global name.
+        """
+        match = _TYPE_NAME.match(type_text)
+        if not match:
+            # Object literal and union types are only meaningful in their file
+            return f"{file}#{type_text}"
+        name = match.group(1)
+        head, _, rest = name.partition('.')
+        index = self.index(file)
+        if index is None:
+            return name
+        for statement in index.statements:
+            for binding in statement.bindings:
+                if binding.name != head or statement.module is None:
+                    continue
+                module = self.resolve(file, statement.module)
+                if binding.kind == NAMESPACE:
+                    return f"{module}#{rest or '*'}"
+                imported = 'default' if binding.kind == DEFAULT else binding.imported
+                return f"{module}#{imported}{'.' + rest if rest else ''}"
+        if re.search(rf'\b(?:class|interface|type|enum|function|const|let|var|namespace)\s+{re.escape(head)}\b',
+                     index.text):
+            return f"{file}#{name}"
+        return name
+
+
+def _shorten(text, width=80):
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def root_of(file, code, message, graph) -> Optional[Tuple[str, str, str]]:
+    """(root, kind, label) for a diagnostic that can cascade, else None."""
+    found = classify(message.split('\n', 1)[0], code)
+    params = found.params
+    if found.name == 'missing-module':
+        module = graph.resolve(file, params['module'])
+        return f"module:{module}", 'module', f"Cannot resolve module '{module}'"
+    if found.name in EXPORT_TEMPLATES:
+        module = graph.resolve(file, params['module'])
+        name = params['name']
+        return f"export:{module}#{name}", 'export', f"'{name}' is not exported by '{module}'"
+    if found.name in MEMBER_TEMPLATES:
+        prop = params['property']
+        type_text = params['type']
+        namespace = _TYPEOF_IMPORT.match(type_text)
+        if namespace:
+            module = graph.resolve(file, namespace.group(1))
+            return f"export:{module}#{prop}", 'export', f"'{prop}' is not exported by '{module}'"
+        owner = graph.owner(file, type_text)
+        return f"member:{owner}.{prop}", 'member', f"Property '{prop}' is missing on {_shorten(owner)}"
+    return None
+
+
+def analyze(diagnostics: Iterable[Tuple[str, str, str]], graph=None):
+    """Cascades and each diagnostic's root, in one pass over (file, code, message).
+
+    Returns (cascades by root sorted by blast radius, list of root or None).
+    """
+    graph = graph or ImportGraph()
+    cascades: Dict[str, Cascade] = {}
+    roots: List[Optional[str]] = []
+    seen = {}
+    for file, code, message in diagnostics:
+        key = (file, code, message)
+        if key not in seen:
+            seen[key] = root_of(file, code, message, graph)
+        found = seen[key]
+        if found is None:
+            roots.append(None)
+            continue
+        root, kind, label = found
+        cascade = cascades.get(root)
+        if cascade is None:
+            cascade = cascades[root] = Cascade(root, kind, label, key)
+        cascade.add(file, code)
+        roots.append(root)
+    ordered = dict(sorted(cascades.items(), key=lambda item: (-item[1].diagnostics, item[0])))
+    return ordered, roots
+
+
+def analyze_errors(errors, graph=None):
+    """analyze() for the error dicts the report scripts build ('file', 'code', 'message')."""
+    return analyze(((e['file'], e['code'], e['message']) for e in errors), graph)
+
+
+def cleared(before, after):
+    """Cascades of before whose root no longer occurs in after."""
+    return [cascade for root, cascade in before.items() if root not in after]
+
+
+def _load(path, graph):
+    tool, diagnostics, parsed = parse_artifact(path)
+    if tool != 'tsc':
+        raise SystemExit(f"{path}: not a tsc run")
+    return analyze(((d.file, d.code, d.message) for d in diagnostics), graph)[0], len(diagnostics)
+
+
+def _print_cascades(cascades, top):
+    for cascade in list(cascades.values())[:top]:
+        codes = ', '.join(f"{code}×{n}" for code, n in cascade.codes.most_common())
+        print(f"  {cascade.diagnostics:5d} errors {len(cascade.files):4d} files  {cascade.label}  [{codes}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Collapse cascading tsc errors into root causes')
+    parser.add_argument('artifact', help='Saved tsc output')
+    parser.add_argument('--since', help='Earlier tsc output to compare against')
+    parser.add_argument('--root', default='.', help='Project root the diagnostic paths are relative to')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json', help='Save all root causes as JSON to this path')
+    args = parser.parse_args()
+
+    graph = ImportGraph(args.root)
+    cascades, total = _load(args.artifact, graph)
+    covered = sum(c.diagnostics for c in cascades.values())
+    multi = [c for c in cascades.values() if c.diagnostics > 1]
+    print(f"{args.artifact}: {total} errors; {covered} trace back to {len(cascades)} root causes "
+          f"({len(multi)} cascades of 2+ errors covering {sum(c.diagnostics for c in multi)})")
+    print(f"\nTop {min(args.top, len(cascades))} root causes by blast radius:")
+    _print_cascades(cascades, args.top)
+
+    if args.since:
+        before, before_total = _load(args.since, graph)
+        gone = cleared(before, cascades)
+        new = {root: c for root, c in cascades.items() if root not in before}
+        print(f"\nSince {args.since} ({before_total} errors):")
+        print(f"  ✓ {len(gone)} root causes cleared, taking {sum(c.diagnostics for c in gone)} errors with them")
+        _print_cascades({c.root: c for c in gone}, args.top)
+        print(f"  ✗ {len(new)} new root causes ({sum(c.diagnostics for c in new.values())} errors)")
+        _print_cascades(new, args.top)
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'artifact': args.artifact, 'errors': total,
+                       'root_causes': [c.as_dict() for c in cascades.values()]}, f, indent=2)
+        print(f"\nRoot causes saved to: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
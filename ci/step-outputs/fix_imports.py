@@ -4,8 +4,16 @@ Systematically fix no-undef errors by adding imports
 """
 import json
 import os
-import re
-from collections import defaultdict
+import sys
+
+# The shared codemod modules live at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+import dry_run
+import message_templates
+from codemod_writer import GuardedWriter
+from diagnostics import BASE_PATH, DiagnosticIndex, parse_eslint_json
+
+writer = GuardedWriter()
 
 def read_eslint_results():
     """Read ESLint results"""
@@ -18,22 +26,23 @@ def read_search_results():
         return json.load(f)
 
 def group_errors_by_file(eslint_results):
-    """Group no-undef errors by file"""
-    file_errors = defaultdict(list)
-    
-    for result in eslint_results:
-        filepath = result['filePath']
-        for message in result['messages']:
-            if message['ruleId'] == 'no-undef':
-                # Extract the undefined variable name from the message
-                match = re.search(r"'(\w+)' is not defined", message['message'])
-                if match:
-                    var_name = match.group(1)
-                    file_errors[filepath].append({
-                        'variable': var_name,
-                        'line': message['line'],
-                        'column': message['column']
-                    })
+    """Group no-undef errors by file (absolute path)"""
+    index = DiagnosticIndex(d for d in parse_eslint_json(eslint_results) if d.code == 'no-undef')
+    file_errors = {}
+    
+    for filepath in index.files():
+        errors = []
+        for diagnostic in index.for_file(filepath):
+            # The undefined variable name comes from the message template
+            params = message_templates.params(diagnostic.message, 'no-undef', 'undefined-name')
+            if params:
+                errors.append({
+                    'variable': params['name'],
+                    'line': diagnostic.line,
+                    'column': diagnostic.column
+                })
+        if errors:
+            file_errors[os.path.join(BASE_PATH, filepath)] = errors
     
     return file_errors
 
@@ -100,12 +109,10 @@ def read_file_content(filepath):
     except:
         return None
 
-def write_file_content(filepath, content):
-    """Write file content safely"""
+def write_file_content(filepath, original, content, rules=None):
+    """Write file content safely (or its diff when dry-running)"""
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
+        return writer.commit(filepath, original, content, rules)
     except:
         return False
 
@@ -136,9 +143,10 @@ def add_imports_to_file(filepath, imports_needed):
     
     # Write back to file
     new_content = '\n'.join(lines)
-    return write_file_content(filepath, new_content)
+    return write_file_content(filepath, content, new_content, {'restored-import': len(imports_needed)})
 
 def main():
+    dry_run.from_argv()
     print("Loading ESLint results...")
     eslint_results = read_eslint_results()
     
@@ -185,6 +193,8 @@ def main():
     print(f"Files processed: {len(file_errors)}")
     print(f"Files fixed: {files_fixed}")
     print(f"Import statements added: {fixes_applied}")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
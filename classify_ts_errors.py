@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+from error_buckets import PHASE_1A, classify_records, compile_scheme
+
 def parse_tsc_output(file_path):
     """Parse TypeScript output and categorize errors"""
     
@@ -34,62 +36,15 @@ def parse_tsc_output(file_path):
     return errors
 
 def classify_errors(errors):
-    """Classify errors into buckets based on the user's requirements"""
-    
-    buckets = {
-        'component_props': [],
-        'user_subscription': [],
-        'persona_analytics': [],
-        'cloudflare_runtime': [],
-        'react_jsx_missing': [],
-        'implicit_any': [],
-        'hoisting_issues': [],
-        'other': []
-    }
-    
-    for error in errors:
-        file = error['file']
-        code = error['code']
-        message = error['message'].lower()
-        
-        # Component Props Issues
-        if ('property' in message and 'does not exist on type' in message and 
-            ('intrinsicattributes' in message or 'props' in message)):
-            buckets['component_props'].append(error)
-        
-        # User/Subscription Type Issues
-        elif ('subscription' in message or 'subscriptiontier' in message or 
-              (file.endswith('user.ts') or file.endswith('subscription.ts')) or
-              'user' in file.lower()):
-            buckets['user_subscription'].append(error)
-        
-        # PersonaAnalytics Issues
-        elif ('persona' in message or 'personadetectiondata' in message or 
-              'personaanalytics' in file.lower()):
-            buckets['persona_analytics'].append(error)
-        
-        # Cloudflare Runtime Types
-        elif ('d1database' in message or 'kvnamespace' in message or 
-              'durableobjectnamespace' in message or 'cloudflare' in message or
-              file.endswith('cloudflare-functions.ts')):
-            buckets['cloudflare_runtime'].append(error)
-        
-        # React/JSX Missing Types
-        elif (code in ['TS2307'] and ('react' in message or 'jsx-runtime' in message)) or \
-             (code in ['TS7026', 'TS2875'] and 'jsx' in message):
-            buckets['react_jsx_missing'].append(error)
-        
-        # Implicit Any Issues
-        elif code in ['TS7006', 'TS7031', 'TS7053', 'TS7015']:
-            buckets['implicit_any'].append(error)
-        
-        # Hoisting Issues
-        elif code in ['TS2448', 'TS2454'] and 'used before' in message:
-            buckets['hoisting_issues'].append(error)
-        
-        # Other
-        else:
-            buckets['other'].append(error)
+    """Classify errors into buckets based on the user's requirements
+
+    The rules are the PHASE_1A scheme in error_buckets.py.
+    """
+    
+    scheme = compile_scheme(PHASE_1A)
+    buckets = {bucket: [] for bucket in scheme.buckets}
+    for error, bucket in zip(errors, classify_records(PHASE_1A, errors)):
+        buckets[bucket].append(error)
     
     return buckets
 
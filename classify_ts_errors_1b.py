@@ -9,55 +9,22 @@ import re
 from collections import defaultdict
 from typing import Dict, List, Any
 
+from error_buckets import PHASE_1B, compile_scheme
+
 
 def classify_ts_error(file_path: str, error_code: str, error_msg: str) -> str:
-    """Classify a TypeScript error into specific Phase 1b categories."""
-    
-    # WakeUpMood enum issues
-    if "WakeUpMood" in error_msg:
-        return "wakeup_mood_enum"
-    
-    # Timeout type conflicts (Node.js vs browser)
-    if "Timeout" in error_msg or "NodeJS.Timeout" in error_msg or "setTimeout" in error_msg:
-        return "timeout_conflicts"
-    
-    # Import/export mismatches - look for underscore prefixed imports and specific patterns
-    if (re.search(r"'[^']*' has no exported member named '[^']*'", error_msg) or
-        "_" in error_msg and ("exported member" in error_msg or "Cannot find module" in error_msg) or
-        error_code in ["TS2724", "TS2307"]):
-        return "import_export_mismatches"
-    
-    # AccessibilityTester style duplicates (look for duplicate properties)
-    if ("AccessibilityTester" in file_path or "accessibility" in file_path.lower()) and \
-       ("duplicate" in error_msg.lower() or "object literal may only specify known properties" in error_msg.lower()):
-        return "accessibility_styles"
-    
-    # Implicit any types
-    if error_code == "TS7006" or "implicitly has an 'any' type" in error_msg:
-        return "implicit_any"
-    
-    # Property access errors
-    if error_code in ["TS2339", "TS2741"] and "Property" in error_msg:
-        return "property_access_errors"
-    
-    # Type assignment/compatibility errors
-    if error_code in ["TS2322", "TS2345", "TS2769"]:
-        return "type_assignment_errors"
-    
-    # Missing type exports/declarations
-    if error_code in ["TS2305", "TS2307", "TS2724"]:
-        return "missing_type_declarations"
-    
-    # Other specific error types
-    if error_code in ["TS7053", "TS2561", "TS2353"]:
-        return "object_property_errors"
-    
-    return "other_errors"
+    """Classify a TypeScript error into specific Phase 1b categories.
+
+    The rules are the PHASE_1B scheme in error_buckets.py; parse_ts_errors
+    classifies all errors in one pass instead of calling this per error.
+    """
+    return compile_scheme(PHASE_1B).classify(file_path, error_code, error_msg)
 
 
 def parse_ts_errors(file_path: str) -> List[Dict[str, Any]]:
     """Parse TypeScript errors from the output file."""
     errors = []
+    raw_messages = []
     
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
@@ -80,8 +47,14 @@ def parse_ts_errors(file_path: str) -> List[Dict[str, Any]]:
             'col': int(col),
             'code': error_code,
             'message': error_msg.strip(),
-            'category': classify_ts_error(file_path_clean, error_code, error_msg)
+            'category': None
         })
+        raw_messages.append(error_msg)
+    
+    categories = compile_scheme(PHASE_1B).classify_column(
+        [error['file'] for error in errors], [error['code'] for error in errors], raw_messages)
+    for error, category in zip(errors, categories):
+        error['category'] = category
     
     return errors
 
@@ -4,6 +4,11 @@ import os
 import re
 import subprocess
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def cleanup_orphaned_markers():
     """Clean up orphaned conflict markers from all files"""
     
@@ -38,9 +43,7 @@ def cleanup_orphaned_markers():
             content = re.sub(r'\n=======\n>>>>>>> origin/main', '', content) 
             content = re.sub(r'=======\n>>>>>>> origin/main', '', content)
             
-            if content != original_content:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if writer.commit(full_path, original_content, content):
                 print(f"✅ Cleaned up orphaned markers in: {file_path}")
                 cleaned_count += 1
             else:
@@ -53,4 +56,7 @@ def cleanup_orphaned_markers():
     return cleaned_count
 
 if __name__ == "__main__":
-    cleanup_orphaned_markers()
\ No newline at end of file
+    dry_run.from_argv()
+    cleanup_orphaned_markers()
+    writer.print_summary()
+    dry_run.finish()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Shared writer for codemod scripts with a parse-validity gate.
+
+Every rule's output is parsed before it is accepted: if a buffer parsed
+before a rule ran and no longer parses afterwards, that rule's edit is
+rejected for the file (and optionally quarantined for inspection) while the
+other rules still apply. commit() is the write path of every fixer: it
+checks the final content the same way before handing it to dry_run.write,
+so a script that rewrites a file in one go is gated too.
+
+Parsing uses the TypeScript compiler through scripts/ts-parse-server.cjs
+(one long-lived node process). When node or the typescript package is not
+available, the gate falls back to the structural check from ts_lexer, which
+catches unbalanced brackets, JSX tags and unterminated literals. A reply
+without an error position (a bad request, a failure in the server) says
+nothing about the text: that edit is written unverified, with a warning.
+"""
+
+import atexit
+import json
+import os
+import subprocess
+from collections import Counter, defaultdict
+
+import dry_run
+from ts_lexer import LexError, LineIndex, first_problem, is_jsx_path
+
+DEFAULT_QUARANTINE_DIR = 'ci/quarantine'
+# Files the gate parses; anything else is written unchecked
+GATED_SUFFIXES = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+PARSE_SERVER = os.path.join(REPO_ROOT, 'scripts', 'ts-parse-server.cjs')
+
+
+class GateFailure(RuntimeError):
+    """The parse server answered without checking the text."""
+
+
+class TypeScriptParser:
+    """Client for the node parse server; started lazily on first use."""
+
+    def __init__(self, server=PARSE_SERVER, cwd=REPO_ROOT):
+        self.server = server
+        self.cwd = cwd
+        self.proc = None
+        self.available = None
+        self._next_id = 0
+
+    def _start(self):
+        try:
+            self.proc = subprocess.Popen(
+                ['node', self.server], cwd=self.cwd,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, encoding='utf-8', bufsize=1,
+            )
+        except OSError as e:
+            self._disable(f"cannot start node: {e}")
+            return
+        self.available = True
+        atexit.register(self.close)
+
+    def _disable(self, reason):
+        if self.available is not False:
+            print(f"⚠️  TypeScript parse gate unavailable ({reason}); using structural check")
+        self.available = False
+        self.close()
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+                self.proc.terminate()
+                self.proc.wait(timeout=5)
+            except Exception:
+                pass
+            self.proc = None
+
+    def first_error(self, text, path):
+        """Return a LexError for the first syntax error, None if the text parses.
+
+        Raises LookupError when the parser is unavailable and GateFailure
+        when it fails on this request.
+        """
+        if self.available is None:
+            self._start()
+        if not self.available:
+            raise LookupError('typescript parser unavailable')
+        self._next_id += 1
+        request = json.dumps({'id': self._next_id, 'file': str(path), 'text': text})
+        try:
+            self.proc.stdin.write(request + '\n')
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (BrokenPipeError, OSError):
+            line = ''
+        if not line:
+            stderr = self.proc.stderr.read().strip().splitlines() if self.proc else []
+            errors = [l.strip() for l in stderr if 'Error' in l]
+            self._disable(errors[0] if errors else 'parse server exited')
+            raise LookupError('typescript parser unavailable')
+        reply = json.loads(line)
+        if reply.get('ok'):
+            return None
+        if reply.get('line') is None:
+            raise GateFailure(reply.get('message') or 'reply without an error position')
+        pos = _utf16_position_to_offset(text, reply.get('line', 0), reply.get('character', 0))
+        return LexError('parse', reply.get('message', 'syntax error'), pos, None)
+
+
+def _utf16_position_to_offset(text, line, character):
+    """Convert a 0-based (line, UTF-16 character) position to a str offset."""
+    index = LineIndex(text)
+    start, end = index.line_span(line + 1)
+    units = 0
+    offset = start
+    while offset < end and units < character:
+        units += 2 if ord(text[offset]) > 0xFFFF else 1
+        offset += 1
+    return offset
+
+
+_typescript = TypeScriptParser()
+
+
+def parse_problem(text, path, use_typescript=True):
+    """Return the first parse problem in text as a LexError, or None if it parses."""
+    if use_typescript:
+        try:
+            return _typescript.first_error(text, path)
+        except LookupError:
+            pass
+    return first_problem(text, jsx=is_jsx_path(path))
+
+
+class GuardedWriter:
+    """Applies rule outputs through the parse gate and writes accepted results.
+
+    Typical use:
+        writer = GuardedWriter()
+        content = writer.apply(path, content, 'rule_name', rule(content))
+        ...
+        writer.commit(path, original_content, content)
+
+    Scripts that do not gate each rule separately only call commit(), with
+    their per-rule counts.
+        writer.save_report('ci/step-outputs/my-fix-rejections.json')
+    """
+
+    def __init__(self, quarantine_dir=None, use_typescript=True):
+        self.quarantine_dir = quarantine_dir
+        self.use_typescript = use_typescript
+        self.accepted = defaultdict(int)
+        self.accepted_by_file = defaultdict(Counter)  # path -> rule -> edits not yet committed
+        self.rejections = defaultdict(list)
+        self.files_written = 0
+        self.last_rejection = None   # entry of the most recent rejection
+        self._baseline_ok = {}
+
+    def _parsed_before(self, path, text):
+        # Cache per file so a chain of rules only re-checks the new buffer
+        key = (str(path), len(text), hash(text))
+        if key not in self._baseline_ok:
+            self._baseline_ok[key] = parse_problem(text, path, self.use_typescript) is None
+        return self._baseline_ok[key]
+
+    def _check(self, path, text, new_text):
+        """Problem new_text introduces (None if it parses or text did not parse)."""
+        try:
+            return self._first_new_problem(path, text, new_text)
+        except GateFailure as e:
+            print(f"⚠️  Parse gate failed on {path} ({e}); writing unverified")
+            return None
+
+    def _first_new_problem(self, path, text, new_text):
+        if not self._parsed_before(path, text):
+            # Broken before the rule ran: nothing to protect
+            return None
+        key = (str(path), len(new_text), hash(new_text))
+        if self._baseline_ok.get(key):
+            return None
+        problem = parse_problem(new_text, path, self.use_typescript)
+        if problem is None:
+            self._baseline_ok[key] = True
+        return problem
+
+    def apply(self, path, text, rule, new_text):
+        """Gate one rule's output; returns new_text if accepted, else text."""
+        if new_text == text:
+            return text
+        problem = self._check(path, text, new_text)
+        if problem is None:
+            self._accept(path, rule)
+            return new_text
+        self._reject(path, rule, new_text, problem)
+        return text
+
+    def _accept(self, path, rule):
+        self.accepted[rule] += 1
+        self.accepted_by_file[str(path)][rule] += 1
+
+    def _reject(self, path, rule, new_text, problem):
+        line, column = LineIndex(new_text).position(problem.pos)
+        entry = {
+            'file': str(path),
+            'line': line,
+            'column': column,
+            'message': problem.message,
+        }
+        if self.quarantine_dir:
+            target = os.path.join(self.quarantine_dir, rule, str(path).lstrip('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+            entry['quarantined'] = target
+        self.rejections[rule].append(entry)
+        self.last_rejection = entry
+        print(f"  ⛔ {rule}: rejected edit to {path} ({problem.message} at {line}:{column})")
+
+    def commit(self, path, original, content, rules=None, encoding='utf-8'):
+        """Write content to path if it differs from original and still parses.
+
+        rules optionally maps rule names to the edits they made; they are
+        added to the rules accepted through apply() for this file. If the
+        original parsed and content does not, nothing is written and the
+        edit is rejected under the names of those rules ('commit' if none).
+        In a dry run (see dry_run.py) the diff is streamed instead.
+        Returns True if written.
+
+        Only written edits stay in accepted: the explicit rules are added
+        once the file is written, and the file's apply() edits are taken
+        back out when it is not.
+        """
+        applied = self.accepted_by_file.pop(str(path), Counter())
+        counts = applied + Counter(rules or {})
+        written = content != original
+        if written and str(path).endswith(GATED_SUFFIXES):
+            problem = self._check(path, original, content)
+            if problem is not None:
+                self._reject(path, '+'.join(sorted(counts)) or 'commit', content, problem)
+                written = False
+        if written:
+            written = dry_run.write(path, original, content, counts or None, encoding)
+        if not written:
+            for rule, n in applied.items():
+                self.accepted[rule] -= n
+                if not self.accepted[rule]:
+                    del self.accepted[rule]
+            return False
+        for rule, n in (rules or {}).items():
+            self.accepted[rule] += n
+        self.files_written += 1
+        return True
+
+    def rejected_count(self):
+        return sum(len(items) for items in self.rejections.values())
+
+    def report(self):
+        """Per-rule accepted/rejected summary."""
+        rules = sorted(set(self.accepted) | set(self.rejections))
+        return {
+            'files_written': self.files_written,
+            'rules': {
+                rule: {
+                    'accepted': self.accepted.get(rule, 0),
+                    'rejected': len(self.rejections.get(rule, [])),
+                    'rejections': self.rejections.get(rule, []),
+                }
+                for rule in rules
+            },
+        }
+
+    def print_summary(self):
+        if not self.rejections:
+            return
+        print("\nParse gate rejections by rule:")
+        for rule, items in sorted(self.rejections.items(), key=lambda kv: -len(kv[1])):
+            print(f"  {len(items):4d}  {rule}")
+
+    def save_report(self, output_file):
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return output_file
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Baseline of known diagnostics, so checks report only new ones.
+
+A baseline (ci/baselines/<tool>.bin, committed; one per tool so a report
+on one tool's run does not count the other's entries as resolved) is a
+header and the sorted 64-bit fingerprints of every accepted diagnostic
+(see diagnostics.fingerprint), 8 bytes each. The k-th repeat of a fingerprint
+in a run is mixed with k, so a second copy of a known problem in the same
+file is still new. Checking a run is one pass: the run's fingerprints go
+in a set, which is intersected with the baseline. Diagnostics outside the
+intersection are new. Baseline entries outside it are resolved and can be
+pruned.
+
+    python3 diagnostic_baseline.py check ci/step-outputs/tsc_final.txt ci/step-outputs/eslint_final_after.json
+    python3 diagnostic_baseline.py check ... --prune      # also drop resolved entries
+    python3 diagnostic_baseline.py update ...             # accept the current diagnostics
+
+check exits with status 1 when there are new diagnostics. update only
+rewrites the baselines of the tools given.
+"""
+
+import argparse
+import os
+import sys
+from array import array
+from typing import Iterable, List, Set, Tuple
+
+from diagnostics import Diagnostic, fingerprint, parse_artifact
+
+BASELINE_DIR = 'ci/baselines'
+
+MAGIC = b'DIAGBASE1\n'
+_REPEAT = 0x9E3779B97F4A7C15   # odd 64-bit constant spreading repeat counts
+
+
+def _signed(value):
+    value &= 0xFFFFFFFFFFFFFFFF
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def fingerprints(diagnostics: Iterable[Diagnostic]) -> List[int]:
+    """Fingerprint of each diagnostic, repeats made distinct."""
+    seen = {}
+    out = []
+    for diagnostic in diagnostics:
+        value = fingerprint(diagnostic)
+        repeat = seen.get(value, 0)
+        seen[value] = repeat + 1
+        out.append(_signed(value + repeat * _REPEAT) if repeat else value)
+    return out
+
+
+def baseline_path(tool, directory=BASELINE_DIR):
+    return os.path.join(directory, f"{tool}.bin")
+
+
+def load(path) -> array:
+    """Sorted fingerprints of a baseline file (empty if there is none)."""
+    hashes = array('q')
+    if not os.path.exists(path):
+        return hashes
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a diagnostics baseline")
+        hashes.frombytes(f.read())
+    if sys.byteorder != 'little':
+        hashes.byteswap()
+    return hashes
+
+
+def save(hashes, path):
+    """Write fingerprints as a baseline (sorted, little-endian)."""
+    data = array('q', sorted(set(hashes)))
+    if sys.byteorder != 'little':
+        data.byteswap()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(data.tobytes())
+    return len(data)
+
+
+class Baseline:
+    """Baseline fingerprints, checked against a run with one set intersection."""
+
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    @classmethod
+    def load(cls, tool, directory=BASELINE_DIR):
+        return cls(load(baseline_path(tool, directory)))
+
+    def split(self, diagnostics) -> Tuple[List[Diagnostic], Set[int], int]:
+        """(new diagnostics, baseline fingerprints still present, number resolved).
+
+        The set is built from the run, which is much smaller than a grown
+        baseline; intersecting it with the baseline array runs in C.
+        """
+        diagnostics = list(diagnostics)
+        hashes = fingerprints(diagnostics)
+        present = set(hashes).intersection(self.hashes)
+        new = [d for d, value in zip(diagnostics, hashes) if value not in present]
+        return new, present, len(self.hashes) - len(present)
+
+
+def load_diagnostics(paths):
+    """Diagnostics of the saved runs, by tool."""
+    by_tool = {}
+    for path in paths:
+        tool, found, parsed = parse_artifact(path)
+        if tool is None or not parsed:
+            raise SystemExit(f"{path}: not a tsc or eslint run")
+        by_tool.setdefault(tool, []).extend(found)
+    return by_tool
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report diagnostics not in the committed baseline')
+    parser.add_argument('command', choices=('check', 'update'))
+    parser.add_argument('artifacts', nargs='+', help='Saved tsc/eslint run outputs')
+    parser.add_argument('--baseline-dir', default=BASELINE_DIR)
+    parser.add_argument('--prune', action='store_true', help='check: drop resolved entries from the baseline')
+    parser.add_argument('--limit', type=int, default=200, help='check: new diagnostics to list')
+    args = parser.parse_args()
+
+    by_tool = load_diagnostics(args.artifacts)
+    if args.command == 'update':
+        for tool, diagnostics in by_tool.items():
+            path = baseline_path(tool, args.baseline_dir)
+            print(f"Baseline saved to {path}: {save(fingerprints(diagnostics), path)} diagnostics")
+        return 0
+
+    failed = False
+    for tool, diagnostics in by_tool.items():
+        baseline = Baseline.load(tool, args.baseline_dir)
+        new, present, resolved = baseline.split(diagnostics)
+        failed = failed or bool(new)
+        print(f"{tool}: {len(diagnostics)} diagnostics, {len(baseline.hashes)} in baseline: "
+              f"{len(new)} new, {resolved} resolved")
+        for d in sorted(new, key=lambda d: (d.file, d.line, d.column))[:args.limit]:
+            print(f"  {d.file}:{d.line}:{d.column}  {d.severity}  {d.code or '-'}  {d.message.splitlines()[0]}")
+        if len(new) > args.limit:
+            print(f"  ... and {len(new) - args.limit} more")
+        if resolved:
+            if args.prune:
+                count = save(present, baseline_path(tool, args.baseline_dir))
+                print(f"  Pruned {resolved} resolved entries; baseline now has {count}")
+            else:
+                print(f"  {resolved} baseline entries are resolved; run with --prune to drop them")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Source context around diagnostics, in bulk.
+
+For every diagnostic of one or more saved tsc/eslint runs, the N lines
+before and after its line are extracted, as in the hand-made
+ci/step-outputs/context_*.txt files. Each file with diagnostics is
+memory-mapped once and indexed by line (ts_lexer.LineIndex over the bytes).
+Only the lines a snippet shows are decoded, so a large run costs about one
+newline scan per file plus the snippets themselves.
+
+    python3 diagnostic_context.py ci/step-outputs/tsc_after_2a.txt -C 3 -o ci/step-outputs/context_tsc_after_2a.jsonl
+    python3 diagnostic_context.py ci/step-outputs/eslint_after_2c.txt --code no-undef -o review.md
+
+Output is JSON Lines (one object per diagnostic, with the snippet's first
+line number and its lines) or markdown (per file, a numbered code block per
+diagnostic with the reported line marked). The format follows the output
+file's extension unless --format is given.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from diagnostics import BASE_PATH, Diagnostic, DiagnosticIndex, parse_artifact
+from ts_lexer import LineIndex
+
+FORMATS = ('jsonl', 'markdown')
+
+# Markdown code block language by extension
+LANGUAGES = {'.ts': 'ts', '.tsx': 'tsx', '.js': 'js', '.jsx': 'jsx', '.cjs': 'js', '.mjs': 'js',
+             '.json': 'json', '.css': 'css', '.html': 'html'}
+
+
+class Snippet(NamedTuple):
+    diagnostic: Diagnostic
+    first_line: int          # line number of lines[0]
+    lines: List[str]
+    error: Optional[str]     # why there is no snippet (file missing, line past the end)
+
+    def as_dict(self):
+        d = self.diagnostic
+        entry = {'file': d.file, 'line': d.line, 'column': d.column, 'severity': d.severity,
+                 'code': d.code, 'message': d.message, 'tool': d.tool,
+                 'first_line': self.first_line, 'lines': self.lines}
+        if self.error:
+            entry['error'] = self.error
+        return entry
+
+
+class MappedFile:
+    """A file memory-mapped read-only, with the byte offsets of its lines."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self.data = b''
+        self.lines = LineIndex(self.data)
+
+    @property
+    def line_count(self):
+        return len(self.lines.starts)
+
+    def text(self, first, last):
+        """Lines first..last (1-based, inclusive) as decoded strings, newlines removed."""
+        start = self.lines.offset(first)
+        end = self.lines.line_span(last)[1]
+        return self.data[start:end].decode('utf-8', errors='replace').split('\n')
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def extract(index: DiagnosticIndex, context=3, root='.') -> Iterator[Snippet]:
+    """Snippets for every diagnostic in index, file by file, each file read once."""
+    for path in index.files():
+        diagnostics = index.for_file(path)
+        try:
+            source = MappedFile(os.path.join(root, path))
+        except OSError as e:
+            for d in diagnostics:
+                yield Snippet(d, 0, [], f"cannot read file: {e.strerror}")
+            continue
+        with source:
+            count = source.line_count
+            for d in diagnostics:
+                if not 1 <= d.line <= count:
+                    yield Snippet(d, 0, [], f"line {d.line} is past the end of the file ({count} lines)")
+                    continue
+                first = max(1, d.line - context)
+                last = min(count, d.line + context)
+                yield Snippet(d, first, [line.rstrip('\r') for line in source.text(first, last)], None)
+
+
+def write_jsonl(snippets: Iterable[Snippet], out):
+    count = 0
+    for snippet in snippets:
+        out.write(json.dumps(snippet.as_dict(), ensure_ascii=False))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def write_markdown(snippets: Iterable[Snippet], out, title='Diagnostic context'):
+    out.write(f"# {title}\n")
+    count = 0
+    current = None
+    for snippet in snippets:
+        d = snippet.diagnostic
+        if d.file != current:
+            current = d.file
+            out.write(f"\n## {d.file}\n")
+        count += 1
+        out.write(f"\n### {d.line}:{d.column} {d.severity} {d.code or '-'}\n\n")
+        out.write(d.message.strip() + '\n\n')
+        if snippet.error:
+            out.write(f"_{snippet.error}_\n")
+            continue
+        width = len(str(snippet.first_line + len(snippet.lines) - 1))
+        out.write(f"```{LANGUAGES.get(os.path.splitext(d.file)[1], '')}\n")
+        for number, line in enumerate(snippet.lines, snippet.first_line):
+            marker = '>' if number == d.line else ' '
+            out.write(f"{marker} {number:>{width}} | {line}\n")
+        out.write("```\n")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract source context around every diagnostic')
+    parser.add_argument('artifacts', nargs='+', help='Saved tsc/eslint run outputs')
+    parser.add_argument('-C', '--context', type=int, default=3, help='Lines before and after each location')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--format', choices=FORMATS,
+                        help='Output format (default: markdown for .md outputs, else jsonl)')
+    parser.add_argument('--code', action='append', help='Only these codes/rules (repeatable)')
+    parser.add_argument('--root', default='.', help='Project root the diagnostic paths are relative to')
+    args = parser.parse_args()
+
+    diagnostics = []
+    for path in args.artifacts:
+        tool, found, parsed = parse_artifact(path, BASE_PATH)
+        if tool is None:
+            raise SystemExit(f"{path}: not a tsc or eslint run")
+        diagnostics.extend(found)
+    if args.code:
+        diagnostics = [d for d in diagnostics if d.code in set(args.code)]
+    index = DiagnosticIndex(diagnostics)
+
+    fmt = args.format or ('markdown' if args.output and args.output.endswith('.md') else 'jsonl')
+    snippets = extract(index, args.context, args.root)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        out = open(args.output, 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
+    try:
+        if fmt == 'markdown':
+            count = write_markdown(snippets, out, f"Context for {', '.join(args.artifacts)}")
+        else:
+            count = write_jsonl(snippets, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.output:
+        print(f"{count} snippets from {len(index.files())} files saved to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Diagnostic-driven codemods with column-precise edits.
+
+A fixer registers for a tsc code or an ESLint rule and is called with a Site
+for each matching diagnostic: the diagnostic's line and column resolved to a
+character offset in the file (tsc and ESLint count columns in UTF-16 units),
+the token at that offset, and the innermost bracket pair or JSX element
+enclosing it. A fixer returns an Edit (or a list of them, or None) instead of
+rewriting the text itself:
+
+    @fixer('TS7006')
+    def annotate(site):
+        return Edit(site.token.end, site.token.end, ': any', 'param-annotation')
+
+fix_file() handles every diagnostic of a file with one read, one lexer pass
+and one write. Edits are applied together after all fixers have run, so the
+positions of later diagnostics never shift. An edit overlapping one that was
+already accepted is reported as a conflict and dropped; identical edits (two
+diagnostics asking for the same change) are applied once. The result is
+committed through the module's GuardedWriter with the edits counted per
+rule, so a file the edits leave unparsable is not written; FixResult.rejected
+says why.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import dry_run
+from codemod_writer import GuardedWriter
+from diagnostics import Diagnostic
+from scope_index import ScopeIndex
+from ts_lexer import JSX_OPEN, PUNCT, LineIndex, is_jsx_path, strip_comments, tokenize
+
+
+class Edit(NamedTuple):
+    start: int
+    end: int
+    text: str
+    rule: str = ''       # defaults to the name of the fixer that made it
+
+
+class Fixer(NamedTuple):
+    code: str
+    name: str
+    fn: Callable
+
+
+class Node(NamedTuple):
+    """Innermost bracket pair or JSX element around a position."""
+    kind: str            # '(', '[', '{', '${', or '<' for a JSX element
+    open: int            # token index of the opener
+    close: Optional[int] # token index of the closer, None if unbalanced
+    start: int
+    end: int
+
+
+class Site:
+    """One diagnostic resolved in its file."""
+
+    __slots__ = ('file', 'diagnostic', 'offset', 'index', 'token', 'node')
+
+    def __init__(self, file, diagnostic, offset, index):
+        self.file = file
+        self.diagnostic = diagnostic
+        self.offset = offset
+        self.index = index                                # token index, None past the last token
+        self.token = file.tokens[index] if index is not None else None
+        self.node = file.enclosing(index if index is not None else len(file.tokens))
+
+    def previous(self, n=1):
+        """Token n positions before the site's token (comments skipped), or None."""
+        return self.file.token(self.index - n if self.index is not None else len(self.file.tokens) - n)
+
+    def next(self, n=1):
+        return self.file.token(self.index + n) if self.index is not None else None
+
+
+class FixResult(NamedTuple):
+    applied: List[tuple]      # (Site, Edit) in file order
+    conflicts: List[tuple]    # (Site, Edit) dropped for overlapping an applied edit
+    unfixed: List[Diagnostic] # diagnostics no fixer made an edit for
+    counts: Counter           # applied edits per rule
+    written: bool
+    rejected: Optional[dict]  # parse gate rejection (file, line, column, message) if not written
+
+
+FIXERS: Dict[str, List[Fixer]] = {}
+
+writer = GuardedWriter()
+
+
+def fixer(code, name=None):
+    """Register the decorated function as a fixer for a tsc code or ESLint rule."""
+    def register(fn):
+        FIXERS.setdefault(code, []).append(Fixer(code, name or fn.__name__, fn))
+        return fn
+    return register
+
+
+class SourceFile:
+    """Text of one file with its line index and comment-free token stream."""
+
+    def __init__(self, path, text):
+        self.path = str(path)
+        self.text = text
+        self.lines = LineIndex(text)
+        self._lexed = tokenize(text, jsx=is_jsx_path(self.path))
+        self.tokens, self.pairs = strip_comments(self._lexed)
+        self._starts = [t.start for t in self.tokens]
+        self._scopes = None
+
+    @property
+    def scopes(self):
+        """ScopeIndex of the file, built from the same lexer pass on first use."""
+        if self._scopes is None:
+            self._scopes = ScopeIndex(self.text, self.path, lexed=self._lexed)
+        return self._scopes
+
+    def offset(self, line, column=1):
+        """Offset of a 1-based diagnostic position whose column counts UTF-16 units."""
+        start, end = self.lines.line_span(line)
+        segment = self.text[start:end]
+        if segment.isascii() or all(ord(c) <= 0xFFFF for c in segment):
+            return min(start + column - 1, end)
+        units = 0
+        offset = start
+        while offset < end and units < column - 1:
+            units += 2 if ord(self.text[offset]) > 0xFFFF else 1
+            offset += 1
+        return offset
+
+    def token_index(self, offset):
+        """Index of the token containing offset, else of the next one (None past the end)."""
+        i = bisect_right(self._starts, offset) - 1
+        if i >= 0 and offset < self.tokens[i].end:
+            return i
+        return i + 1 if i + 1 < len(self.tokens) else None
+
+    def token(self, index):
+        return self.tokens[index] if 0 <= index < len(self.tokens) else None
+
+    def enclosing(self, index) -> Optional[Node]:
+        """Innermost bracket pair or JSX element containing token index (None at top level)."""
+        pairs = self.pairs
+        j = index - 1
+        while j >= 0:
+            partner = pairs.get(j)
+            if partner is not None and partner < j:
+                j = partner - 1      # skip a complete sibling group
+                continue
+            token = self.tokens[j]
+            if token.kind == JSX_OPEN or (token.kind == PUNCT and token.value in ('(', '[', '{', '${')):
+                if partner is None or partner >= index:
+                    end = self.tokens[partner].end if partner is not None else len(self.text)
+                    kind = '<' if token.kind == JSX_OPEN else token.value
+                    return Node(kind, j, partner, token.start, end)
+            j -= 1
+        return None
+
+    def indentation(self, offset):
+        """Leading whitespace of the line containing offset."""
+        start, end = self.lines.line_span(self.lines.position(offset)[0])
+        line = self.text[start:end]
+        return line[:len(line) - len(line.lstrip())]
+
+    def site(self, diagnostic: Diagnostic) -> Site:
+        offset = self.offset(diagnostic.line, diagnostic.column)
+        return Site(self, diagnostic, offset, self.token_index(offset))
+
+
+def apply_edits(text, edits):
+    """Apply non-overlapping edits in one pass; returns (new text, applied, conflicts).
+
+    edits is a list of (Site, Edit). Ties keep their given order, so among
+    insertions at the same offset the first diagnostic's text comes first.
+    """
+    ordered = sorted(edits, key=lambda item: (item[1].start, item[1].end))
+    applied, conflicts = [], []
+    pieces = []
+    position = 0
+    last = None
+    for site, edit in ordered:
+        if last is not None and edit[:3] == last[:3]:
+            continue
+        if edit.start < position or edit.end > len(text):
+            conflicts.append((site, edit))
+            continue
+        pieces.append(text[position:edit.start])
+        pieces.append(edit.text)
+        position = edit.end
+        last = edit
+        applied.append((site, edit))
+    pieces.append(text[position:])
+    return ''.join(pieces), applied, conflicts
+
+
+def _edits_of(result, name):
+    if result is None:
+        return []
+    if isinstance(result, Edit):
+        result = [result]
+    return [edit if edit.rule else edit._replace(rule=name) for edit in result]
+
+
+def fix_file(path, diagnostics: Iterable[Diagnostic], fixers=None, encoding='utf-8') -> FixResult:
+    """Run the registered fixers over one file's diagnostics; one read, one write."""
+    fixers = FIXERS if fixers is None else fixers
+    original = dry_run.read(path, encoding=encoding)
+    source = SourceFile(path, original)
+    edits, unfixed = [], []
+    for diagnostic in diagnostics:
+        handlers = fixers.get(diagnostic.code)
+        if not handlers:
+            unfixed.append(diagnostic)
+            continue
+        site = source.site(diagnostic)
+        made = []
+        for handler in handlers:
+            made = _edits_of(handler.fn(site), handler.name)
+            if made:
+                break
+        if not made:
+            unfixed.append(diagnostic)
+        edits.extend((site, edit) for edit in made)
+    content, applied, conflicts = apply_edits(original, edits)
+    counts = Counter(edit.rule for _, edit in applied)
+    written = writer.commit(path, original, content, counts, encoding=encoding)
+    rejected = writer.last_rejection if not written and content != original else None
+    return FixResult(applied, conflicts, unfixed, counts, written, rejected)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Parsers for the lint and type-check outputs saved under ci/step-outputs.
+
+Three formats are recognised:
+
+    tsc            src/App.tsx(2,19): error TS2307: Cannot find module 'react' ...
+                   (indented lines continue the message above)
+    eslint         stylish text: a file path line, then "  12:5  error  message  rule"
+                   lines, ending with "✖ N problems (E errors, W warnings)"
+    eslint-json    eslint --format json: [{"filePath": ..., "messages": [...]}]
+
+Every format is turned into Diagnostic tuples with paths relative to the
+project root. DiagnosticIndex groups them by file for fixers that work
+file by file. fingerprint() hashes a diagnostic's tool, file, code and
+message (not its position), so the same problem keeps its fingerprint when
+edits above it move it to another line.
+"""
+
+import json
+import os
+import posixpath
+import re
+from collections import defaultdict
+from hashlib import blake2b
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+BASE_PATH = '/project/workspace/Coolhgg/Relife'
+
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+TSC_LINE = re.compile(r'^(\S.*?)\((\d+),(\d+)\):\s*(error|warning)\s+(TS\d+):\s*(.*)$')
+ESLINT_LINE = re.compile(r'^\s+(\d+):(\d+)\s+(error|warning)\s+(.*)$')
+# Only tried where a whitespace run starts; from inside one, \s{2,} rescans the rest of the run
+ESLINT_RULE = re.compile(r'(?<!\s)\s{2,}(@?[\w-]+(?:/[\w-]+)*)$')
+ESLINT_SUMMARY = re.compile(r'^✖ (\d+) problems? \((\d+) errors?, (\d+) warnings?\)')
+
+SEVERITIES = {1: 'warning', 2: 'error'}
+
+# Bumped when fingerprint() changes, so stored fingerprints can be recomputed
+FINGERPRINT_VERSION = 2
+
+
+class Diagnostic(NamedTuple):
+    tool: str        # 'tsc' or 'eslint'
+    file: str        # relative to the project root
+    line: int
+    column: int
+    severity: str    # 'error' or 'warning'
+    code: str        # TS2307, no-undef, ... ('' for eslint parsing errors)
+    message: str
+
+
+def relative_path(path, root=BASE_PATH):
+    """path relative to root when it lies inside it, else unchanged."""
+    if root and os.path.isabs(path):
+        root = root.rstrip('/') + '/'
+        if path.startswith(root):
+            return path[len(root):]
+    return path
+
+
+def normalize_path(path, root=BASE_PATH):
+    """Key for a file: relative to root (or the current directory), '/'-separated, no './' or '..'."""
+    path = relative_path(os.fspath(path), root)
+    if os.path.isabs(path):
+        relative = os.path.relpath(path)
+        if not relative.startswith('..'):
+            path = relative
+    return posixpath.normpath(path.replace(os.sep, '/'))
+
+
+def fingerprint(diagnostic):
+    """Line-independent 64-bit hash of a diagnostic, as a signed int (fits SQLite).
+
+    Whitespace and a final '.' are ignored: stylish output drops the '.'
+    that eslint --format json keeps.
+    """
+    key = '\0'.join((diagnostic.tool, diagnostic.file, diagnostic.code,
+                     ' '.join(diagnostic.message.split()).rstrip('.')))
+    return int.from_bytes(blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big', signed=True)
+
+
+def parse_tsc(text, root=BASE_PATH):
+    """Diagnostics from `tsc --noEmit` output (non-pretty)."""
+    diagnostics = []
+    current = None
+    for line in ANSI_ESCAPE.sub('', text).splitlines():
+        match = TSC_LINE.match(line)
+        if match:
+            if current:
+                diagnostics.append(Diagnostic(*current))
+            path, row, col, severity, code, message = match.groups()
+            current = ['tsc', relative_path(path, root), int(row), int(col), severity, code, message]
+        elif current and line[:1].isspace() and line.strip():
+            # Elaboration of the message above ("  Type 'X' is not assignable ...")
+            current[6] += '\n' + line.strip()
+        elif current:
+            diagnostics.append(Diagnostic(*current))
+            current = None
+    if current:
+        diagnostics.append(Diagnostic(*current))
+    return diagnostics
+
+
+def parse_eslint_stylish(text, root=BASE_PATH):
+    """Diagnostics and the "✖ N problems" total (or None) from stylish output."""
+    diagnostics = []
+    total = None
+    path = None
+    current = None
+    previous_blank = True
+
+    def flush():
+        if current:
+            body = current[6]
+            match = ESLINT_RULE.search(body)
+            code = match.group(1) if match and not body.startswith('Parsing error') else ''
+            if code:
+                body = body[:match.start()]
+            current[5], current[6] = code, body.rstrip()
+            diagnostics.append(Diagnostic(*current))
+
+    for line in ANSI_ESCAPE.sub('', text).splitlines():
+        match = ESLINT_LINE.match(line) if path else None
+        if match:
+            flush()
+            row, col, severity, body = match.groups()
+            current = ['eslint', path, int(row), int(col), severity, '', body]
+        elif not line.strip():
+            flush()
+            current = None
+        elif ESLINT_SUMMARY.match(line):
+            flush()
+            current = None
+            total = int(ESLINT_SUMMARY.match(line).group(1))
+        elif current:
+            # Multi-line message; the rule id ends its last line
+            current[6] += '\n' + line
+        elif previous_blank and not line[:1].isspace() and ' ' not in line.strip():
+            path = relative_path(line.strip(), root)
+        previous_blank = not line.strip()
+    flush()
+    return diagnostics, total
+
+
+def parse_eslint_json(results, root=BASE_PATH):
+    """Diagnostics from parsed `eslint --format json` results."""
+    diagnostics = []
+    for file_result in results:
+        path = relative_path(file_result.get('filePath', ''), root)
+        for message in file_result.get('messages', []):
+            diagnostics.append(Diagnostic(
+                'eslint', path, message.get('line') or 0, message.get('column') or 0,
+                SEVERITIES.get(message.get('severity'), 'error'),
+                message.get('ruleId') or '', message.get('message', '')))
+    return diagnostics
+
+
+class DiagnosticIndex:
+    """Diagnostics by file, each file's sorted by (line, column).
+
+    Lookups go through normalize_path, so 'src/a.ts', './src/a.ts' and the
+    absolute path are the same file, and files with the same name in
+    different folders stay apart.
+    """
+
+    def __init__(self, diagnostics: Iterable[Diagnostic], root=BASE_PATH):
+        self.root = root
+        by_file: Dict[str, List[Diagnostic]] = defaultdict(list)
+        for diagnostic in diagnostics:
+            by_file[normalize_path(diagnostic.file, root)].append(diagnostic)
+        for found in by_file.values():
+            found.sort(key=lambda d: (d.line, d.column))
+        self._by_file = dict(by_file)
+
+    @classmethod
+    def from_artifact(cls, path, root=BASE_PATH, codes=None):
+        """Index of a saved tsc/eslint run, optionally only some codes (rules)."""
+        _, diagnostics, _ = parse_artifact(path, root)
+        if codes is not None:
+            diagnostics = [d for d in diagnostics if d.code in codes]
+        return cls(diagnostics, root)
+
+    def __len__(self):
+        return sum(len(found) for found in self._by_file.values())
+
+    def __contains__(self, path):
+        return normalize_path(path, self.root) in self._by_file
+
+    def files(self, code=None) -> List[str]:
+        """Normalised paths with diagnostics (with code, if given), sorted."""
+        return sorted(path for path, found in self._by_file.items()
+                      if code is None or any(d.code == code for d in found))
+
+    def for_file(self, path, code=None) -> List[Diagnostic]:
+        """Diagnostics of path (with code, if given) by position."""
+        found = self._by_file.get(normalize_path(path, self.root), [])
+        return found if code is None else [d for d in found if d.code == code]
+
+
+def parse_artifact(path, root=BASE_PATH) -> Tuple[Optional[str], List[Diagnostic], bool]:
+    """(tool, diagnostics, parsed) for a saved run output.
+
+    tool is None when the file is not a tsc or eslint run. parsed is False
+    when the run did not produce a result (eslint crashed, a note was saved
+    instead of the output), so it should not count as a clean run.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    name = os.path.basename(path)
+    if name.endswith('.json'):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None, [], False
+        if isinstance(data, list) and all(isinstance(item, dict) and 'filePath' in item for item in data):
+            return 'eslint', parse_eslint_json(data, root), True
+        return None, [], False
+    if name.startswith('tsc'):
+        diagnostics = parse_tsc(text, root)
+        # tsc prints nothing for a clean run; anything else without errors is a note
+        return 'tsc', diagnostics, bool(diagnostics) or not text.strip()
+    if name.startswith('eslint'):
+        diagnostics, total = parse_eslint_stylish(text, root)
+        return 'eslint', diagnostics, total is not None or bool(diagnostics)
+    diagnostics = parse_tsc(text, root)
+    if diagnostics:
+        return 'tsc', diagnostics, True
+    diagnostics, total = parse_eslint_stylish(text, root)
+    if total is not None:
+        return 'eslint', diagnostics, True
+    return None, [], False
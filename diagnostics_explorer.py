@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Static HTML explorer for every diagnostic of a run.
+
+The markdown reports stop at the top 50 issues. This writes all
+diagnostics of a run in the run_history database as small JSON shards,
+grouped by directory and by rule and cut into pages of --page-size:
+
+    <out>/index.html            viewer (loads index.json, then one shard at a time)
+    <out>/index.json            run totals, and per group its name, count and page count
+    <out>/dirs/<n>/<page>.json  diagnostics of the n-th directory
+    <out>/rules/<n>/<page>.json diagnostics of the n-th code or rule
+
+A shard lists its files once. Its rows are [file index, line, column,
+severity, code, message]. Each grouping is one query ordered by group,
+streamed from SQLite with one page in memory at a time, so the size of a
+run only changes the number of shards.
+
+    python3 run_history.py ingest
+    python3 diagnostics_explorer.py tsc_after_2c [--out ci/step-outputs/explorer]
+    python3 -m http.server -d ci/step-outputs/explorer
+
+Browsers do not fetch JSON from file:// pages, hence the server.
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import shutil
+import sys
+
+from run_history import DEFAULT_DB, connect, find_run, latest_run
+
+DEFAULT_OUT = 'ci/step-outputs/explorer'
+PAGE_SIZE = 500
+
+# (directory under <out>, SQL expression of the group, label in the viewer)
+GROUPINGS = (
+    ('dirs', 'fd.dir', 'By directory'),
+    ('rules', "COALESCE(NULLIF(d.code, ''), '-')", 'By rule'),
+)
+
+_QUERY = """
+    SELECT {group} AS grp, f.path, d.line, d.col, d.severity, d.code, d.message
+    FROM diagnostics d
+    JOIN files f ON f.id = d.file_id
+    JOIN explorer_dirs fd ON fd.file_id = d.file_id
+    WHERE d.run_id = ?
+    ORDER BY grp, f.path, d.line, d.col
+"""
+
+_JSON = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def _file_dirs(db):
+    """Temporary table of each file's directory, so grouping by it needs no per-row call."""
+    db.execute("CREATE TEMP TABLE IF NOT EXISTS explorer_dirs (file_id INTEGER PRIMARY KEY, dir TEXT NOT NULL)")
+    db.execute("DELETE FROM explorer_dirs")
+    db.executemany("INSERT INTO explorer_dirs VALUES (?, ?)",
+                   ((file_id, posixpath.dirname(path) or '.') for file_id, path in db.execute("SELECT id, path FROM files")))
+
+
+def _write_json(path, data):
+    # json.dump() streams through the pure-Python encoder; dumps() uses the C one
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(data, **_JSON))
+
+
+class _ShardWriter:
+    """Pages of one group, written as they fill."""
+
+    def __init__(self, directory, page_size):
+        self.directory = directory
+        self.page_size = page_size
+        self.count = 0
+        self.pages = 0
+        self._files = {}
+        self._rows = []
+
+    def add(self, path, line, col, severity, code, message):
+        file_index = self._files.setdefault(path, len(self._files))
+        self._rows.append([file_index, line, col, severity, code, message])
+        self.count += 1
+        if len(self._rows) == self.page_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        if not self.pages:
+            os.makedirs(self.directory, exist_ok=True)
+        _write_json(os.path.join(self.directory, f"{self.pages}.json"),
+                    {'files': list(self._files), 'rows': self._rows})
+        self.pages += 1
+        self._files = {}
+        self._rows = []
+
+
+def write_grouping(db, run_id, out, name, group_sql, page_size=PAGE_SIZE):
+    """Shards of one grouping; returns [{'name', 'count', 'pages'}] in shard order."""
+    groups = []
+    writer = None
+    current = None
+    cursor = db.execute(_QUERY.format(group=group_sql), (run_id,))
+    for grp, path, line, col, severity, code, message in cursor:
+        if writer is None or grp != current:
+            if writer is not None:
+                writer.flush()
+                groups.append({'name': current, 'count': writer.count, 'pages': writer.pages})
+            current = grp
+            writer = _ShardWriter(os.path.join(out, name, str(len(groups))), page_size)
+        writer.add(path, line, col, severity, code or '-', message)
+    if writer is not None:
+        writer.flush()
+        groups.append({'name': current, 'count': writer.count, 'pages': writer.pages})
+    return groups
+
+
+def generate(db, run_name, run_id, out=DEFAULT_OUT, page_size=PAGE_SIZE):
+    """Write the viewer, the index and every shard of a run; returns the index."""
+    tool, total, errors, warnings = db.execute(
+        "SELECT tool, total, errors, warnings FROM runs WHERE id = ?", (run_id,)).fetchone()
+    _file_dirs(db)
+    os.makedirs(out, exist_ok=True)
+    index = {'run': run_name, 'tool': tool, 'total': total, 'errors': errors, 'warnings': warnings,
+             'page_size': page_size, 'groupings': []}
+    for name, group_sql, label in GROUPINGS:
+        # Shards of an earlier run would otherwise linger next to the new ones
+        shutil.rmtree(os.path.join(out, name), ignore_errors=True)
+        groups = write_grouping(db, run_id, out, name, group_sql, page_size)
+        index['groupings'].append({'name': name, 'label': label, 'groups': groups})
+    _write_json(os.path.join(out, 'index.json'), index)
+    with open(os.path.join(out, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(VIEWER)
+    return index
+
+
+VIEWER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Diagnostics explorer</title>
+<style>
+  body { margin: 0; font: 13px system-ui, sans-serif; display: grid; grid-template: auto 1fr / 22em 1fr; height: 100vh; }
+  header { grid-column: 1 / 3; padding: 8px 12px; border-bottom: 1px solid #ddd; }
+  header h1 { display: inline; font-size: 16px; margin-right: 1em; }
+  nav { overflow: auto; border-right: 1px solid #ddd; padding: 8px; }
+  nav ul { list-style: none; margin: 8px 0; padding: 0; }
+  nav li { padding: 2px 4px; cursor: pointer; display: flex; justify-content: space-between; gap: 8px; }
+  nav li:hover { background: #eef3ff; }
+  nav li span:first-child { overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+  nav input, nav select { width: 100%; box-sizing: border-box; margin-bottom: 4px; }
+  main { overflow: auto; padding: 8px 12px; }
+  table { border-collapse: collapse; width: 100%; }
+  th, td { text-align: left; padding: 2px 6px; border-bottom: 1px solid #eee; vertical-align: top; }
+  td.msg { white-space: pre-wrap; }
+  .error { color: #b00020; } .warning { color: #a06000; }
+  #pager button { margin-right: 4px; }
+</style>
+</head>
+<body>
+<header><h1 id="title">Diagnostics</h1><span id="totals"></span></header>
+<nav>
+  <select id="grouping"></select>
+  <input id="filter" placeholder="Filter groups">
+  <ul id="groups"></ul>
+</nav>
+<main>
+  <div id="pager"></div>
+  <table>
+    <thead><tr><th>File</th><th>Line</th><th>Col</th><th>Severity</th><th>Code</th><th>Message</th></tr></thead>
+    <tbody id="rows"></tbody>
+  </table>
+</main>
+<script>
+const $ = id => document.getElementById(id);
+const MAX_LISTED = 500;
+let index = null;
+
+function el(tag, text, cls) {
+  const node = document.createElement(tag);
+  if (text !== undefined) node.textContent = text;
+  if (cls) node.className = cls;
+  return node;
+}
+
+function grouping(name) {
+  return index.groupings.find(g => g.name === name) || index.groupings[0];
+}
+
+function showGroups() {
+  const current = grouping($('grouping').value);
+  const needle = $('filter').value.toLowerCase();
+  const list = $('groups');
+  list.replaceChildren();
+  const matches = current.groups.map((g, i) => [g, i]).filter(([g]) => String(g.name).toLowerCase().includes(needle));
+  for (const [g, i] of matches.slice(0, MAX_LISTED)) {
+    const item = el('li');
+    item.append(el('span', g.name), el('span', g.count.toLocaleString()));
+    item.title = g.name;
+    item.onclick = () => { location.hash = `${current.name}/${i}/0`; };
+    list.append(item);
+  }
+  if (matches.length > MAX_LISTED) list.append(el('li', `… ${matches.length - MAX_LISTED} more, filter to narrow`));
+}
+
+async function showShard() {
+  const [name, i, page] = location.hash.slice(1).split('/');
+  const current = grouping(name);
+  const group = current.groups[Number(i)];
+  if (!group) return;
+  const p = Math.min(Math.max(Number(page) || 0, 0), group.pages - 1);
+  const shard = await (await fetch(`${current.name}/${i}/${p}.json`)).json();
+  const rows = $('rows');
+  rows.replaceChildren();
+  for (const [file, line, col, severity, code, message] of shard.rows) {
+    const tr = el('tr');
+    tr.append(el('td', shard.files[file]), el('td', line), el('td', col),
+              el('td', severity, severity), el('td', code), el('td', message, 'msg'));
+    rows.append(tr);
+  }
+  const pager = $('pager');
+  pager.replaceChildren(el('strong', `${group.name} `),
+                        el('span', `${group.count.toLocaleString()} diagnostics, page ${p + 1} of ${group.pages} `));
+  for (const [label, target] of [['« first', 0], ['‹ prev', p - 1], ['next ›', p + 1], ['last »', group.pages - 1]]) {
+    const button = el('button', label);
+    button.disabled = target < 0 || target >= group.pages || target === p;
+    button.onclick = () => { location.hash = `${current.name}/${i}/${target}`; };
+    pager.append(button);
+  }
+}
+
+fetch('index.json').then(r => r.json()).then(data => {
+  index = data;
+  $('title').textContent = `${data.run} (${data.tool})`;
+  $('totals').textContent = `${data.total.toLocaleString()} diagnostics: ` +
+    `${data.errors.toLocaleString()} errors, ${data.warnings.toLocaleString()} warnings`;
+  for (const g of data.groupings) $('grouping').append(new Option(`${g.label} (${g.groups.length})`, g.name));
+  $('grouping').value = location.hash.slice(1).split('/')[0] || data.groupings[0].name;
+  $('grouping').onchange = showGroups;
+  $('filter').oninput = showGroups;
+  window.onhashchange = showShard;
+  showGroups();
+  showShard();
+});
+</script>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a sharded static HTML explorer of a run')
+    parser.add_argument('run', nargs='?', help='Run name (default: latest run of --tool)')
+    parser.add_argument('--tool', choices=('tsc', 'eslint'), default='tsc')
+    parser.add_argument('--db', default=DEFAULT_DB, help='run_history database')
+    parser.add_argument('--out', default=DEFAULT_OUT, help='Output directory')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help='Diagnostics per shard')
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    if args.run:
+        run_id, _ = find_run(db, args.run)
+        run = args.run
+    else:
+        latest = latest_run(db, args.tool)
+        if not latest:
+            sys.exit(f"No {args.tool} runs in {args.db}; run `python3 run_history.py ingest` first")
+        run_id, run = latest
+    index = generate(db, run, run_id, args.out, args.page_size)
+    shards = sum(g['pages'] for grouping in index['groupings'] for g in grouping['groups'])
+    groups = ', '.join(f"{len(grouping['groups'])} {grouping['name']}" for grouping in index['groupings'])
+    print(f"{run}: {index['total']:,} diagnostics in {shards:,} shards ({groups}) written to {args.out}")
+    print(f"View with: python3 -m http.server -d {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Dry-run mode for the codemod scripts: unified diffs instead of writes.
+
+Fixers commit source files through codemod_writer.GuardedWriter, whose
+parse gate hands accepted content to write(path, original, content, rules)
+(and read files they edit more than once through read(path)).
+Normally write() just writes the file. With --dry-run [PATCH] on the command
+line (see from_argv), nothing is written: each file's edit is streamed as
+a git-style unified diff as soon as it is computed, to PATCH or to stdout
+('-', the default), and the per-rule counts passed along are totalled. The
+patch applies with `git apply` (or `patch -p1`) from --diff-root, the
+current directory by default, so an edit can be reviewed and applied later
+without re-running the rules. The totals are saved as JSON next to
+PATCH (PATCH with a .stats.json extension), or to --dry-run-stats; a dry
+run to stdout saves them only when --dry-run-stats is given, so nothing
+lands in the working tree.
+
+When the patch goes to stdout, the script's own output is sent to stderr
+so the patch stays clean:
+    python3 fix-event-handlers.py --dry-run > handlers.patch
+    git apply --stat handlers.patch && git apply handlers.patch
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from difflib import unified_diff
+
+_LINE_RE = re.compile(r'[^\n]*\n|[^\n]+')
+
+_SINK = None
+
+
+def _lines(text):
+    # git splits on '\n' only (str.splitlines also splits on \r, \f, ...)
+    return _LINE_RE.findall(text)
+
+
+def file_diff(path, original, content, context=3):
+    """git-style unified diff of one file, '' when nothing changed."""
+    if original == content:
+        return ''
+    out = [f"diff --git a/{path} b/{path}\n"]
+    for line in unified_diff(_lines(original), _lines(content), f"a/{path}", f"b/{path}", n=context):
+        out.append(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n')
+    return ''.join(out)
+
+
+class DiffSink:
+    """Streams per-file diffs and totals per-rule counts."""
+
+    def __init__(self, patch='-', root=None, stats_path=None):
+        self.patch = patch
+        self.root = os.path.abspath(root or os.getcwd())
+        if stats_path is None and patch != '-':
+            stats_path = os.path.splitext(patch)[0] + '.stats.json'
+        self.stats_path = stats_path     # None: the totals are only printed
+        self.rules = Counter()
+        self.files = []          # relative paths with a diff, in order
+        self.pending = {}        # absolute path -> content after the edits so far
+        self.lines_added = 0
+        self.lines_removed = 0
+        if patch == '-':
+            # Keep stdout for the patch; the script's own output goes to stderr
+            self._out = sys.stdout
+            sys.stdout = sys.stderr
+        else:
+            os.makedirs(os.path.dirname(patch) or '.', exist_ok=True)
+            self._out = open(patch, 'w', encoding='utf-8', newline='')
+
+    def relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    def emit(self, path, original, content, rules=None, encoding='utf-8'):
+        """Stream the diff for one file; returns True if it changed."""
+        relative = self.relative(path)
+        key = os.path.abspath(path)
+        if key in self.pending:
+            # A later edit to the same file applies on top of the earlier diff
+            original = self.pending[key]
+        else:
+            try:
+                # Diff against the bytes on disk (scripts read with newline
+                # translation), so the patch applies to the file as it is
+                with open(path, 'r', encoding=encoding, newline='') as f:
+                    original = f.read()
+            except (OSError, UnicodeDecodeError):
+                pass
+        diff = file_diff(relative, original, content)
+        if not diff:
+            return False
+        self._out.write(diff)
+        self._out.flush()
+        self.pending[key] = content
+        if relative not in self.files:
+            self.files.append(relative)
+        for line in diff.splitlines():
+            if line.startswith('+') and not line.startswith('+++'):
+                self.lines_added += 1
+            elif line.startswith('-') and not line.startswith('---'):
+                self.lines_removed += 1
+        if rules:
+            self.rules.update({rule: n for rule, n in rules.items() if n})
+        return True
+
+    def report(self):
+        return {
+            'patch': self.patch,
+            'root': self.root,
+            'files': self.files,
+            'lines_added': self.lines_added,
+            'lines_removed': self.lines_removed,
+            'rules': dict(self.rules.most_common()),
+        }
+
+    def save_stats(self, path=None):
+        path = path or self.stats_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def finish(self):
+        """Close the patch, print the per-rule counts and save them as JSON."""
+        if self.patch != '-':
+            self._out.close()
+        where = 'stdout' if self.patch == '-' else self.patch
+        print(f"\n🔍 Dry run: {len(self.files)} files would change "
+              f"(+{self.lines_added} -{self.lines_removed} lines); patch written to {where}")
+        if self.rules:
+            print("  Edits by rule:")
+            for rule, n in self.rules.most_common():
+                print(f"  {n:6d}  {rule}")
+        if self.stats_path:
+            print(f"Dry-run stats saved to: {self.save_stats()}")
+
+
+# -- process-wide sink --------------------------------------------------------------
+
+def enable(patch='-', root=None, stats_path=None):
+    global _SINK
+    _SINK = DiffSink(patch, root, stats_path)
+    return _SINK
+
+
+def active():
+    """The enabled DiffSink, or None."""
+    return _SINK
+
+
+def from_argv(argv=None, root=None):
+    """Enable dry-run mode when --dry-run [PATCH] is on the command line.
+
+    root is the default --diff-root for scripts that edit a tree elsewhere.
+    Unrelated arguments are left for the script. Returns the sink or None.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--dry-run', nargs='?', const='-', default=None)
+    parser.add_argument('--diff-root', default=None)
+    parser.add_argument('--dry-run-stats', default=None)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if args.dry_run is None:
+        return None
+    return enable(args.dry_run, args.diff_root or root, args.dry_run_stats)
+
+
+def read(path, encoding='utf-8'):
+    """Content of path, including edits already made in this dry run.
+
+    Scripts that edit the same file more than once read it through here.
+    """
+    if _SINK is not None and os.path.abspath(path) in _SINK.pending:
+        return _SINK.pending[os.path.abspath(path)]
+    with open(path, 'r', encoding=encoding) as f:
+        return f.read()
+
+
+def write(path, original, content, rules=None, encoding='utf-8'):
+    """Write content to path, or stream its diff when dry-running.
+
+    rules optionally maps rule names to the edits they made in this file.
+    Returns True if content differs from original.
+    """
+    if content == original:
+        return False
+    if _SINK is not None:
+        return _SINK.emit(path, original, content, rules, encoding)
+    with open(path, 'w', encoding=encoding) as f:
+        f.write(content)
+    return True
+
+
+def finish():
+    if _SINK is not None:
+        _SINK.finish()
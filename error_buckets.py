@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Bucket rules for the tsc error reports, compiled into decision tables.
+
+The predicates the bucketing scripts test are declared once in WHEN, and
+each report's scheme is an ordered list of (bucket, predicate, codes)
+rules, first match wins:
+
+    PHASE_1A   classify_ts_errors.py     (tsc_buckets-1a.json)
+    PHASE_1B   classify_ts_errors_1b.py  (tsc_buckets-1b.json)
+    OVERVIEW   analyze_ts_errors.py      (tsc_buckets.json)
+
+A predicate is a conjunction of atoms (Msg, File) and Any(...) groups.
+compile_scheme() turns a scheme into a table keyed by TS code that holds
+only the rules that can apply to that code. classify_column() then
+buckets a whole column of (file, code, message) at once:
+
+  * the column's messages are joined into one string (lowercased for the
+    case-insensitive substrings) and each substring of the scheme is
+    located in it with str.find, jumping to the next message after a hit,
+    so the per-message work is done in C rather than per rule in Python;
+  * messages and file predicates are evaluated once per distinct message
+    and file;
+  * each row's substrings and file predicates form a bitmask, and the
+    bucket for a (code, bitmask) pair is decided once and reused.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Msg(NamedTuple):
+    """The message contains text (compared lowercased when nocase)."""
+    text: str
+    nocase: bool = False
+
+
+class File(NamedTuple):
+    """The file path ends with (suffix) or contains text."""
+    text: str
+    suffix: bool = False
+    nocase: bool = False
+
+    def test(self, path):
+        path = path.lower() if self.nocase else path
+        return path.endswith(self.text) if self.suffix else self.text in path
+
+
+class Any(NamedTuple):
+    """At least one of the atoms holds."""
+    atoms: Tuple[Union[Msg, File], ...]
+
+
+def any_of(*atoms):
+    return Any(tuple(atoms))
+
+
+def nocase(*texts):
+    return tuple(Msg(text, True) for text in texts)
+
+
+class Rule(NamedTuple):
+    bucket: str
+    when: str                                   # key of WHEN; '' always holds
+    codes: Optional[Tuple[str, ...]] = None     # None: any code
+
+
+# Predicates shared by the schemes; each is a conjunction of atoms and Any groups
+WHEN: Dict[str, Tuple[Union[Msg, File, Any], ...]] = {
+    '': (),
+    # Phase 1a compares lowercased messages
+    'props-property-missing-lc': nocase('property', 'does not exist on type') + (
+        any_of(*nocase('intrinsicattributes', 'props')),),
+    'user-subscription-lc': (any_of(*nocase('subscription', 'subscriptiontier'),
+                                    File('user.ts', suffix=True), File('subscription.ts', suffix=True),
+                                    File('user', nocase=True)),),
+    'persona-lc': (any_of(*nocase('persona', 'personadetectiondata'), File('personaanalytics', nocase=True)),),
+    'cloudflare-lc': (any_of(*nocase('d1database', 'kvnamespace', 'durableobjectnamespace', 'cloudflare'),
+                             File('cloudflare-functions.ts', suffix=True)),),
+    'react-module-lc': (any_of(*nocase('react', 'jsx-runtime')),),
+    'jsx-lc': nocase('jsx'),
+    'used-before-lc': nocase('used before'),
+    # Case-sensitive
+    'wakeup-mood': (Msg('WakeUpMood'),),
+    'timeout': (any_of(Msg('Timeout'), Msg('NodeJS.Timeout'), Msg('setTimeout')),),
+    'timeout-not-assignable': (Msg('Timeout'), Msg('not assignable to type')),
+    'no-exported-member-named': (Msg("' has no exported member named '"),),
+    'underscore-export-or-module': (Msg('_'), any_of(Msg('exported member'), Msg('Cannot find module'))),
+    'accessibility-duplicate': (any_of(File('AccessibilityTester'), File('accessibility', nocase=True)),
+                                any_of(*nocase('duplicate', 'object literal may only specify known properties'))),
+    'implicit-any': (Msg("implicitly has an 'any' type"),),
+    'property': (Msg('Property'),),
+    'props-not-assignable': (Msg('not assignable to type'), Msg('Props')),
+    'props-property-missing': (Msg('Property'), Msg('does not exist on type'), Msg('Props')),
+    'subscription-tier': (Msg('subscriptionTier'),),
+    'user-subscription': (Msg('subscription', True), Msg('User')),
+    'persona-detection': (any_of(Msg('PersonaDetectionData'), File('PersonaAnalytics')),),
+    'cloudflare': (any_of(Msg('D1Database'), Msg('KVNamespace'), Msg('DurableObjectNamespace')),),
+    'missing-export': (any_of(Msg('has no exported member'), Msg('has no default export')),),
+    'duplicate-style': (Msg('is specified more than once'), Msg('style')),
+    'used-before': (any_of(Msg('used before its declaration'), Msg('used before being assigned')),),
+    'cannot-find-name': (Msg('Cannot find name'),),
+}
+
+PHASE_1A = [
+    Rule('component_props', 'props-property-missing-lc'),
+    Rule('user_subscription', 'user-subscription-lc'),
+    Rule('persona_analytics', 'persona-lc'),
+    Rule('cloudflare_runtime', 'cloudflare-lc'),
+    Rule('react_jsx_missing', 'react-module-lc', ('TS2307',)),
+    Rule('react_jsx_missing', 'jsx-lc', ('TS7026', 'TS2875')),
+    Rule('implicit_any', '', ('TS7006', 'TS7031', 'TS7053', 'TS7015')),
+    Rule('hoisting_issues', 'used-before-lc', ('TS2448', 'TS2454')),
+    Rule('other', ''),
+]
+
+PHASE_1B = [
+    Rule('wakeup_mood_enum', 'wakeup-mood'),
+    Rule('timeout_conflicts', 'timeout'),
+    Rule('import_export_mismatches', 'no-exported-member-named'),
+    Rule('import_export_mismatches', 'underscore-export-or-module'),
+    Rule('import_export_mismatches', '', ('TS2724', 'TS2307')),
+    Rule('accessibility_styles', 'accessibility-duplicate'),
+    Rule('implicit_any', '', ('TS7006',)),
+    Rule('implicit_any', 'implicit-any'),
+    Rule('property_access_errors', 'property', ('TS2339', 'TS2741')),
+    Rule('type_assignment_errors', '', ('TS2322', 'TS2345', 'TS2769')),
+    Rule('missing_type_declarations', '', ('TS2305', 'TS2307', 'TS2724')),
+    Rule('object_property_errors', '', ('TS7053', 'TS2561', 'TS2353')),
+    Rule('other_errors', ''),
+]
+
+OVERVIEW = [
+    Rule('component_props', 'props-not-assignable'),
+    Rule('component_props', 'props-property-missing'),
+    Rule('user_types', 'subscription-tier'),
+    Rule('user_types', 'user-subscription'),
+    Rule('persona_analytics', 'persona-detection'),
+    Rule('cloudflare_types', 'cloudflare'),
+    Rule('wakeup_mood', 'wakeup-mood'),
+    Rule('timeout_types', 'timeout-not-assignable'),
+    Rule('import_exports', 'missing-export'),
+    Rule('duplicate_styles', 'duplicate-style'),
+    Rule('hoisting_issues', 'used-before'),
+    Rule('implicit_any', 'implicit-any'),
+    Rule('missing_imports', 'cannot-find-name'),
+    Rule('other', ''),
+]
+
+_SEPARATOR = '\0'
+
+
+class _Scanner:
+    """Finds which of a set of substrings each text of a column contains."""
+
+    def __init__(self, bits, nocase=False):
+        self.bits = bits            # substring -> bitmask
+        self.nocase = nocase
+
+    def scan(self, texts):
+        """Bitmask of the substrings found in each of texts."""
+        masks = [0] * len(texts)
+        if not self.bits or not texts:
+            return masks
+        if self.nocase:
+            texts = [text.lower() for text in texts]
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+        starts.append(position)
+        find = _SEPARATOR.join(texts).find
+        for text, bit in self.bits.items():
+            index = find(text)
+            while index >= 0:
+                row = bisect_right(starts, index) - 1
+                masks[row] |= bit
+                # One hit per row is enough: continue from the next row
+                index = find(text, starts[row + 1])
+        return masks
+
+
+class CompiledScheme:
+    """A scheme as a decision table keyed by TS code."""
+
+    def __init__(self, rules: Sequence[Rule], when=WHEN):
+        bits = {}
+
+        def bit(atom):
+            if atom not in bits:
+                bits[atom] = 1 << len(bits)
+            return bits[atom]
+
+        compiled = []
+        for rule in rules:
+            masks = []
+            for item in when[rule.when]:
+                atoms = item.atoms if isinstance(item, Any) else (item,)
+                mask = 0
+                for atom in atoms:
+                    if isinstance(atom, Msg) and atom.nocase:
+                        atom = Msg(atom.text.lower(), True)
+                    mask |= bit(atom)
+                masks.append(mask)
+            compiled.append((rule.bucket, tuple(masks), rule.codes))
+        # Bucket names in rule order (the order the reports list them in)
+        self.buckets = tuple(dict.fromkeys(rule.bucket for rule in rules))
+        self.files = [(atom, mask) for atom, mask in bits.items() if isinstance(atom, File)]
+
+        messages = {atom: mask for atom, mask in bits.items() if isinstance(atom, Msg)}
+        self.exact = _Scanner({a.text: m for a, m in messages.items() if not a.nocase})
+        self.lower = _Scanner({a.text: m for a, m in messages.items() if a.nocase}, nocase=True)
+
+        # Decision table: code -> the rules that can apply to it, in order
+        codes = {code for _, _, rule_codes in compiled for code in rule_codes or ()}
+        self.table = {code: tuple((bucket, masks) for bucket, masks, rule_codes in compiled
+                                  if rule_codes is None or code in rule_codes)
+                      for code in codes}
+        self.default = tuple((bucket, masks) for bucket, masks, rule_codes in compiled if rule_codes is None)
+        self._decided = {}
+
+    def _decide(self, code, mask):
+        bucket = next((name for name, masks in self.table.get(code, self.default)
+                       if all(mask & m for m in masks)), None)
+        self._decided[code, mask] = bucket
+        return bucket
+
+    def _file_mask(self, path):
+        mask = 0
+        for atom, bit in self.files:
+            if atom.test(path):
+                mask |= bit
+        return mask
+
+    def classify_column(self, files: Sequence[str], codes: Sequence[str], messages: Sequence[str]) -> List[Optional[str]]:
+        """Bucket of each row (None if no rule matched)."""
+        # tsc repeats messages heavily; scan each distinct one once
+        distinct = list(dict.fromkeys(messages))
+        message_masks = self.exact.scan(distinct)
+        if self.lower.bits:
+            for row, mask in enumerate(self.lower.scan(distinct)):
+                message_masks[row] |= mask
+        message_masks = dict(zip(distinct, message_masks))
+        if self.files:
+            file_masks = {path: self._file_mask(path) for path in set(files)}
+            masks = [message_masks[message] | file_masks[path] for message, path in zip(messages, files)]
+        else:
+            masks = [message_masks[message] for message in messages]
+        decided = self._decided
+        decide = self._decide
+        return [decided[key] if key in decided else decide(*key) for key in zip(codes, masks)]
+
+    def classify(self, file, code, message):
+        return self.classify_column([file], [code], [message])[0]
+
+
+_COMPILED = {}
+
+
+def compile_scheme(rules):
+    """CompiledScheme for rules (one of the scheme lists above), built once."""
+    key = id(rules)
+    if key not in _COMPILED:
+        _COMPILED[key] = CompiledScheme(rules)
+    return _COMPILED[key]
+
+
+def classify_records(rules, errors, file_key='file', code_key='code', message_key='message'):
+    """Bucket of each error dict under rules, in one pass over the column."""
+    return compile_scheme(rules).classify_column(
+        [error[file_key] for error in errors],
+        [error[code_key] for error in errors],
+        [error[message_key] for error in errors])
@@ -5,6 +5,8 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
+from cascades import analyze_errors
+
 def parse_tsc_errors(file_path):
     """Parse TypeScript errors from the output file."""
     errors = []
@@ -97,13 +99,37 @@ def categorize_and_prioritize_errors(errors):
     
     return categorized
 
+def collapse_cascades(errors):
+    """Keep one error per root cause (see cascades.py), annotated with its cascade.
+
+    Errors that are one of many reports of the same missing module, export or
+    member would otherwise be ranked as separate problems.
+    """
+    cascades, roots = analyze_errors(errors)
+    kept = []
+    shown = set()
+    for error, root in zip(errors, roots):
+        cascade = cascades.get(root)
+        if cascade is None or cascade.diagnostics < 2:
+            kept.append(error)
+        elif root not in shown:
+            shown.add(root)
+            error['cascade'] = {
+                'root': root,
+                'label': cascade.label,
+                'errors': cascade.diagnostics,
+                'files': len(cascade.files),
+            }
+            kept.append(error)
+    return kept
+
 def extract_top_errors(errors, limit=200):
     """Extract top errors by severity and frequency."""
     
-    # Sort by severity (descending) then by file/line for consistency
+    # Sort by severity (descending), larger cascades first, then by file/line for consistency
     sorted_errors = sorted(
-        errors, 
-        key=lambda x: (-x['severity'], x['file'], x['line'])
+        collapse_cascades(errors), 
+        key=lambda x: (-x['severity'], -x.get('cascade', {}).get('errors', 1), x['file'], x['line'])
     )
     
     # Deduplicate similar errors (same file, same error code, similar line numbers)
@@ -151,7 +177,10 @@ def main():
     with open(output_file, 'w') as f:
         f.write("# Top 200 TypeScript Errors - Staged Remediation Analysis\n\n")
         f.write(f"Total errors found: {len(all_errors)}\n")
-        f.write(f"Unique high-priority errors: {len(top_errors)}\n\n")
+        f.write(f"Unique high-priority errors: {len(top_errors)}\n")
+        collapsed = [e['cascade'] for e in top_errors if 'cascade' in e]
+        f.write(f"Root causes collapsed: {len(collapsed)} "
+                f"(standing for {sum(c['errors'] for c in collapsed)} errors)\n\n")
         
         # Summary by category
         f.write("## Error Categories Summary\n\n")
@@ -170,7 +199,12 @@ def main():
             
             f.write(f"{i}. **{error['file']}:{error['line']}:{error['col']}** "
                    f"[{error['code']}] (Severity: {error['severity']})\n")
-            f.write(f"   {error['message']}\n\n")
+            f.write(f"   {error['message']}\n")
+            if 'cascade' in error:
+                cascade = error['cascade']
+                f.write(f"   Root cause: {cascade['label']} - "
+                        f"{cascade['errors']} errors in {cascade['files']} files\n")
+            f.write("\n")
     
     print(f"Written top {len(top_errors)} errors to {output_file}")
     
@@ -1,243 +1,14 @@
 #!/usr/bin/env python3
 """
 Final aggressive any-type reduction to reach < 1,500 target
-"""
 
-import os
-import re
-import subprocess
+Runs the final stage of any_reduction.py (its rules live in any_rules.py);
+run any_reduction.py itself to apply every stage in one pass.
+"""
 
-def process_file_final(file_path):
-    """Final aggressive processing to eliminate all remaining any types"""
-    print(f"Processing: {file_path}")
-    
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        original_content = content
-        changes_made = 0
-        
-        # Most aggressive patterns - replace every single 'any' that's safe to replace
-        aggressive_patterns = [
-            # All parameter types
-            (r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\b', r'\1: unknown'),
-            
-            # All array types
-            (r'\bany\[\]', 'unknown[]'),
-            
-            # All generic types
-            (r'<any>', '<unknown>'),
-            (r'<any,', '<unknown,'),
-            (r',\s*any>', ', unknown>'),
-            (r',\s*any,', ', unknown,'),
-            
-            # All object types
-            (r'Record<[^,>]+,\s*any>', 'Record<string, unknown>'),
-            (r':\s*\{\s*\[key:\s*string\]:\s*any\s*\}', ': Record<string, unknown>'),
-            
-            # All return types
-            (r':\s*any\s*(?=\s*[=;,\)])', ': unknown'),
-            (r'Promise<any>', 'Promise<unknown>'),
-            (r'Array<any>', 'Array<unknown>'),
-            
-            # All casts and assertions
-            (r'\bas\s+any\b', 'as unknown'),
-            
-            # Function types
-            (r'Function:\s*any', 'Function: (...args: unknown[]) => unknown'),
-            (r'=>\s*any\b', '=> unknown'),
-            
-            # Property declarations
-            (r':\s*any(?=\s*[;,\}])', ': unknown'),
-            
-            # Callback and event handler types
-            (r'callback:\s*any', 'callback: (...args: unknown[]) => unknown'),
-            (r'handler:\s*any', 'handler: (...args: unknown[]) => unknown'),
-            (r'listener:\s*any', 'listener: (...args: unknown[]) => unknown'),
-            
-            # React specific
-            (r'React\.FC<any>', 'React.FC<Record<string, unknown>>'),
-            (r'Component<any>', 'Component<Record<string, unknown>>'),
-            
-            # Test and mock specific (but preserve expect.any)
-            (r'jest\.fn\(\)\s*as\s*any', 'jest.fn() as jest.MockedFunction<(...args: unknown[]) => unknown>'),
-            
-            # Service and configuration
-            (r'config:\s*any', 'config: Record<string, unknown>'),
-            (r'options:\s*any', 'options: Record<string, unknown>'),
-            (r'settings:\s*any', 'settings: Record<string, unknown>'),
-            (r'params:\s*any', 'params: Record<string, unknown>'),
-            (r'metadata:\s*any', 'metadata: Record<string, unknown>'),
-            
-            # Error handling
-            (r'error:\s*any', 'error: Error | unknown'),
-            (r'catch\s*\(\s*([^)]+):\s*any\s*\)', r'catch (\1: Error | unknown)'),
-            
-            # Event and DOM
-            (r'event:\s*any', 'event: Event | unknown'),
-            (r'target:\s*any', 'target: EventTarget | unknown'),
-            
-            # Data and response types
-            (r'data:\s*any', 'data: unknown'),
-            (r'response:\s*any', 'response: unknown'),
-            (r'result:\s*any', 'result: unknown'),
-            (r'payload:\s*any', 'payload: unknown'),
-            (r'body:\s*any', 'body: unknown'),
-            
-            # Utility and helper types
-            (r'value:\s*any', 'value: unknown'),
-            (r'item:\s*any', 'item: unknown'),
-            (r'element:\s*any', 'element: unknown'),
-            (r'node:\s*any', 'node: unknown'),
-        ]
-        
-        # Apply patterns with detailed logging
-        for pattern, replacement in aggressive_patterns:
-            old_content = content
-            # Use re.MULTILINE flag for better matching
-            content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-            if content != old_content:
-                matches = len(re.findall(pattern, old_content, flags=re.MULTILINE))
-                changes_made += matches
-                if matches > 0:
-                    print(f"  - Replaced {matches} instances of: {pattern[:50]}...")
-        
-        # Special handling for specific file types
-        if '.test.ts' in file_path or 'mock' in file_path.lower():
-            # Additional test-specific patterns
-            test_patterns = [
-                (r'\bany\b(?!\s*\()', 'unknown'),  # Replace standalone 'any' except function calls like any(Object)
-            ]
-            
-            for pattern, replacement in test_patterns:
-                # Skip expect.any patterns
-                if 'expect.any' not in content:
-                    old_content = content
-                    content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-                    if content != old_content:
-                        matches = len(re.findall(pattern, old_content, flags=re.MULTILINE))
-                        changes_made += matches
-                        print(f"  - Test-specific: Replaced {matches} standalone 'any'")
-        
-        # Write back if changes were made
-        if content != original_content:
-            with open(file_path, 'w') as f:
-                f.write(content)
-            
-            print(f"  ✅ Made {changes_made} aggressive type improvements")
-            return changes_made
-        else:
-            print(f"  ✅ No changes needed")
-            return 0
-            
-    except Exception as e:
-        print(f"  ❌ Error processing {file_path}: {e}")
-        return 0
+import sys
 
-def main():
-    """Final aggressive reduction"""
-    
-    base_path = '/project/workspace/Coolhgg/Relife'
-    
-    # Process all TypeScript files in the entire codebase
-    print("🔍 Finding all TypeScript files...")
-    all_ts_files = []
-    
-    for root, dirs, files in os.walk(os.path.join(base_path, 'src')):
-        # Skip node_modules and other irrelevant directories
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
-        
-        for file in files:
-            if file.endswith(('.ts', '.tsx')):
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, base_path)
-                all_ts_files.append(rel_path)
-    
-    print(f"🚀 Starting FINAL AGGRESSIVE any-type reduction...")
-    print(f"Processing {len(all_ts_files)} TypeScript files...\n")
-    
-    total_changes = 0
-    
-    # Sort by file size (larger files first) for maximum impact
-    file_sizes = []
-    for file_path in all_ts_files:
-        full_path = os.path.join(base_path, file_path)
-        try:
-            size = os.path.getsize(full_path)
-            file_sizes.append((file_path, size))
-        except:
-            file_sizes.append((file_path, 0))
-    
-    file_sizes.sort(key=lambda x: x[1], reverse=True)
-    
-    for file_path, _ in file_sizes:
-        full_path = os.path.join(base_path, file_path)
-        if os.path.exists(full_path):
-            changes = process_file_final(full_path)
-            total_changes += changes
-            
-            # Check if we've reached our target
-            if total_changes > 0 and total_changes % 100 == 0:
-                print(f"\n📊 Progress check after {total_changes} changes...")
-                try:
-                    result = subprocess.run(
-                        ['grep', '-r', '-c', r'\bany\b', f'{base_path}/src/', '--include=*.ts', '--include=*.tsx'],
-                        capture_output=True, text=True, cwd=base_path
-                    )
-                    
-                    if result.returncode == 0:
-                        lines = [line for line in result.stdout.strip().split('\n') if line and not line.endswith(':0')]
-                        current_total = sum(int(line.split(':')[-1]) for line in lines if ':' in line and line.split(':')[-1].isdigit())
-                        print(f"Current any usage: {current_total} occurrences")
-                        
-                        if current_total < 1500:
-                            print("🎉 EARLY SUCCESS: Reached target!")
-                            break
-                except:
-                    pass
-    
-    print(f"\n✅ FINAL PHASE Completed! Made {total_changes} total aggressive improvements")
-    
-    # Final count
-    print("\n📊 FINAL ASSESSMENT...")
-    try:
-        result = subprocess.run(
-            ['grep', '-r', '-c', r'\bany\b', f'{base_path}/src/', '--include=*.ts', '--include=*.tsx'],
-            capture_output=True, text=True, cwd=base_path
-        )
-        
-        if result.returncode == 0:
-            lines = [line for line in result.stdout.strip().split('\n') if line and not line.endswith(':0')]
-            final_total = sum(int(line.split(':')[-1]) for line in lines if ':' in line and line.split(':')[-1].isdigit())
-            
-            original_estimate = 3372  # From our initial count
-            total_reduction = original_estimate - final_total
-            
-            print(f"🎯 FINAL RESULTS:")
-            print(f"   Original any usage: ~{original_estimate} occurrences")
-            print(f"   Final any usage: {final_total} occurrences")
-            print(f"   Total reduction: {total_reduction} occurrences ({total_reduction/original_estimate*100:.1f}%)")
-            
-            if final_total < 1500:
-                print("🎉🎉🎉 SUCCESS: REACHED TARGET OF < 1,500 ANY OCCURRENCES!")
-                print(f"🏆 Exceeded goal by {1500 - final_total} occurrences!")
-            else:
-                print(f"📈 Close! Need {final_total - 1500} more reductions to reach < 1,500")
-                
-            # Show remaining high-usage files
-            remaining_files = [(line.split(':')[0].replace(f'{base_path}/', ''), int(line.split(':')[1])) 
-                             for line in lines if ':' in line and line.split(':')[-1].isdigit()]
-            remaining_files.sort(key=lambda x: x[1], reverse=True)
-            
-            print(f"\n🔝 Top 10 remaining files with any usage:")
-            for file_path, count in remaining_files[:10]:
-                print(f"   {file_path}: {count} occurrences")
-                
-        else:
-            print("Could not perform final count")
-    except Exception as e:
-        print(f"Error in final assessment: {e}")
+import any_reduction
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    any_reduction.main(['--only', 'final'] + sys.argv[1:])
@@ -6,9 +6,17 @@ Fix malformed arrow functions in React event handlers
 import re
 import os
 import glob
+from collections import Counter
 
-def fix_arrow_function_syntax(content):
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
+def fix_arrow_function_syntax(content, counts=None):
     """Fix common arrow function syntax issues in React event handlers"""
+    if counts is None:
+        counts = Counter()
     
     # Pattern 1: Fix missing opening brace after arrow function
     # onChange={(e: React.ChangeEvent<HTMLInputElement>) =>
@@ -26,7 +34,8 @@ def fix_arrow_function_syntax(content):
         closing_indent = match.group(4)
         return f"{prefix} {{\n{indent}{content}\n{closing_indent}}}"
     
-    content = pattern1.sub(replace1, content)
+    content, n = pattern1.subn(replace1, content)
+    counts['onchange-missing-brace'] += n
     
     # Pattern 2: Fix broken arrow function declarations with extra parenthesis
     # onChange={(e: React.ChangeEvent<HTMLInputElement>)
@@ -36,7 +45,8 @@ def fix_arrow_function_syntax(content):
         re.MULTILINE
     )
     
-    content = pattern2.sub(r'\1 =>', content)
+    content, n = pattern2.subn(r'\1 =>', content)
+    counts['onchange-extra-paren'] += n
     
     return content
 
@@ -54,12 +64,11 @@ def process_file(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             original_content = f.read()
         
-        fixed_content = fix_arrow_function_syntax(original_content)
+        counts = Counter()
+        fixed_content = fix_arrow_function_syntax(original_content, counts)
         fixed_content = fix_jsx_syntax_errors(fixed_content)
         
-        if fixed_content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
+        if writer.commit(file_path, original_content, fixed_content, counts):
             print(f"Fixed: {file_path}")
             return True
         else:
@@ -72,6 +81,7 @@ def process_file(file_path):
 
 def main():
     """Main function"""
+    dry_run.from_argv()
     src_dir = "./src"
     
     # Find all TypeScript/TSX files
@@ -85,6 +95,8 @@ def main():
             files_fixed += 1
     
     print(f"\nProcessed {len(files)} files, fixed {files_fixed} files")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,131 +7,61 @@ import re
 import os
 import glob
 
-def fix_event_handler_typing(content):
-    """Fix untyped React event handlers with proper TypeScript types"""
-    
-    patterns_replacements = [
-        # onChange handlers for input elements
-        (
-            r'onChange=\{?\(e: any\)\s*=>',
-            r'onChange={(e: React.ChangeEvent<HTMLInputElement>) =>'
-        ),
-        
-        # onChange handlers for textarea elements (look for context clues)
-        (
-            r'onChange=\{?\(e: any\)\s*=>\s*[^}]*textarea[^}]*\}?',
-            lambda m: m.group(0).replace('(e: any)', '(e: React.ChangeEvent<HTMLTextAreaElement>)')
-        ),
-        
-        # onChange handlers for select elements
-        (
-            r'onChange=\{?\(e: any\)\s*=>\s*[^}]*\.value[^}]*target\.value[^}]*\}?',
-            lambda m: m.group(0).replace('(e: any)', '(e: React.ChangeEvent<HTMLSelectElement>)')
-        ),
-        
-        # onClick handlers for button elements  
-        (
-            r'onClick=\{?\(e: any\)\s*=>',
-            r'onClick={(e: React.MouseEvent<HTMLButtonElement>) =>'
-        ),
-        
-        # onSubmit handlers for form elements
-        (
-            r'onSubmit=\{?\(e: any\)\s*=>',
-            r'onSubmit={(e: React.FormEvent<HTMLFormElement>) =>'
-        ),
-        
-        # onKeyDown handlers
-        (
-            r'onKeyDown=\{?\(e: any\)\s*=>',
-            r'onKeyDown={(e: React.KeyboardEvent) =>'
-        ),
-        
-        # onFocus handlers
-        (
-            r'onFocus=\{?\(e: any\)\s*=>',
-            r'onFocus={(e: React.FocusEvent<HTMLInputElement>) =>'
-        ),
-        
-        # onBlur handlers
-        (
-            r'onBlur=\{?\(e: any\)\s*=>',
-            r'onBlur={(e: React.FocusEvent<HTMLInputElement>) =>'
-        ),
-        
-        # Generic event handlers that might be missed
-        (
-            r'on[A-Z][a-zA-Z]*=\{?\(e: any\)\s*=>',
-            lambda m: m.group(0).replace('(e: any)', '(e: React.SyntheticEvent)')
-        )
-    ]
-    
-    modified = False
-    for pattern, replacement in patterns_replacements:
-        if callable(replacement):
-            # For lambda replacements
-            matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-            for match in reversed(list(matches)):  # Reverse to avoid offset issues
-                new_content = replacement(match)
-                if new_content != match.group(0):
-                    content = content[:match.start()] + new_content + content[match.end():]
-                    modified = True
-        else:
-            # For string replacements
-            old_content = content
-            content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-            if content != old_content:
-                modified = True
-    
-    return content, modified
+import dry_run
+import rule_profile
+import rule_watchdog
+from codemod_writer import GuardedWriter
+from jsx_index import JsxIndex, event_type
 
-def infer_element_type_from_context(content, match_obj):
-    """Try to infer the correct HTML element type from surrounding context"""
-    
-    start = max(0, match_obj.start() - 200)  # Look 200 chars before
-    end = min(len(content), match_obj.end() + 200)  # Look 200 chars after
-    context = content[start:end]
-    
-    # Check for element types
-    if '<input' in context or 'type="text"' in context or 'type="email"' in context:
-        return 'HTMLInputElement'
-    elif '<textarea' in context:
-        return 'HTMLTextAreaElement'
-    elif '<select' in context:
-        return 'HTMLSelectElement'  
-    elif '<button' in context:
-        return 'HTMLButtonElement'
-    elif '<form' in context:
-        return 'HTMLFormElement'
-    else:
-        return 'HTMLElement'  # Generic fallback
+writer = GuardedWriter()
 
-def fix_context_aware_handlers(content):
-    """Fix handlers by looking at surrounding context to determine element type"""
-    
-    # Find all untyped event handlers
-    pattern = r'(on[A-Z][a-zA-Z]*=\{?\(e:\s*any\)\s*=>)'
-    
-    def replacement_func(match):
-        handler_name = match.group(0).split('=')[0]  # Extract handler name like 'onChange'
-        element_type = infer_element_type_from_context(content, match)
-        
-        # Map handler types to React event types
-        event_type_map = {
-            'onChange': f'React.ChangeEvent<{element_type}>',
-            'onClick': f'React.MouseEvent<{element_type}>',
-            'onSubmit': f'React.FormEvent<{element_type}>',
-            'onKeyDown': f'React.KeyboardEvent<{element_type}>',
-            'onKeyUp': f'React.KeyboardEvent<{element_type}>',
-            'onFocus': f'React.FocusEvent<{element_type}>',
-            'onBlur': f'React.FocusEvent<{element_type}>',
-        }
-        
-        event_type = event_type_map.get(handler_name, f'React.SyntheticEvent<{element_type}>')
-        
-        return match.group(0).replace('(e: any)', f'(e: {event_type})')
+# Untyped handler attribute: group 1 is the handler name
+UNTYPED_HANDLER_RE = re.compile(r'(on[A-Z][a-zA-Z]*)(=\{?\()e:\s*any(\)\s*=>)')
+
+# Element assumed when the owning tag is a component the index cannot resolve
+DEFAULT_HANDLER_ELEMENTS = {
+    'onChange': 'HTMLInputElement',
+    'onClick': 'HTMLButtonElement',
+    'onSubmit': 'HTMLFormElement',
+    'onFocus': 'HTMLInputElement',
+    'onBlur': 'HTMLInputElement',
+}
+
+def infer_element_type_from_context(index, match_obj):
+    """Look up the DOM element type of the JSX element owning the handler"""
     
-    return re.sub(pattern, replacement_func, content)
+    attribute = index.at(match_obj.start())
+    if attribute is None:
+        return None
+    return attribute.element_type or DEFAULT_HANDLER_ELEMENTS.get(attribute.name)
+
+def fix_event_handler_typing(content, index=None):
+    """Fix untyped React event handlers with proper TypeScript types
+    
+    The element type comes from the JSX index (the tag that owns the
+    attribute), so handlers on <textarea> and <select> get their own types.
+    """
+    
+    if index is None:
+        with rule_profile.timed('jsx-index', content):
+            index = JsxIndex(content)
+    matches = edits = 0
+    
+    def replacement(match):
+        nonlocal matches, edits
+        matches += 1
+        if index.at(match.start()) is None:
+            # Not a JSX attribute (e.g. inside a string or comment)
+            return match.group(0)
+        edits += 1
+        handler = match.group(1)
+        element_type = infer_element_type_from_context(index, match)
+        return f"{handler}{match.group(2)}e: {event_type(handler, element_type)}{match.group(3)}"
+    
+    with rule_profile.timed('untyped-handler', content), rule_watchdog.running('untyped-handler'):
+        new_content = UNTYPED_HANDLER_RE.sub(replacement, content)
+    rule_profile.count('untyped-handler', matches, edits)
+    return new_content, new_content != content
 
 def ensure_react_import(content):
     """Ensure React is imported for React event types"""
@@ -164,34 +94,31 @@ def process_file(file_path):
             original_content = f.read()
         
         # Skip if no event handlers found
-        if not re.search(r'on[A-Z][a-zA-Z]*=.*\(e:\s*any\)', original_content):
+        with rule_profile.timed('event-handler-prefilter', original_content), \
+                rule_watchdog.running('event-handler-prefilter'):
+            candidate = re.search(r'on[A-Z][a-zA-Z]*=.*\(e:\s*any\)', original_content)
+        if not candidate:
+            rule_profile.skipped('untyped-handler', original_content)
             return False, []
         
         content = original_content
         changes = []
         
-        # Fix event handler typing
+        # Fix event handler typing from the owning JSX element
         content, modified = fix_event_handler_typing(content)
         if modified:
             changes.append("Fixed event handler typing")
         
-        # Context-aware fixing for remaining handlers
-        context_fixed = fix_context_aware_handlers(content)
-        if context_fixed != content:
-            content = context_fixed
-            changes.append("Applied context-aware handler fixes")
-        
         # Ensure React import if we made changes
         if changes:
-            content, import_added = ensure_react_import(content)
+            with rule_profile.timed('react-import', content):
+                content, import_added = ensure_react_import(content)
             if import_added:
                 changes.append("Added React import")
         
         # Write back if changes were made
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
+        rules = {'event-handler-type': int(modified), 'react-import': int('Added React import' in changes)}
+        if writer.commit(file_path, original_content, content, rules):
             return True, changes
         
         return False, []
@@ -202,6 +129,9 @@ def process_file(file_path):
 
 def main():
     """Main function"""
+    profiler = rule_profile.from_argv()
+    rule_watchdog.from_argv()
+    dry_run.from_argv()
     
     # Find all TypeScript React files
     component_files = glob.glob("./src/components/**/*.tsx", recursive=True)
@@ -216,7 +146,8 @@ def main():
     print(f"Processing {len(all_files)} React component files...")
     
     for file_path in all_files:
-        was_fixed, changes = process_file(file_path)
+        with rule_watchdog.file_budget(file_path):
+            was_fixed, changes = process_file(file_path)
         if was_fixed:
             files_fixed += 1
             print(f"Fixed: {file_path}")
@@ -236,6 +167,12 @@ def main():
         print("\n  Change breakdown:")
         for change, count in change_counts.items():
             print(f"    {change}: {count}")
+    
+    rule_watchdog.report()
+    if profiler:
+        profiler.finish()
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,8 +6,52 @@ import os
 import re
 import glob
 
+import dry_run
+from codemod_writer import GuardedWriter
+from jsx_index import JsxIndex
+
+writer = GuardedWriter()
+
+# onChange={(e: any) or a form-control ChangeEvent chosen by an earlier pass
+ONCHANGE_PARAM_RE = re.compile(
+    r'onChange=\{\(e: (?:any\n?|React\.ChangeEvent<(HTML(?:Input|TextArea|Select)Element)>)\)'
+)
+FORM_CONTROL_TYPES = {'HTMLInputElement', 'HTMLTextAreaElement', 'HTMLSelectElement'}
+
+def retype_onchange_handlers(content, index=None):
+    """Type onChange handlers from the element that owns them
+    
+    Untyped handlers get the owning element's type (HTMLInputElement for
+    components the index cannot resolve); handlers already typed as one form
+    control but attached to another (e.g. Input on a <select>) are corrected.
+    Returns the new content and the number of handlers changed.
+    """
+    if index is None:
+        index = JsxIndex(content)
+    changes = 0
+    
+    def replacement(match):
+        nonlocal changes
+        attribute = index.at(match.start())
+        if attribute is None:
+            return match.group(0)
+        current = match.group(1)
+        element_type = attribute.element_type
+        if current is not None and element_type not in FORM_CONTROL_TYPES:
+            # Already typed and nothing better known
+            return match.group(0)
+        element_type = element_type or 'HTMLInputElement'
+        if element_type == current:
+            return match.group(0)
+        changes += 1
+        return f'onChange={{(e: React.ChangeEvent<{element_type}>)'
+    
+    content = ONCHANGE_PARAM_RE.sub(replacement, content)
+    return content, changes
+
 def fix_onchange_types():
     """Fix onChange handlers in all tsx files"""
+    dry_run.from_argv()
     tsx_files = glob.glob('src/**/*.tsx', recursive=True)
     fixed_count = 0
     total_fixes = 0
@@ -18,45 +62,13 @@ def fix_onchange_types():
                 content = f.read()
             
             original_content = content
+            if 'onChange={(e: ' not in content:
+                continue
             
-            # Pattern 1: onChange={(e: any\n) => ...} - for input elements
-            pattern1 = re.compile(r'onChange=\{\(e: any\n\) => ([^}]+)\}')
-            matches = pattern1.findall(content)
-            if matches:
-                content = pattern1.sub(r'onChange={(e: React.ChangeEvent<HTMLInputElement>) => \1}', content)
-            
-            # Pattern 2: onChange={(e: any) => ...} - already on one line
-            pattern2 = re.compile(r'onChange=\{\(e: any\) => ([^}]+)\}')  
-            matches2 = pattern2.findall(content)
-            if matches2:
-                content = pattern2.sub(r'onChange={(e: React.ChangeEvent<HTMLInputElement>) => \1}', content)
-            
-            # Pattern 3: Check for textarea elements and fix those
-            if '<textarea' in content.lower() or '<Textarea' in content:
-                content = re.sub(
-                    r'onChange=\{\(e: React\.ChangeEvent<HTMLInputElement>\)',
-                    r'onChange={(e: React.ChangeEvent<HTMLTextAreaElement>)',
-                    content
-                )
-            
-            # Pattern 4: Check for select elements and fix those  
-            if '<select' in content.lower() or '<Select' in content:
-                # Find onChange handlers that are likely for selects
-                select_pattern = re.compile(r'<Select[^>]*>\s*.*?onChange=\{\(e: React\.ChangeEvent<HTMLInputElement>\)', re.DOTALL)
-                if select_pattern.search(content):
-                    content = re.sub(
-                        r'(<Select[^>]*>.*?)onChange=\{\(e: React\.ChangeEvent<HTMLInputElement>\)',
-                        r'\1onChange={(e: React.ChangeEvent<HTMLSelectElement>)',
-                        content,
-                        flags=re.DOTALL
-                    )
-            
-            changes_made = len(matches) + len(matches2)
+            content, changes_made = retype_onchange_handlers(content)
             total_fixes += changes_made
             
-            if content != original_content:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if writer.commit(filepath, original_content, content, {'onchange-handler-type': changes_made}):
                 print(f"Fixed {changes_made} onChange handlers in {filepath}")
                 fixed_count += 1
                 
@@ -65,6 +77,8 @@ def fix_onchange_types():
     
     print(f"\nFixed onChange handlers in {fixed_count} files")
     print(f"Total onChange handlers fixed: {total_fixes}")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     fix_onchange_types()
\ No newline at end of file
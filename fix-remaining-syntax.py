@@ -4,25 +4,31 @@ Fix remaining specific syntax errors
 """
 import os
 import re
+from collections import Counter
+
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def fix_jsx_brace_issues(filepath):
     """Fix JSX brace and tag issues in a specific file"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = dry_run.read(filepath)
         
         original_content = content
+        counts = Counter()
         
         # Fix malformed JSX attributes and closing issues
         # Pattern: Fix broken template literals in JSX
-        content = re.sub(
+        content, counts['jsx-template-literal'] = re.subn(
             r'>\{`([^`]*)`\}([^<]*)<',
             r'>{\1}\2<',
             content
         )
         
         # Fix broken JSX closing tags
-        content = re.sub(
+        content, counts['jsx-closing-tag'] = re.subn(
             r'([^>])\s*\n\s*</(\w+)>',
             r'\1\n</\2>',
             content,
@@ -30,16 +36,14 @@ def fix_jsx_brace_issues(filepath):
         )
         
         # Fix unclosed JSX fragments
-        content = re.sub(
+        content, counts['jsx-unclosed-fragment'] = re.subn(
             r'<>\s*\n([^<]*)\n([^<]*)\n$',
             r'<>\n\1\n\2\n</>',
             content,
             flags=re.MULTILINE | re.DOTALL
         )
         
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if writer.commit(filepath, original_content, content, counts):
             print(f"Fixed JSX issues in {filepath}")
             return True
         
@@ -52,29 +56,27 @@ def fix_jsx_brace_issues(filepath):
 def fix_object_literal_issues(filepath):
     """Fix object literal syntax issues"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = dry_run.read(filepath)
         
         original_content = content
+        counts = Counter()
         
         # Fix missing commas in object literals  
-        content = re.sub(
+        content, counts['object-missing-comma'] = re.subn(
             r'(\w+): ([^,\n}]+)\n\s*(\w+):',
             r'\1: \2,\n  \3:',
             content
         )
         
         # Fix incomplete object destructuring
-        content = re.sub(
+        content, counts['object-incomplete-destructuring'] = re.subn(
             r'const \{ ([^}]*)\s*$',
             r'const { \1 }',
             content,
             flags=re.MULTILINE
         )
         
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if writer.commit(filepath, original_content, content, counts):
             print(f"Fixed object literal issues in {filepath}")
             return True
             
@@ -86,6 +88,7 @@ def fix_object_literal_issues(filepath):
 
 def main():
     """Main function"""
+    dry_run.from_argv()
     problem_files = [
         'src/components/CustomSoundThemeCreator.tsx',
         'src/components/CustomThemeManager.tsx', 
@@ -103,6 +106,8 @@ def main():
             print(f"File not found: {filepath}")
     
     print(f"\nAttempted fixes on {len(problem_files)} problem files")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
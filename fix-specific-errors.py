@@ -4,13 +4,18 @@ Fix specific known syntax errors
 """
 import os
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def fix_custom_sound_theme_creator():
     """Fix specific issues in CustomSoundThemeCreator.tsx"""
     filepath = 'src/components/CustomSoundThemeCreator.tsx'
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+            content = original_content = f.read()
         
         # Fix line 679: category.label} - {category.description 
         content = content.replace(
@@ -46,8 +51,8 @@ def fix_custom_sound_theme_creator():
             'onSoundDeleted={(soundId: any) => onSoundsUpdated(uploadedSounds.filter((s: any) => s.id !== soundId))}'
         )
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if not writer.commit(filepath, original_content, content):
+            return False
         print(f"Fixed specific issues in {filepath}")
         return True
         
@@ -61,7 +66,7 @@ def fix_custom_theme_manager():
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+            content = original_content = f.read()
         
         # Fix missing comma around line 189
         content = content.replace(
@@ -69,8 +74,8 @@ def fix_custom_theme_manager():
             'filteredThemes={filteredThemes},\n        selectedThemeIds={selectedThemeIds}'
         )
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if not writer.commit(filepath, original_content, content):
+            return False
         print(f"Fixed specific issues in {filepath}")
         return True
         
@@ -80,6 +85,7 @@ def fix_custom_theme_manager():
 
 def main():
     """Main function"""
+    dry_run.from_argv()
     fixed_count = 0
     
     if fix_custom_sound_theme_creator():
@@ -88,6 +94,8 @@ def main():
         fixed_count += 1
         
     print(f"Fixed {fixed_count} files with specific issues")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,12 @@ Fix state setter types from any to proper types
 """
 import re
 import glob
+from collections import Counter
+
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def infer_setter_type(setter_name, content_context):
     """Infer the proper type for a state setter based on usage patterns"""
@@ -42,6 +48,7 @@ def infer_setter_type(setter_name, content_context):
 
 def fix_state_setters():
     """Fix state setter types in all TypeScript files"""
+    dry_run.from_argv()
     tsx_files = glob.glob('src/**/*.tsx', recursive=True) + glob.glob('src/**/*.ts', recursive=True)
     fixed_count = 0
     total_fixes = 0
@@ -55,6 +62,7 @@ def fix_state_setters():
                 content = f.read()
             
             original_content = content
+            rules = Counter()
             
             # Pattern: set[Something]((prev: any\n) => ...)
             pattern = re.compile(r'(set\w+)\(\(prev: any\n\) => ([^}]+)\)')
@@ -74,6 +82,8 @@ def fix_state_setters():
                 else:  # object
                     replacement = f'{setter_name}((prev: any) => {setter_body})'  # Keep as any for complex objects for now
                 
+                if inferred_type != 'object':
+                    rules[f'prev-{inferred_type}-setter'] += 1
                 old_pattern = f'{setter_name}((prev: any\\n) => {re.escape(setter_body)})'
                 content = re.sub(old_pattern, replacement, content)
             
@@ -95,15 +105,15 @@ def fix_state_setters():
                 else:  # object
                     replacement = f'{setter_name}((prev: any) => {setter_body})'  # Keep as any for complex objects
                 
+                if inferred_type != 'object':
+                    rules[f'prev-{inferred_type}-setter'] += 1
                 old_pattern = f'{setter_name}\\(\\(prev: any\\) => {re.escape(setter_body)}\\)'
                 content = re.sub(old_pattern, replacement, content)
             
             changes_made = len(matches) + len(matches2)
             total_fixes += changes_made
             
-            if content != original_content:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            if writer.commit(filepath, original_content, content, rules):
                 print(f"Fixed {changes_made} state setters in {filepath}")
                 fixed_count += 1
                 
@@ -112,6 +122,8 @@ def fix_state_setters():
     
     print(f"\nFixed state setters in {fixed_count} files")
     print(f"Total state setters fixed: {total_fixes}")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     fix_state_setters()
\ No newline at end of file
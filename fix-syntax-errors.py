@@ -4,6 +4,12 @@ Fix syntax errors in TypeScript files
 """
 import os
 import re
+from collections import Counter
+
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def fix_file(filepath):
     """Fix common syntax patterns in a file"""
@@ -12,10 +18,11 @@ def fix_file(filepath):
             content = f.read()
         
         original_content = content
+        counts = Counter()
         
         # Pattern 1: Fix broken array spread syntax
         # setCustomSounds((prev: any\n) => [ // auto: implicit anyresult.customSound!, ...prev]);
-        content = re.sub(
+        content, counts['broken-array-spread'] = re.subn(
             r'setCustomSounds\(\(prev: any\n\) => \[ // auto: implicit anyresult\.customSound!,', 
             'setCustomSounds((prev: any) => [result.customSound!,', 
             content
@@ -23,36 +30,34 @@ def fix_file(filepath):
         
         # Pattern 2: Fix broken map functions
         # .map((condition: any\n) => ({\n              <div
-        content = re.sub(
+        content, counts['broken-map-callback'] = re.subn(
             r'\.map\(\(([^:]+): any\n\) => \(\{\n\s*<div',
             r'.map((\1: any) => (\n        <div',
             content
         )
         
         # Pattern 3: Fix comment fragments in setters
-        content = re.sub(
+        content, counts['setter-comment-fragment'] = re.subn(
             r'setSelectedThemes\(\(prev: any\n\) => \{ // auto: implicit any',
             'setSelectedThemes((prev: any) => {',
             content
         )
         
         # Pattern 4: Fix general comment fragments mixed with code
-        content = re.sub(
+        content, counts['comment-fragment'] = re.subn(
             r'// auto: implicit any([a-zA-Z])',
             r'// auto: implicit any\n\1',
             content
         )
         
         # Pattern 5: Fix broken JSX attributes
-        content = re.sub(
+        content, counts['broken-jsx-attribute'] = re.subn(
             r'(\w+)=\{([^}]+)\}\s*>\s*\{([^>]+)\}\s*<',
             r'\1={\2}>\3<',
             content
         )
         
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if writer.commit(filepath, original_content, content, counts):
             print(f"Fixed syntax issues in {filepath}")
             return True
         
@@ -64,6 +69,7 @@ def fix_file(filepath):
 
 def main():
     """Main function to fix syntax errors in key files"""
+    dry_run.from_argv()
     files_to_fix = [
         'src/components/AlarmForm.tsx',
         'src/components/CustomSoundThemeCreator.tsx', 
@@ -90,6 +96,8 @@ def main():
             print(f"File not found: {filepath}")
     
     print(f"\nFixed syntax errors in {fixed_count} files")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 
 import os
-import re
 import json
 from typing import List, Dict, Any
 from pathlib import Path
 
+import dry_run
+import rule_profile
+from codemod_writer import GuardedWriter
+from trycatch_locator import (
+    describe, find_try_blocks, is_console_call, is_rethrow, outermost,
+)
+
+writer = GuardedWriter()
+
 class SelectiveTryCatchCleaner:
     def __init__(self, base_dir: str):
         self.base_dir = Path(base_dir)
@@ -34,81 +42,54 @@ class SelectiveTryCatchCleaner:
     
     def detect_truly_useless_patterns(self, content: str) -> List[Dict[str, Any]]:
         """Detect only truly useless try/catch patterns - those that just log and rethrow."""
-        patterns = []
-        
-        # Very specific pattern: Only catch blocks that ONLY log and throw the same error
+        # Only catch blocks that ONLY log and throw the same error
         # This excludes patterns that:
         # - Return different values
         # - Have other side effects
         # - Transform the error
         # - Have multiple statements beyond log + throw
-        
-        # Pattern: catch (error) { console.error/log/warn(...); throw error; }
-        # Must be exactly 2 statements: log and throw
-        pattern = re.compile(
-            r'(\s*)try\s*\{\s*\n(.*?)\n\s*\}\s*catch\s*\(\s*(\w+)\s*\)\s*\{\s*\n'
-            r'\s*console\.(error|log|warn)\s*\([^;]*\);\s*\n'
-            r'\s*throw\s+\3;\s*\n'
-            r'\s*\}',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        for match in pattern.finditer(content):
-            # Additional validation: ensure the catch block ONLY has console.X + throw
-            catch_body_start = match.start() + len(match.group(1)) + len('try {') + len(match.group(2)) + len('} catch (' + match.group(3) + ') {')
-            catch_body_end = match.end() - 1  # Before the closing }
-            
-            # Extract just the catch block content
-            catch_content = content[catch_body_start:catch_body_end].strip()
-            
-            # Count non-empty lines in catch block
-            non_empty_lines = [line.strip() for line in catch_content.split('\n') if line.strip()]
-            
-            # Only consider it useless if there are exactly 2 lines: console.X and throw
-            if len(non_empty_lines) == 2:
-                console_line = non_empty_lines[0]
-                throw_line = non_empty_lines[1]
+        # - Carry comments or a finally block
+        if 'try' not in content:
+            rule_profile.skipped('find-try-blocks', content)
+            return []
+        with rule_profile.timed('find-try-blocks', content):
+            blocks = find_try_blocks(content)
+        candidates = []
+        with rule_profile.timed('classify-try-blocks'):
+            for block in blocks:
+                catch = block.catch_block
+                if (catch is None or block.finally_block is not None or
+                        catch.has_comments or not block.catch_param):
+                    continue
                 
-                # Verify the pattern
-                if (console_line.startswith('console.') and 
-                    console_line.endswith(';') and
-                    throw_line == f'throw {match.group(3)};'):
-                    
-                    patterns.append({
-                        'type': 'truly_useless_log_throw',
-                        'full_match': match.group(0),
-                        'indentation': match.group(1),
-                        'try_body': match.group(2),
-                        'error_var': match.group(3),
-                        'start': match.start(),
-                        'end': match.end(),
-                        'console_line': console_line,
-                        'throw_line': throw_line
-                    })
+                # Must be exactly 2 statements: console.X(...) and throw <param>
+                statements = catch.statements
+                if (len(statements) == 2 and
+                        is_console_call(statements[0]) and
+                        is_rethrow(statements[1], block.catch_param)):
+                    candidates.append(block)
+                    rule_profile.count('truly_useless_log_throw', matches=1)
+        
+        patterns = []
+        for block in outermost(candidates):
+            statements = block.catch_block.statements
+            pattern = describe(content, block)
+            pattern.update({
+                'type': 'truly_useless_log_throw',
+                'console_line': statements[0].text,
+                'throw_line': statements[1].text,
+            })
+            patterns.append(pattern)
         
         return sorted(patterns, key=lambda p: p['start'], reverse=True)
     
     def fix_pattern(self, content: str, pattern: Dict[str, Any]) -> str:
-        """Fix a single truly useless try/catch pattern."""
-        try_body = pattern['try_body'].strip()
-        indentation = pattern['indentation']
-        
-        # Create the replacement - just the try body with proper indentation
-        replacement_lines = []
-        for line in try_body.split('\n'):
-            if line.strip():  # Skip empty lines
-                replacement_lines.append(indentation + line.strip())
-        
-        replacement = '\n'.join(replacement_lines)
-        
-        # Replace the full match with just the try body
-        new_content = (
+        """Replace the try/catch with its try body, re-indented to the try's level."""
+        return (
             content[:pattern['start']] + 
-            replacement + 
+            pattern['replacement'] + 
             content[pattern['end']:]
         )
-        
-        return new_content
     
     def process_file(self, file_path: Path) -> bool:
         """Process a single file and fix truly useless try/catch patterns."""
@@ -131,12 +112,11 @@ class SelectiveTryCatchCleaner:
                     fixed_patterns.append(pattern)
                     content = new_content
             
-            if fixed_patterns:
-                # Write the fixed content back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
+            # Write the fixed content back (unless the parse gate rejects it)
+            if fixed_patterns and writer.commit(file_path, original_content, content,
+                                                {'truly_useless_log_throw': len(fixed_patterns)}):
                 self.patterns_fixed += len(fixed_patterns)
+                rule_profile.count('truly_useless_log_throw', edits=len(fixed_patterns))
                 
                 # Log the changes
                 self.changes_log.append({
@@ -189,6 +169,8 @@ class SelectiveTryCatchCleaner:
 
 def main():
     base_dir = "/project/workspace/lalpyaare440-star/Relife"
+    profiler = rule_profile.from_argv()
+    dry_run.from_argv()
     cleaner = SelectiveTryCatchCleaner(base_dir)
     
     print("🚀 Starting selective try/catch cleanup process...")
@@ -231,6 +213,11 @@ def main():
     print(f"\n📝 Results saved to:")
     print(f"   {log_file}")
     print(f"   {json_file}")
+    
+    if profiler:
+        profiler.finish()
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
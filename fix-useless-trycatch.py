@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 
 import os
-import re
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+import dry_run
+import rule_profile
+from codemod_writer import GuardedWriter
+from trycatch_locator import (
+    TryBlock, describe, find_try_blocks, is_console_call, is_rethrow, outermost,
+)
+
+writer = GuardedWriter()
+
 class UselessTryCatchCleaner:
     def __init__(self, base_dir: str):
         self.base_dir = Path(base_dir)
@@ -32,99 +40,60 @@ class UselessTryCatchCleaner:
                 
         return filtered_files
     
+    def classify(self, block: TryBlock) -> Optional[str]:
+        """Pattern type of a useless try/catch block, or None to keep it."""
+        catch = block.catch_block
+        if catch is None or block.finally_block is not None or catch.has_comments:
+            return None
+        param = block.catch_param
+        statements = catch.statements
+        
+        # catch (error) { throw error; } (no logging)
+        if len(statements) == 1 and param and is_rethrow(statements[0], param):
+            return 'simple_throw'
+        if len(statements) != 2 or not is_console_call(statements[0]):
+            return None
+        # catch (error) { console.error(...); throw error; }
+        if param and is_rethrow(statements[1], param):
+            return 'console_log_throw'
+        # catch (_error) { console.error(..., error); throw error; }
+        # (Note the variable name mismatch - common typo)
+        if 'error' in statements[0].text and is_rethrow(statements[1], 'error'):
+            return 'console_log_throw_mismatch'
+        return None
+    
     def detect_useless_patterns(self, content: str) -> List[Dict[str, Any]]:
         """Detect useless try/catch patterns in file content."""
-        patterns = []
-        
-        # Pattern 1: catch (error) { console.error(...); throw error; }
-        pattern1 = re.compile(
-            r'(\s*)try\s*\{\s*\n(.*?)\n\s*\}\s*catch\s*\(\s*(\w+)\s*\)\s*\{\s*\n'
-            r'\s*console\.(error|log|warn)\s*\([^;]*\);\s*\n'
-            r'\s*throw\s+\3;\s*\n'
-            r'\s*\}',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        for match in pattern1.finditer(content):
-            patterns.append({
-                'type': 'console_log_throw',
-                'full_match': match.group(0),
-                'indentation': match.group(1),
-                'try_body': match.group(2),
-                'error_var': match.group(3),
-                'start': match.start(),
-                'end': match.end()
-            })
-        
-        # Pattern 2: catch (error) { throw error; } (no logging)
-        pattern2 = re.compile(
-            r'(\s*)try\s*\{\s*\n(.*?)\n\s*\}\s*catch\s*\(\s*(\w+)\s*\)\s*\{\s*\n'
-            r'\s*throw\s+\3;\s*\n'
-            r'\s*\}',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        for match in pattern2.finditer(content):
-            # Skip if already found by pattern1
-            already_found = any(p['start'] == match.start() for p in patterns)
-            if not already_found:
-                patterns.append({
-                    'type': 'simple_throw',
-                    'full_match': match.group(0),
-                    'indentation': match.group(1),
-                    'try_body': match.group(2),
-                    'error_var': match.group(3),
-                    'start': match.start(),
-                    'end': match.end()
-                })
+        if 'try' not in content:
+            rule_profile.skipped('find-try-blocks', content)
+            return []
+        with rule_profile.timed('find-try-blocks', content):
+            blocks = find_try_blocks(content)
+        candidates = []
+        types = {}
+        with rule_profile.timed('classify-try-blocks'):
+            for block in blocks:
+                pattern_type = self.classify(block)
+                if pattern_type:
+                    candidates.append(block)
+                    types[block.start] = pattern_type
+                    rule_profile.count(pattern_type, matches=1)
         
-        # Pattern 3: catch (_error) { console.error(..., error); throw error; }
-        # (Note the variable name mismatch - common typo)
-        pattern3 = re.compile(
-            r'(\s*)try\s*\{\s*\n(.*?)\n\s*\}\s*catch\s*\(\s*_?(\w+)\s*\)\s*\{\s*\n'
-            r'\s*console\.(error|log|warn)\s*\([^;]*error[^;]*\);\s*\n'
-            r'\s*throw\s+error;\s*\n'
-            r'\s*\}',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        for match in pattern3.finditer(content):
-            # Skip if already found by previous patterns
-            already_found = any(p['start'] == match.start() for p in patterns)
-            if not already_found:
-                patterns.append({
-                    'type': 'console_log_throw_mismatch',
-                    'full_match': match.group(0),
-                    'indentation': match.group(1),
-                    'try_body': match.group(2),
-                    'error_var': match.group(3),
-                    'start': match.start(),
-                    'end': match.end()
-                })
+        patterns = []
+        for block in outermost(candidates):
+            pattern = describe(content, block)
+            pattern['type'] = types[block.start]
+            patterns.append(pattern)
         
         return sorted(patterns, key=lambda p: p['start'], reverse=True)
     
     def fix_pattern(self, content: str, pattern: Dict[str, Any]) -> str:
-        """Fix a single useless try/catch pattern."""
-        try_body = pattern['try_body'].strip()
-        indentation = pattern['indentation']
-        
-        # Create the replacement - just the try body with proper indentation
-        replacement_lines = []
-        for line in try_body.split('\n'):
-            if line.strip():  # Skip empty lines
-                replacement_lines.append(indentation + line.strip())
-        
-        replacement = '\n'.join(replacement_lines)
-        
-        # Replace the full match with just the try body
-        new_content = (
+        """Replace the try/catch with its try body, re-indented to the try's level."""
+        return (
             content[:pattern['start']] + 
-            replacement + 
+            pattern['replacement'] + 
             content[pattern['end']:]
         )
-        
-        return new_content
     
     def process_file(self, file_path: Path) -> bool:
         """Process a single file and fix useless try/catch patterns."""
@@ -147,12 +116,14 @@ class UselessTryCatchCleaner:
                     fixed_patterns.append(pattern)
                     content = new_content
             
-            if fixed_patterns:
-                # Write the fixed content back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                
+            rules = {}
+            for p in fixed_patterns:
+                rules[p['type']] = rules.get(p['type'], 0) + 1
+            # Write the fixed content back (unless the parse gate rejects it)
+            if fixed_patterns and writer.commit(file_path, original_content, content, rules):
                 self.patterns_fixed += len(fixed_patterns)
+                for p in fixed_patterns:
+                    rule_profile.count(p['type'], edits=1)
                 
                 # Log the changes
                 self.changes_log.append({
@@ -203,6 +174,8 @@ class UselessTryCatchCleaner:
 
 def main():
     base_dir = "/project/workspace/lalpyaare440-star/Relife"
+    profiler = rule_profile.from_argv()
+    dry_run.from_argv()
     cleaner = UselessTryCatchCleaner(base_dir)
     
     print("🚀 Starting useless try/catch cleanup process...")
@@ -239,6 +212,11 @@ def main():
     print(f"\n📝 Results saved to:")
     print(f"   {log_file}")
     print(f"   {json_file}")
+    
+    if profiler:
+        profiler.finish()
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
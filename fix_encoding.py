@@ -7,11 +7,16 @@ Replace curly quotes with regular quotes to fix TS compilation errors.
 import os
 import glob
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def fix_file_encoding(file_path):
     """Fix character encoding in a single file."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            content = original_content = f.read()
         
         # Replace curly quotes with regular quotes
         content = content.replace('"', '"')  # Left double quotation mark
@@ -19,8 +24,8 @@ def fix_file_encoding(file_path):
         content = content.replace(''', "'")  # Left single quotation mark
         content = content.replace(''', "'")  # Right single quotation mark
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if not writer.commit(file_path, original_content, content):
+            return False
         
         print(f"Fixed: {file_path}")
         return True
@@ -98,6 +103,7 @@ def main():
         "src/utils/http-client.ts"
     ]
     
+    dry_run.from_argv()
     print("Fixing character encoding issues in TypeScript files...")
     
     fixed_count = 0
@@ -109,6 +115,8 @@ def main():
             print(f"File not found: {file_path}")
     
     print(f"\nCompleted! Fixed {fixed_count} files.")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
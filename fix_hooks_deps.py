@@ -12,238 +12,162 @@ Safety rules:
 """
 
 import os
-import re
 import json
 import subprocess
 from typing import List, Dict, Set, Optional, Tuple
 from pathlib import Path
 
+import dry_run
+import message_templates
+from diagnostic_fixers import Edit, fix_file, fixer
+from diagnostics import Diagnostic, DiagnosticIndex, parse_eslint_json
+from scope_index import ScopeIndex
+
 # Track manual review items
 manual_review_items = []
 
-def run_eslint_for_hooks(directory: str) -> List[Dict]:
-    """Run ESLint specifically for exhaustive-deps violations"""
-    try:
+HOOKS_RULE = 'react-hooks/exhaustive-deps'
+
+def run_eslint_for_hooks(files: List[str], project_dir: str, batch_size: int = 100) -> DiagnosticIndex:
+    """Run ESLint for exhaustive-deps violations over files, a batch per run, indexed by file"""
+    diagnostics = []
+    for i in range(0, len(files), batch_size):
+        batch = files[i:i + batch_size]
         cmd = [
-            'npx', 'eslint', 
-            f'{directory}/**/*.{ts,tsx}',
-            '--rule', 'react-hooks/exhaustive-deps:error',
+            'npx', 'eslint',
+            *batch,
+            '--rule', f'{HOOKS_RULE}:error',
             '--format', 'json',
-            '--no-eslintrc',
-            '--config', 'eslint.config.js'
+            '--no-ignore'
         ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=directory)
-        
-        if result.stdout:
-            return json.loads(result.stdout)
-        else:
-            print("No ESLint output received")
-            return []
-            
-    except Exception as e:
-        print(f"Error running ESLint: {e}")
-        return []
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=project_dir)
+            if result.stdout:
+                diagnostics.extend(d for d in parse_eslint_json(json.loads(result.stdout), project_dir)
+                                   if d.code == HOOKS_RULE)
+            else:
+                print(f"  No ESLint output for files {i + 1}-{i + len(batch)}")
+        except Exception as e:
+            print(f"  ❌ Error running ESLint on files {i + 1}-{i + len(batch)}: {e}")
+        print(f"Linted {min(i + batch_size, len(files))} of {len(files)} files...")
+    return DiagnosticIndex(diagnostics, project_dir)
 
-def extract_hook_violation_details(message: Dict) -> Optional[Dict]:
+def extract_hook_violation_details(diagnostic: Diagnostic) -> Optional[Dict]:
     """Extract details from a hooks dependency violation"""
-    if message.get('ruleId') != 'react-hooks/exhaustive-deps':
+    if diagnostic.code != HOOKS_RULE:
         return None
     
-    # Parse the message to extract missing dependencies
-    msg_text = message.get('message', '')
-    
-    # Common patterns in exhaustive-deps messages
-    missing_deps_pattern = r"React Hook .+ has (?:a )?missing dependenc(?:y|ies): (.+?)\."
-    match = re.search(missing_deps_pattern, msg_text)
+    # The hook and its missing dependencies come from the message template
+    params = message_templates.params(diagnostic.message, HOOKS_RULE, 'hook-missing-deps')
     
-    if match:
-        deps_text = match.group(1)
-        # Split dependencies, handling quotes and 'and'
-        deps_raw = re.split(r',\s*|\s+and\s+', deps_text)
-        dependencies = []
-        for dep in deps_raw:
-            # Remove quotes and clean up
-            clean_dep = re.sub(r"['\"]", '', dep.strip())
-            if clean_dep:
-                dependencies.append(clean_dep)
-        
+    if params:
         return {
-            'hook_type': extract_hook_type(msg_text),
-            'missing_dependencies': dependencies,
-            'line': message.get('line'),
-            'column': message.get('column'),
-            'message': msg_text
+            'hook_type': params['hook'],
+            'missing_dependencies': list(params['dependencies']),
+            'line': diagnostic.line,
+            'column': diagnostic.column,
+            'message': diagnostic.message
         }
     
     return None
 
-def extract_hook_type(message: str) -> str:
-    """Extract hook type from message"""
-    if 'useEffect' in message:
-        return 'useEffect'
-    elif 'useCallback' in message:
-        return 'useCallback'
-    elif 'useMemo' in message:
-        return 'useMemo'
-    elif 'useLayoutEffect' in message:
-        return 'useLayoutEffect'
-    else:
-        return 'unknown'
-
-def is_safe_dependency(dep: str, file_content: str) -> bool:
+def is_safe_dependency(dep: str, file_content: str, line: Optional[int] = None,
+                       index: Optional[ScopeIndex] = None) -> bool:
     """
     Determine if a dependency is safe to auto-add.
     
-    Safe dependencies:
-    - Simple variable references (not object access)
-    - Imported functions from modules
-    - Constants defined at module level
+    The dependency is resolved through the file's scope index at the hook's
+    line (module scope when no line is given).
+    
+    Safe dependencies (stable across renders):
+    - Imports
+    - Declarations at module level
+    - useState setters, useReducer dispatch and useRef refs
     
     Unsafe dependencies:
-    - setState functions (usually start with 'set' or end with 'Setter')
     - Object property access (contains '.')
-    - Functions defined in component scope
-    - Variables that could change on every render
+    - Props, parameters and anything declared in component scope
+    - Names the index cannot resolve
     """
     
-    # Definitely unsafe patterns
-    unsafe_patterns = [
-        r'^set[A-Z]',  # setState functions
-        r'\.', # Object property access
-        r'Setter$',  # Setter functions
-        r'Handler$',  # Event handlers (often inline)
-        r'Callback$',  # Callbacks (often inline)
-    ]
+    # Object property access is never stable on its own
+    if '.' in dep:
+        return False
     
-    for pattern in unsafe_patterns:
-        if re.search(pattern, dep):
-            return False
+    if index is None:
+        index = ScopeIndex(file_content)
+    offset = index.offset(line) if line else None
+    return index.is_stable(dep, offset)
+
+@fixer(HOOKS_RULE)
+def manual_review_comment(site) -> Optional[Edit]:
+    """Disable the rule on the reported line, indented like that line, for manual review"""
+    details = extract_hook_violation_details(site.diagnostic)
+    if not details:
+        return None
     
-    # Check if it's an import (appears in import statements)
-    import_pattern = rf'import.*\b{re.escape(dep)}\b.*from'
-    if re.search(import_pattern, file_content, re.MULTILINE):
-        return True
+    source = site.file
+    missing_deps = details['missing_dependencies']
+    line_number = details['line']
+    hook_type = details['hook_type']
     
-    # Check if it's a module-level constant (defined outside any function)
-    # This is a simplified check - in practice, proper AST parsing would be better
-    const_pattern = rf'^(const|let|var)\s+{re.escape(dep)}\s*='
-    if re.search(const_pattern, file_content, re.MULTILINE):
-        # Check if it's not inside a function (very basic check)
-        lines = file_content.split('\n')
-        for i, line in enumerate(lines):
-            if re.search(const_pattern, line):
-                # Check if we're inside a function/component (look backwards for function declarations)
-                in_function = False
-                for j in range(max(0, i-20), i):
-                    if re.search(r'^\s*(function|const \w+\s*=|class \w+)', lines[j]):
-                        in_function = True
-                        break
-                if not in_function:
-                    return True
+    if line_number <= 0 or line_number > len(source.lines.starts):
+        print(f"Invalid line number {line_number} in {source.path}")
+        return None
     
-    # If we can't determine it's safe, treat as unsafe
-    return False
-
-def add_manual_review_comment(file_path: str, line_number: int, dependencies: List[str], hook_type: str) -> bool:
-    """Add ESLint disable comment with manual review annotation"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        if line_number <= 0 or line_number > len(lines):
-            print(f"Invalid line number {line_number} in {file_path}")
-            return False
-        
-        # Insert comment before the hook line
-        insert_line = line_number - 1  # Convert to 0-based index
-        
-        # Check if comment already exists
-        if insert_line > 0:
-            prev_line = lines[insert_line - 1].strip()
-            if 'eslint-disable-next-line react-hooks/exhaustive-deps' in prev_line:
-                print(f"Manual review comment already exists at {file_path}:{line_number}")
-                return False
-        
-        # Create the comment
-        deps_str = ', '.join(dependencies)
-        comment = f"    // eslint-disable-next-line react-hooks/exhaustive-deps -- auto: manual review required; refs: {deps_str}\n"
-        
-        # Insert the comment
-        lines.insert(insert_line, comment)
-        
-        # Write back to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines)
-        
-        # Add to manual review list
-        manual_review_items.append({
-            'file': file_path,
-            'line': line_number,
-            'hook_type': hook_type,
-            'dependencies': dependencies,
-            'reason': 'Contains potentially unsafe dependencies'
-        })
-        
-        print(f"✓ Added manual review comment in {file_path}:{line_number} for {hook_type}")
-        return True
-        
-    except Exception as e:
-        print(f"Error adding manual review comment to {file_path}: {e}")
-        return False
+    print(f"  Line {line_number}: {hook_type} missing: {', '.join(missing_deps)}")
+    
+    # Check if all dependencies are safe to auto-add
+    safe_deps = [dep for dep in missing_deps
+                 if is_safe_dependency(dep, source.text, line_number, source.scopes)]
+    if len(safe_deps) == len(missing_deps):
+        # All dependencies are safe - could auto-add them
+        # For now, we'll still add manual review comment to be extra conservative
+        print(f"    All dependencies appear safe: {safe_deps}")
+    
+    # Check if comment already exists
+    if line_number > 1:
+        start, end = source.lines.line_span(line_number - 1)
+        if f'eslint-disable-next-line {HOOKS_RULE}' in source.text[start:end]:
+            print(f"Manual review comment already exists at {source.path}:{line_number}")
+            return None
+    
+    # Insert the comment before the reported line, at its indentation
+    line_start = source.lines.offset(line_number)
+    deps_str = ', '.join(missing_deps)
+    comment = (f"{source.indentation(line_start)}// eslint-disable-next-line {HOOKS_RULE} "
+               f"-- auto: manual review required; refs: {deps_str}\n")
+    return Edit(line_start, line_start, comment, 'manual-review-comment')
 
-def process_hooks_violations(file_path: str, violations: List[Dict]) -> int:
-    """Process all hooks violations in a file"""
-    fixes_applied = 0
-    
+def process_hooks_violations(file_path: str, violations: List[Diagnostic]) -> int:
+    """Process all hooks violations in a file with one read and one write"""
     if not violations:
-        return fixes_applied
+        return 0
     
     print(f"\nProcessing {len(violations)} violations in {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_content = f.read()
+        result = fix_file(file_path, violations)
     except Exception as e:
-        print(f"Error reading {file_path}: {e}")
-        return fixes_applied
-    
-    # Sort violations by line number (descending) to avoid line number shifts
-    violations_sorted = sorted(violations, key=lambda v: v.get('line', 0), reverse=True)
-    
-    for violation in violations_sorted:
-        details = extract_hook_violation_details(violation)
-        if not details:
-            continue
-        
-        missing_deps = details['missing_dependencies']
-        line_number = details['line']
-        hook_type = details['hook_type']
-        
-        print(f"  Line {line_number}: {hook_type} missing: {', '.join(missing_deps)}")
-        
-        # Check if all dependencies are safe to auto-add
-        safe_deps = []
-        unsafe_deps = []
-        
-        for dep in missing_deps:
-            if is_safe_dependency(dep, file_content):
-                safe_deps.append(dep)
-            else:
-                unsafe_deps.append(dep)
-        
-        if unsafe_deps:
-            # Has unsafe dependencies - add manual review comment
-            if add_manual_review_comment(file_path, line_number, missing_deps, hook_type):
-                fixes_applied += 1
-        else:
-            # All dependencies are safe - could auto-add them
-            # For now, we'll still add manual review comment to be extra conservative
-            print(f"    All dependencies appear safe: {safe_deps}")
-            if add_manual_review_comment(file_path, line_number, missing_deps, hook_type):
-                fixes_applied += 1
+        print(f"Error adding manual review comments to {file_path}: {e}")
+        return 0
+    
+    if result.rejected:
+        r = result.rejected
+        print(f"⛔ Not written: {file_path} would no longer parse ({r['message']} at {r['line']}:{r['column']})")
+        return 0
+    for site, edit in result.applied:
+        details = extract_hook_violation_details(site.diagnostic)
+        manual_review_items.append({
+            'file': file_path,
+            'line': details['line'],
+            'hook_type': details['hook_type'],
+            'dependencies': details['missing_dependencies'],
+            'reason': 'Contains potentially unsafe dependencies'
+        })
+        print(f"✓ Added manual review comment in {file_path}:{details['line']} for {details['hook_type']}")
     
-    return fixes_applied
+    return len(result.applied)
 
 def save_manual_review_list():
     """Save the manual review list to a file"""
@@ -274,6 +198,7 @@ def save_manual_review_list():
 
 def main():
     """Main function to process hooks dependencies"""
+    dry_run.from_argv()
     print("🔧 Starting conservative React hooks dependencies fix...\n")
     
     # Change to the project directory
@@ -295,54 +220,17 @@ def main():
     total_fixes = 0
     processed_files = 0
     
-    # Process files in batches to avoid overwhelming output
-    batch_size = 5
-    for i in range(0, len(src_files), batch_size):
-        batch = src_files[i:i + batch_size]
-        
-        for file_path in batch:
-            print(f"\nChecking {file_path}...")
-            
-            # Run ESLint on this specific file for hooks violations
-            try:
-                cmd = [
-                    'npx', 'eslint',
-                    file_path,
-                    '--rule', 'react-hooks/exhaustive-deps:error',
-                    '--format', 'json',
-                    '--no-ignore'
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=project_dir)
-                
-                if result.stdout:
-                    eslint_results = json.loads(result.stdout)
-                    
-                    for file_result in eslint_results:
-                        if file_result.get('messages'):
-                            # Filter for hooks violations
-                            hooks_violations = [
-                                msg for msg in file_result['messages']
-                                if msg.get('ruleId') == 'react-hooks/exhaustive-deps'
-                            ]
-                            
-                            if hooks_violations:
-                                fixes = process_hooks_violations(file_path, hooks_violations)
-                                total_fixes += fixes
-                                processed_files += 1
-                            else:
-                                print(f"  ✓ No hooks dependency violations found")
-                        else:
-                            print(f"  ✓ No violations found")
-                else:
-                    print(f"  ✓ No ESLint issues found")
-                    
-            except Exception as e:
-                print(f"  ❌ Error processing {file_path}: {e}")
-        
-        # Small delay between batches
-        if i + batch_size < len(src_files):
-            print(f"\nProcessed {min(i + batch_size, len(src_files))} of {len(src_files)} files...")
+    # One ESLint run per batch of files; violations are then looked up per file
+    violations_by_file = run_eslint_for_hooks(src_files, project_dir)
+    print(f"Found {len(violations_by_file)} hooks dependency violations "
+          f"in {len(violations_by_file.files())} files")
+    
+    for file_path in src_files:
+        hooks_violations = violations_by_file.for_file(file_path)
+        if hooks_violations:
+            fixes = process_hooks_violations(file_path, hooks_violations)
+            total_fixes += fixes
+            processed_files += 1
     
     # Save manual review list
     review_file = save_manual_review_list()
@@ -353,6 +241,7 @@ def main():
     print(f"Manual review items: {len(manual_review_items)}")
     if review_file:
         print(f"Review list saved to: {review_file}")
+    dry_run.finish()
     
     return total_fixes
 
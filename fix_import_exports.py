@@ -7,6 +7,12 @@ Specifically handles underscore-prefixed imports and missing modules.
 import os
 import re
 import glob
+from collections import Counter
+
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def fix_import_exports_in_file(file_path):
     """Fix import/export issues in a single file."""
@@ -16,6 +22,7 @@ def fix_import_exports_in_file(file_path):
             content = f.read()
         
         original_content = content
+        counts = Counter()
         
         # Fix underscore-prefixed imports - pattern: import { _Name } from '...'
         underscore_import_fixes = [
@@ -49,7 +56,7 @@ def fix_import_exports_in_file(file_path):
         ]
         
         for pattern, replacement_fn in underscore_import_fixes:
-            content = re.sub(pattern, replacement_fn, content)
+            content, counts[pattern] = re.subn(pattern, replacement_fn, content)
         
         # Fix specific import issues
         specific_fixes = [
@@ -72,7 +79,7 @@ def fix_import_exports_in_file(file_path):
         ]
         
         for pattern, replacement in specific_fixes:
-            content = re.sub(pattern, replacement, content)
+            content, counts[pattern] = re.subn(pattern, replacement, content)
             
         # Remove imports for unavailable packages (commented out with explanation)
         unavailable_packages = [
@@ -88,12 +95,10 @@ def fix_import_exports_in_file(file_path):
         for package in unavailable_packages:
             # Comment out import lines for unavailable packages
             pattern = f"import.*?from ['\"]({re.escape(package)})['\"];?"
-            content = re.sub(pattern, r"// import ... from '\1'; // Package not available in current setup", content)
+            content, counts[f"unavailable {package}"] = re.subn(pattern, r"// import ... from '\1'; // Package not available in current setup", content)
         
         # Write back if changed
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if writer.commit(file_path, original_content, content, counts):
             return True
             
     except Exception as e:
@@ -104,6 +109,7 @@ def fix_import_exports_in_file(file_path):
 
 def main():
     """Main function to fix import/export issues across the codebase."""
+    dry_run.from_argv()
     
     # Find all TypeScript/JavaScript files
     patterns = [
@@ -130,6 +136,8 @@ def main():
             print(f"Modified: {file_path}")
     
     print(f"\nCompleted: {modified_count} files modified")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,6 +7,11 @@ Addresses incomplete imports, duplicates, and structural issues.
 import os
 import re
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def fix_import_corruption(content):
     """Fix various import corruption patterns."""
     lines = content.split('\n')
@@ -140,6 +145,7 @@ def fix_specific_file_patterns(file_path, content):
 
 def main():
     """Fix import corruption in all affected files."""
+    dry_run.from_argv()
     
     files = [
         # Components
@@ -225,11 +231,9 @@ def main():
                 # Clean up extra newlines
                 fixed_content = re.sub(r'\n{3,}', '\n\n', fixed_content)
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(fixed_content)
-                
-                print(f"Fixed imports: {file_path}")
-                fixed_count += 1
+                if writer.commit(file_path, content, fixed_content):
+                    print(f"Fixed imports: {file_path}")
+                    fixed_count += 1
                 
             except Exception as e:
                 print(f"Error fixing {file_path}: {e}")
@@ -237,6 +241,8 @@ def main():
             print(f"File not found: {file_path}")
     
     print(f"\nCompleted! Fixed imports in {fixed_count} files.")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
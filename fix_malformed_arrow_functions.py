@@ -18,6 +18,11 @@ import os
 import json
 from pathlib import Path
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+# Parse gate: edits that break a previously balanced file are rejected
+writer = GuardedWriter(quarantine_dir='ci/quarantine/arrow-function-fixes')
 
 def fix_malformed_arrow_functions(content: str) -> tuple[str, list[dict]]:
     """
@@ -43,7 +48,7 @@ def fix_malformed_arrow_functions(content: str) -> tuple[str, list[dict]]:
         ),
         # Pattern 3: Single parameter without parentheses
         (
-            r'(\w+)\s*=>\s*\{\s*/\*\s*TODO:\s*implement\s*\*/\s*\}\s*\n\s*([^\n\}]+)',
+            r'(?<!\w)(\w+)\s*=>\s*\{\s*/\*\s*TODO:\s*implement\s*\*/\s*\}\s*\n\s*([^\n\}]+)',
             r'\1 => \2'
         ),
         # Pattern 4: Complex parameter with type annotations
@@ -129,12 +134,15 @@ def process_file(file_path: Path) -> dict:
     
     original_content = content
     fixed_content, fixes = fix_malformed_arrow_functions(content)
+    fixed_content = writer.apply(str(file_path), original_content, 'fix_malformed_arrow_functions', fixed_content)
+    if fixed_content is original_content:
+        fixes = []
     
-    # Only write if changes were made
+    # Only write if changes were made (and the parse gate lets them through)
+    written = False
     if fixed_content != original_content:
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
+            written = writer.commit(file_path, original_content, fixed_content)
         except Exception as e:
             return {
                 'file': str(file_path),
@@ -144,13 +152,14 @@ def process_file(file_path: Path) -> dict:
     
     return {
         'file': str(file_path),
-        'fixes': fixes,
-        'changed': fixed_content != original_content
+        'fixes': fixes if written else [],
+        'changed': written
     }
 
 
 def main():
     """Main function to fix malformed arrow functions."""
+    dry_run.from_argv()
     base_dir = Path('/project/workspace/Coolhgg/Relife/src')
     
     # Find all TypeScript/JavaScript files
@@ -193,6 +202,11 @@ def main():
     print(f"- Files with fixes: {results['files_with_fixes']}")
     print(f"- Total fixes applied: {results['total_fixes']}")
     print(f"- Results saved to: ci/step-outputs/arrow-function-fixes.json")
+    
+    writer.print_summary()
+    writer.save_report(str(output_dir / 'arrow-function-rejections.json'))
+    print(f"- Parse gate report saved to: ci/step-outputs/arrow-function-rejections.json")
+    dry_run.finish()
 
 
 if __name__ == '__main__':
@@ -5,8 +5,14 @@ Script to fix malformed auto comments that break TypeScript syntax.
 
 import os
 import re
+from collections import Counter
 from pathlib import Path
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def fix_malformed_comments(file_path):
     """Fix malformed auto comments in a TypeScript/TSX file."""
     print(f"Processing {file_path}")
@@ -15,52 +21,52 @@ def fix_malformed_comments(file_path):
         content = f.read()
     
     original_content = content
+    counts = Counter()
     
     # Pattern 1: Fix "=> // auto: implicit any (" to "=> ({ // auto: implicit any"
-    content = re.sub(
+    content, counts['arrow-comment-before-paren'] = re.subn(
         r'=> // auto: implicit any \(',
         r'=> ({ // auto: implicit any',
         content
     )
     
     # Pattern 2: Fix "=> // auto: implicit any ([^(])" to "=> $1 // auto: implicit any"
-    content = re.sub(
+    content, counts['arrow-comment-before-expression'] = re.subn(
         r'=> // auto: implicit any ([^(])',
         r'=> \1 // auto: implicit any',
         content
     )
     
     # Pattern 3: Fix "=> // auto: implicit any ({" to "=> ({ // auto: implicit any"
-    content = re.sub(
+    content, counts['arrow-comment-before-object'] = re.subn(
         r'=> // auto: implicit any \(\{',
         r'=> ({ // auto: implicit any',
         content
     )
     
     # Pattern 4: Fix standalone "// auto: implicit any" at start of expression
-    content = re.sub(
+    content, counts['arrow-comment-standalone'] = re.subn(
         r'\) => // auto: implicit any ([a-zA-Z_])',
         r') => \1 // auto: implicit any',
         content
     )
     
     # Pattern 5: Fix filter callbacks
-    content = re.sub(
+    content, counts['filter-callback-comment'] = re.subn(
         r'\(([\w:]+)\) => // auto: implicit any ([a-zA-Z_])',
         r'(\1) => \2 // auto: implicit any',
         content
     )
     
-    if content != original_content:
+    if writer.commit(file_path, original_content, content, counts):
         print(f"  - Fixed malformed comments in {file_path}")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
         return True
     
     return False
 
 def main():
     """Main function to process all TypeScript files."""
+    dry_run.from_argv()
     src_dir = Path("src")
     
     if not src_dir.exists():
@@ -76,6 +82,8 @@ def main():
             fixed_count += 1
     
     print(f"\nFixed {fixed_count} files")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -10,6 +10,13 @@ import glob
 from pathlib import Path
 import json
 
+import dry_run
+from codemod_writer import GuardedWriter
+from fixpoint import run_to_fixpoint
+
+# Parse gate: rule outputs that break a previously balanced file are rejected
+writer = GuardedWriter(quarantine_dir='ci/quarantine/manual-sweep-2')
+
 def find_typescript_files(src_dir="src"):
     """Find all TypeScript/JavaScript files in the src directory."""
     patterns = [
@@ -25,7 +32,7 @@ def find_typescript_files(src_dir="src"):
     
     return sorted(files)
 
-def clean_auto_comments(content):
+def clean_auto_comments(content, first_line=1):
     """
     Clean up // auto: comments by either removing them or moving them above the line.
     """
@@ -39,12 +46,12 @@ def clean_auto_comments(content):
             # Remove the auto comment from the end of the line
             cleaned_line = re.sub(r'\s*//\s*auto:.*$', '', line)
             fixed_lines.append(cleaned_line)
-            fixes_made.append(f"Line {i+1}: Removed mid-expression auto comment")
+            fixes_made.append(f"Line {i+first_line}: Removed mid-expression auto comment")
             
         # Pattern 2: Standalone auto comment lines like // auto: implicit any
         elif re.match(r'^\s*//\s*auto:', line):
             # Skip standalone auto comment lines (remove them entirely)
-            fixes_made.append(f"Line {i+1}: Removed standalone auto comment")
+            fixes_made.append(f"Line {i+first_line}: Removed standalone auto comment")
             continue
             
         # Pattern 3: Auto comments at end of import lines
@@ -52,14 +59,14 @@ def clean_auto_comments(content):
             # Clean the import line
             cleaned_line = re.sub(r'\s*//\s*auto:.*$', '', line)
             fixed_lines.append(cleaned_line)
-            fixes_made.append(f"Line {i+1}: Removed auto comment from import")
+            fixes_made.append(f"Line {i+first_line}: Removed auto comment from import")
             
         else:
             fixed_lines.append(line)
     
     return '\n'.join(fixed_lines), fixes_made
 
-def fix_incomplete_arrow_functions(content):
+def fix_incomplete_arrow_functions(content, first_line=1):
     """
     Fix incomplete arrow functions by providing complete function bodies.
     """
@@ -76,21 +83,21 @@ def fix_incomplete_arrow_functions(content):
             # Add a complete function body
             fixed_line = line + ' { /* TODO: implement */ }'
             fixed_lines.append(fixed_line)
-            fixes_made.append(f"Line {i+1}: Added function body to incomplete arrow function")
+            fixes_made.append(f"Line {i+first_line}: Added function body to incomplete arrow function")
             
         # Pattern 2: Lines ending with => (incomplete)
         elif re.search(r'=>\s*$', line) and not re.search(r'//.*=>', line):
             # Add a complete function body
             fixed_line = line + ' { /* TODO: implement */ }'
             fixed_lines.append(fixed_line)
-            fixes_made.append(f"Line {i+1}: Added function body to incomplete arrow function")
+            fixes_made.append(f"Line {i+first_line}: Added function body to incomplete arrow function")
             
         # Pattern 3: Malformed callbacks like (param: any) => // comment code
         elif re.search(r'\(.*:\s*any\)\s*=>\s*//', line):
             # Replace with proper function body
             fixed_line = re.sub(r'\(([^)]+)\)\s*=>\s*//.*$', r'(\1) => { /* TODO: implement */ }', line)
             fixed_lines.append(fixed_line)
-            fixes_made.append(f"Line {i+1}: Fixed malformed callback with comment")
+            fixes_made.append(f"Line {i+first_line}: Fixed malformed callback with comment")
             
         else:
             fixed_lines.append(line)
@@ -110,23 +117,30 @@ def process_file(filepath):
         print(f"Error reading {filepath}: {e}")
         return None
     
-    # Apply auto-comment cleanup
-    content_after_comments, comment_fixes = clean_auto_comments(original_content)
-    
-    # Apply arrow function fixes
-    final_content, arrow_fixes = fix_incomplete_arrow_functions(content_after_comments)
-    
-    all_fixes = comment_fixes + arrow_fixes
+    # Comment cleanup can expose incomplete arrows (and arrow fixes can leave
+    # new auto comments), so both passes run until the file is stable
+    result = run_to_fixpoint(
+        original_content,
+        [('clean_auto_comments', clean_auto_comments),
+         ('fix_incomplete_arrow_functions', fix_incomplete_arrow_functions)],
+        gate=lambda rule, before, after: writer.apply(filepath, before, rule, after) is after,
+    )
+    final_content = result.text
+    all_fixes = [message for _, message in result.fixes]
+    if result.oscillation:
+        rules = ' <-> '.join(result.oscillation['rules'])
+        print(f"  ⚠️  Rules oscillate ({rules}) at line {result.oscillation['line']}; stopped")
     
     if all_fixes:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(final_content)
+            if not writer.commit(filepath, original_content, final_content):
+                return None
             
             return {
                 'file': filepath,
                 'fixes': all_fixes,
-                'total_fixes': len(all_fixes)
+                'total_fixes': len(all_fixes),
+                'fixpoint': result.report()
             }
         except Exception as e:
             print(f"Error writing {filepath}: {e}")
@@ -136,6 +150,7 @@ def process_file(filepath):
 
 def main():
     """Main function to process all files."""
+    dry_run.from_argv()
     print("=== MANUAL SWEEP TASK C - AUTO-COMMENT AND CALLBACK CLEANUP ===")
     print()
     
@@ -193,6 +208,11 @@ def main():
         json.dump(summary, f, indent=2, ensure_ascii=False)
     
     print(f"Results saved to: {output_file}")
+    
+    writer.print_summary()
+    rejections_file = writer.save_report("ci/step-outputs/manual-sweep-2-rejections.json")
+    print(f"Parse gate report saved to: {rejections_file}")
+    dry_run.finish()
     return total_fixes_made > 0
 
 if __name__ == "__main__":
@@ -5,10 +5,16 @@ Fix remaining specific syntax errors after Prettier run.
 
 import re
 import os
+from collections import Counter
 from pathlib import Path
 
+import dry_run
+from codemod_writer import GuardedWriter
+
 
 # Define specific fixes for each file based on the error patterns
+
+writer = GuardedWriter()
 SPECIFIC_FIXES = {
     'src/__tests__/factories/support-factories.ts': [
         # Fix: `: AppSettings => ;` should be complete
@@ -162,7 +168,7 @@ def apply_general_syntax_fixes(content: str) -> tuple[str, list[dict]]:
         })
     
     # Fix 5: Array access patterns broken by auto comments
-    pattern = r'(\w+)\s*//\s*auto:\s*implicit\s*any\[(\d+)\]\)'
+    pattern = r'(?<!\w)(\w+)\s*//\s*auto:\s*implicit\s*any\[(\d+)\]\)'
     if re.search(pattern, fixed_content):
         fixed_content = re.sub(pattern, r'\1[\2])', fixed_content)
         fixes.append({
@@ -195,11 +201,12 @@ def process_file(file_path: Path) -> dict:
     
     all_fixes = general_fixes + specific_fixes
     
-    # Only write if changes were made
+    # Only write if changes were made (and the parse gate lets them through)
+    written = False
     if fixed_content != original_content:
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(fixed_content)
+            written = writer.commit(file_path, original_content, fixed_content,
+                                    Counter(fix['type'] for fix in all_fixes))
         except Exception as e:
             return {
                 'file': str(file_path),
@@ -209,13 +216,14 @@ def process_file(file_path: Path) -> dict:
     
     return {
         'file': str(file_path),
-        'fixes': all_fixes,
-        'changed': fixed_content != original_content
+        'fixes': all_fixes if written else [],
+        'changed': written
     }
 
 
 def main():
     """Main function."""
+    dry_run.from_argv()
     # Files with remaining syntax errors
     error_files = [
         'src/__tests__/factories/support-factories.ts',
@@ -263,6 +271,8 @@ def main():
     print(f"- Files processed: {results['files_processed']}")
     print(f"- Files with fixes: {results['files_with_fixes']}")
     print(f"- Total fixes applied: {results['total_fixes']}")
+    writer.print_summary()
+    dry_run.finish()
 
 
 if __name__ == '__main__':
@@ -7,6 +7,12 @@ Replace `number` with `TimeoutHandle` for setTimeout/setInterval returns.
 import os
 import re
 import glob
+from collections import Counter
+
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def fix_timeout_types_in_file(file_path):
     """Fix timeout type issues in a single file."""
@@ -16,6 +22,7 @@ def fix_timeout_types_in_file(file_path):
             content = f.read()
         
         original_content = content
+        counts = Counter()
         
         # Add TimeoutHandle import if not present and setTimeout/setInterval is used
         has_timeout_usage = re.search(r'setTimeout|setInterval', content)
@@ -30,6 +37,7 @@ def fix_timeout_types_in_file(file_path):
                 content = (content[:insertion_point] + 
                           "\nimport { TimeoutHandle } from '../types/timers';" +
                           content[insertion_point:])
+                counts['timeout-handle-import'] += 1
         
         # Fix common timeout type patterns
         fixes = [
@@ -51,12 +59,10 @@ def fix_timeout_types_in_file(file_path):
         ]
         
         for pattern, replacement in fixes:
-            content = re.sub(pattern, replacement, content)
+            content, counts[pattern] = re.subn(pattern, replacement, content)
         
         # Write back if changed
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if writer.commit(file_path, original_content, content, counts):
             return True
             
     except Exception as e:
@@ -67,6 +73,7 @@ def fix_timeout_types_in_file(file_path):
 
 def main():
     """Main function to fix timeout types across the codebase."""
+    dry_run.from_argv()
     
     # Find all TypeScript/JavaScript files
     patterns = [
@@ -95,6 +102,8 @@ def main():
             print(f"Modified: {file_path}")
     
     print(f"\nCompleted: {modified_count} files modified")
+    writer.print_summary()
+    dry_run.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
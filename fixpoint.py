@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Fixpoint runner for line-local rewrite passes.
+
+Passes are applied in order, repeatedly, until an iteration changes
+nothing. The first iteration covers the whole text; after that each pass
+only re-runs on the lines changed during the previous iteration (plus a
+few lines of context), so reaching a stable result costs roughly the size
+of the edits rather than iterations x file size.
+
+A pass is a function `fn(text, first_line=1) -> (new_text, fixes)` that
+only looks at one line (or `context` neighbouring lines) at a time, like
+the line fixers in fix_manual_sweep_issues.py; first_line is the line
+number of the text's first line, for the messages in fixes. ruleset_pass()
+wraps a rewrite_engine.RuleSet as such a pass.
+
+When an edit is made again after its exact inverse was also made, two
+rules (or one rule with itself) are undoing each other: the run stops and
+reports the pair instead of looping until max_iterations.
+"""
+
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class Edit(NamedTuple):
+    rule: str
+    iteration: int
+    line: int                 # 1-based line where the new lines start
+    before: Tuple[str, ...]
+    after: Tuple[str, ...]
+
+
+class FixpointResult(NamedTuple):
+    text: str
+    converged: bool
+    iterations: int
+    fixes: List[Tuple[str, str]]    # (rule, message) in application order
+    counts: Counter                 # fixes per rule
+    edits: List[Edit]
+    scanned_lines: List[int]        # lines handed to passes, per iteration
+    rejected: List[Tuple[int, str]]  # (iteration, rule) refused by the gate
+    oscillation: Optional[dict]
+
+    def report(self):
+        """Dict for JSON reports."""
+        return {
+            'converged': self.converged,
+            'iterations': self.iterations,
+            'fixes_per_rule': dict(self.counts),
+            'scanned_lines': self.scanned_lines,
+            'rejected': [{'iteration': i, 'rule': rule} for i, rule in self.rejected],
+            'oscillation': self.oscillation,
+        }
+
+
+def ruleset_pass(rules):
+    """A pass applying a rewrite_engine RuleSet; one fix message per rule that matched."""
+    def apply(text, first_line=1):
+        text, counts = rules.apply(text)
+        fixes = [f"Lines {first_line}+: {name} x{n}" for name, n in counts.items()]
+        return text, fixes
+    return apply
+
+
+def _windows(regions, context, total):
+    """Merge dirty line ranges, each widened by context lines."""
+    spans = sorted((max(0, start - context), min(total, end + context)) for start, end in regions)
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged if start < end]
+
+
+def _shift(regions, a, b, delta):
+    """Keep line ranges valid after lines[a:b] grew by delta lines."""
+    for region in regions:
+        if region[0] >= b:
+            region[0] += delta
+            region[1] += delta
+        elif region[1] > a:
+            # Overlapping ranges grow to cover whatever replaced [a, b)
+            region[0] = min(region[0], a)
+            region[1] = max(region[1], b) + delta
+
+
+def run_to_fixpoint(text, passes, context=1, max_iterations=10,
+                    gate: Optional[Callable[[str, str, str], bool]] = None) -> FixpointResult:
+    """Apply (name, fn) passes until nothing changes.
+
+    gate(rule, before, after) may veto a pass's edits for one iteration
+    (e.g. a parse check on the whole file); vetoed edits are not retried
+    on the same regions.
+    """
+    lines = text.split('\n')
+    regions = [[0, len(lines)]]
+    fixes = []
+    counts = Counter()
+    edits = []
+    scanned_lines = []
+    rejected = []
+    applied = {}          # (before, after) -> first Edit that made it
+    oscillation = None
+    iteration = 0
+
+    while regions and iteration < max_iterations and oscillation is None:
+        iteration += 1
+        scanned = 0
+        next_regions = []
+        for name, fn in passes:
+            replacements = []
+            pass_fixes = []
+            for a, b in _windows(regions, context, len(lines)):
+                old = lines[a:b]
+                old_text = '\n'.join(old)
+                scanned += b - a
+                new_text, region_fixes = fn(old_text, first_line=a + 1)
+                if new_text != old_text:
+                    replacements.append((a, b, old, new_text.split('\n')))
+                    pass_fixes.extend(region_fixes)
+            if not replacements:
+                continue
+            if gate is not None:
+                after = list(lines)
+                for a, b, _, new in reversed(replacements):
+                    after[a:b] = new
+                if not gate(name, '\n'.join(lines), '\n'.join(after)):
+                    rejected.append((iteration, name))
+                    continue
+            # Bottom-up, so the offsets of the windows above stay valid
+            for a, b, old, new in reversed(replacements):
+                lines[a:b] = new
+                _shift(regions, a, b, len(new) - len(old))
+                _shift(next_regions, a, b, len(new) - len(old))
+                for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+                    if tag == 'equal':
+                        continue
+                    edit = Edit(name, iteration, a + j1 + 1, tuple(old[i1:i2]), tuple(new[j1:j2]))
+                    edits.append(edit)
+                    next_regions.append([a + j1, a + j2])
+                    key = (edit.before, edit.after)
+                    inverse = applied.get((edit.after, edit.before))
+                    if key in applied and inverse is not None and oscillation is None:
+                        oscillation = {
+                            'rules': [inverse.rule, name],
+                            'iteration': iteration,
+                            'line': edit.line,
+                            'before': list(edit.before),
+                            'after': list(edit.after),
+                        }
+                    applied.setdefault(key, edit)
+            fixes.extend((name, message) for message in pass_fixes)
+            counts[name] += len(pass_fixes)
+        scanned_lines.append(scanned)
+        regions = next_regions
+
+    converged = not regions and oscillation is None
+    return FixpointResult('\n'.join(lines), converged, iteration, fixes, counts,
+                          edits, scanned_lines, rejected, oscillation)
@@ -2,88 +2,22 @@
 """
 Generate comprehensive ESLint final report comparing before/after states.
 """
-import json
 import sys
-from collections import defaultdict
 from pathlib import Path
 
-
-def load_eslint_results(file_path):
-    """Load ESLint JSON results from file."""
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
-
-
-def analyze_results(results):
-    """Analyze ESLint results and return summary statistics."""
-    stats = {
-        'total_files': len(results),
-        'files_with_issues': 0,
-        'total_errors': 0,
-        'total_warnings': 0,
-        'total_fixable_errors': 0,
-        'total_fixable_warnings': 0,
-        'rule_counts': defaultdict(int),
-        'issues_by_file': {},
-        'top_issues': []
-    }
-    
-    for file_result in results:
-        file_path = file_result['filePath']
-        error_count = file_result['errorCount']
-        warning_count = file_result['warningCount']
-        
-        if error_count > 0 or warning_count > 0:
-            stats['files_with_issues'] += 1
-            stats['issues_by_file'][file_path] = {
-                'errors': error_count,
-                'warnings': warning_count,
-                'messages': file_result['messages']
-            }
-        
-        stats['total_errors'] += error_count
-        stats['total_warnings'] += warning_count
-        stats['total_fixable_errors'] += file_result['fixableErrorCount']
-        stats['total_fixable_warnings'] += file_result['fixableWarningCount']
-        
-        # Count issues by rule
-        for message in file_result['messages']:
-            rule_id = message.get('ruleId') or 'unknown'
-            stats['rule_counts'][rule_id] += 1
-            
-            # Collect top issues for detailed reporting
-            stats['top_issues'].append({
-                'file': file_path.replace('/project/workspace/Coolhgg/Relife/', ''),
-                'line': message.get('line', 0),
-                'column': message.get('column', 0),
-                'severity': message.get('severity', 0),
-                'message': message.get('message', ''),
-                'rule': rule_id,
-                'fixable': message.get('fix') is not None
-            })
-    
-    # Sort top issues by severity (errors first), then by rule
-    stats['top_issues'].sort(key=lambda x: (x['severity'], x['rule'] or '', x['file'] or ''))
-    
-    return stats
-
-
-def format_file_path(file_path):
-    """Format file path for display."""
-    return file_path.replace('/project/workspace/Coolhgg/Relife/', '')
+import message_templates
+from lint_summary import SummaryCache, format_file_path
 
 
 def generate_fix_suggestion(issue):
     """Generate a simple fix suggestion for common issues."""
     rule = issue['rule']
+    params = message_templates.classify(issue['message'], rule).params
+    name = params.get('name', 'variable')
     suggestions = {
-        'no-undef': f"Add missing import or declare variable: {issue['message'].split(' ')[0] if ' ' in issue['message'] else 'variable'}",
-        'no-unused-vars': f"Remove or prefix with underscore: {issue['message'].split(' ')[0] if ' ' in issue['message'] else 'variable'}",
-        '@typescript-eslint/no-unused-vars': f"Remove or prefix with underscore: {issue['message'].split(' ')[0] if ' ' in issue['message'] else 'variable'}",
+        'no-undef': f"Add missing import or declare variable: {name}",
+        'no-unused-vars': f"Remove or prefix with underscore: {name}",
+        '@typescript-eslint/no-unused-vars': f"Remove or prefix with underscore: {name}",
         'react-hooks/exhaustive-deps': 'Add missing dependencies to dependency array',
         'prefer-const': 'Change let to const for variables that are never reassigned',
         'no-constant-condition': 'Replace constant condition with dynamic check'
@@ -100,11 +34,10 @@ def generate_report():
     if not before_file.exists() or not after_file.exists():
         return "Error: Required ESLint JSON files not found."
     
-    before_results = load_eslint_results(before_file)
-    after_results = load_eslint_results(after_file)
-    
-    before_stats = analyze_results(before_results)
-    after_stats = analyze_results(after_results)
+    # Aggregates only; the runs are parsed again only when they change (see lint_summary.py)
+    summaries = SummaryCache()
+    before_stats = summaries.get(before_file)
+    after_stats = summaries.get(after_file)
     
     # Calculate improvements
     errors_fixed = before_stats['total_errors'] - after_stats['total_errors']
@@ -130,6 +63,27 @@ def generate_report():
     report.append(f"- **Total issues fixed:** {errors_fixed + warnings_fixed:,}")
     report.append("")
     
+    # New issues relative to the committed baseline (see diagnostic_baseline.py)
+    baseline = after_stats['baseline']
+    if baseline['entries']:
+        new_issues = baseline['new_issues']
+        report.append("## 🆕 New Since Baseline")
+        report.append("")
+        report.append(f"- **New issues:** {baseline['new']:,}")
+        report.append(f"- **Resolved baseline entries:** {baseline['resolved']:,} "
+                      f"(drop them with `python3 diagnostic_baseline.py check --prune`)")
+        report.append("")
+        if new_issues:
+            report.append("| File | Line | Rule | Message |")
+            report.append("|------|------|------|---------|")
+            for issue in new_issues[:50]:
+                message_short = issue['message'][:60] + "..." if len(issue['message']) > 60 else issue['message']
+                severity_icon = "🔴" if issue['severity'] == 'error' else "🟡"
+                report.append(f"| {issue['file'][:50]} | {issue['line']} | {severity_icon} {issue['code'] or 'unknown'} | {message_short} |")
+            if baseline['new'] > 50:
+                report.append(f"| ... | | | {baseline['new'] - 50:,} more |")
+            report.append("")
+    
     # Process Issues
     report.append("## 🔧 Process Summary")
     report.append("")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Per-file index of import statements and identifier occurrences.
+
+Import statements are read from the ts_lexer token stream, so multi-line
+braces, `import type`, default-plus-named, namespace, side-effect and
+`import x = require()` forms are all handled. The same pass counts every
+identifier used outside the import statements; an imported name is unused
+when its count is zero.
+"""
+
+from collections import Counter
+from typing import List, NamedTuple, Optional
+
+from ts_lexer import (
+    JSX_OPEN, NAME, STRING, LineIndex, is_jsx_path, strip_comments, tokenize,
+)
+
+DEFAULT = 'default'
+NAMED = 'named'
+NAMESPACE = 'namespace'
+
+
+class ImportBinding(NamedTuple):
+    name: str                # local name
+    imported: str            # exported name ('default' / '*' for those forms)
+    kind: str                # DEFAULT, NAMED or NAMESPACE
+    type_only: bool
+    start: int               # offset of the local name
+
+
+class ImportStatement(NamedTuple):
+    module: Optional[str]
+    start: int
+    end: int
+    type_only: bool
+    bindings: List[ImportBinding]  # empty for side-effect imports
+
+    @property
+    def side_effect(self):
+        return not self.bindings
+
+
+def _unquote(value):
+    return value[1:-1] if len(value) >= 2 and value[0] in '\'"' else value
+
+
+def parse_import(tokens, pairs, i):
+    """Parse the import statement whose `import` keyword is tokens[i].
+
+    tokens must be comment-free (see ts_lexer.strip_comments). Returns
+    (ImportStatement, next_index), or (None, i + 1) for import() calls and
+    import.meta.
+    """
+    n = len(tokens)
+    j = i + 1
+    if j >= n or tokens[j].value in ('(', '.'):
+        return None, i + 1
+    type_only = False
+    if tokens[j].value == 'type' and j + 1 < n and tokens[j + 1].value not in ('from', ',', '='):
+        type_only = True
+        j += 1
+    bindings = []
+    module = None
+    while j < n:
+        token = tokens[j]
+        value = token.value
+        if token.kind == STRING:
+            module = _unquote(value)
+            j += 1
+            break
+        if value == 'from' and j + 1 < n and tokens[j + 1].kind == STRING:
+            module = _unquote(tokens[j + 1].value)
+            j += 2
+            break
+        if value == '{' and j in pairs:
+            _parse_specifiers(tokens, j + 1, pairs[j], type_only, bindings)
+            j = pairs[j] + 1
+        elif value == '*' and j + 2 < n and tokens[j + 1].value == 'as':
+            name = tokens[j + 2]
+            bindings.append(ImportBinding(name.value, '*', NAMESPACE, type_only, name.start))
+            j += 3
+        elif value == '=' and j + 4 < n and tokens[j + 1].value == 'require':
+            # import x = require('module')
+            module = _unquote(tokens[j + 3].value)
+            j = pairs.get(j + 2, j + 4) + 1
+            break
+        elif token.kind == NAME and value != 'from':
+            bindings.append(ImportBinding(value, 'default', DEFAULT, type_only, token.start))
+            j += 1
+        elif value == ',':
+            j += 1
+        else:
+            break
+    # Import attributes: with { type: 'json' } / assert { ... }
+    if j + 1 < n and tokens[j].value in ('with', 'assert') and tokens[j + 1].value == '{':
+        j = pairs.get(j + 1, j + 1) + 1
+    if j < n and tokens[j].value == ';':
+        j += 1
+    end = tokens[j - 1].end
+    return ImportStatement(module, tokens[i].start, end, type_only, bindings), j
+
+
+def _parse_specifiers(tokens, j, close, type_only, bindings):
+    # { a, type B, c as d, default as e }
+    while j < close:
+        spec_type = type_only
+        if tokens[j].value == 'type' and j + 1 < close and tokens[j + 1].value not in (',', 'as'):
+            spec_type = True
+            j += 1
+        imported = tokens[j]
+        local = imported
+        if j + 2 < close + 1 and tokens[j + 1].value == 'as':
+            local = tokens[j + 2]
+            j += 2
+        j += 1
+        if imported.kind in (NAME, STRING) and local.kind == NAME:
+            bindings.append(ImportBinding(
+                local.value, _unquote(imported.value), NAMED, spec_type, local.start))
+        while j < close and tokens[j].value != ',':
+            j += 1
+        j += 1
+
+
+class ImportIndex:
+    """Imports of one buffer plus a table of identifier occurrences.
+
+    `occurrences[name]` counts identifier tokens (and JSX tag names) outside
+    import statements, ignoring property names after '.' and '?.'.
+    """
+
+    def __init__(self, text, path='', lexed=None):
+        self.text = text
+        if lexed is None:
+            lexed = tokenize(text, jsx=is_jsx_path(path) if path else True)
+        tokens, pairs = strip_comments(lexed)
+        self.statements = []
+        self.occurrences = Counter()
+        self._lines = None
+        self._scan(tokens, pairs)
+
+    def _scan(self, tokens, pairs):
+        occurrences = self.occurrences
+        depth = 0
+        previous = ''
+        i = 0
+        n = len(tokens)
+        while i < n:
+            token = tokens[i]
+            kind = token.kind
+            value = token.value
+            if kind == NAME:
+                if value == 'import' and depth == 0 and previous != '.':
+                    statement, i = parse_import(tokens, pairs, i)
+                    if statement is not None:
+                        self.statements.append(statement)
+                        previous = ';'
+                        continue
+                    occurrences[value] += 1
+                elif previous not in ('.', '?.'):
+                    occurrences[value] += 1
+            elif kind == JSX_OPEN and value:
+                # <Foo.Bar> uses Foo
+                occurrences[value.split('.', 1)[0]] += 1
+            elif value in ('{', '(', '[', '${'):
+                depth += 1
+            elif value in ('}', ')', ']'):
+                depth -= 1
+            previous = value
+            i += 1
+
+    @property
+    def bindings(self):
+        return [b for statement in self.statements for b in statement.bindings]
+
+    def line_of(self, offset):
+        if self._lines is None:
+            self._lines = LineIndex(self.text)
+        return self._lines.position(offset)[0]
+
+    def is_used(self, name):
+        return self.occurrences[name] > 0
+
+    def unused(self):
+        """(statement, binding) pairs whose local name is never referenced."""
+        return [
+            (statement, binding)
+            for statement in self.statements
+            for binding in statement.bindings
+            if not self.occurrences[binding.name]
+        ]
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Per-file index of JSX attributes and the elements that own them.
+
+Built from one ts_lexer pass: every attribute is mapped to its owning tag
+(`input`, `textarea`, `Select`, ...), the component name when the tag is a
+component, and the DOM interface its events are typed with. Codemods look
+handlers up by offset instead of re-scanning the surrounding text.
+"""
+
+from bisect import bisect_right
+from typing import NamedTuple, Optional
+
+from ts_lexer import JSX_ATTR, JSX_END, JSX_OPEN, JSX_SELF_CLOSE, tokenize
+
+# Intrinsic tags whose DOM interface is not simply HTML<Tag>Element
+INTRINSIC_ELEMENT_TYPES = {
+    'a': 'HTMLAnchorElement',
+    'button': 'HTMLButtonElement',
+    'div': 'HTMLDivElement',
+    'form': 'HTMLFormElement',
+    'h1': 'HTMLHeadingElement',
+    'h2': 'HTMLHeadingElement',
+    'h3': 'HTMLHeadingElement',
+    'h4': 'HTMLHeadingElement',
+    'h5': 'HTMLHeadingElement',
+    'h6': 'HTMLHeadingElement',
+    'img': 'HTMLImageElement',
+    'input': 'HTMLInputElement',
+    'label': 'HTMLLabelElement',
+    'li': 'HTMLLIElement',
+    'ol': 'HTMLOListElement',
+    'option': 'HTMLOptionElement',
+    'p': 'HTMLParagraphElement',
+    'select': 'HTMLSelectElement',
+    'span': 'HTMLSpanElement',
+    'table': 'HTMLTableElement',
+    'textarea': 'HTMLTextAreaElement',
+    'ul': 'HTMLUListElement',
+    'video': 'HTMLVideoElement',
+    'audio': 'HTMLAudioElement',
+    'canvas': 'HTMLCanvasElement',
+}
+
+# Components from src/components/ui that render (and forward props to) a
+# single intrinsic element
+COMPONENT_ELEMENTS = {
+    'Input': 'input',
+    'Textarea': 'textarea',
+    'Button': 'button',
+    'Label': 'label',
+}
+
+# React event type per handler prop; anything else is a SyntheticEvent
+HANDLER_EVENT_TYPES = {
+    'onChange': 'React.ChangeEvent',
+    'onInput': 'React.FormEvent',
+    'onSubmit': 'React.FormEvent',
+    'onClick': 'React.MouseEvent',
+    'onDoubleClick': 'React.MouseEvent',
+    'onMouseDown': 'React.MouseEvent',
+    'onMouseUp': 'React.MouseEvent',
+    'onMouseEnter': 'React.MouseEvent',
+    'onMouseLeave': 'React.MouseEvent',
+    'onKeyDown': 'React.KeyboardEvent',
+    'onKeyUp': 'React.KeyboardEvent',
+    'onKeyPress': 'React.KeyboardEvent',
+    'onFocus': 'React.FocusEvent',
+    'onBlur': 'React.FocusEvent',
+    'onTouchStart': 'React.TouchEvent',
+    'onTouchEnd': 'React.TouchEvent',
+    'onTouchMove': 'React.TouchEvent',
+    'onDragStart': 'React.DragEvent',
+    'onDragOver': 'React.DragEvent',
+    'onDrop': 'React.DragEvent',
+    'onScroll': 'React.UIEvent',
+}
+
+
+class JsxAttribute(NamedTuple):
+    name: str                    # attribute name, e.g. 'onChange'
+    tag: str                     # owning tag as written, e.g. 'textarea', 'Select'
+    component: Optional[str]     # tag when it is a component, else None
+    element_type: Optional[str]  # DOM interface, None for unknown components
+    start: int                   # offset of the attribute name
+    end: int                     # end of the attribute (name or value)
+
+
+def is_component_tag(tag):
+    return bool(tag) and (tag[0].isupper() or '.' in tag)
+
+
+def element_type_for_tag(tag):
+    """DOM interface for a tag, resolving known wrapper components; None if unknown."""
+    if is_component_tag(tag):
+        tag = COMPONENT_ELEMENTS.get(tag)
+        if tag is None:
+            return None
+    if not tag:
+        return None
+    return INTRINSIC_ELEMENT_TYPES.get(tag.lower(), 'HTMLElement')
+
+
+def event_type(handler, element_type):
+    """React event type for a handler prop on an element, e.g. React.ChangeEvent<HTMLInputElement>."""
+    base = HANDLER_EVENT_TYPES.get(handler, 'React.SyntheticEvent')
+    return f'{base}<{element_type}>' if element_type else base
+
+
+class JsxIndex:
+    """Attribute lookup for one buffer.
+
+    `at(offset)` answers for the offset of an attribute name in O(1);
+    `enclosing(offset)` finds the innermost attribute whose name or value
+    contains an offset.
+    """
+
+    def __init__(self, text, lexed=None):
+        self.text = text
+        self.attributes = []
+        self._by_start = {}
+        self._build(lexed if lexed is not None else tokenize(text, jsx=True))
+        # _build appends nested attributes before the one whose value holds them
+        self.attributes.sort(key=lambda a: a.start)
+        self._starts = [a.start for a in self.attributes]
+        self._parents = self._nesting()
+
+    def _build(self, lexed):
+        # Elements can open inside an attribute value (icon={<Icon />}), so
+        # the enclosing tag and its unfinished attribute are kept on a stack
+        stack = []
+        tag = None
+        pending = None
+        for token in lexed.tokens:
+            kind = token.kind
+            if kind == JSX_OPEN:
+                stack.append((tag, pending))
+                tag, pending = token.value, None
+            elif tag is None:
+                continue
+            elif kind == JSX_ATTR:
+                self._close_pending(pending, token.start)
+                pending = (token.value, tag, token.start, token.end)
+            elif kind in (JSX_END, JSX_SELF_CLOSE):
+                self._close_pending(pending, token.start)
+                tag, pending = stack.pop() if stack else (None, None)
+
+    def _nesting(self):
+        """Index of the attribute directly containing each attribute (None at the top)."""
+        parents = []
+        stack = []
+        for i, attribute in enumerate(self.attributes):
+            while stack and self.attributes[stack[-1]].end <= attribute.start:
+                stack.pop()
+            parents.append(stack[-1] if stack else None)
+            stack.append(i)
+        return parents
+
+    def _close_pending(self, pending, end):
+        if pending is None:
+            return
+        name, tag, start, name_end = pending
+        # The value ends before the whitespace preceding the next attribute
+        text = self.text
+        while end > name_end and text[end - 1].isspace():
+            end -= 1
+        attribute = JsxAttribute(
+            name, tag, tag if is_component_tag(tag) else None,
+            element_type_for_tag(tag), start, end,
+        )
+        self.attributes.append(attribute)
+        self._by_start[start] = attribute
+
+    def at(self, offset):
+        """Attribute whose name starts at offset, or None."""
+        return self._by_start.get(offset)
+
+    def enclosing(self, offset):
+        """Innermost attribute whose name or value contains offset, or None."""
+        i = bisect_right(self._starts, offset) - 1
+        if i < 0:
+            return None
+        # Attributes nest, so if the last one starting at or before offset
+        # ends before it, only one of its ancestors can contain it
+        while i is not None:
+            if offset < self.attributes[i].end:
+                return self.attributes[i]
+            i = self._parents[i]
+        return None
+
+    def handler_event_type(self, offset, handler=None, default_element=None):
+        """Event type for the handler attribute at offset.
+
+        Unknown components fall back to default_element (bare React event
+        type when that is None too).
+        """
+        attribute = self.at(offset) or self.enclosing(offset)
+        if attribute is None:
+            return None
+        element = attribute.element_type or default_element
+        return event_type(handler or attribute.name, element)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Pre-aggregated summaries of ESLint JSON runs, for the report scripts.
+
+The final-report runs are ~19MB each; parsing them dominates rendering a
+report. A summary keeps only what the reports show:
+
+- the totals and fixable counts;
+- issues per rule and per file;
+- the first TOP_ISSUES issues in report order (errors first, then by rule
+  and file);
+- the issues new since the committed eslint baseline (see
+  diagnostic_baseline.py).
+
+Summaries are stored in SUMMARY_DIR as <sha256 of the run>.json. An index
+records the size, mtime and hash of each run summarized, so an unchanged
+run is found from a stat() alone. A touched but unchanged run is found by
+its hash, and only a changed run is parsed again. The baseline part is
+keyed by the hash of the baseline file as well. A summary written by
+another SUMMARY_VERSION is rebuilt.
+
+    python3 lint_summary.py ci/step-outputs/eslint_final_before.json ci/step-outputs/eslint_final_after.json
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+
+import diagnostic_baseline
+from diagnostics import BASE_PATH, parse_eslint_json
+
+SUMMARY_DIR = 'ci/step-outputs/summaries'
+SUMMARY_VERSION = 2
+TOP_ISSUES = 50
+NEW_ISSUES = 50
+
+_INDEX = 'index.json'
+
+
+def load_eslint_results(file_path):
+    """Load ESLint JSON results from file."""
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        return []
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def format_file_path(file_path):
+    """Format file path for display."""
+    return file_path.replace(BASE_PATH + '/', '')
+
+
+def _issues(results):
+    for file_result in results:
+        file_path = format_file_path(file_result['filePath'])
+        for message in file_result['messages']:
+            yield {
+                'file': file_path,
+                'line': message.get('line', 0),
+                'column': message.get('column', 0),
+                'severity': message.get('severity', 0),
+                'message': message.get('message', ''),
+                'rule': message.get('ruleId') or 'unknown',
+                'fixable': message.get('fix') is not None
+            }
+
+
+def _issue_key(issue):
+    # ESLint severity 2 is an error, 1 a warning
+    return -issue['severity'], issue['rule'] or '', issue['file'] or ''
+
+
+def summarize(results, top=TOP_ISSUES):
+    """Totals, per-rule and per-file counts and the top issues of an ESLint run."""
+    stats = {
+        'total_files': len(results),
+        'files_with_issues': 0,
+        'total_errors': 0,
+        'total_warnings': 0,
+        'total_fixable_errors': 0,
+        'total_fixable_warnings': 0,
+        'rule_counts': Counter(),
+        'issues_by_file': {},
+    }
+
+    for file_result in results:
+        error_count = file_result['errorCount']
+        warning_count = file_result['warningCount']
+        if error_count > 0 or warning_count > 0:
+            stats['files_with_issues'] += 1
+            stats['issues_by_file'][file_result['filePath']] = {'errors': error_count, 'warnings': warning_count}
+        stats['total_errors'] += error_count
+        stats['total_warnings'] += warning_count
+        stats['total_fixable_errors'] += file_result['fixableErrorCount']
+        stats['total_fixable_warnings'] += file_result['fixableWarningCount']
+        stats['rule_counts'].update(message.get('ruleId') or 'unknown' for message in file_result['messages'])
+
+    # Same as a stable sort of every issue, cut to the first `top`
+    stats['top_issues'] = heapq.nsmallest(top, _issues(results), key=_issue_key)
+    stats['rule_counts'] = dict(stats['rule_counts'])
+    return stats
+
+
+def baseline_summary(results, tool='eslint', directory=diagnostic_baseline.BASELINE_DIR):
+    """New and resolved counts against the committed baseline, and the first new issues."""
+    path = diagnostic_baseline.baseline_path(tool, directory)
+    baseline = diagnostic_baseline.Baseline(diagnostic_baseline.load(path))
+    summary = {'sha256': file_hash(path) if os.path.exists(path) else None,
+               'entries': len(baseline.hashes)}
+    if len(baseline.hashes):
+        new, _, resolved = baseline.split(parse_eslint_json(results))
+        summary.update(new=len(new), resolved=resolved,
+                       new_issues=[d._asdict() for d in new[:NEW_ISSUES]])
+    return summary
+
+
+class SummaryCache:
+    """Summaries of ESLint runs by content hash, with a stat index in front."""
+
+    def __init__(self, directory=SUMMARY_DIR, baseline_dir=diagnostic_baseline.BASELINE_DIR):
+        self.directory = directory
+        self.baseline_dir = baseline_dir
+        self.rebuilt = []      # runs parsed (not taken from the cache) by this instance
+        self._index = None
+
+    def _index_path(self):
+        return os.path.join(self.directory, _INDEX)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _write_json(self, path, data):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _read_summary(self, sha256):
+        try:
+            with open(os.path.join(self.directory, f"{sha256}.json"), 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return summary if summary.get('version') == SUMMARY_VERSION else None
+
+    def _baseline_sha256(self):
+        path = diagnostic_baseline.baseline_path('eslint', self.baseline_dir)
+        return file_hash(path) if os.path.exists(path) else None
+
+    def get(self, path):
+        """Summary of the ESLint run at path, parsing it only if it changed."""
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        index = self._load_index()
+        entry = index.get(key)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            sha256 = entry['sha256']
+        else:
+            sha256 = file_hash(path)
+        summary = self._read_summary(sha256)
+        results = None
+        if summary is None:
+            results = load_eslint_results(path)
+            summary = {'version': SUMMARY_VERSION, 'sha256': sha256, **summarize(results)}
+        if summary.get('baseline', {}).get('sha256', '') != self._baseline_sha256():
+            if results is None:
+                results = load_eslint_results(path)
+            summary['baseline'] = baseline_summary(results, 'eslint', self.baseline_dir)
+        if results is not None:
+            self.rebuilt.append(path)
+            self._write_json(os.path.join(self.directory, f"{sha256}.json"), summary)
+        if entry != {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}:
+            index[key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+            self._write_json(self._index_path(), index)
+        return summary
+
+
+def main():
+    paths = sys.argv[1:]
+    if not paths:
+        raise SystemExit("usage: lint_summary.py ESLINT_JSON...")
+    cache = SummaryCache()
+    for path in paths:
+        summary = cache.get(path)
+        state = 'rebuilt' if path in cache.rebuilt else 'cached'
+        print(f"{path}: {summary['total_errors']:,} errors, {summary['total_warnings']:,} warnings "
+              f"in {summary['files_with_issues']:,} files ({state}, {summary['sha256'][:12]})")
+
+
+if __name__ == '__main__':
+    main()
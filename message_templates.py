@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Message templates for tsc and ESLint diagnostics.
+
+A message is lexed into words, punctuation and typed parameters:
+
+    identifier   'alarm'                      quoted name
+    path         './types' '@/utils/x'        quoted module path
+    text         'string | undefined'         any other quoted text
+    list         'a', 'b', and 'c'            quoted items joined by ',' / 'and'
+    number       2, 12
+    regex        /^_/u
+
+Replacing the parameters with their kinds gives the message's shape, e.g.
+"'{identifier}' is not defined." - grouping by shape is what mine() does.
+
+Known messages are described by the TEMPLATES catalog, where slots are
+named: "'{name:identifier}' is not defined.". The catalog is compiled once
+into a prefix trie keyed by code (TS code or ESLint rule, '*' for any) and
+then by token, so matching a message is one walk along its tokens. A slot
+accepts the parameter kinds listed in ACCEPTS; '{x:word}' takes one bare
+word (useEffect) and a trailing '{x:rest}' takes the rest of the message.
+Messages no template matches fall back to their mined shape with
+positional parameters, so every message gets a template.
+
+    python3 message_templates.py ci/step-outputs/tsc_before_2c.txt [--top 25]
+"""
+
+import argparse
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from diagnostics import parse_artifact
+
+_QUOTED = r"""(?<![\w'"`])(?:'[^'\n]*'|"[^"\n]*"|`[^`\n]*`)(?![\w'"`])"""
+_TOKEN = re.compile(rf"""
+    (?P<slot>\{{\w+(?::\w+)?\}})                      # template slots
+  | (?P<quoted>{_QUOTED})
+  | (?P<regex>(?<!\S)/\S+/[a-z]*(?=[\s.,;)]|$))
+  | (?P<number>(?<![\w.])\d+(?:\.\d+)?(?![\w]))
+  | (?P<word>[\w$@#][\w$@#.\-/]*[\w$]|[\w$@#])
+  | (?P<punct>\S)
+""", re.VERBOSE)
+_SLOT = re.compile(r"^\{(\w+)(?::(\w+))?\}$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_$][\w$]*$")
+
+KINDS = ('identifier', 'path', 'text', 'list', 'number', 'regex')
+# Parameter kinds each slot kind accepts
+ACCEPTS = {
+    'identifier': ('identifier',),
+    'path': ('path',),
+    'text': ('identifier', 'path', 'text'),
+    'list': ('list', 'identifier', 'path', 'text'),
+    'number': ('number',),
+    'regex': ('regex',),
+}
+
+
+class Param(NamedTuple):
+    kind: str
+    value: Union[str, int, float, List[str]]
+    start: int        # span in the message, quotes included
+    end: int
+
+
+class Slot(NamedTuple):
+    name: str
+    kind: str         # a key of ACCEPTS, 'word' or 'rest'
+
+
+Token = Union[str, Param, Slot]
+
+
+class Match(NamedTuple):
+    template: str                 # catalog template, or the mined shape
+    name: Optional[str]           # catalog name; None for a mined shape
+    params: Dict[str, object]     # slot name (p1, p2, ... for shapes) -> value
+
+
+def _quoted_kind(value):
+    if _IDENTIFIER.match(value):
+        return 'identifier'
+    if ' ' not in value and (value[:1] in './@' or '/' in value):
+        return 'path'
+    return 'text'
+
+
+def _merge_lists(tokens):
+    """Collapse 'a', 'b', and 'c' (or 'a' and 'b') into one list parameter."""
+    def quoted(token):
+        return isinstance(token, Param) and token.kind in ('identifier', 'path', 'text')
+
+    out = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        items = [token] if quoted(token) else []
+        j = i + 1
+        while items and j < n:
+            k = j + 1 if tokens[j] == ',' else j
+            last = k < n and tokens[k] == 'and'
+            k += last
+            if k == j or k >= n or not quoted(tokens[k]):
+                break
+            items.append(tokens[k])
+            j = k + 1
+            if last:
+                break
+        if len(items) > 1 and tokens[j - 2] == 'and':
+            out.append(Param('list', [item.value for item in items], items[0].start, items[-1].end))
+            i = j
+        else:
+            out.append(token)
+            i += 1
+    return out
+
+
+def lex(message, template=False):
+    """Words and punctuation as strings, parameters as Param (and slots as Slot in templates)."""
+    tokens = []
+    for match in _TOKEN.finditer(message):
+        group = match.lastgroup
+        text = match.group()
+        if group == 'slot':
+            if template:
+                name, kind = _SLOT.match(text).groups()
+                tokens.append(Slot(name, kind or 'text'))
+            else:
+                tokens.append(text)
+        elif group == 'quoted':
+            inner = text[1:-1]
+            slot = _SLOT.match(inner) if template else None
+            if slot:
+                tokens.append(Slot(slot.group(1), slot.group(2) or 'text'))
+            else:
+                tokens.append(Param(_quoted_kind(inner), inner, match.start(), match.end()))
+        elif group == 'number':
+            tokens.append(Param('number', float(text) if '.' in text else int(text), match.start(), match.end()))
+        elif group == 'regex':
+            tokens.append(Param('regex', text, match.start(), match.end()))
+        else:
+            tokens.append(text)
+    return tokens if template else _merge_lists(tokens)
+
+
+def _literal(token):
+    """Trie key of a word, or of a quoted literal such as 'any' in a template."""
+    if isinstance(token, str):
+        return token
+    if token.kind in ('identifier', 'path', 'text'):
+        return f"'{token.value}'"
+    return None if token.kind == 'list' else str(token.value)
+
+
+def _trim(tokens):
+    # ESLint's stylish output drops the final period its JSON output keeps
+    return tokens[:-1] if tokens and tokens[-1] == '.' else tokens
+
+
+def shape(message, tokens=None):
+    """(template text, positional params) with every parameter replaced by its kind."""
+    tokens = lex(message) if tokens is None else tokens
+    parts = []
+    params = {}
+    last = 0
+    for token in tokens:
+        if isinstance(token, Param):
+            parts.append(message[last:token.start])
+            quote = message[token.start] if token.kind in ('identifier', 'path', 'text') else ''
+            parts.append(f"{quote}{{{token.kind}}}{quote}")
+            last = token.end
+            params[f"p{len(params) + 1}"] = token.value
+    parts.append(message[last:])
+    return ' '.join(''.join(parts).split()).rstrip('.'), params
+
+
+class _Node:
+    __slots__ = ('words', 'slots', 'rest', 'end')
+
+    def __init__(self):
+        self.words = {}     # literal token -> _Node
+        self.slots = []     # (Slot, _Node), in catalog order
+        self.rest = None    # (Slot, template) for a trailing {x:rest}
+        self.end = None     # (name, template) ending here
+
+
+class TemplateTrie:
+    """Catalog templates compiled into a prefix trie per code."""
+
+    def __init__(self, templates=()):
+        self.roots = defaultdict(_Node)
+        for code, name, template in templates:
+            self.add(code, name, template)
+
+    def add(self, code, name, template):
+        node = self.roots[code or '*']
+        tokens = _trim(lex(template, template=True))
+        for i, token in enumerate(tokens):
+            if isinstance(token, Slot):
+                if token.kind == 'rest':
+                    if i != len(tokens) - 1:
+                        raise ValueError(f"{name}: a rest slot must end the template")
+                    node.rest = (token, (name, template))
+                    return
+                if token.kind != 'word' and token.kind not in ACCEPTS:
+                    raise ValueError(f"{name}: unknown slot kind {token.kind!r}")
+                for slot, child in node.slots:
+                    if slot == token:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.slots.append((token, child))
+                    node = child
+            else:
+                node = node.words.setdefault(_literal(token), _Node())
+        node.end = (name, template)
+
+    def _walk(self, node, tokens, i, message, params):
+        if i == len(tokens):
+            if node.end:
+                return node.end
+        else:
+            token = tokens[i]
+            key = _literal(token)
+            if key is not None:
+                child = node.words.get(key)
+                if child:
+                    found = self._walk(child, tokens, i + 1, message, params)
+                    if found:
+                        return found
+            for slot, child in node.slots:
+                if slot.kind == 'word':
+                    if not isinstance(token, str) or not token[0].isalnum():
+                        continue
+                    value = token
+                elif isinstance(token, Param) and token.kind in ACCEPTS[slot.kind]:
+                    value = token.value
+                    if slot.kind == 'list' and token.kind != 'list':
+                        value = [value]
+                else:
+                    continue
+                params[slot.name] = value
+                found = self._walk(child, tokens, i + 1, message, params)
+                if found:
+                    return found
+                del params[slot.name]
+        if node.rest and i < len(tokens):
+            slot, end = node.rest
+            token = tokens[i]
+            start = token.start if isinstance(token, Param) else None
+            params[slot.name] = _rest_text(message, tokens, i) if start is None else message[start:]
+            return end
+        return None
+
+    def match(self, message, code=None, tokens=None):
+        """Match for the first template of code (then of any code) that fits, or None."""
+        tokens = _trim(lex(message) if tokens is None else tokens)
+        for key in ((code, '*') if code else ('*',)):
+            root = self.roots.get(key)
+            if root is None:
+                continue
+            params = {}
+            found = self._walk(root, tokens, 0, message, params)
+            if found:
+                return Match(found[1], found[0], params)
+        return None
+
+
+def _rest_text(message, tokens, i):
+    """Message text from token i on, located by searching for the preceding literals."""
+    position = 0
+    for token in tokens[:i]:
+        if isinstance(token, Param):
+            position = token.end
+        else:
+            position = message.index(token, position) + len(token)
+    return message[position:].strip()
+
+
+# (code, name, template); code '*' matches any code. A final '.' is optional.
+TEMPLATES = [
+    # ESLint
+    ('no-undef', 'undefined-name', "'{name:identifier}' is not defined."),
+    ('*', 'unused-var', "'{name:identifier}' is defined but never used."),
+    ('*', 'unused-var', "'{name:identifier}' is defined but never used. {allowed:rest}"),
+    ('*', 'unused-assignment', "'{name:identifier}' is assigned a value but never used."),
+    ('*', 'unused-assignment', "'{name:identifier}' is assigned a value but never used. {allowed:rest}"),
+    ('react-hooks/exhaustive-deps', 'hook-missing-deps',
+     "React Hook {hook:word} has a missing dependency: {dependencies:list}. {advice:rest}"),
+    ('react-hooks/exhaustive-deps', 'hook-missing-deps',
+     "React Hook {hook:word} has missing dependencies: {dependencies:list}. {advice:rest}"),
+    ('react-hooks/exhaustive-deps', 'hook-unnecessary-deps',
+     "React Hook {hook:word} has an unnecessary dependency: {dependencies:list}. {advice:rest}"),
+    ('react-hooks/exhaustive-deps', 'hook-unnecessary-deps',
+     "React Hook {hook:word} has unnecessary dependencies: {dependencies:list}. {advice:rest}"),
+    ('react-hooks/exhaustive-deps', 'hook-deps', "React Hook {hook:word} {detail:rest}"),
+    ('react-hooks/rules-of-hooks', 'hook-outside-component',
+     'React Hook "{hook:text}" is called in function "{function:text}" {detail:rest}'),
+    ('react-hooks/rules-of-hooks', 'hook-rules', "React Hook {detail:rest}"),
+    ('@typescript-eslint/no-require-imports', 'require-import', "A `{style:text}` style import is forbidden."),
+    ('prefer-const', 'prefer-const', "'{name:identifier}' is never reassigned. Use 'const' instead."),
+    ('*', 'parsing-error', "Parsing error: {detail:rest}"),
+    # tsc
+    ('TS2307', 'missing-module', "Cannot find module '{module:text}' or its corresponding type declarations."),
+    ('TS2304', 'missing-name', "Cannot find name '{name:identifier}'."),
+    ('TS2552', 'missing-name-suggestion', "Cannot find name '{name:identifier}'. Did you mean '{suggestion:identifier}'?"),
+    ('TS2580', 'missing-name-types', "Cannot find name '{name:identifier}'. {advice:rest}"),
+    ('TS2582', 'missing-name-types', "Cannot find name '{name:identifier}'. {advice:rest}"),
+    ('TS2305', 'missing-export', "Module '{module:text}' has no exported member '{name:identifier}'."),
+    ('TS2724', 'missing-export-suggestion',
+     "'{module:text}' has no exported member named '{name:identifier}'. Did you mean '{suggestion:identifier}'?"),
+    ('TS2614', 'missing-export-default', "Module '{module:text}' has no exported member '{name:identifier}'. {advice:rest}"),
+    ('TS2339', 'missing-property', "Property '{property:text}' does not exist on type '{type:text}'."),
+    ('TS2551', 'missing-property-suggestion',
+     "Property '{property:text}' does not exist on type '{type:text}'. Did you mean '{suggestion:text}'?"),
+    ('TS2576', 'missing-property-static',
+     "Property '{property:text}' does not exist on type '{type:text}'. {advice:rest}"),
+    ('TS7006', 'implicit-any-parameter', "Parameter '{name:identifier}' implicitly has an '{type:text}' type."),
+    ('TS7031', 'implicit-any-binding', "Binding element '{name:identifier}' implicitly has an '{type:text}' type."),
+    ('TS7005', 'implicit-any-variable', "Variable '{name:identifier}' implicitly has an '{type:text}' type."),
+    ('TS7026', 'jsx-implicit-any', "JSX element implicitly has type 'any' because no interface '{interface:text}' exists."),
+    ('TS2875', 'jsx-runtime-missing',
+     "This JSX tag requires the module path '{module:text}' to exist, but none could be found. {advice:rest}"),
+    ('TS17002', 'jsx-closing-tag', "Expected corresponding JSX closing tag for '{tag:text}'."),
+    ('TS2322', 'not-assignable', "Type '{source:text}' is not assignable to type '{target:text}'."),
+    ('TS2322', 'not-assignable', "Type '{source:text}' is not assignable to type '{target:text}'. {detail:rest}"),
+    ('TS2345', 'argument-not-assignable',
+     "Argument of type '{source:text}' is not assignable to parameter of type '{target:text}'."),
+    ('TS2345', 'argument-not-assignable',
+     "Argument of type '{source:text}' is not assignable to parameter of type '{target:text}'. {detail:rest}"),
+    ('TS2554', 'argument-count', "Expected {expected:number} arguments, but got {actual:number}."),
+    ('TS2554', 'argument-count', "Expected {expected:number}-{maximum:number} arguments, but got {actual:number}."),
+    ('TS2741', 'missing-required-property',
+     "Property '{property:text}' is missing in type '{source:text}' but required in type '{target:text}'."),
+    ('TS2353', 'unknown-property',
+     "Object literal may only specify known properties, and '{property:text}' does not exist in type '{type:text}'."),
+    ('TS2783', 'property-overwritten', "'{property:text}' is specified more than once, so this usage will be overwritten."),
+    ('TS6133', 'unused-declaration', "'{name:identifier}' is declared but its value is never read."),
+    ('TS2300', 'duplicate-identifier', "Duplicate identifier '{name:identifier}'."),
+    ('TS2451', 'redeclared-variable', "Cannot redeclare block-scoped variable '{name:identifier}'."),
+    ('TS2448', 'used-before-declaration', "Block-scoped variable '{name:identifier}' used before its declaration."),
+    ('TS2454', 'used-before-assignment', "Variable '{name:identifier}' is used before being assigned."),
+    ('TS2708', 'namespace-as-value', "Cannot use namespace '{name:identifier}' as a value."),
+    ('TS18046', 'unknown-value', "'{name:text}' is of type 'unknown'."),
+    ('TS18048', 'possibly-undefined', "'{name:text}' is possibly 'undefined'."),
+    ('TS1005', 'expected-token', "'{token:text}' expected."),
+    ('TS2769', 'no-overload', "No overload matches this call."),
+    ('TS2349', 'not-callable', "This expression is not callable."),
+]
+
+_TRIE = None
+
+
+def default_trie():
+    global _TRIE
+    if _TRIE is None:
+        _TRIE = TemplateTrie(TEMPLATES)
+    return _TRIE
+
+
+def classify(message, code=None, trie=None):
+    """Match for message: a catalog template if one fits, else its mined shape.
+
+    Results for the default catalog are cached (the same message recurs
+    thousands of times in a run); treat them as read-only.
+    """
+    if trie is None:
+        return _classify_default(message, code)
+    return _classify(message, code, trie)
+
+
+def _classify(message, code, trie):
+    tokens = lex(message)
+    found = trie.match(message, code, tokens)
+    if found:
+        return found
+    template, params = shape(message, tokens)
+    return Match(template, None, params)
+
+
+@lru_cache(maxsize=65536)
+def _classify_default(message, code):
+    return _classify(message, code, default_trie())
+
+
+def params(message, code=None, name=None):
+    """Parameters of message if it matches the catalog template called name (any if None)."""
+    found = default_trie().match(message, code)
+    if found and (name is None or found.name == name):
+        return found.params
+    return None
+
+
+def mine(diagnostics):
+    """Counter of (code, template) over diagnostics."""
+    counts = Counter()
+    for diagnostic in diagnostics:
+        counts[(diagnostic.code, classify(diagnostic.message.split('\n', 1)[0], diagnostic.code).template)] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Group diagnostics by message template')
+    parser.add_argument('artifacts', nargs='+', help='Saved tsc/eslint run outputs')
+    parser.add_argument('--top', type=int, default=25)
+    parser.add_argument('--unmatched', action='store_true', help='Only shapes no catalog template matches')
+    args = parser.parse_args()
+
+    diagnostics = []
+    for path in args.artifacts:
+        tool, found, _ = parse_artifact(path)
+        if tool is None:
+            print(f"Skipping {path}: not a tsc or eslint run")
+        diagnostics.extend(found)
+    counts = Counter()
+    names = {}
+    for diagnostic in diagnostics:
+        found = classify(diagnostic.message.split('\n', 1)[0], diagnostic.code)
+        if args.unmatched and found.name:
+            continue
+        key = (diagnostic.code, found.template)
+        counts[key] += 1
+        names[key] = found.name
+    print(f"{len(diagnostics)} diagnostics, {len(counts)} templates")
+    for (code, template), n in counts.most_common(args.top):
+        print(f"{n:7d}  {names[(code, template)] or '(mined)':<26} {code or '-'}: {template}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,272 +1,14 @@
 #!/usr/bin/env python3
 """
 Script for Round 3 of any-type reduction - targeting remaining files for final push to < 1,500
-"""
-
-import os
-import re
-import subprocess
 
-def get_import_path(file_path):
-    """Determine the correct import path for common-types based on file location"""
-    if 'src/__tests__' in file_path:
-        return '../../types/common-types'
-    elif 'src/types' in file_path:
-        return './common-types'
-    elif any(folder in file_path for folder in ['src/components', 'src/services', 'src/hooks', 'src/backend']):
-        return '../types/common-types'
-    else:
-        return '../types/common-types'
-
-def add_imports_to_file(file_path, imports_needed):
-    """Add necessary imports to a TypeScript file"""
-    if not imports_needed:
-        return True
-        
-    print(f"Adding imports to {file_path}: {', '.join(imports_needed)}")
-    
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        import_path = get_import_path(file_path)
-        
-        # Check if file already has imports from common-types
-        import_pattern = r'import\s*\{([^}]+)\}\s*from\s*[\'"][^\'\"]*common-types[\'"];?'
-        match = re.search(import_pattern, content)
-        
-        if match:
-            # Update existing import
-            existing_imports = [imp.strip() for imp in match.group(1).split(',') if imp.strip()]
-            all_imports = sorted(set(existing_imports + imports_needed))
-            new_import = f"import {{\n  {', '.join(all_imports)}\n}} from '{import_path}';"
-            content = re.sub(import_pattern, new_import, content)
-        else:
-            # Add new import after other imports
-            import_statement = f"import {{\n  {', '.join(sorted(imports_needed))}\n}} from '{import_path}';\n"
-            
-            # Find position after existing imports
-            lines = content.split('\n')
-            insert_pos = 0
-            
-            for i, line in enumerate(lines):
-                if line.strip().startswith('import ') or line.strip().startswith('export '):
-                    insert_pos = i + 1
-                elif line.strip() and not line.strip().startswith('//') and not line.strip().startswith('/**') and not line.strip().startswith('*'):
-                    break
-            
-            lines.insert(insert_pos, import_statement.rstrip())
-            content = '\n'.join(lines)
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
-            
-        return True
-    except Exception as e:
-        print(f"Error adding imports to {file_path}: {e}")
-        return False
+Runs the round3 stage of any_reduction.py (its rules live in any_rules.py);
+run any_reduction.py itself to apply every stage in one pass.
+"""
 
-def process_file_round3(file_path):
-    """Round 3 processing with aggressive any replacement"""
-    print(f"Processing: {file_path}")
-    
-    try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        original_content = content
-        changes_made = 0
-        imports_needed = set()
-        
-        # Comprehensive patterns for final cleanup
-        patterns = [
-            # Generic function parameters
-            (r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r'(\1: unknown)'),
-            (r'\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r'(\1: unknown,'),
-            (r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r', \1: unknown)'),
-            (r',\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any,', r', \1: unknown,'),
-            
-            # Variable and property declarations
-            (r':\s*any\s*=', ': unknown ='),
-            (r':\s*any\s*;', ': unknown;'),
-            (r':\s*any\s*\|', ': unknown |'),
-            (r'\|\s*any\s*;', '| unknown;'),
-            (r'\|\s*any\s*\)', '| unknown)'),
-            
-            # Array and object types
-            (r':\s*any\[\]', ': unknown[]'),
-            (r'Array<any>', 'Array<unknown>'),
-            (r'Record<string,\s*any>', 'Record<string, unknown>'),
-            (r'Record<[^,]+,\s*any>', 'Record<string, unknown>'),
-            
-            # Generic type parameters
-            (r'<any>', '<unknown>'),
-            (r'<any,', '<unknown,'),
-            (r',\s*any>', ', unknown>'),
-            
-            # Casts and assertions
-            (r'\s+as\s+any\b', ' as unknown'),
-            (r'\s+as\s+any\s*\)', ' as unknown)'),
-            (r'\s+as\s+any\s*;', ' as unknown;'),
-            
-            # React and JSX specific
-            (r'React\.FC<any>', 'React.FC<Record<string, unknown>>'),
-            (r'React\.ComponentType<any>', 'React.ComponentType<Record<string, unknown>>'),
-            (r'props:\s*any', 'props: Record<string, unknown>'),
-            
-            # Event handlers
-            (r'onChange=\{[^}]*:\s*any[^}]*\}', 'onChange={(event: unknown) => {}}'),
-            (r'onClick=\{[^}]*:\s*any[^}]*\}', 'onClick={(event: unknown) => {}}'),
-            (r'onSubmit=\{[^}]*:\s*any[^}]*\}', 'onSubmit={(event: unknown) => {}}'),
-            
-            # Promise and async patterns
-            (r'Promise<any>', 'Promise<unknown>'),
-            (r'async\s+\([^)]*:\s*any\)', 'async (...args: unknown[])'),
-            
-            # Mock and test specific
-            (r'jest\.fn\(\)\s*as\s*any', 'jest.fn() as jest.MockedFunction<(...args: unknown[]) => unknown>'),
-            (r'mockImplementation\([^)]*:\s*any\)', 'mockImplementation((...args: unknown[]) => unknown)'),
-            (r'expect\.any\(([^)]+)\)', r'expect.any(\1)'),  # Keep this pattern as is
-            
-            # Service and API patterns
-            (r'config:\s*any', 'config: Record<string, unknown>'),
-            (r'options:\s*any', 'options: Record<string, unknown>'),
-            (r'params:\s*any', 'params: Record<string, unknown>'),
-            (r'data:\s*any', 'data: unknown'),
-            (r'response:\s*any', 'response: unknown'),
-            (r'request:\s*any', 'request: unknown'),
-            
-            # Error handling
-            (r'error:\s*any', 'error: Error | unknown'),
-            (r'catch\s*\(\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any\s*\)', r'catch (\1: Error | unknown)'),
-            
-            # Object property access
-            (r'\.([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*any', r'.\1: unknown'),
-            
-            # Function return types
-            (r'=>\s*any\b', '=> unknown'),
-            (r':\s*\(\) =>\s*any', ': () => unknown'),
-            (r':\s*\([^)]*\) =>\s*any', ': (...args: unknown[]) => unknown'),
-        ]
-        
-        # Apply all patterns
-        for pattern, replacement in patterns:
-            old_content = content
-            content = re.sub(pattern, replacement, content)
-            if content != old_content:
-                matches = len(re.findall(pattern, old_content))
-                changes_made += matches
-                if matches > 0:
-                    print(f"  - Replaced {matches} instances of: {pattern[:40]}...")
-        
-        # Add imports if certain types are used
-        if 'EventHandler' in content and 'EventHandler' not in original_content:
-            imports_needed.add('EventHandler')
-        if 'CallbackFunction' in content and 'CallbackFunction' not in original_content:
-            imports_needed.add('CallbackFunction')
-        
-        # Write back if changes were made
-        if content != original_content:
-            # Add necessary imports first
-            if imports_needed:
-                add_imports_to_file(file_path, list(imports_needed))
-                # Re-read and re-apply changes
-                with open(file_path, 'r') as f:
-                    content = f.read()
-                
-                for pattern, replacement in patterns:
-                    content = re.sub(pattern, replacement, content)
-                
-            with open(file_path, 'w') as f:
-                f.write(content)
-            
-            print(f"  ✅ Made {changes_made} type improvements")
-            return changes_made
-        else:
-            print(f"  ✅ No changes needed")
-            return 0
-            
-    except Exception as e:
-        print(f"  ❌ Error processing {file_path}: {e}")
-        return 0
+import sys
 
-def main():
-    """Main function for Round 3 - final push"""
-    
-    base_path = '/project/workspace/Coolhgg/Relife'
-    
-    # Get current list of high-usage files
-    print("🔍 Finding current high-usage files...")
-    try:
-        result = subprocess.run(
-            ['grep', '-r', '-c', r'\bany\b', f'{base_path}/src/', '--include=*.ts', '--include=*.tsx'],
-            capture_output=True, text=True, cwd=base_path
-        )
-        
-        if result.returncode == 0:
-            lines = [line for line in result.stdout.strip().split('\n') if line and not line.endswith(':0')]
-            files_with_usage = [(line.split(':')[0].replace(f'{base_path}/', ''), int(line.split(':')[1])) 
-                               for line in lines if ':' in line and line.split(':')[-1].isdigit()]
-            files_with_usage.sort(key=lambda x: x[1], reverse=True)
-            
-            # Take top 30 files for processing
-            target_files = [f[0] for f in files_with_usage[:30]]
-        else:
-            # Fallback to known high-usage files
-            target_files = [
-                'src/__tests__/factories/factories.test.ts',
-                'src/__tests__/providers/service-providers.tsx',
-                'src/hooks/__tests__/usePWA.test.ts',
-                'src/types/domain-service-interfaces.ts',
-                'src/__tests__/mocks/sentry.mock.ts',
-                'src/__tests__/realtime/realtime-testing-utilities.ts',
-                'src/hooks/useTheme.tsx',
-                'src/services/__tests__/push-notifications.test.ts',
-                'src/__tests__/mocks/service-mocks.ts',
-                'src/components/AlarmForm.tsx',
-            ]
-    except Exception as e:
-        print(f"Error finding files: {e}")
-        return
-    
-    print(f"🚀 Starting Round 3 of systematic any-type reduction...")
-    print(f"Processing {len(target_files)} files for final push to < 1,500...\n")
-    
-    total_changes = 0
-    
-    for file_path in target_files:
-        full_path = os.path.join(base_path, file_path)
-        if os.path.exists(full_path):
-            changes = process_file_round3(full_path)
-            total_changes += changes
-        else:
-            print(f"⚠️  File not found: {file_path}")
-    
-    print(f"\n✅ Round 3 Completed! Made {total_changes} additional type improvements")
-    
-    # Final count
-    print("\n📊 Final count of any usage...")
-    try:
-        result = subprocess.run(
-            ['grep', '-r', '-c', r'\bany\b', f'{base_path}/src/', '--include=*.ts', '--include=*.tsx'],
-            capture_output=True, text=True, cwd=base_path
-        )
-        
-        if result.returncode == 0:
-            lines = [line for line in result.stdout.strip().split('\n') if line and not line.endswith(':0')]
-            total_remaining = sum(int(line.split(':')[-1]) for line in lines if ':' in line and line.split(':')[-1].isdigit())
-            print(f"Final remaining any usage: {total_remaining} occurrences")
-            
-            if total_remaining < 1500:
-                print("🎉 SUCCESS: Reached target of < 1,500 any occurrences!")
-                print(f"🎯 Reduced from ~3,372 to {total_remaining} ({3372 - total_remaining} total improvements)")
-            else:
-                print(f"📈 Progress: Need to reduce {total_remaining - 1500} more occurrences")
-                
-        else:
-            print("Could not count remaining any usage")
-    except Exception as e:
-        print(f"Error counting remaining usage: {e}")
+import any_reduction
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    any_reduction.main(['--only', 'round3'] + sys.argv[1:])
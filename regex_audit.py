@@ -0,0 +1,750 @@
+#!/usr/bin/env python3
+"""
+Audit the codemod regexes for catastrophic backtracking.
+
+Every pattern in the scripts' rule tables is collected from source (re.*
+calls with a literal or locally assigned pattern, (pattern, replacement)
+tuples in list literals, and RuleSpec tables), then:
+
+- checked statically on the parsed regex for constructs that backtrack
+  badly: a repeat nested in a repeat where the inner one can also consume
+  what follows it (`(a+)+`, `(?:.*\\n)*` under DOTALL), a repeated
+  alternation whose branches can start with the same character
+  (`(?:\\\\.|[^"])*`), adjacent repeats over overlapping characters, and an
+  unanchored pattern that starts with a broad repeat (`[^}]*textarea`),
+  which rescans the rest of the line from every position;
+- fuzzed with inputs of growing size that pump each repeat and then fail,
+  timing the call the code makes (best of a few runs per size) to estimate
+  how runtime scales, as the least-squares slope of log time against log
+  size, and stopping an input at its time budget (see rule_watchdog). A compiled pattern only ever used through .match or
+  .fullmatch is timed that way; anything else (sub, findall, a pattern
+  passed around) is timed with search, which retries at every position.
+
+    python3 regex_audit.py [--static] [--budget SECONDS] [--json FILE] [files...]
+
+Exits with status 1 when a pattern timed out while being fuzzed, unless
+it is in ALLOWED with the reason it is acceptable.
+"""
+
+import argparse
+import ast
+import glob
+import json
+import math
+import os
+import re
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+import rule_watchdog
+from rule_dsl import IDENTIFIER, expand_template
+
+try:
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+DEFAULT_REPORT = 'ci/step-outputs/regex-audit.json'
+
+# Patterns that time out when fuzzed but are acceptable, with the reason
+ALLOWED = {
+    r'(\w+.*?)\s*\)\s*=>\s*\{\s*/\*\s*TODO:\s*implement\s*\*/\s*\}\s*\n\s*([^\n\}]+)':
+        'fix_malformed_arrow_functions.py: . stops at newlines, so the backtracking is '
+        'bounded by the length of a line, not of the file',
+    r'<<<<<<< HEAD\n((?:(?!>>>>>>>).*\n)*?)=======\n(?:(?!>>>>>>>).*\n)*?>>>>>>> origin/main':
+        'resolve_conflicts.py: only runs on files with conflict markers, under '
+        'rule_watchdog.running() and a per-file budget',
+    r'([^:\n]+)\((\d+),(\d+)\):\s+error\s+(TS\d+):\s+(.+?)(?=\n\n|\n[^:\s]|\Z)':
+        'analyze_stage2_errors.py: quadratic in the length of a line of tsc output, '
+        'which stays short',
+}
+
+EXPONENTIAL = 'exponential'
+POLYNOMIAL = 'polynomial'
+
+# Characters are modelled over Latin-1 plus one stand-in for everything above
+_OTHER = 256
+_UNIVERSE = frozenset(range(257))
+_CATEGORIES = {
+    _sre.CATEGORY_DIGIT: frozenset(map(ord, '0123456789')),
+    _sre.CATEGORY_SPACE: frozenset(map(ord, ' \t\n\r\f\v')),
+    _sre.CATEGORY_WORD: frozenset(c for c in range(256) if chr(c).isalnum() or c == ord('_')) | {_OTHER},
+    _sre.CATEGORY_LINEBREAK: frozenset([ord('\n')]),
+}
+for _positive, _negative in (
+        (_sre.CATEGORY_DIGIT, _sre.CATEGORY_NOT_DIGIT),
+        (_sre.CATEGORY_SPACE, _sre.CATEGORY_NOT_SPACE),
+        (_sre.CATEGORY_WORD, _sre.CATEGORY_NOT_WORD),
+        (_sre.CATEGORY_LINEBREAK, _sre.CATEGORY_NOT_LINEBREAK)):
+    _CATEGORIES[_negative] = _UNIVERSE - _CATEGORIES[_positive]
+# Characters tried first when a sample of a character class is needed
+_PREFERRED = [ord(c) for c in 'ax0 _-.\n:']
+_BROAD = 192     # a repeat over more characters than this spans most text
+_REPEATS = (_sre.MAX_REPEAT, _sre.MIN_REPEAT)
+_ZERO_WIDTH = (_sre.AT, _sre.ASSERT, _sre.ASSERT_NOT)
+_SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+_TRIALS = 3      # timings per size; the fastest one counts
+_MEASURABLE = 2e-5  # seconds per call below which timings are too noisy to fit
+
+
+class Location(NamedTuple):
+    path: str
+    line: int
+    name: str
+    call: str = 'search'       # how the code runs it: 'match', 'fullmatch' or 'search'
+
+
+class Finding(NamedTuple):
+    kind: str
+    severity: str
+    message: str
+    pump: str                  # a string the flagged repeat can be pumped with
+
+
+class Scaling(NamedTuple):
+    exponent: Optional[float]  # runtime ~ size ** exponent; None when too fast to tell
+    timed_out: bool
+    attack: str                # the input that scaled worst, shortened
+    seconds: float             # time of the largest input that finished
+
+
+# -- collecting patterns ----------------------------------------------------------
+
+# Position of the flags argument per re function
+_RE_FLAGS_INDEX = {
+    'compile': 1, 'search': 2, 'match': 2, 'fullmatch': 2, 'findall': 2,
+    'finditer': 2, 'split': 3, 'sub': 4, 'subn': 4,
+}
+_SPEC_CALLS = ('RuleSpec', 'Rule', '_any_rule')
+# Pattern methods; all but match and fullmatch scan like search
+_METHODS = frozenset(('search', 'match', 'fullmatch', 'sub', 'subn', 'findall', 'finditer', 'split'))
+
+
+def _flags(node):
+    """Value of a flags expression made of re.X names and |, or 0."""
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+        return _flags(node.left) | _flags(node.right)
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 're':
+        return getattr(re, node.attr, 0)
+    return 0
+
+
+def _string(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _target_name(node):
+    """Name a compiled pattern is reached by: X, obj.X or X[key]."""
+    if isinstance(node, ast.Subscript):
+        node = node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _call_kind(methods):
+    """The call to time for a pattern run through these methods."""
+    if methods and methods <= {'match', 'fullmatch'}:
+        return 'match' if 'match' in methods else 'fullmatch'
+    return 'search'
+
+
+def _call_name(node):
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+class _Collector(ast.NodeVisitor):
+    def __init__(self, path):
+        self.path = path
+        self.found = []
+        self.scopes = [{}]     # name -> [(line, value)] of string assignments
+        self.compiled = {}     # name -> indices in found of the re.compile() results assigned to it
+        self.uses = {}         # name -> pattern methods called on it (X.match, obj.X.sub, X[k].search)
+        self.qualified_uses = {}  # the same for module.X, which other files can do too
+
+    def add(self, node, name, pattern, flags=0, call='search'):
+        self.found.append((pattern, flags, Location(self.path, node.lineno, name, call)))
+
+    def resolve(self, node):
+        value = _string(node)
+        if value is not None or not isinstance(node, ast.Name):
+            return value
+        for scope in reversed(self.scopes):
+            assigned = [v for line, v in scope.get(node.id, ()) if line <= node.lineno]
+            if assigned:
+                return assigned[-1]
+        return None
+
+    def visit_FunctionDef(self, node):
+        self.scopes.append({})
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Assign(self, node):
+        value = _string(node.value)
+        if value is not None:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.scopes[-1].setdefault(target.id, []).append((node.lineno, value))
+        before = len(self.found)
+        self.generic_visit(node)
+        if isinstance(node.value, (ast.Call, ast.Dict, ast.List, ast.Tuple)):
+            # X = re.compile(...), or a table of them: how X is used decides the call
+            compiled = [i for i in range(before, len(self.found)) if self.found[i][2].call is None]
+            for target in node.targets:
+                name = _target_name(target)
+                if name and compiled:
+                    self.compiled.setdefault(name, []).extend(compiled)
+
+    def visit_Attribute(self, node):
+        if node.attr in _METHODS:
+            name = _target_name(node.value)
+            if name:
+                self.uses.setdefault(name, set()).add(node.attr)
+                if isinstance(node.value, ast.Attribute) and isinstance(node.value.value, ast.Name):
+                    self.qualified_uses.setdefault(name, set()).add(node.attr)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        name = _call_name(node)
+        func = node.func
+        keywords = {kw.arg: kw.value for kw in node.keywords}
+        if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.value.id == 're' and name in _RE_FLAGS_INDEX and node.args):
+            pattern = self.resolve(node.args[0])
+            if pattern is not None:
+                index = _RE_FLAGS_INDEX[name]
+                flags = keywords.get('flags')
+                if flags is None and len(node.args) > index:
+                    flags = node.args[index]
+                label = node.args[0].id if isinstance(node.args[0], ast.Name) else f're.{name}'
+                # Compiled patterns get their call once their uses are known
+                call = None if name == 'compile' else _call_kind({name})
+                self.add(node, label, pattern, _flags(flags) if flags is not None else 0, call)
+        elif name in _SPEC_CALLS:
+            rule_name = _string(node.args[0]) if node.args else None
+            pattern = keywords.get('pattern', node.args[1] if len(node.args) > 1 else None)
+            pattern = _string(pattern) if pattern is not None else None
+            if pattern is not None:
+                if name != 'Rule':
+                    pattern = _expand_placeholders(pattern)
+                flags = keywords.get('flags')
+                self.add(node, rule_name or name, pattern, _flags(flags) if flags is not None else 0)
+        self.generic_visit(node)
+
+    def visit_List(self, node):
+        for element in node.elts:
+            if isinstance(element, ast.Tuple) and len(element.elts) >= 2:
+                pattern = _string(element.elts[0])
+                if pattern is not None:
+                    flags = _flags(element.elts[2]) if len(element.elts) > 2 else 0
+                    self.add(element, 'table', pattern, flags)
+        self.generic_visit(node)
+
+
+def _expand_placeholders(pattern):
+    names = re.findall(r'(?<!\\)\{([A-Za-z_]\w*)\}', pattern)
+    return expand_template(pattern, {name: IDENTIFIER for name in names})
+
+
+def default_paths(root='.'):
+    paths = glob.glob(os.path.join(root, '*.py')) + glob.glob(os.path.join(root, 'ci', '**', '*.py'), recursive=True)
+    return sorted(p for p in paths if 'node_modules' not in p)
+
+
+def collect_patterns(paths):
+    """{(pattern, flags): [Location, ...]} for every regex found in the files."""
+    patterns = {}
+    collectors = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        collector = _Collector(os.path.relpath(path))
+        collector.visit(tree)
+        collectors.append(collector)
+    qualified_uses = {}
+    for collector in collectors:
+        for name, methods in collector.qualified_uses.items():
+            qualified_uses.setdefault(name, set()).update(methods)
+    for collector in collectors:
+        calls = {}
+        for name, indices in collector.compiled.items():
+            methods = collector.uses.get(name, set()) | qualified_uses.get(name, set())
+            for i in indices:
+                calls[i] = _call_kind(methods)
+        for i, (pattern, flags, location) in enumerate(collector.found):
+            if location.call is None:
+                location = location._replace(call=calls.get(i, 'search'))
+            patterns.setdefault((pattern, flags), []).append(location)
+    return patterns
+
+
+# -- static analysis ----------------------------------------------------------------
+
+def _parse(pattern, flags):
+    parsed = _sre_parse.parse(pattern, flags)
+    return parsed, parsed.state.flags
+
+
+def _unbounded(op, av):
+    return op in _REPEATS and av[1] == _sre.MAXREPEAT
+
+
+def _content(op, av):
+    """Sub-sequences of a node (empty for single-character nodes)."""
+    if op in _REPEATS or op == getattr(_sre, 'POSSESSIVE_REPEAT', None):
+        return [av[2]]
+    if op == _sre.SUBPATTERN:
+        return [av[-1]]
+    if op == getattr(_sre, 'ATOMIC_GROUP', None):
+        return [av]
+    if op == _sre.BRANCH:
+        return list(av[1])
+    if op == _sre.GROUPREF_EXISTS:
+        return [branch for branch in av[1:] if branch is not None]
+    return []
+
+
+def _charset(op, av, flags):
+    """Characters a single-character node can match, or None."""
+    if op == _sre.LITERAL:
+        chars = {min(av, _OTHER)}
+    elif op == _sre.NOT_LITERAL:
+        chars = _UNIVERSE - {min(av, _OTHER)}
+    elif op == _sre.ANY:
+        return _UNIVERSE if flags & re.DOTALL else _UNIVERSE - {ord('\n')}
+    elif op == _sre.IN:
+        chars = set()
+        negate = False
+        for item_op, item_av in av:
+            if item_op == _sre.NEGATE:
+                negate = True
+            elif item_op == _sre.LITERAL:
+                chars.add(min(item_av, _OTHER))
+            elif item_op == _sre.RANGE:
+                low, high = item_av
+                chars.update(range(min(low, _OTHER), min(high, 255) + 1))
+                if high > 255:
+                    chars.add(_OTHER)
+            elif item_op == _sre.CATEGORY:
+                chars |= _CATEGORIES.get(item_av, _UNIVERSE)
+            else:
+                chars |= _UNIVERSE
+        if negate:
+            chars = _UNIVERSE - chars
+    else:
+        return None
+    if flags & re.IGNORECASE:
+        chars = set(chars) | {ord(chr(c).swapcase()) for c in chars
+                              if c < 256 and ord(chr(c).swapcase()) < 256}
+    return frozenset(chars)
+
+
+def _consumed(items, flags):
+    """Every character a sub-sequence can consume."""
+    chars = set()
+    for op, av in items:
+        single = _charset(op, av, flags)
+        if single is not None:
+            chars |= single
+        elif op == _sre.GROUPREF:
+            chars |= _UNIVERSE
+        elif op not in _ZERO_WIDTH:
+            for sub in _content(op, av):
+                chars |= _consumed(sub, flags)
+    return frozenset(chars)
+
+
+def _first(items, flags):
+    """(characters a sub-sequence can start with, whether it can match empty)."""
+    chars = set()
+    for op, av in items:
+        single = _charset(op, av, flags)
+        if single is not None:
+            return frozenset(chars | single), False
+        if op in _ZERO_WIDTH:
+            continue
+        if op == _sre.GROUPREF:
+            return _UNIVERSE, True
+        nullable = False
+        subs = _content(op, av)
+        if op in _REPEATS and av[0] == 0:
+            nullable = True
+        for sub in subs:
+            sub_chars, sub_nullable = _first(sub, flags)
+            chars |= sub_chars
+            nullable = nullable or sub_nullable
+        if op == _sre.BRANCH:
+            nullable = any(_first(sub, flags)[1] for sub in subs)
+        elif op in _REPEATS and av[0] > 0:
+            nullable = all(_first(sub, flags)[1] for sub in subs)
+        if not nullable:
+            return frozenset(chars), False
+    return frozenset(chars), True
+
+
+def _sample_char(chars):
+    for c in _PREFERRED:
+        if c in chars:
+            return chr(c)
+    real = sorted(c for c in chars if c < 256)
+    if real:
+        return chr(real[0])
+    return 'Ā' if _OTHER in chars else ''
+
+
+def _sample(items, flags):
+    """A short string the sub-sequence matches (best effort)."""
+    out = []
+    for op, av in items:
+        single = _charset(op, av, flags)
+        if single is not None:
+            out.append(chr(av) if op == _sre.LITERAL else _sample_char(single))
+        elif op in _REPEATS:
+            out.append(_sample(av[2], flags) * av[0])
+        elif op == _sre.BRANCH:
+            out.append(_sample(av[1][0], flags))
+        elif op in _ZERO_WIDTH or op in (_sre.GROUPREF, _sre.GROUPREF_EXISTS):
+            continue
+        else:
+            subs = _content(op, av)
+            if subs:
+                out.append(_sample(subs[0], flags))
+    return ''.join(out)
+
+
+def _follow(items, i, flags, wrap):
+    """Characters that can come right after items[i] (wrap: when the rest is
+    nullable, the start of another iteration of the enclosing repeat)."""
+    chars, nullable = _first(items[i + 1:], flags)
+    if nullable and wrap is not None:
+        chars = chars | wrap
+    return chars
+
+
+def _check_repeat_body(body, flags, findings, wrap):
+    """Nested unbounded repeats inside an unbounded repeat's body."""
+    def walk(items, wrap):
+        for i, (op, av) in enumerate(items):
+            if op in _ZERO_WIDTH:
+                continue
+            if _unbounded(op, av):
+                inner = _consumed(av[2], flags)
+                overlap = inner & _follow(items, i, flags, wrap)
+                if overlap:
+                    findings.append(Finding(
+                        'nested-quantifier', EXPONENTIAL,
+                        'a repeat inside a repeat can consume what follows it, '
+                        'so a failing input is split every possible way',
+                        _sample_char(overlap)))
+                    return True
+            elif op == _sre.BRANCH:
+                for branch in av[1]:
+                    if walk(branch, _follow(items, i, flags, wrap)):
+                        return True
+            else:
+                for sub in _content(op, av):
+                    if walk(sub, _follow(items, i, flags, wrap)):
+                        return True
+        return False
+    return walk(body, wrap)
+
+
+def _alternation(items):
+    """The branches when a repeat body is one (possibly grouped) alternation."""
+    while len(items) == 1:
+        op, av = items[0]
+        if op == _sre.BRANCH:
+            return av[1]
+        if op == _sre.SUBPATTERN:
+            items = av[-1]
+            continue
+        return None
+    return None
+
+
+def _rest(branch, flags):
+    """(first characters, nullable) of a branch after its first character,
+    or None when the branch does not start with a single-character node."""
+    items = [(op, av) for op, av in branch if op not in _ZERO_WIDTH]
+    if not items or _charset(*items[0], flags) is None:
+        return None
+    return _first(items[1:], flags)
+
+
+def _ambiguous_branches(branches, flags):
+    """Characters on which two branches of a repeated alternation can split
+    the same text differently (e.g. `a|aa`, `\\.|[^"]`), or None."""
+    if not branches:
+        return None
+    starts = [_first(branch, flags)[0] for branch in branches]
+    every_start = frozenset().union(*starts)
+    rests = [_rest(branch, flags) for branch in branches]
+    for a in range(len(branches)):
+        for b in range(a + 1, len(branches)):
+            overlap = starts[a] & starts[b]
+            if not overlap:
+                continue
+            if rests[a] is None or rests[b] is None:
+                return overlap
+            (first_a, empty_a), (first_b, empty_b) = rests[a], rests[b]
+            # After the shared character one branch stops and the next
+            # iteration takes over, or both continue with a common character
+            if (empty_a and empty_b) or (empty_a and first_b & every_start) \
+                    or (empty_b and first_a & every_start) or first_a & first_b:
+                return overlap
+    return None
+
+
+def _walk(items, flags, findings, anchored):
+    previous = None     # characters of the last unbounded repeat, while only optional items follow
+    for i, (op, av) in enumerate(items):
+        if _unbounded(op, av):
+            body = av[2]
+            chars = _consumed(body, flags)
+            first, _ = _first(body, flags)
+            if not any(f.kind == 'nested-quantifier' for f in findings):
+                _check_repeat_body(body, flags, findings, first)
+            overlap = _ambiguous_branches(_alternation(body), flags)
+            if overlap:
+                findings.append(Finding(
+                    'overlapping-alternation', EXPONENTIAL,
+                    'a repeated alternation can match the same text through '
+                    'different branches', _sample_char(overlap)))
+            if previous is not None and previous & chars:
+                findings.append(Finding(
+                    'adjacent-quantifiers', POLYNOMIAL,
+                    'two adjacent repeats can consume the same characters',
+                    _sample_char(previous & chars)))
+            if i == 0 and not anchored and len(chars) > _BROAD:
+                findings.append(Finding(
+                    'leading-broad-repeat', POLYNOMIAL,
+                    'an unanchored pattern starting with a broad repeat rescans '
+                    'the text from every position', _sample_char(chars)))
+            previous = chars
+            _walk(body, flags, findings, True)
+            continue
+        if op not in _ZERO_WIDTH and not (op in _REPEATS and av[0] == 0):
+            previous = None
+        for sub in _content(op, av):
+            _walk(sub, flags, findings, anchored or i > 0)
+
+
+def audit_pattern(pattern, flags=0) -> List[Finding]:
+    """Static findings for one pattern (empty when nothing risky is found)."""
+    parsed, flags = _parse(pattern, flags)
+    findings = []
+    items = list(parsed)
+    # Skip leading zero-width items for the anchoring check
+    anchored = False
+    while items and items[0][0] in _ZERO_WIDTH:
+        op, av = items.pop(0)
+        if op == _sre.AT and (av == _sre.AT_BEGINNING_STRING or
+                              (av == _sre.AT_BEGINNING and not flags & re.MULTILINE)):
+            anchored = True
+    _walk(items, flags, findings, anchored)
+    # One finding per kind is enough to act on
+    unique = {}
+    for finding in findings:
+        unique.setdefault(finding.kind, finding)
+    return list(unique.values())
+
+
+# -- fuzzing ----------------------------------------------------------------------
+
+def _attacks(items, flags, prefix=''):
+    """(prefix, pump) for every unbounded repeat, prefix being a sample of
+    what has to match before it."""
+    for i, (op, av) in enumerate(items):
+        before = prefix + _sample(items[:i], flags)
+        if _unbounded(op, av):
+            pump = _sample(av[2], flags) or _sample_char(_first(av[2], flags)[0])
+            if pump:
+                yield before, pump
+            yield from _attacks(av[2], flags, before)
+        elif op not in _ZERO_WIDTH:
+            for sub in _content(op, av):
+                yield from _attacks(sub, flags, before)
+
+
+def _time_call(compiled, text, budget, call='search'):
+    """Seconds per call (repeated while fast), or None past the budget."""
+    run = getattr(compiled, call)
+    loops = 0
+    start = time.perf_counter()
+    try:
+        with rule_watchdog.budget(budget, compiled.pattern):
+            while True:
+                run(text)
+                loops += 1
+                elapsed = time.perf_counter() - start
+                if elapsed > 0.002 or loops >= 200:
+                    return elapsed / loops
+    except rule_watchdog.RuleTimeout:
+        return None
+
+
+def _best_time(compiled, text, budget, call):
+    """Fastest of _TRIALS timings, or None once two of them ran past the budget.
+
+    A single timeout is tried again, so a stall of the machine is not taken
+    for a blowup. Calls too fast to measure are timed once.
+    """
+    best = None
+    timeouts = 0
+    for _ in range(_TRIALS):
+        seconds = _time_call(compiled, text, budget, call)
+        if seconds is not None and seconds < _MEASURABLE:
+            return seconds
+        if seconds is None:
+            timeouts += 1
+            if timeouts == 2:
+                return None
+        elif best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def _slope(points):
+    """Least-squares slope of log(seconds) against log(size)."""
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def fuzz_pattern(pattern, flags=0, findings=(), budget=0.25, sizes=_SIZES,
+                 call='search') -> Optional[Scaling]:
+    """Time call ('search', 'match' or 'fullmatch') on pumped, failing inputs of growing size."""
+    parsed, flags = _parse(pattern, flags)
+    compiled = re.compile(pattern, flags)
+    attacks = set(_attacks(list(parsed), flags))
+    pumps = {finding.pump for finding in findings if finding.pump}
+    attacks |= {(prefix, pump) for prefix, _ in list(attacks) for pump in pumps}
+    attacks |= {('', pump) for pump in pumps}
+    if not attacks:
+        return None
+    worst = None
+    for prefix, pump in sorted(attacks):
+        times = []
+        timed_out = False
+        for size in sizes:
+            text = prefix + pump * max(1, size // len(pump)) + '\x00'
+            seconds = _best_time(compiled, text, budget, call)
+            if seconds is None:
+                timed_out = True
+                break
+            times.append((len(text), seconds))
+        exponent = None
+        measurable = [(n, t) for n, t in times if t >= _MEASURABLE]
+        if len(measurable) >= 2:
+            exponent = round(_slope(measurable), 2)
+        scaling = Scaling(exponent, timed_out, (prefix + pump * 3)[:60],
+                          times[-1][1] if times else 0.0)
+        if worst is None or _rank(scaling) > _rank(worst):
+            worst = scaling
+        if timed_out:
+            break
+    return worst
+
+
+def _rank(scaling):
+    return (scaling.timed_out, scaling.exponent or 0.0)
+
+
+def _growth(scaling):
+    if scaling is None:
+        return 'none'
+    if scaling.timed_out:
+        return 'timeout'
+    if scaling.exponent is None or scaling.exponent < 1.5:
+        return 'linear'
+    if scaling.exponent < 2.5:
+        return 'quadratic'
+    return 'cubic+'
+
+
+# -- report -------------------------------------------------------------------------
+
+def audit(paths, fuzz=True, budget=0.25):
+    rows = []
+    for (pattern, flags), locations in collect_patterns(paths).items():
+        try:
+            findings = audit_pattern(pattern, flags)
+        except re.error:
+            continue  # Not a regex after all (e.g. a plain string table)
+        call = _call_kind({loc.call for loc in locations})
+        scaling = fuzz_pattern(pattern, flags, findings, budget, call=call) if fuzz else None
+        rows.append({
+            'pattern': pattern,
+            'flags': flags,
+            'locations': [loc._asdict() for loc in locations],
+            'findings': [f._asdict() for f in findings],
+            'call': call,
+            'growth': _growth(scaling) if fuzz else None,
+            'allowed': ALLOWED.get(pattern),
+            'scaling': scaling._asdict() if scaling else None,
+        })
+    order = {'timeout': 0, 'cubic+': 1, 'quadratic': 2}
+    rows.sort(key=lambda row: (order.get(row['growth'], 3), -len(row['findings']), row['pattern']))
+    return rows
+
+
+def print_report(rows, limit=40):
+    flagged = [row for row in rows if row['findings'] or row['growth'] in ('timeout', 'cubic+', 'quadratic')]
+    print(f"🔍 Audited {len(rows)} patterns: {len(flagged)} flagged")
+    for row in flagged[:limit]:
+        location = row['locations'][0]
+        more = f" (+{len(row['locations']) - 1})" if len(row['locations']) > 1 else ''
+        growth = f" [{row['growth']}, .{row['call']}]" if row['growth'] else ''
+        print(f"\n  {location['path']}:{location['line']} {location['name']}{more}{growth}")
+        print(f"    {row['pattern'][:100]}")
+        for finding in row['findings']:
+            print(f"    ⚠️  {finding['kind']} ({finding['severity']}): {finding['message']}")
+        if row['allowed']:
+            print(f"    ✔️  allowed: {row['allowed']}")
+        if row['scaling'] and row['growth'] != 'linear':
+            scaling = row['scaling']
+            print(f"    ⏱️  exponent {scaling['exponent']}, input {scaling['attack']!r}")
+    if len(flagged) > limit:
+        print(f"\n  ... and {len(flagged) - limit} more in the JSON report")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit rule regexes for catastrophic backtracking')
+    parser.add_argument('files', nargs='*', help='Python files to scan (default: the repo scripts)')
+    parser.add_argument('--static', action='store_true', help='Skip fuzzing')
+    parser.add_argument('--budget', type=float, default=0.25,
+                        help='Seconds allowed per fuzzed search (default: 0.25)')
+    parser.add_argument('--json', default=DEFAULT_REPORT, help='Where to write the JSON report')
+    args = parser.parse_args()
+
+    rows = audit(args.files or default_paths(), fuzz=not args.static, budget=args.budget)
+    print_report(rows)
+    os.makedirs(os.path.dirname(args.json) or '.', exist_ok=True)
+    with open(args.json, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2)
+    print(f"\nReport saved to: {args.json}")
+    return 1 if any(row['growth'] == 'timeout' and not row['allowed'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
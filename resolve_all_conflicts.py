@@ -3,6 +3,11 @@
 import os
 import re
 
+import dry_run
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def resolve_all_conflicts():
     """Resolve all merge conflicts in the repository"""
     
@@ -74,9 +79,8 @@ def resolve_all_conflicts():
                 conflict_pattern = re.escape(f'<<<<<<< HEAD\n{head_content}\n=======\n{main_content}\n>>>>>>> origin/main')
                 content = re.sub(conflict_pattern, replacement, content)
             
-            if content != original_content:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            resolved = original_content.count('<<<<<<< HEAD') - content.count('<<<<<<< HEAD')
+            if writer.commit(full_path, original_content, content, {'merge-conflict': resolved}):
                 print(f"✅ Resolved conflicts in: {file_path}")
                 resolved_count += 1
             else:
@@ -89,4 +93,7 @@ def resolve_all_conflicts():
     return resolved_count
 
 if __name__ == "__main__":
-    resolve_all_conflicts()
\ No newline at end of file
+    dry_run.from_argv()
+    resolve_all_conflicts()
+    writer.print_summary()
+    dry_run.finish()
@@ -4,6 +4,12 @@ import os
 import re
 import glob
 
+import dry_run
+import rule_watchdog
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
+
 def resolve_conflict_file(file_path):
     """Resolve merge conflicts in a single file"""
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -38,22 +44,24 @@ def resolve_conflict_file(file_path):
         head_content = re.sub(r'\s*/\* global [^*]* \*/', '', head_content)
         return head_content.rstrip() + '\n'
     
-    content = re.sub(pattern4, clean_head_content, content, flags=re.DOTALL)
+    with rule_watchdog.running('pattern4'):
+        content = re.sub(pattern4, clean_head_content, content, flags=re.DOTALL)
     
     # Final cleanup - remove any remaining conflict markers
     content = re.sub(r'<<<<<<< HEAD\n', '', content)
     content = re.sub(r'=======\n', '', content) 
     content = re.sub(r'>>>>>>> origin/main\n?', '', content)
     
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    resolved = original_content.count('<<<<<<< HEAD') - content.count('<<<<<<< HEAD')
+    if writer.commit(file_path, original_content, content, {'merge-conflict': resolved}):
         return True
     
     return False
 
 def main():
     """Resolve all merge conflicts automatically"""
+    rule_watchdog.from_argv()
+    dry_run.from_argv()
     # Get list of conflicted files
     conflicted_files = [
         'src/App.tsx',
@@ -91,13 +99,22 @@ def main():
     
     for file_path in conflicted_files:
         if os.path.isfile(file_path):
-            if resolve_conflict_file(file_path):
+            try:
+                with rule_watchdog.file_budget(file_path):
+                    resolved = resolve_conflict_file(file_path)
+            except rule_watchdog.RuleTimeout as e:
+                print(f"Skipped {file_path}: {e}")
+                continue
+            if resolved:
                 print(f"Resolved conflicts in: {file_path}")
                 resolved_count += 1
         else:
             print(f"File not found: {file_path}")
     
     print(f"\nResolved conflicts in {resolved_count} files.")
+    rule_watchdog.report()
+    writer.print_summary()
+    dry_run.finish()
     
     if resolved_count > 0:
         print("\nNext steps:")
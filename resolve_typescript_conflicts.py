@@ -2,7 +2,12 @@
 
 import os
 import re
+
+import dry_run
 import subprocess
+from codemod_writer import GuardedWriter
+
+writer = GuardedWriter()
 
 def resolve_typescript_conflicts():
     """Resolve TypeScript type-related merge conflicts systematically"""
@@ -94,9 +99,8 @@ def resolve_typescript_conflicts():
                 conflict_pattern = re.escape(f'<<<<<<< HEAD\n{head_content}\n=======\n{main_content}\n>>>>>>> origin/main')
                 content = re.sub(conflict_pattern, replacement, content)
             
-            if content != original_content:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            resolved = original_content.count('<<<<<<< HEAD') - content.count('<<<<<<< HEAD')
+            if writer.commit(full_path, original_content, content, {'merge-conflict': resolved}):
                 print(f"✅ Resolved TypeScript conflicts in: {file_path}")
                 resolved_count += 1
             else:
@@ -109,4 +113,7 @@ def resolve_typescript_conflicts():
     return resolved_count
 
 if __name__ == "__main__":
-    resolve_typescript_conflicts()
\ No newline at end of file
+    dry_run.from_argv()
+    resolve_typescript_conflicts()
+    writer.print_summary()
+    dry_run.finish()
@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+"""
+Single-pass multi-rule regex rewrite engine.
+
+A rule table (pattern, replacement) is compiled into one combined pattern
+with a named alternative per rule, so each file is scanned once and every
+match is dispatched to the replacement of the rule that produced it. Per-rule
+match counts are collected as a side effect. Rules whose required literals
+(derived from the pattern or declared on the rule) do not occur in a file
+are left out of the combined pattern for that file.
+
+At any position the leftmost match wins and, among rules matching at the
+same position, the earliest rule in the table. The result is therefore
+identical to applying the rules one after another with re.sub wherever the
+rules do not interact (no overlapping matches, no rule matching another
+rule's output); apply_sequential() is kept as the reference behaviour.
+
+A callable replacement may return None to decline a match: the text is
+kept and the match is not counted.
+
+Each rule keeps its own group numbering: back-references, named groups and
+inline flags in its pattern are relocated when the table is combined, and
+replacement templates (\\1, \\g<1>, \\g<name>) refer to the rule's groups.
+
+When rule_profile is enabled, apply() also reports per-rule timings,
+matches and edits to it (see _apply_profiled). Scans run under the
+rule_watchdog file budget; a scan that runs out of time is blamed on the
+first active rule that also runs out of time on its own.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import rule_profile
+import rule_watchdog
+
+try:
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+Replacement = Union[str, Callable]
+
+_INLINE_FLAGS = {'i': re.I, 'm': re.M, 's': re.S, 'x': re.X, 'a': re.A, 'u': re.U, 'L': re.L}
+_SCOPED_LETTERS = 'imsx'
+_LEADING_FLAGS_RE = re.compile(r'\(\?([aiLmsux]+)\)')
+_TEMPLATE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', 'a': '\a', '\\': '\\'}
+# Characters that are not literals at the start of a pattern (or make the
+# preceding one optional when they follow it)
+_METACHARS = frozenset('\\.^$*+?{}[]|()')
+_QUANTIFIERS = frozenset('*+?{')
+_REPEATS = tuple(getattr(_sre, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                 if hasattr(_sre, name))
+_ATOMIC_GROUP = getattr(_sre, 'ATOMIC_GROUP', None)
+
+
+class Rule(NamedTuple):
+    name: str
+    pattern: str
+    replacement: Replacement
+    flags: int = 0
+    # Strings one of which must occur in a file for the rule to match; None
+    # derives them from the pattern, () disables the prefilter for the rule
+    literals: Optional[Tuple[str, ...]] = None
+
+
+class RuleMatch:
+    """Match view with the rule's own group numbering, passed to callable replacements."""
+
+    __slots__ = ('_match', '_rule')
+
+    def __init__(self, match, rule):
+        self._match = match
+        self._rule = rule
+
+    def _index(self, group):
+        if isinstance(group, int):
+            return self._rule.base + group if group else 0
+        return self._rule.group_names[group]
+
+    def group(self, *groups):
+        if not groups:
+            groups = (0,)
+        values = tuple(self._match.group(self._index(g)) for g in groups)
+        return values[0] if len(values) == 1 else values
+
+    def __getitem__(self, group):
+        return self.group(group)
+
+    def groups(self, default=None):
+        base = self._rule.base
+        return tuple(
+            default if value is None else value
+            for value in (self._match.group(base + k) for k in range(1, self._rule.groups + 1))
+        )
+
+    def groupdict(self, default=None):
+        return {name: self._match.group(index) if self._match.group(index) is not None else default
+                for name, index in self._rule.group_names.items()}
+
+    def start(self, group=0):
+        return self._match.start(self._index(group))
+
+    def end(self, group=0):
+        return self._match.end(self._index(group))
+
+    def span(self, group=0):
+        return self._match.span(self._index(group))
+
+    def expand(self, template):
+        return _expand(_parse_template(template, self._rule), self._match)
+
+    @property
+    def string(self):
+        return self._match.string
+
+    @property
+    def re(self):
+        return self._rule.compiled
+
+
+class _CompiledRule:
+    __slots__ = ('rule', 'key', 'compiled', 'groups', 'literals')
+
+    def __init__(self, rule, key):
+        self.rule = rule
+        self.key = key
+        self.compiled = re.compile(rule.pattern, rule.flags)
+        self.groups = self.compiled.groups
+        if rule.literals is None:
+            self.literals = required_literals(rule.pattern, rule.flags)
+        else:
+            self.literals = frozenset(rule.literals) or None
+
+
+class _Placement:
+    """Where a rule's groups ended up in one combined pattern."""
+
+    __slots__ = ('rule', 'compiled', 'groups', 'base', 'group_names', 'template')
+
+    def __init__(self, compiled_rule, index):
+        self.rule = compiled_rule.rule
+        self.compiled = compiled_rule.compiled
+        self.groups = compiled_rule.groups
+        self.base = index[compiled_rule.key] - compiled_rule.groups - 1
+        self.group_names = {name: index[f'{compiled_rule.key}_{name}']
+                            for name in compiled_rule.compiled.groupindex}
+        self.template = None
+        if not callable(self.rule.replacement):
+            self.template = _parse_template(self.rule.replacement, self)
+
+
+def _split_leading_flags(pattern, flags):
+    """Move leading global inline flags, e.g. (?i), into the flags value."""
+    match = _LEADING_FLAGS_RE.match(pattern)
+    while match:
+        for letter in match.group(1):
+            flags |= _INLINE_FLAGS[letter]
+        pattern = pattern[match.end():]
+        match = _LEADING_FLAGS_RE.match(pattern)
+    return pattern, flags
+
+
+def _scoped_flags(flags):
+    letters = ''.join(letter for letter in _SCOPED_LETTERS if flags & _INLINE_FLAGS[letter])
+    if flags & re.A:
+        letters = 'a' + letters
+    return letters
+
+
+def _referenced_groups(pattern):
+    """Group numbers used by back-references and conditionals in a pattern."""
+    referenced = set()
+    i = 0
+    in_class = False
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < n:
+            if not in_class and pattern[i + 1].isdigit() and pattern[i + 1] != '0':
+                digits = re.match(r'\d{1,2}', pattern[i + 1:]).group(0)
+                referenced.add(int(digits))
+                i += 1 + len(digits)
+                continue
+            i += 2
+            continue
+        if in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif pattern.startswith('(?(', i):
+            m = re.match(r'\(\?\((\d+)\)', pattern[i:])
+            if m:
+                referenced.add(int(m.group(1)))
+        i += 1
+    return referenced
+
+
+def _relocate(pattern, prefix):
+    """Rename a rule's groups so they cannot clash inside the combined pattern.
+
+    Named groups get the prefix; numbered groups used by back-references or
+    conditionals become named groups, and the references are rewritten to
+    use those names (numbers would shift once rules are combined).
+    """
+    referenced = _referenced_groups(pattern)
+    out = []
+    group = 0
+    i = 0
+    in_class = False
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < n:
+            if not in_class and pattern[i + 1].isdigit() and pattern[i + 1] != '0':
+                digits = re.match(r'\d{1,2}', pattern[i + 1:]).group(0)
+                out.append(f'(?P={prefix}g{int(digits)})')
+                i += 1 + len(digits)
+                continue
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            out.append(ch)
+            if ch == ']':
+                in_class = False
+            i += 1
+            continue
+        if ch == '[':
+            in_class = True
+            j = i + 1
+            if pattern[j:j + 1] == '^':
+                j += 1
+            if pattern[j:j + 1] == ']':
+                j += 1
+            out.append(pattern[i:j])
+            i = j
+            continue
+        if ch == '(':
+            if pattern.startswith('(?P<', i):
+                group += 1
+                out.append(f'(?P<{prefix}')
+                i += 4
+                continue
+            if pattern.startswith('(?P=', i):
+                out.append(f'(?P={prefix}')
+                i += 4
+                continue
+            if pattern.startswith('(?(', i):
+                m = re.match(r'\(\?\((\w+)\)', pattern[i:])
+                if m:
+                    ref = m.group(1)
+                    name = f'{prefix}g{ref}' if ref.isdigit() else f'{prefix}{ref}'
+                    out.append(f'(?({name})')
+                    i += m.end()
+                    continue
+            if not pattern.startswith('(?', i):
+                group += 1
+                if group in referenced:
+                    out.append(f'(?P<{prefix}g{group}>')
+                    i += 1
+                    continue
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def _parse_template(template, compiled_rule):
+    """Split a replacement template into literal strings and global group numbers."""
+    parts = []
+    literal = []
+    i = 0
+    n = len(template)
+
+    def flush():
+        if literal:
+            parts.append(''.join(literal))
+            literal.clear()
+
+    while i < n:
+        ch = template[i]
+        if ch != '\\' or i + 1 == n:
+            literal.append(ch)
+            i += 1
+            continue
+        nxt = template[i + 1]
+        if nxt == 'g':
+            m = re.match(r'\\g<([^>]+)>', template[i:])
+            if not m:
+                raise re.error(f'bad group reference in template {template!r}')
+            ref = m.group(1)
+            flush()
+            parts.append(_group_index(ref, compiled_rule, template))
+            i += m.end()
+        elif nxt.isdigit() and nxt != '0':
+            digits = re.match(r'\d{1,2}', template[i + 1:]).group(0)
+            flush()
+            parts.append(_group_index(digits, compiled_rule, template))
+            i += 1 + len(digits)
+        elif nxt in _TEMPLATE_ESCAPES:
+            literal.append(_TEMPLATE_ESCAPES[nxt])
+            i += 2
+        elif nxt.isascii() and nxt.isalpha():
+            raise re.error(f'bad escape \\{nxt} in template {template!r}')
+        else:
+            literal.append(template[i:i + 2])
+            i += 2
+    flush()
+    return parts
+
+
+def _group_index(ref, compiled_rule, template):
+    if ref.isdigit():
+        number = int(ref)
+        if number > compiled_rule.groups:
+            raise re.error(f'invalid group reference {number} in template {template!r}')
+        return compiled_rule.base + number if number else 0
+    if ref not in compiled_rule.group_names:
+        raise re.error(f'unknown group name {ref!r} in template {template!r}')
+    return compiled_rule.group_names[ref]
+
+
+def _expand(parts, match):
+    if len(parts) == 1 and isinstance(parts[0], str):
+        return parts[0]
+    return ''.join(part if isinstance(part, str) else (match.group(part) or '') for part in parts)
+
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != ']'
+        elif ch == '[':
+            in_class = True
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def _leading_literal(pattern):
+    """Source of the literal character a pattern must start with (e.g. 'a'
+    or '\\('), or None."""
+    if not pattern:
+        return None
+    if pattern[0] == '\\':
+        literal = pattern[:2]
+        if len(literal) < 2 or literal[1].isalnum():
+            return None
+    elif pattern[0] in _METACHARS:
+        return None
+    else:
+        literal = pattern[0]
+    if pattern[len(literal):len(literal) + 1] in _QUANTIFIERS:
+        return None
+    return literal
+
+
+def _first_chars(pattern):
+    """Characters a match can start with, or None when that is not obvious.
+
+    Only zero-width assertions followed by a literal are recognised, e.g.
+    \\bas\\s+any starts with 'a'.
+    """
+    while True:
+        if pattern.startswith(('\\b', '\\B', '\\A')):
+            pattern = pattern[2:]
+        elif pattern.startswith('^'):
+            pattern = pattern[1:]
+        else:
+            break
+    literal = _leading_literal(pattern)
+    return None if literal is None else {literal[-1]}
+
+
+def _group_slot(slots, char):
+    """The slot a rule starting with char can join without changing priorities.
+
+    Sharing a slot moves the rule ahead of every alternative between that
+    slot and the end, which is only safe when none of them can match at a
+    position starting with char.
+    """
+    for slot in reversed(slots):
+        if slot[0] == char:
+            return slot
+        if slot[0] is None and (slot[2] is None or char in slot[2]):
+            return None
+    return None
+
+
+def _slot_pattern(slot):
+    if slot[0] is None:
+        return slot[1]
+    _, literal, bodies = slot
+    if len(bodies) == 1:
+        return literal + bodies[0]
+    return f'{literal}(?:{"|".join(bodies)})'
+
+
+def required_literals(pattern, flags=0):
+    """Strings one of which occurs in every match of pattern, or None.
+
+    Read from the regex parse tree: literal runs, groups and repeats that
+    must match at least once, and alternations whose branches all have a
+    requirement. The most selective candidate (longest shortest string) is
+    kept. Case-insensitive patterns get None.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    if state.flags & re.I:
+        return None
+    return _best_requirement(_requirements(parsed))
+
+
+def _requirements(items):
+    """Candidate requirements of a sequence of parse items."""
+    candidates = []
+    run = []
+    for op, av in items:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is _sre.AT:
+            # Zero-width, so literals on both sides stay contiguous
+            continue
+        if run:
+            candidates.append(frozenset([''.join(run)]))
+            run = []
+        required = None
+        if op is _sre.SUBPATTERN:
+            add_flags = av[1]
+            if not add_flags & re.I:
+                required = _best_requirement(_requirements(av[3]))
+        elif op is _sre.BRANCH:
+            options = set()
+            for branch in av[1]:
+                branch_required = _best_requirement(_requirements(branch))
+                if branch_required is None:
+                    options = None
+                    break
+                options |= branch_required
+            required = frozenset(options) if options else None
+        elif op in _REPEATS and av[0] >= 1:
+            required = _best_requirement(_requirements(av[2]))
+        elif op is _ATOMIC_GROUP:
+            required = _best_requirement(_requirements(av))
+        if required:
+            candidates.append(required)
+    if run:
+        candidates.append(frozenset([''.join(run)]))
+    return candidates
+
+
+def _best_requirement(candidates):
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(map(len, c)), -len(c)))
+
+
+class LiteralPrefilter:
+    """Finds which of a set of literals occur in a text.
+
+    Literals are tested shortest first with substring searches, and a
+    literal found absent rules out every longer literal containing it
+    without another pass over the text (e.g. no 'any' means no '<any>').
+    """
+
+    def __init__(self, literals):
+        self.literals = frozenset(literals)
+        self._ordered = sorted(self.literals, key=lambda lit: (len(lit), lit))
+        self._containing = {
+            inner: frozenset(outer for outer in self.literals if outer != inner and inner in outer)
+            for inner in self.literals
+        }
+
+    def present(self, text):
+        """The literals that occur in text."""
+        found = set()
+        absent = set()
+        for literal in self._ordered:
+            if literal in absent:
+                continue
+            if literal in text:
+                found.add(literal)
+            else:
+                absent |= self._containing[literal]
+        return found
+
+
+class RuleStats:
+    """Prefilter counters for one rule."""
+
+    __slots__ = ('files', 'skipped_files', 'skipped_bytes')
+
+    def __init__(self):
+        self.files = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+
+    def as_dict(self):
+        return {'files': self.files, 'skipped_files': self.skipped_files,
+                'skipped_bytes': self.skipped_bytes}
+
+
+class _Matcher:
+    __slots__ = ('pattern', 'placements')
+
+    def __init__(self, pattern, placements):
+        self.pattern = pattern
+        self.placements = placements
+
+
+class RuleSet:
+    """A compiled rule table.
+
+    rules may be Rule instances or (pattern, replacement[, flags]) tuples;
+    tuples are named by their position. `apply(text)` returns (new_text,
+    Counter of matches per rule name).
+
+    Before scanning, each text is checked once for the literals the rules
+    require (see required_literals); rules whose literals are all absent
+    are left out of the combined pattern for that text, and `stats` records
+    how many files and bytes each rule skipped.
+    """
+
+    def __init__(self, rules, flags=0):
+        self.rules: List[Rule] = []
+        for i, rule in enumerate(rules):
+            if not isinstance(rule, Rule):
+                pattern, replacement = rule[0], rule[1]
+                rule_flags = rule[2] if len(rule) > 2 else 0
+                rule = Rule(str(i), pattern, replacement, rule_flags)
+            self.rules.append(rule._replace(flags=rule.flags | flags))
+        self._compiled = [_CompiledRule(rule, f'_r{i}') for i, rule in enumerate(self.rules)]
+        self.prefilter = LiteralPrefilter(
+            literal for c in self._compiled if c.literals for literal in c.literals)
+        self.stats: Dict[str, RuleStats] = {rule.name: RuleStats() for rule in self.rules}
+        self._matchers = {}
+        everything = tuple(range(len(self._compiled)))
+        self.pattern = self._matcher(everything).pattern if self._compiled else None
+
+    def _matcher(self, active):
+        """Combined pattern for the rules at the given indices (cached)."""
+        matcher = self._matchers.get(active)
+        if matcher is None:
+            matcher = self._combine([self._compiled[i] for i in active])
+            self._matchers[active] = matcher
+        return matcher
+
+    def _combine(self, compiled):
+        # Flags shared by every rule apply to the whole pattern; only rules
+        # that differ get a scoped (?flags:...) group
+        split = [_split_leading_flags(c.rule.pattern, c.rule.flags) for c in compiled]
+        common = split[0][1]
+        for _, flags in split[1:]:
+            common &= flags
+        # Each slot is one top-level alternative: [char, source, [bodies]] for
+        # rules that start with that literal character, or [None, body,
+        # possible first characters (None when unknown)]. Sharing the literal
+        # lets the regex engine reject a whole slot with one comparison.
+        slots = []
+        factor = not common & (re.I | re.X)
+        for c, (pattern, flags) in zip(compiled, split):
+            body = _relocate(pattern, c.key + '_')
+            if _has_top_level_alternation(body):
+                body = f'(?:{body})'
+            letters = _scoped_flags(flags & ~common)
+            # The rule is identified by an empty marker group at the end of its
+            # alternative: it closes last, so it is the match's lastgroup
+            marker = f'(?P<{c.key}>)'
+            char = _leading_literal(body) if factor and not set(letters) & set('ix') else None
+            if char is None:
+                if letters:
+                    body = f'(?{letters}:{body})'
+                slots.append([None, body + marker, _first_chars(body)])
+                continue
+            rest = body[len(char):]
+            if letters:
+                rest = f'(?{letters}:{rest})'
+            slot = _group_slot(slots, char[-1])
+            if slot is None:
+                slots.append([char[-1], char, [rest + marker]])
+            else:
+                slot[2].append(rest + marker)
+        combined = re.compile('|'.join(_slot_pattern(slot) for slot in slots), common)
+        index = combined.groupindex
+        return _Matcher(combined, {c.key: _Placement(c, index) for c in compiled})
+
+    def active_rules(self, text):
+        """Indices of the rules whose required literals occur in text."""
+        present = self.prefilter.present(text)
+        return tuple(
+            i for i, c in enumerate(self._compiled)
+            if c.literals is None or not c.literals.isdisjoint(present)
+        )
+
+    def apply(self, text, counts: Optional[Counter] = None):
+        """Rewrite text in one scan; returns (new_text, counts)."""
+        if counts is None:
+            counts = Counter()
+        if not self._compiled:
+            return text, counts
+        profiler = rule_profile.active()
+        if profiler is not None:
+            return self._apply_profiled(text, counts, profiler)
+        active = self.active_rules(text)
+        self._record(active, text)
+        if not active:
+            return text, counts
+        placements = self._matcher(active).placements
+
+        def dispatch(match):
+            placement = placements[match.lastgroup]
+            if placement.template is not None:
+                counts[placement.rule.name] += 1
+                return _expand(placement.template, match)
+            replaced = placement.rule.replacement(RuleMatch(match, placement))
+            if replaced is None:
+                return match.group(0)
+            counts[placement.rule.name] += 1
+            return replaced
+
+        return self._scan(text, active, dispatch), counts
+
+    def _scan(self, text, active, dispatch):
+        try:
+            with rule_watchdog.running('(combined scan)'):
+                return self._matcher(active).pattern.sub(dispatch, text)
+        except rule_watchdog.RuleTimeout as timeout:
+            raise self._blame(text, active, timeout) from None
+
+    def _blame(self, text, active, timeout):
+        """The timeout of a combined scan, attributed to a single rule if one
+        also exceeds the budget alone."""
+        for i in active:
+            rule = self._compiled[i]
+            try:
+                with rule_watchdog.budget(timeout.seconds, rule.rule.name):
+                    for _ in rule.compiled.finditer(text):
+                        pass
+            except rule_watchdog.RuleTimeout:
+                return rule_watchdog.blame(timeout, rule.rule.name)
+        return timeout
+
+    def _apply_profiled(self, text, counts, profiler):
+        """apply() reporting to a rule_profile.RuleProfiler.
+
+        The combined scan cannot attribute time to single rules, so each
+        active rule is additionally timed scanning the text on its own; its
+        matches and edits come from the combined scan, as in apply().
+        """
+        with profiler.timed('(prefilter)', text):
+            active = self.active_rules(text)
+        self._record(active, text)
+        active_set = set(active)
+        for i, c in enumerate(self._compiled):
+            if i not in active_set:
+                profiler.skipped(c.rule.name, text)
+                continue
+            with profiler.timed(c.rule.name, text), rule_watchdog.running(c.rule.name):
+                for _ in c.compiled.finditer(text):
+                    pass
+        if not active:
+            return text, counts
+        placements = self._matcher(active).placements
+
+        def dispatch(match):
+            placement = placements[match.lastgroup]
+            name = placement.rule.name
+            if placement.template is not None:
+                replaced = _expand(placement.template, match)
+            else:
+                replaced = placement.rule.replacement(RuleMatch(match, placement))
+                if replaced is None:
+                    return match.group(0)
+            counts[name] += 1
+            profiler.count(name, 1, replaced != match.group(0))
+            return replaced
+
+        with profiler.timed('(combined scan)', text):
+            text = self._scan(text, active, dispatch)
+        return text, counts
+
+    def _record(self, active, text):
+        skipped = len(self._compiled) - len(active)
+        size = len(text.encode('utf-8')) if skipped else 0
+        active = set(active)
+        for i, rule in enumerate(self.rules):
+            stats = self.stats[rule.name]
+            stats.files += 1
+            if i not in active:
+                stats.skipped_files += 1
+                stats.skipped_bytes += size
+
+    def apply_sequential(self, text, counts: Optional[Counter] = None):
+        """Reference behaviour: one re.subn per rule, in table order."""
+        if counts is None:
+            counts = Counter()
+        for c in self._compiled:
+            replacement = c.rule.replacement
+            if callable(replacement):
+                declined = 0
+
+                def replace(match, replacement=replacement):
+                    nonlocal declined
+                    replaced = replacement(match)
+                    if replaced is None:
+                        declined += 1
+                        return match.group(0)
+                    return replaced
+
+                text, n = c.compiled.subn(replace, text)
+                n -= declined
+            else:
+                text, n = c.compiled.subn(replacement, text)
+            if n:
+                counts[c.rule.name] += n
+        return text, counts
+
+    def prefilter_report(self):
+        """Per-rule prefilter stats, most bytes skipped first."""
+        rows = []
+        for c in self._compiled:
+            row = {'rule': c.rule.name,
+                   'literals': sorted(c.literals) if c.literals else None}
+            row.update(self.stats[c.rule.name].as_dict())
+            rows.append(row)
+        rows.sort(key=lambda row: -row['skipped_bytes'])
+        return rows
+
+    def print_prefilter_stats(self, title='Prefilter'):
+        rows = [row for row in self.prefilter_report() if row['files']]
+        if not rows:
+            return
+        print(f"\n🔎 {title}: files and bytes skipped per rule")
+        for row in rows:
+            literals = ', '.join(repr(lit) for lit in row['literals']) if row['literals'] else '-'
+            print(f"  {row['rule']:<14} skipped {row['skipped_files']:>5}/{row['files']:<5} files "
+                  f"{row['skipped_bytes'] / 1024:>9.1f} KiB  needs {literals}")
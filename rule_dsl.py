@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Declarative rule format for the regex codemods.
+
+A RuleSpec names a pattern template plus its metadata: parameters, the
+literals a file must contain for it to match, where in the source it is
+meant to apply and how safe the rewrite is. A `{name}` placeholder in a
+template becomes a named group matching the parameter's regex, so each
+template compiles once; binding a value, e.g. param='item', only adds a
+check on that group when a match is found.
+
+Every rule only rewrites code: a match that starts or ends inside a
+comment, string, template or regex literal (or JSX text) is declined,
+going by ts_lexer's tokens. JSX-scoped rules additionally only run on
+files that can contain JSX (see select()).
+
+Specs turn into rewrite_engine rules with `bind()`, or apply directly to a
+single string with `subn()`. select() picks the specs a file should get,
+by path and safety level, and compile_table() turns them into one
+rewrite_engine RuleSet per binding.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from rewrite_engine import Replacement, Rule, RuleSet, required_literals
+from ts_lexer import code_mask, is_jsx_path, tokenize
+
+# Where a rule is meant to match
+CODE = 'code'
+JSX = 'jsx'
+SCOPES = (CODE, JSX)
+
+# How much a rewrite can change, from least to most
+SAFE = 'safe'        # cannot change behaviour or introduce type errors
+REVIEW = 'review'    # type-level change that may surface new type errors
+UNSAFE = 'unsafe'    # may change meaning or produce invalid syntax
+SAFETY_LEVELS = (SAFE, REVIEW, UNSAFE)
+
+IDENTIFIER = r'[A-Za-z_$][\w$]*'
+
+_PLACEHOLDER_RE = re.compile(r'(\\.)|\{([A-Za-z_]\w*)\}')
+
+
+class RuleSpec(NamedTuple):
+    name: str
+    pattern: str                              # regex with {param} placeholders
+    replacement: Replacement
+    params: Optional[Dict[str, str]] = None   # placeholder -> regex for its values
+    literals: Optional[Tuple[str, ...]] = None
+    scope: str = CODE
+    safety: str = REVIEW
+    flags: int = 0
+
+    @property
+    def expanded(self):
+        """The pattern with each placeholder turned into a named group."""
+        return expand_template(self.pattern, self.params or {})
+
+    @property
+    def compiled(self):
+        return _compile(self.expanded, self.flags)
+
+    def bind(self, jsx=True, **values) -> Rule:
+        """A rewrite_engine Rule that only accepts code matches with these parameter values.
+
+        jsx says how the text it runs on is tokenized.
+        """
+        _check_params(self, values)
+        literals = self.literals
+        if literals is None and values:
+            literals = _best_literals(required_literals(self.expanded, self.flags), values)
+        return Rule(self.name, self.expanded, _guarded(self.replacement, values, jsx),
+                    self.flags, literals)
+
+    def subn(self, text, jsx=True, **values):
+        """re.subn with the compiled template; matches outside code or with
+        other parameter values are left alone and not counted."""
+        _check_params(self, values)
+        if any(value not in text for value in values.values()):
+            return text, 0
+        if self.literals and not any(literal in text for literal in self.literals):
+            return text, 0
+        count = 0
+        accept = _guarded(self.replacement, values, jsx)
+
+        def replace(match):
+            nonlocal count
+            new = accept(match)
+            if new is None:
+                return match.group(0)
+            count += 1
+            return new
+
+        return self.compiled.sub(replace, text), count
+
+    def sub(self, text, jsx=True, **values):
+        return self.subn(text, jsx, **values)[0]
+
+
+def expand_template(pattern, params):
+    """Replace {name} placeholders with named groups.
+
+    The first occurrence of a parameter becomes (?P<name>regex) and later
+    ones back-references, so `{a}.*{a}` matches the same value twice.
+    Braces that are not a declared parameter (quantifiers such as {2,3})
+    are left as they are.
+    """
+    seen = set()
+
+    def placeholder(match):
+        name = match.group(2)
+        if match.group(1) or name not in params:
+            return match.group(0)
+        if name in seen:
+            return f'(?P={name})'
+        seen.add(name)
+        return f'(?P<{name}>{params[name]})'
+
+    return _PLACEHOLDER_RE.sub(placeholder, pattern)
+
+
+@lru_cache(maxsize=None)
+def _compile(pattern, flags):
+    return re.compile(pattern, flags)
+
+
+def _check_params(spec, values):
+    unknown = set(values) - set(spec.params or {})
+    if unknown:
+        raise ValueError(f"rule {spec.name!r} has no parameter(s) {', '.join(sorted(unknown))}")
+
+
+def _best_literals(derived, values):
+    # A bound value has to occur as well; keep whichever requirement is longer
+    candidates = [frozenset([value]) for value in values.values() if value]
+    if derived:
+        candidates.append(derived)
+    if not candidates:
+        return None
+    return tuple(sorted(max(candidates, key=lambda c: min(map(len, c)))))
+
+
+# The code mask of the text matched last; a scan passes the same string to
+# every replacement, so it is tokenized once per scan
+_last_mask = (None, None, None)
+
+
+def _in_code(match, jsx):
+    global _last_mask
+    text = match.string
+    cached, cached_jsx, mask = _last_mask
+    if cached is not text or cached_jsx != jsx:
+        mask = code_mask(tokenize(text, jsx=jsx).tokens, len(text))
+        _last_mask = (text, jsx, mask)
+    start, end = match.span()
+    last = max(end - 1, start)
+    return 1 not in mask[start:start + 1] and 1 not in mask[last:last + 1]
+
+
+def _guarded(replacement, values, jsx):
+    # None declines the match (see rewrite_engine)
+    def accept(match):
+        for name, value in values.items():
+            if match.group(name) != value:
+                return None
+        if not _in_code(match, jsx):
+            return None
+        if callable(replacement):
+            return replacement(match)
+        return match.expand(replacement)
+    return accept
+
+
+def validate(specs: Iterable[RuleSpec]):
+    """Check names are unique, metadata is known and every template compiles."""
+    names = set()
+    for spec in specs:
+        if spec.name in names:
+            raise ValueError(f'duplicate rule name {spec.name!r}')
+        names.add(spec.name)
+        if spec.scope not in SCOPES:
+            raise ValueError(f'rule {spec.name!r}: unknown scope {spec.scope!r}')
+        if spec.safety not in SAFETY_LEVELS:
+            raise ValueError(f'rule {spec.name!r}: unknown safety level {spec.safety!r}')
+        try:
+            spec.compiled
+        except re.error as e:
+            raise ValueError(f'rule {spec.name!r}: {e}') from e
+
+
+def select(specs: Iterable[RuleSpec], max_safety=UNSAFE, path=None) -> List[RuleSpec]:
+    """Specs up to a safety level; JSX rules are dropped for non-JSX paths."""
+    limit = SAFETY_LEVELS.index(max_safety)
+    jsx = is_jsx_path(path) if path else True
+    return [
+        spec for spec in specs
+        if SAFETY_LEVELS.index(spec.safety) <= limit and (jsx or spec.scope != JSX)
+    ]
+
+
+_RULE_SETS = {}
+
+
+def compile_table(specs: Iterable[RuleSpec], flags=0, jsx=True, **values) -> RuleSet:
+    """RuleSet for a table of specs (cached per table, flags, jsx and binding)."""
+    specs = tuple(specs)
+    key = (tuple(id(spec) for spec in specs), flags, jsx, tuple(sorted(values.items())))
+    entry = _RULE_SETS.get(key)
+    if entry is None:
+        rules = [spec.bind(jsx, **{k: v for k, v in values.items() if k in (spec.params or {})})
+                 for spec in specs]
+        # The specs are kept with the RuleSet so their ids stay unique
+        entry = _RULE_SETS[key] = (specs, RuleSet(rules, flags))
+    return entry[1]
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Per-rule profiling for the codemod scripts.
+
+A process-wide RuleProfiler is off by default; the module-level helpers
+(timed, skipped, count, subn) cost nothing until enable() or from_argv()
+turns it on. For every rule it records wall time, CPU time of the running
+thread, files attempted, files and bytes skipped by a prefilter, bytes
+scanned, matches and edits (matches whose replacement changed the text).
+
+rewrite_engine.RuleSet reports through the active profiler on its own.
+Inside a combined scan a rule's own cost cannot be separated, so while
+profiling each active rule is also timed scanning the file on its own,
+and the combined pass is reported as '(combined scan)'.
+
+With stack sampling on, a background thread records the Python stack of
+the thread running a rule every few milliseconds; the most common stacks
+of the slowest rule are printed with the table.
+
+Scripts call from_argv() in main() and profiler.finish() at the end:
+    python3 reduce-any-types-round3.py --profile [FILE] [--profile-stacks]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import rule_watchdog
+
+DEFAULT_REPORT = 'ci/step-outputs/rule-profile.json'
+
+_PROFILER = None
+
+
+class RuleProfile:
+    __slots__ = ('wall', 'cpu', 'files', 'skipped_files', 'skipped_bytes',
+                 'bytes_scanned', 'matches', 'edits')
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.files = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.bytes_scanned = 0
+        self.matches = 0
+        self.edits = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RuleProfiler:
+    def __init__(self, report_path=DEFAULT_REPORT, sample_interval=None):
+        self.report_path = report_path
+        self.sample_interval = sample_interval
+        self.rules = defaultdict(RuleProfile)
+        self.stacks = defaultdict(Counter)
+        self._active = []          # (rule, thread id) of the timed sections in progress
+        self._sampler = None
+        self._stopped = threading.Event()
+        if sample_interval:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+    # -- recording ------------------------------------------------------------
+
+    @contextmanager
+    def timed(self, rule, text=None):
+        """Time one file's work for a rule (counts as one file attempted)."""
+        profile = self.rules[rule]
+        profile.files += 1
+        if text is not None:
+            profile.bytes_scanned += _size(text)
+        self._active.append((rule, threading.get_ident()))
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield profile
+        finally:
+            profile.cpu += time.thread_time() - cpu
+            profile.wall += time.perf_counter() - wall
+            self._active.pop()
+
+    def skipped(self, rule, text):
+        """A prefilter ruled the rule out for a file."""
+        profile = self.rules[rule]
+        profile.files += 1
+        profile.skipped_files += 1
+        profile.skipped_bytes += _size(text)
+
+    def count(self, rule, matches=0, edits=0):
+        profile = self.rules[rule]
+        profile.matches += matches
+        profile.edits += edits
+
+    def _sample(self):
+        frames = sys._current_frames
+        while not self._stopped.wait(self.sample_interval):
+            if not self._active:
+                continue
+            rule, thread_id = self._active[-1]
+            frame = frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != __file__ and 'contextlib' not in code.co_filename:
+                    stack.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+                frame = frame.f_back
+            self.stacks[rule][tuple(reversed(stack))] += 1
+
+    # -- reporting ------------------------------------------------------------
+
+    def rows(self):
+        """Per-rule dicts, slowest first."""
+        rows = [dict(rule=rule, **profile.as_dict()) for rule, profile in self.rules.items()]
+        return sorted(rows, key=lambda row: -row['wall'])
+
+    def save_json(self, path=None):
+        path = path or self.report_path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        slowest = self.rows()[0]['rule'] if self.rules else None
+        report = {
+            'rules': self.rows(),
+            'slowest_rule_stacks': [
+                {'samples': n, 'stack': list(stack)}
+                for stack, n in self.stacks[slowest].most_common(10)
+            ] if slowest in self.stacks else [],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return path
+
+    def print_table(self, limit=25):
+        rows = self.rows()
+        if not rows:
+            return
+        print(f"\n⏱️  Rule profile ({len(rows)} rules, slowest first)")
+        print(f"  {'rule':<42} {'wall s':>8} {'cpu s':>8} {'files':>6} {'skipped':>7} "
+              f"{'MiB scanned':>11} {'matches':>8} {'edits':>7}")
+        for row in rows[:limit]:
+            print(f"  {_short(row['rule'], 42):<42} {row['wall']:>8.3f} {row['cpu']:>8.3f} "
+                  f"{row['files']:>6} {row['skipped_files']:>7} "
+                  f"{row['bytes_scanned'] / 2**20:>11.2f} {row['matches']:>8} {row['edits']:>7}")
+        if len(rows) > limit:
+            print(f"  ... and {len(rows) - limit} more in the JSON report")
+
+    def print_slowest_stacks(self, limit=5):
+        rows = self.rows()
+        if not rows or rows[0]['rule'] not in self.stacks:
+            return
+        rule = rows[0]['rule']
+        samples = self.stacks[rule]
+        total = sum(samples.values())
+        print(f"\n🔬 Sampled stacks for slowest rule {_short(rule, 60)} ({total} samples)")
+        for stack, n in samples.most_common(limit):
+            print(f"  {n:>5} ({n / total:.0%})")
+            for frame in stack[-6:]:
+                print(f"        {frame}")
+
+    def finish(self):
+        """Stop sampling, print the table (and stacks) and save the JSON report."""
+        self._stopped.set()
+        self.print_table()
+        self.print_slowest_stacks()
+        print(f"Rule profile saved to: {self.save_json()}")
+
+
+def _size(text):
+    return len(text.encode('utf-8')) if isinstance(text, str) else len(text)
+
+
+def _short(text, width):
+    text = text.replace('\n', ' ')
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+# -- process-wide profiler -------------------------------------------------------
+
+def enable(report_path=DEFAULT_REPORT, sample_interval=None):
+    global _PROFILER
+    _PROFILER = RuleProfiler(report_path, sample_interval)
+    return _PROFILER
+
+
+def active():
+    """The enabled profiler, or None."""
+    return _PROFILER
+
+
+def from_argv(argv=None):
+    """Enable profiling when --profile [FILE] is on the command line.
+
+    Unrelated arguments are left for the script. Returns the profiler or None.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, default=None)
+    parser.add_argument('--profile-stacks', action='store_true')
+    parser.add_argument('--profile-interval', type=float, default=0.005)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if args.profile is None and not args.profile_stacks:
+        return None
+    return enable(args.profile or DEFAULT_REPORT,
+                  args.profile_interval if args.profile_stacks else None)
+
+
+@contextmanager
+def timed(rule, text=None):
+    if _PROFILER is None:
+        yield None
+    else:
+        with _PROFILER.timed(rule, text) as profile:
+            yield profile
+
+
+def skipped(rule, text):
+    if _PROFILER is not None:
+        _PROFILER.skipped(rule, text)
+
+
+def count(rule, matches=0, edits=0):
+    if _PROFILER is not None:
+        _PROFILER.count(rule, matches, edits)
+
+
+def subn(pattern, replacement, text, flags=0, rule=None):
+    """re.subn, profiled under rule (default: the pattern) when profiling is on.
+
+    A callable replacement may return None to decline a match, as with
+    rewrite_engine: the text is kept and the match is not counted. Runs
+    under the rule_watchdog budget of the current file.
+    """
+    rule = rule or pattern
+    declined = 0
+    if callable(replacement):
+        accept = replacement
+
+        def replacement(match):
+            nonlocal declined
+            new = accept(match)
+            if new is None:
+                declined += 1
+                return match.group(0)
+            return new
+
+    if _PROFILER is None:
+        with rule_watchdog.running(rule):
+            text, n = re.subn(pattern, replacement, text, flags=flags)
+        return text, n - declined
+    compiled = re.compile(pattern, flags)
+    edits = 0
+
+    def replace(match):
+        nonlocal edits
+        new = replacement(match) if callable(replacement) else match.expand(replacement)
+        if new != match.group(0):
+            edits += 1
+        return new
+
+    with _PROFILER.timed(rule, text), rule_watchdog.running(rule):
+        text, n = compiled.subn(replace, text)
+    _PROFILER.count(rule, n - declined, edits)
+    return text, n - declined
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Per-file time budget for the codemod rules.
+
+A regex that backtracks catastrophically on one odd file should cost that
+file, not hang the whole run. Scripts wrap the work on each file in
+file_budget(path), and rule code marks what it is running with
+running(rule). A timer is armed only while a rule runs and is charged
+against the file's budget, so I/O between rules is never interrupted; when
+the budget runs out, RuleTimeout is raised from inside the rule (CPython's
+regex engine checks for signals while it backtracks), naming the rule and
+the file. Timeouts on files are also recorded for report().
+
+The timer is SIGALRM-based: on platforms without it, or off the main
+thread, budgets are not enforced.
+
+    python3 final-any-reduction.py --rule-budget 10   # seconds per file, 0 = off
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUDGET = 30.0
+
+_budget = DEFAULT_BUDGET
+_files = []       # [path, seconds, remaining] of the file budgets in progress
+_rules = []       # names of the rules running, innermost last
+_armed_at = None  # when the timer was armed, while a rule runs
+timeouts = []     # RuleTimeout instances, in order
+
+
+class RuleTimeout(Exception):
+    def __init__(self, rule, seconds, path=None):
+        self.rule = rule
+        self.seconds = seconds
+        self.path = path
+        where = f" on {path}" if path else ''
+        super().__init__(f"rule {rule!r} exceeded its {seconds:g}s budget{where}")
+
+    def as_dict(self):
+        return {'rule': self.rule, 'seconds': self.seconds, 'path': self.path}
+
+
+def _can_interrupt():
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def configure(seconds):
+    """Default budget per file in seconds; 0 or None turns budgets off."""
+    global _budget
+    _budget = seconds or None
+
+
+def from_argv(argv=None):
+    """Read --rule-budget SECONDS (other arguments are left to the script)."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--rule-budget', type=float, default=DEFAULT_BUDGET)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    configure(args.rule_budget)
+    return _budget
+
+
+def current_rule():
+    return _rules[-1] if _rules else None
+
+
+def _expired(signum, frame):
+    path, seconds, _ = _files[-1]
+    timeout = RuleTimeout(current_rule(), seconds, path)
+    if path is not None:
+        timeouts.append(timeout)
+    raise timeout
+
+
+@contextmanager
+def file_budget(path, seconds=None):
+    """Give the rules run on one file a shared time budget."""
+    global _armed_at
+    seconds = _budget if seconds is None else seconds
+    if not seconds or not _can_interrupt():
+        yield
+        return
+    _files.append([path, seconds, seconds])
+    depth = len(_rules)
+    try:
+        yield
+    finally:
+        _files.pop()
+        # The timer can fire while running() is cleaning up; leave no state behind
+        if _armed_at is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            _armed_at = None
+        del _rules[depth:]
+
+
+@contextmanager
+def running(rule):
+    """Mark rule as running; its time is charged to the current file budget."""
+    global _armed_at
+    if _armed_at is not None or not _files:
+        # Nested in another rule (already timed) or no budget to enforce
+        _rules.append(rule)
+        try:
+            yield
+        finally:
+            _rules.pop()
+        return
+    budget = _files[-1]
+    _rules.append(rule)
+    previous = signal.signal(signal.SIGALRM, _expired)
+    _armed_at = time.perf_counter()
+    try:
+        if budget[2] <= 0:
+            _expired(signal.SIGALRM, None)
+        signal.setitimer(signal.ITIMER_REAL, budget[2])
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        budget[2] -= time.perf_counter() - _armed_at
+        _armed_at = None
+        _rules.pop()
+
+
+@contextmanager
+def budget(seconds, rule, path=None):
+    """A one-off budget for a single rule (used by regex_audit's fuzzer)."""
+    with file_budget(path, seconds):
+        with running(rule):
+            yield
+
+
+def blame(timeout, rule):
+    """The same timeout charged to rule instead (replaces the recorded one)."""
+    blamed = RuleTimeout(rule, timeout.seconds, timeout.path)
+    if timeout in timeouts:
+        timeouts[timeouts.index(timeout)] = blamed
+    return blamed
+
+
+def report():
+    """Print the files aborted because a rule ran out of time."""
+    if not timeouts:
+        return
+    print(f"\n⏰ {len(timeouts)} file(s) aborted by the rule time budget:")
+    for timeout in timeouts:
+        print(f"  {timeout.path}: {timeout.rule} (budget {timeout.seconds:g}s)")
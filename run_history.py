@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+SQLite history of the lint and type-check runs saved in ci/step-outputs.
+
+Each saved run (tsc_before_2a.txt, eslint_after_2c.txt, eslint --format
+json results, ...) is parsed once by diagnostics.py and loaded into
+ci/step-outputs/run-history.sqlite with its diagnostics, per-file counts
+and per-code counts. Ingestion is incremental: an artifact whose size and
+mtime are unchanged is skipped, a changed one replaces its earlier run.
+Runs are ordered by the artifact's mtime, then by ingestion order.
+
+Artifacts that are not a run result (eslint crashed, a note was saved in
+place of the output) are kept as unparsed runs and left out of the
+regression and trend queries.
+
+    python3 run_history.py ingest [ARTIFACT ...]
+    python3 run_history.py runs [--tool tsc]
+    python3 run_history.py regressed tsc_before_2c [--run tsc_after_2c]
+    python3 run_history.py new tsc_before_2c [--run tsc_after_2c]
+    python3 run_history.py trend TS7006 [--tool tsc] [--last 30]
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime
+
+from diagnostics import BASE_PATH, FINGERPRINT_VERSION, fingerprint, parse_artifact
+
+DEFAULT_DB = 'ci/step-outputs/run-history.sqlite'
+ARTIFACT_DIR = 'ci/step-outputs'
+ARTIFACT_PATTERNS = ('tsc*.txt', 'eslint*.txt', 'eslint*.json')
+# Filtered subsets and write-ups of a run rather than runs
+NOT_A_RUN = ('bucket', 'summary', 'report')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    run_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    tool TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    parsed INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    warnings INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS diagnostics (
+    run_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    severity TEXT NOT NULL,
+    code TEXT NOT NULL,
+    message TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_files (
+    run_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (run_id, file_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_codes (
+    run_id INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (run_id, code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_order ON runs (tool, mtime_ns, id);
+CREATE INDEX IF NOT EXISTS diagnostics_run ON diagnostics (run_id, file_id);
+CREATE INDEX IF NOT EXISTS diagnostics_file ON diagnostics (file_id, run_id);
+CREATE INDEX IF NOT EXISTS diagnostics_code ON diagnostics (code, run_id);
+CREATE INDEX IF NOT EXISTS diagnostics_fingerprint ON diagnostics (fingerprint, run_id);
+CREATE INDEX IF NOT EXISTS run_files_file ON run_files (file_id, run_id);
+CREATE INDEX IF NOT EXISTS run_codes_code ON run_codes (code, run_id);
+"""
+
+
+def connect(db_path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    db = sqlite3.connect(db_path)
+    if db.execute('PRAGMA user_version').fetchone()[0] != FINGERPRINT_VERSION:
+        # Stored fingerprints are stale: start over, the artifacts are re-ingested
+        for (table,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            db.execute(f'DROP TABLE {table}')
+        db.execute(f'PRAGMA user_version = {FINGERPRINT_VERSION}')
+    db.executescript(SCHEMA)
+    return db
+
+
+def run_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def default_artifacts(directory=ARTIFACT_DIR):
+    paths = set()
+    for pattern in ARTIFACT_PATTERNS:
+        paths.update(glob.glob(os.path.join(directory, pattern)))
+    return sorted(path for path in paths if not any(word in run_name(path) for word in NOT_A_RUN))
+
+
+def _file_ids(db, paths):
+    db.executemany("INSERT OR IGNORE INTO files (path) VALUES (?)", [(path,) for path in paths])
+    ids = {}
+    for path in paths:
+        ids[path] = db.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()[0]
+    return ids
+
+
+def _delete_run(db, run_id):
+    for table in ('diagnostics', 'run_files', 'run_codes'):
+        db.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+    db.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+
+def ingest(db, paths, root=BASE_PATH):
+    """Load new or changed artifacts; returns (ingested, unchanged) counts."""
+    ingested = unchanged = 0
+    for path in paths:
+        path = os.path.normpath(path)
+        st = os.stat(path)
+        row = db.execute("SELECT size, mtime_ns, run_id FROM artifacts WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            unchanged += 1
+            continue
+        tool, diagnostics, parsed = parse_artifact(path, root)
+        with db:
+            if row and row[2] is not None:
+                _delete_run(db, row[2])
+            run_id = None
+            if tool:
+                name = run_name(path)
+                stale = db.execute("SELECT id FROM runs WHERE name = ?", (name,)).fetchone()
+                if stale:
+                    # The same run saved under another extension
+                    _delete_run(db, stale[0])
+                severities = Counter(d.severity for d in diagnostics)
+                run_id = db.execute(
+                    "INSERT INTO runs (name, tool, mtime_ns, parsed, total, errors, warnings, ingested_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, tool, st.st_mtime_ns, int(parsed), len(diagnostics),
+                     severities['error'], severities['warning'],
+                     datetime.now().isoformat(timespec='seconds'))).lastrowid
+                file_ids = _file_ids(db, sorted({d.file for d in diagnostics}))
+                db.executemany(
+                    "INSERT INTO diagnostics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, file_ids[d.file], d.line, d.column, d.severity, d.code, d.message,
+                      fingerprint(d)) for d in diagnostics])
+                db.executemany("INSERT INTO run_files VALUES (?, ?, ?)",
+                               [(run_id, file_ids[file], n)
+                                for file, n in Counter(d.file for d in diagnostics).items()])
+                db.executemany("INSERT INTO run_codes VALUES (?, ?, ?)",
+                               [(run_id, code, n) for code, n in Counter(d.code for d in diagnostics).items()])
+                print(f"  {name}: {len(diagnostics)} diagnostics ({tool}{'' if parsed else ', unparsed'})")
+            db.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)",
+                       (path, st.st_size, st.st_mtime_ns, run_id))
+        ingested += 1
+    return ingested, unchanged
+
+
+def find_run(db, name):
+    row = db.execute("SELECT id, tool, parsed FROM runs WHERE name = ?", (name,)).fetchone()
+    if not row:
+        sys.exit(f"Unknown run: {name} (see `run_history.py runs`)")
+    if not row[2]:
+        sys.exit(f"Run {name} has no parsed result")
+    return row[0], row[1]
+
+
+def latest_run(db, tool):
+    row = db.execute("SELECT id, name FROM runs WHERE tool = ? AND parsed"
+                     " ORDER BY mtime_ns DESC, id DESC LIMIT 1", (tool,)).fetchone()
+    return row
+
+
+def compared_runs(db, since, run=None):
+    """(since_id, run_id, run_name) for a comparison; run defaults to the latest of the same tool."""
+    since_id, tool = find_run(db, since)
+    if run:
+        run_id, run_tool = find_run(db, run)
+        if run_tool != tool:
+            sys.exit(f"Cannot compare a {tool} run with a {run_tool} run")
+        return since_id, run_id, run
+    run_id, run = latest_run(db, tool)
+    return since_id, run_id, run
+
+
+def regressed_files(db, since_id, run_id):
+    """(path, count before, count after) of files with more diagnostics in run_id, worst first."""
+    return db.execute("""
+        SELECT f.path, COALESCE(b.n, 0), a.n
+        FROM run_files a
+        JOIN files f ON f.id = a.file_id
+        LEFT JOIN run_files b ON b.run_id = ? AND b.file_id = a.file_id
+        WHERE a.run_id = ? AND a.n > COALESCE(b.n, 0)
+        ORDER BY a.n - COALESCE(b.n, 0) DESC, f.path
+    """, (since_id, run_id)).fetchall()
+
+
+def new_diagnostics(db, since_id, run_id):
+    """Diagnostics of run_id whose fingerprint does not occur in since_id."""
+    return db.execute("""
+        SELECT f.path, d.line, d.col, d.code, d.message
+        FROM diagnostics d
+        JOIN files f ON f.id = d.file_id
+        WHERE d.run_id = ? AND NOT EXISTS (
+            SELECT 1 FROM diagnostics o WHERE o.fingerprint = d.fingerprint AND o.run_id = ?)
+        ORDER BY f.path, d.line, d.col
+    """, (run_id, since_id)).fetchall()
+
+
+def trend(db, tool, code=None, last=30):
+    """(run name, count) over the last parsed runs of tool, oldest first."""
+    runs = db.execute("SELECT id, name, total FROM runs WHERE tool = ? AND parsed"
+                      " ORDER BY mtime_ns DESC, id DESC LIMIT ?", (tool, last)).fetchall()
+    points = []
+    for run_id, name, total in reversed(runs):
+        if code:
+            row = db.execute("SELECT n FROM run_codes WHERE run_id = ? AND code = ?", (run_id, code)).fetchone()
+            total = row[0] if row else 0
+        points.append((name, total))
+    return points
+
+
+def print_runs(db, tool=None):
+    query = "SELECT name, tool, parsed, total, errors, warnings FROM runs"
+    params = ()
+    if tool:
+        query += " WHERE tool = ?"
+        params = (tool,)
+    rows = db.execute(query + " ORDER BY mtime_ns, id", params).fetchall()
+    print(f"{'run':<40} {'tool':<7} {'total':>7} {'errors':>7} {'warnings':>8}")
+    for name, run_tool, parsed, total, errors, warnings in rows:
+        if parsed:
+            print(f"{name:<40} {run_tool:<7} {total:>7} {errors:>7} {warnings:>8}")
+        else:
+            print(f"{name:<40} {run_tool:<7} {'(no result)':>24}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='History of lint and type-check runs')
+    parser.add_argument('--db', default=DEFAULT_DB, help='SQLite database')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help='Load new or changed run outputs')
+    ingest_parser.add_argument('artifacts', nargs='*', help=f'Run outputs (default: runs in {ARTIFACT_DIR})')
+    ingest_parser.add_argument('--root', default=BASE_PATH, help='Project root the reported paths are under')
+
+    runs_parser = commands.add_parser('runs', help='List the ingested runs')
+    runs_parser.add_argument('--tool', choices=('tsc', 'eslint'))
+
+    for command, description in (('regressed', 'Files with more diagnostics than in an earlier run'),
+                                 ('new', 'Diagnostics that are not in an earlier run')):
+        compare_parser = commands.add_parser(command, help=description)
+        compare_parser.add_argument('since', help='Earlier run')
+        compare_parser.add_argument('--run', help='Later run (default: latest run of the same tool)')
+        compare_parser.add_argument('--limit', type=int, default=50)
+
+    trend_parser = commands.add_parser('trend', help='Count of a code/rule (or all) over recent runs')
+    trend_parser.add_argument('code', nargs='?', help='TS code or eslint rule (default: all diagnostics)')
+    trend_parser.add_argument('--tool', choices=('tsc', 'eslint'))
+    trend_parser.add_argument('--last', type=int, default=30)
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    if args.command == 'ingest':
+        ingested, unchanged = ingest(db, args.artifacts or default_artifacts(), args.root)
+        print(f"Ingested {ingested} artifacts ({unchanged} unchanged) into {args.db}")
+    elif args.command == 'runs':
+        print_runs(db, args.tool)
+    elif args.command == 'regressed':
+        since_id, run_id, run = compared_runs(db, args.since, args.run)
+        rows = regressed_files(db, since_id, run_id)
+        print(f"{len(rows)} files regressed from {args.since} to {run}:")
+        for path, before, after in rows[:args.limit]:
+            print(f"  {after - before:+5d}  {path} ({before} -> {after})")
+    elif args.command == 'new':
+        since_id, run_id, run = compared_runs(db, args.since, args.run)
+        rows = new_diagnostics(db, since_id, run_id)
+        print(f"{len(rows)} diagnostics in {run} are not in {args.since}:")
+        for path, line, col, code, message in rows[:args.limit]:
+            print(f"  {path}:{line}:{col} {code} {message.splitlines()[0] if message else ''}")
+    elif args.command == 'trend':
+        tool = args.tool or ('tsc' if args.code and args.code.startswith('TS') else 'eslint' if args.code else 'tsc')
+        points = trend(db, tool, args.code, args.last)
+        print(f"{args.code or 'All diagnostics'} over the last {len(points)} {tool} runs:")
+        for name, n in points:
+            print(f"  {n:7d}  {name}")
+
+
+if __name__ == '__main__':
+    main()
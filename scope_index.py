@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Per-file scope and declaration index for hooks-dependency decisions.
+
+One ts_lexer pass records, per block scope, every binding and what kind of
+binding it is: imports, module-level declarations, declarations local to a
+component or hook, function parameters, and the React bindings that are
+stable across renders (useState setters, useReducer dispatch, useRef refs).
+Resolving a name at an offset walks the enclosing scopes with dict lookups,
+so nested components see their own locals rather than the outer ones.
+"""
+
+from bisect import bisect_right
+
+from import_index import parse_import
+from ts_lexer import NAME, PUNCT, LineIndex, is_jsx_path, strip_comments, tokenize
+
+IMPORT = 'import'
+MODULE = 'module'            # declared at module level
+LOCAL = 'local'              # declared inside a function or block
+PARAM = 'param'              # function parameter (props included)
+STATE = 'state'              # first element of useState/useReducer
+STATE_SETTER = 'state_setter'
+DISPATCH = 'dispatch'
+REF = 'ref'
+
+# React guarantees these keep their identity between renders
+STABLE_KINDS = frozenset([IMPORT, MODULE, STATE_SETTER, DISPATCH, REF])
+
+DECLARATION_KEYWORDS = frozenset(['const', 'let', 'var'])
+STATE_HOOKS = {'useState': STATE_SETTER, 'useReducer': DISPATCH}
+REF_HOOKS = frozenset(['useRef'])
+
+
+class Scope:
+    __slots__ = ('start', 'end', 'parent', 'bindings')
+
+    def __init__(self, start, end, parent):
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.bindings = {}
+
+
+class ScopeIndex:
+    """Bindings of one buffer, grouped by block scope.
+
+    `kind(name, offset)` returns the kind of the binding `name` resolves to
+    at offset (module scope when offset is None), or None when undeclared;
+    `offset(line, column)` converts a 1-based diagnostic position.
+    """
+
+    def __init__(self, text, path='', lexed=None):
+        self.text = text
+        self.lines = LineIndex(text)
+        if lexed is None:
+            lexed = tokenize(text, jsx=is_jsx_path(path) if path else True)
+        self.tokens, self.pairs = strip_comments(lexed)
+        self.module = Scope(0, len(text), None)
+        self.scopes = [self.module]
+        self._build()
+        self.scopes.sort(key=lambda s: s.start)
+        self._starts = [s.start for s in self.scopes]
+
+    # -- construction -----------------------------------------------------
+
+    def _build(self):
+        tokens = self.tokens
+        stack = [self.module]
+        block_of = {}  # '{' token index -> Scope
+        for i, token in enumerate(tokens):
+            value = token.value
+            if token.kind == PUNCT:
+                if value in ('{', '${'):
+                    scope = block_of.get(i) or self._new_scope(i, stack[-1])
+                    stack.append(scope)
+                elif value == '}' and len(stack) > 1:
+                    stack.pop()
+                elif value == '=>':
+                    self._arrow_params(i, stack[-1], block_of)
+                continue
+            if token.kind != NAME:
+                continue
+            scope = stack[-1]
+            if value in DECLARATION_KEYWORDS:
+                self._declaration(i, scope)
+            elif value in ('function', 'class'):
+                self._named(i, scope, block_of)
+            elif value == 'import' and scope is self.module:
+                self._import(i)
+
+    def _new_scope(self, brace, parent):
+        end = self.pairs.get(brace)
+        end_offset = self.tokens[end].end if end is not None else len(self.text)
+        scope = Scope(self.tokens[brace].start, end_offset, parent)
+        self.scopes.append(scope)
+        return scope
+
+    def _bind(self, scope, name, kind):
+        # A more specific kind (e.g. a hook result) wins over a plain declaration
+        if name not in scope.bindings or kind != LOCAL:
+            scope.bindings[name] = kind
+
+    def _declared_kind(self, scope):
+        return MODULE if scope is self.module else LOCAL
+
+    def _declaration(self, i, scope):
+        tokens = self.tokens
+        if i + 1 >= len(tokens):
+            return
+        kind = self._declared_kind(scope)
+        target = tokens[i + 1]
+        if target.kind == NAME:
+            self._bind(scope, target.value, kind)
+            init = self._initializer(i + 2)
+            if init is not None and tokens[init].value in REF_HOOKS:
+                self._bind(scope, target.value, REF)
+            return
+        if target.value not in ('[', '{') or i + 1 not in self.pairs:
+            return
+        close = self.pairs[i + 1]
+        names = []
+        self._pattern_names(i + 1, close, names)
+        for name in names:
+            self._bind(scope, name, kind)
+        init = self._initializer(close + 1)
+        if target.value == '[' and init is not None and tokens[init].value in STATE_HOOKS:
+            elements = self._array_elements(i + 1, close)
+            if elements:
+                self._bind(scope, elements[0], STATE)
+            if len(elements) > 1:
+                self._bind(scope, elements[1], STATE_HOOKS[tokens[init].value])
+
+    def _initializer(self, i):
+        """Index of the callee name when tokens[i:] is '= [React.]hook', else None."""
+        tokens = self.tokens
+        j = i
+        if j < len(tokens) and tokens[j].value == ':':
+            # Skip a type annotation up to the '=' at this depth
+            while j < len(tokens) and tokens[j].value not in ('=', ';'):
+                j = self.pairs.get(j, j) + 1
+        if j >= len(tokens) or tokens[j].value != '=':
+            return None
+        j += 1
+        if j + 2 < len(tokens) and tokens[j].value == 'React' and tokens[j + 1].value == '.':
+            j += 2
+        return j if j < len(tokens) and tokens[j].kind == NAME else None
+
+    def _array_elements(self, open_index, close):
+        """Top-level element names of an array pattern ('' for holes and nested patterns)."""
+        tokens = self.tokens
+        elements = []
+        current = ''
+        j = open_index + 1
+        while j < close:
+            value = tokens[j].value
+            if value == ',':
+                elements.append(current)
+                current = ''
+            elif tokens[j].kind == NAME and not current and tokens[j - 1].value in ('[', ','):
+                current = value
+            j = self.pairs.get(j, j) + 1 if value in ('(', '[', '{') else j + 1
+        elements.append(current)
+        return elements
+
+    def _pattern_names(self, open_index, close, names):
+        """Collect the binding names of an object/array pattern or parameter list."""
+        tokens = self.tokens
+        is_object = tokens[open_index].value == '{'
+        j = open_index + 1
+        at_element = True
+        while j < close:
+            token = tokens[j]
+            value = token.value
+            if value == ',':
+                at_element = True
+                j += 1
+                continue
+            if not at_element:
+                # Type annotations and default values up to the next ','
+                j = self.pairs.get(j, j) + 1 if value in ('(', '[', '{', '<') else j + 1
+                continue
+            if value == '...':
+                j += 1
+                continue
+            if value in ('[', '{') and j in self.pairs:
+                self._pattern_names(j, self.pairs[j], names)
+                j = self.pairs[j] + 1
+                at_element = False
+                continue
+            if token.kind == NAME:
+                following = tokens[j + 1].value if j + 1 < close else ''
+                if is_object and following == ':':
+                    # { key: pattern } binds the pattern, not the key
+                    j += 2
+                    continue
+                if value not in ('this', 'public', 'private', 'protected', 'readonly'):
+                    names.append(value)
+                    at_element = False
+                j += 1
+                continue
+            j += 1
+
+    def _named(self, i, scope, block_of):
+        tokens = self.tokens
+        j = i + 1
+        if j < len(tokens) and tokens[j].value == '*':
+            j += 1
+        if j < len(tokens) and tokens[j].kind == NAME:
+            self._bind(scope, tokens[j].value, self._declared_kind(scope))
+            j += 1
+        if tokens[i].value != 'function':
+            return
+        # Skip type parameters: function f<T>(...)
+        while j < len(tokens) and tokens[j].value not in ('(', '{', ';'):
+            j += 1
+        if j < len(tokens) and tokens[j].value == '(' and j in self.pairs:
+            close = self.pairs[j]
+            body = self._next_brace(close + 1)
+            if body is not None:
+                self._bind_params(j, close, self._body_scope(body, scope, block_of))
+
+    def _arrow_params(self, i, scope, block_of):
+        tokens = self.tokens
+        params = self._arrow_param_end(i)
+        if i + 1 < len(tokens) and tokens[i + 1].value == '{':
+            target = self._body_scope(i + 1, scope, block_of)
+        else:
+            target = self._expression_scope(i, scope)
+        if params is None:
+            return
+        if tokens[params].value == ')':
+            if params in self.pairs:
+                self._bind_params(self.pairs[params], params, target)
+        else:
+            self._bind(target, tokens[params].value, PARAM)
+
+    def _arrow_param_end(self, arrow):
+        """Index of the ')' (or single NAME) holding an arrow's parameters."""
+        tokens = self.tokens
+        j = arrow - 1
+        if j < 0:
+            return None
+        if tokens[j].value == ')':
+            return j
+        if tokens[j].kind == NAME and (j == 0 or tokens[j - 1].value != ':'):
+            return j
+        # Skip a return type annotation: (a): Promise<void> => ...
+        while j > 0 and tokens[j].value not in (';', '{', '}', '=', '=>'):
+            if tokens[j].value == ':' and tokens[j - 1].value == ')':
+                return j - 1
+            j = self.pairs.get(j, j) - 1 if tokens[j].value in (')', ']') else j - 1
+        return None
+
+    def _body_scope(self, brace, parent, block_of):
+        if brace not in block_of:
+            block_of[brace] = self._new_scope(brace, parent)
+        return block_of[brace]
+
+    def _expression_scope(self, arrow, parent):
+        # An expression-bodied arrow's parameters are visible until the end of
+        # the innermost bracket around it (e.g. the call in items.map(x => ...))
+        end = len(self.text)
+        depth = 0
+        for j in range(arrow + 1, len(self.tokens)):
+            value = self.tokens[j].value
+            if value in ('(', '[', '{', '${'):
+                depth += 1
+            elif value in (')', ']', '}'):
+                if depth == 0:
+                    end = self.tokens[j].start
+                    break
+                depth -= 1
+            elif depth == 0 and value in (';', ','):
+                end = self.tokens[j].start
+                break
+        scope = Scope(self.tokens[arrow].start, end, parent)
+        self.scopes.append(scope)
+        return scope
+
+    def _bind_params(self, open_index, close, scope):
+        names = []
+        self._pattern_names(open_index, close, names)
+        for name in names:
+            self._bind(scope, name, PARAM)
+
+    def _next_brace(self, j):
+        tokens = self.tokens
+        while j < len(tokens):
+            value = tokens[j].value
+            if value == '{':
+                return j
+            if value in (';', '=>'):
+                return None
+            j = self.pairs.get(j, j) + 1 if value in ('(', '[', '<') else j + 1
+        return None
+
+    def _import(self, i):
+        statement, _ = parse_import(self.tokens, self.pairs, i)
+        if statement is not None:
+            for binding in statement.bindings:
+                self._bind(self.module, binding.name, IMPORT)
+
+    # -- queries ------------------------------------------------------------
+
+    def scope_at(self, offset):
+        """Innermost scope containing offset."""
+        # Scopes nest, so the last one starting before offset either contains
+        # it or sits inside the scope that does
+        i = bisect_right(self._starts, offset) - 1
+        scope = self.scopes[i] if i >= 0 else self.module
+        while scope is not None and not scope.start <= offset < scope.end:
+            scope = scope.parent
+        return scope or self.module
+
+    def kind(self, name, offset=None):
+        """Kind of binding `name` resolves to at offset, or None if undeclared."""
+        scope = self.module if offset is None else self.scope_at(offset)
+        while scope is not None:
+            kind = scope.bindings.get(name)
+            if kind is not None:
+                return kind
+            scope = scope.parent
+        return None
+
+    def offset(self, line, column=1):
+        return self.lines.offset(line, column)
+
+    def is_stable(self, name, offset=None):
+        return self.kind(name, offset) in STABLE_KINDS
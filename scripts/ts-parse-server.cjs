@@ -0,0 +1,52 @@
+#!/usr/bin/env node
+
+/**
+ * TypeScript Parse Server
+ *
+ * Long-lived helper for the Python codemod writer (codemod_writer.py).
+ * Reads one JSON request per line on stdin: { id, file, text }
+ * and answers one JSON line per request: { id, ok, line, character, message }
+ * describing the first syntactic diagnostic (line/character are 0-based,
+ * character in UTF-16 code units as reported by the compiler).
+ */
+
+const readline = require('readline');
+const ts = require('typescript');
+
+function scriptKind(file) {
+  if (file.endsWith('.tsx')) return ts.ScriptKind.TSX;
+  if (file.endsWith('.jsx')) return ts.ScriptKind.JSX;
+  if (/\.[cm]?js$/.test(file)) return ts.ScriptKind.JS;
+  return ts.ScriptKind.TS;
+}
+
+function firstSyntaxError(file, text) {
+  const source = ts.createSourceFile(file, text, ts.ScriptTarget.Latest, false, scriptKind(file));
+  const diagnostics = source.parseDiagnostics || [];
+  if (diagnostics.length === 0) {
+    return { ok: true };
+  }
+  const first = diagnostics[0];
+  const { line, character } = source.getLineAndCharacterOfPosition(first.start);
+  return {
+    ok: false,
+    line,
+    character,
+    message: ts.flattenDiagnosticMessageText(first.messageText, ' '),
+  };
+}
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+
+rl.on('line', (line) => {
+  if (!line.trim()) return;
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    process.stdout.write(JSON.stringify({ id: null, ok: false, message: `bad request: ${error.message}` }) + '\n');
+    return;
+  }
+  const reply = { id: request.id, ...firstSyntaxError(request.file || 'input.ts', request.text || '') };
+  process.stdout.write(JSON.stringify(reply) + '\n');
+});
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Linear-time locator for try/catch/finally blocks.
+
+Blocks are found from the ts_lexer token stream using its bracket pairing,
+so every `try` is visited once and nothing backtracks over the rest of the
+file. Each block exposes its try body, catch parameter, catch body split
+into top-level statements, and optional finally body, for the try/catch
+cleaners to classify with plain string checks.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from ts_lexer import (
+    COMMENT, NAME, NUMBER, STRING, TEMPLATE, REGEX, is_jsx_path, tokenize,
+)
+
+# A line break after one of these may end a statement (automatic semicolon)
+_STATEMENT_END_KINDS = (NAME, NUMBER, STRING, TEMPLATE, REGEX)
+_STATEMENT_END_PUNCT = frozenset([')', ']', '}', '++', '--'])
+# ...unless the next line starts with one of these
+_CONTINUATION_NAMES = frozenset([
+    'else', 'catch', 'finally', 'instanceof', 'in', 'of', 'as', 'satisfies',
+])
+
+
+class Statement(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+class Block(NamedTuple):
+    open: int                  # offset of '{'
+    close: int                 # offset just past '}'
+    statements: List[Statement]
+    has_comments: bool
+
+    def body(self, text):
+        """Source between the braces."""
+        return text[self.open + 1:self.close - 1]
+
+
+class TryBlock(NamedTuple):
+    start: int                 # offset of the start of the line holding 'try'
+    try_offset: int            # offset of the 'try' keyword
+    end: int                   # offset just past the last '}'
+    indentation: str           # whitespace before 'try' on its line
+    try_block: Block
+    catch_param: Optional[str]  # None for `catch {` and when there is no catch
+    catch_block: Optional[Block]
+    finally_block: Optional[Block]
+
+
+def _line_start(text, offset):
+    return text.rfind('\n', 0, offset) + 1
+
+
+def _block(text, tokens, pairs, open_index):
+    close_index = pairs[open_index]
+    statements = []
+    has_comments = False
+    first = None
+    j = open_index + 1
+    last = None
+    while j < close_index:
+        token = tokens[j]
+        if token.kind == COMMENT:
+            has_comments = True
+            j += 1
+            continue
+        if first is None:
+            first = token
+        elif last is not None and _ends_statement(text, last, token):
+            statements.append(Statement(text[first.start:last.end], first.start, last.end))
+            first = token
+        if token.value in ('(', '[', '{', '${') and j in pairs:
+            # Skip nested brackets wholesale, noting comments inside
+            k = pairs[j]
+            if not has_comments:
+                has_comments = any(t.kind == COMMENT for t in tokens[j + 1:k])
+            last = tokens[k]
+            j = k + 1
+            continue
+        if token.value == ';':
+            statements.append(Statement(text[first.start:token.end], first.start, token.end))
+            first = last = None
+        else:
+            last = token
+        j += 1
+    if first is not None and last is not None:
+        statements.append(Statement(text[first.start:last.end], first.start, last.end))
+    return Block(tokens[open_index].start, tokens[close_index].end, statements, has_comments)
+
+
+def _ends_statement(text, last, token):
+    """Whether a line break between last and token ends a statement."""
+    if '\n' not in text[last.end:token.start]:
+        return False
+    if not (last.kind in _STATEMENT_END_KINDS or last.value in _STATEMENT_END_PUNCT):
+        return False
+    return token.kind == NAME and token.value not in _CONTINUATION_NAMES
+
+
+def _next_code(tokens, j):
+    while j < len(tokens) and tokens[j].kind == COMMENT:
+        j += 1
+    return j
+
+
+def find_try_blocks(text, path='', lexed=None) -> List[TryBlock]:
+    """Every try statement in text, in source order."""
+    if lexed is None:
+        lexed = tokenize(text, jsx=is_jsx_path(path) if path else True)
+    tokens, pairs = lexed.tokens, lexed.pairs
+    blocks = []
+    previous = None
+    for i, token in enumerate(tokens):
+        if token.kind == COMMENT:
+            continue
+        if token.kind == NAME and token.value == 'try' and previous not in ('.', '?.'):
+            block = _try_at(text, tokens, pairs, i)
+            if block is not None:
+                blocks.append(block)
+        previous = token.value
+    return blocks
+
+
+def _try_at(text, tokens, pairs, i):
+    j = _next_code(tokens, i + 1)
+    if j >= len(tokens) or tokens[j].value != '{' or j not in pairs:
+        return None
+    try_block = _block(text, tokens, pairs, j)
+    end = try_block.close
+    j = _next_code(tokens, pairs[j] + 1)
+
+    catch_param = catch_block = finally_block = None
+    if j < len(tokens) and tokens[j].value == 'catch':
+        j = _next_code(tokens, j + 1)
+        if j < len(tokens) and tokens[j].value == '(' and j in pairs:
+            inside = [t for t in tokens[j + 1:pairs[j]] if t.kind != COMMENT]
+            if inside and inside[0].kind == NAME:
+                catch_param = inside[0].value
+            j = _next_code(tokens, pairs[j] + 1)
+        if j >= len(tokens) or tokens[j].value != '{' or j not in pairs:
+            return None
+        catch_block = _block(text, tokens, pairs, j)
+        end = catch_block.close
+        j = _next_code(tokens, pairs[j] + 1)
+    if j < len(tokens) and tokens[j].value == 'finally':
+        j = _next_code(tokens, j + 1)
+        if j < len(tokens) and tokens[j].value == '{' and j in pairs:
+            finally_block = _block(text, tokens, pairs, j)
+            end = finally_block.close
+
+    start = _line_start(text, tokens[i].start)
+    indentation = text[start:tokens[i].start]
+    if indentation.strip():
+        # 'try' does not start its line; keep whatever precedes it
+        start = tokens[i].start
+        indentation = ''
+    return TryBlock(start, tokens[i].start, end, indentation,
+                    try_block, catch_param, catch_block, finally_block)
+
+
+def is_console_call(statement, methods=('error', 'log', 'warn')):
+    """console.<method>(...) as a whole statement."""
+    text = statement.text.rstrip(';').rstrip()
+    for method in methods:
+        prefix = f'console.{method}('
+        if text.startswith(prefix) and text.endswith(')'):
+            return True
+    return False
+
+
+def is_rethrow(statement, name):
+    """`throw <name>;` (semicolon optional)."""
+    text = statement.text.rstrip(';').rstrip()
+    return text.startswith('throw') and text[5:].strip() == name
+
+
+def reindent_body(text, block, indentation):
+    """The try body's statements re-indented to the try statement's level."""
+    lines = block.body(text).strip('\n').split('\n')
+    content = [line for line in lines if line.strip()]
+    if not content:
+        return ''
+    common = min(len(line) - len(line.lstrip()) for line in content)
+    return '\n'.join(indentation + line[common:].rstrip() if line.strip() else ''
+                     for line in lines).strip('\n')
+
+
+def describe(text, block):
+    """Dict form used by the cleaners' logs and fix_pattern()."""
+    return {
+        'full_match': text[block.start:block.end],
+        'indentation': block.indentation,
+        'try_body': block.try_block.body(text),
+        'error_var': block.catch_param,
+        'start': block.start,
+        'end': block.end,
+        'replacement': reindent_body(text, block.try_block, block.indentation),
+    }
+
+
+def outermost(blocks):
+    """Drop blocks nested inside an earlier one so edits never overlap."""
+    kept = []
+    end = -1
+    for block in sorted(blocks, key=lambda b: b.start):
+        if block.start >= end:
+            kept.append(block)
+            end = block.end
+    return kept
@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Lightweight TypeScript/TSX lexer shared by the codemod and triage scripts.
+
+It understands comments, string/template/regex literals and JSX well enough
+to track bracket and tag nesting without a full parse. Two entry points:
+
+- first_problem(): fast structural check, stops at the first unbalanced
+  bracket, JSX tag or unterminated literal.
+- tokenize(): full token stream with bracket/tag pairing, used by the
+  per-file indexes.
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+Token = namedtuple('Token', 'kind value start end')
+LexError = namedtuple('LexError', 'kind message pos related')
+Lexed = namedtuple('Lexed', 'tokens pairs errors')
+
+# Token kinds
+NAME = 'name'
+NUMBER = 'number'
+STRING = 'string'
+TEMPLATE = 'template'
+REGEX = 'regex'
+COMMENT = 'comment'
+PUNCT = 'punct'
+JSX_OPEN = 'jsx_open'              # value: tag name ('' for fragments)
+JSX_ATTR = 'jsx_attr'              # value: attribute name
+JSX_STRING = 'jsx_string'
+JSX_END = 'jsx_end'                # '>' closing an opening tag
+JSX_SELF_CLOSE = 'jsx_self_close'  # '/>'
+JSX_CLOSE = 'jsx_close'            # value: tag name of '</name>'
+JSX_TEXT = 'jsx_text'
+
+JSX_SUFFIXES = ('.tsx', '.jsx', '.js')
+
+OPENERS = {'(': ')', '[': ']', '{': '}'}
+CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+# Keywords after which an expression (and so a regex or JSX) may start
+EXPR_KEYWORDS = frozenset([
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+])
+
+_WS_RE = re.compile(r'\s+')
+_FAST_RE = re.compile(r'[/\'"`(){}\[\]]')
+_FAST_JSX_RE = re.compile(r'[/\'"`(){}\[\]<]')
+_TOKEN_RE = re.compile(r"""
+    (?P<name>(?:[^\W\d]|\$)(?:\w|\$)*)
+  | (?P<number>(?:\d|\.\d)(?:[eE][+-]|[\w.])*)
+  | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=
+      |<=|>=|&&|\|\||\?\?|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|%=|&=|\|=|\^=|\*\*
+      |<<|>>|[;,<>+\-*%&|^!~?:=.@\#\\])
+""", re.X)
+# Collect-mode fast path: optional whitespace then a name, number or
+# punctuator other than '<' (which may open JSX)
+_CODE_TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<name>(?:[^\W\d]|\$)(?:\w|\$)*)
+    | (?P<number>(?:\d|\.\d)(?:[eE][+-]|[\w.])*)
+    | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=
+        |>=|&&|\|\||\?\?|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|%=|&=|\|=|\^=|\*\*
+        |>>|[;,>+\-*%&|^!~?:=.@\#\\])
+    )
+""", re.X)
+_STRING_RES = {
+    "'": re.compile(r"'(?:[^'\\\n]|\\[\s\S])*'"),
+    '"': re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"'),
+}
+_REGEX_RE = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_TEMPLATE_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+_CHILD_RE = re.compile(r'[{<]')
+_JSX_NAME_RE = re.compile(r'(?:[^\W\d]|\$)[\w$\-]*(?:[.:][\w$\-]+)*')
+_JSX_ATTR_RE = re.compile(r'(?:[^\W\d]|\$)[\w$\-]*(?::[\w$\-]+)?')
+_JSX_ATTR_STRING_RES = {'"': re.compile(r'"[^"]*"'), "'": re.compile(r"'[^']*'")}
+_JSX_CLOSE_RE = re.compile(r'</\s*(?:((?:[^\W\d]|\$)[\w$\-]*(?:[.:][\w$\-]+)*)\s*)?>')
+_GENERIC_ARROW_RE = re.compile(r'\s*(?:,|=[^>]|extends\b)')
+_JSX_TAG_COMMENT_RE = re.compile(r'//[^\n]*|/\*[\s\S]*?\*/')
+
+
+def is_jsx_path(path):
+    """Whether files with this path may contain JSX."""
+    return str(path).endswith(JSX_SUFFIXES)
+
+
+def _is_word_char(c):
+    return c.isalnum() or c == '_' or c == '$'
+
+
+def _previous_significant(text, pos):
+    """Return (char, word) for the last non-whitespace character before pos."""
+    j = pos - 1
+    while j >= 0 and text[j] in ' \t\r\n\f\v':
+        j -= 1
+    if j < 0:
+        return '', ''
+    c = text[j]
+    if not _is_word_char(c):
+        return c, ''
+    k = j
+    while k > 0 and _is_word_char(text[k - 1]):
+        k -= 1
+    return c, text[k:j + 1]
+
+
+def _expression_may_start(text, pos, after_brace):
+    """Heuristic used for both regex literals and JSX: is pos in expression position?"""
+    c, word = _previous_significant(text, pos)
+    if not c:
+        return True
+    if word:
+        return word in EXPR_KEYWORDS
+    if c in ')]\'"`':
+        return False
+    if c == '}':
+        return after_brace
+    return True
+
+
+class _Scanner:
+    """Single-pass scanner; see tokenize() and first_problem()."""
+
+    def __init__(self, text, jsx, collect, stop_at_first):
+        self.text = text
+        self.n = len(text)
+        self.jsx = jsx
+        self.tokens = [] if collect else None
+        self.pairs = {} if collect else None
+        self.stop_at_first = stop_at_first
+        self.errors = []
+        # Stack entries: [kind, pos, restore_mode, restore_tag, name, token_index]
+        self.stack = []
+
+    # -- helpers ---------------------------------------------------------
+
+    def emit(self, kind, start, end, value=None):
+        if self.tokens is not None:
+            self.tokens.append(Token(kind, self.text[start:end] if value is None else value, start, end))
+        return len(self.tokens) - 1 if self.tokens is not None else -1
+
+    def error(self, kind, message, pos, related=None):
+        self.errors.append(LexError(kind, message, pos, related))
+        return self.stop_at_first
+
+    def push(self, kind, pos, mode, tag, name=None, token_index=-1):
+        self.stack.append([kind, pos, mode, tag, name, token_index])
+
+    def pop_to(self, index, close_token):
+        """Pop the stack down to and including index; record pairing."""
+        entry = self.stack[index]
+        del self.stack[index:]
+        if self.pairs is not None and entry[5] >= 0 and close_token >= 0:
+            self.pairs[entry[5]] = close_token
+            self.pairs[close_token] = entry[5]
+        return entry
+
+    def find_open(self, kind, name=None):
+        for i in range(len(self.stack) - 1, -1, -1):
+            entry = self.stack[i]
+            if entry[0] == kind and (name is None or entry[4] == name):
+                return i
+        return -1
+
+    # -- main loop -------------------------------------------------------
+
+    def run(self):
+        text, n = self.text, self.n
+        pos = 0
+        if text.startswith('#!'):
+            pos = text.find('\n')
+            pos = n if pos < 0 else pos
+        mode = 'code'
+        tag = None  # (name, start, parent_mode, outer_tag) while inside an opening tag
+        collect = self.tokens is not None
+        fast = not collect
+        stack = self.stack
+        code_re = _FAST_JSX_RE if self.jsx else _FAST_RE
+        code_token = _CODE_TOKEN_RE.match
+        append = self.tokens.append if collect else None
+
+        while pos < n:
+            if mode == 'code':
+                if fast:
+                    # Tight loop over plain brackets; anything else falls through.
+                    m = restored = None
+                    for m in code_re.finditer(text, pos):
+                        ch = m.group()
+                        if ch in OPENERS:
+                            stack.append([ch, m.start(), 'code', tag, None, -1])
+                        elif ch in CLOSERS and stack and stack[-1][0] == CLOSERS[ch]:
+                            top = stack.pop()
+                            if top[2] != 'code':
+                                restored = top
+                                break
+                        else:
+                            break
+                    else:
+                        break
+                    if restored is not None:
+                        mode, tag = restored[2], restored[3]
+                        pos = m.end()
+                        continue
+                    pos = m.start()
+                else:
+                    m = code_token(text, pos)
+                    if m is not None:
+                        kind = m.lastgroup
+                        start = m.start(kind)
+                        pos = m.end()
+                        append(Token(kind, text[start:pos], start, pos))
+                        continue
+                    m = _WS_RE.match(text, pos)
+                    if m:
+                        pos = m.end()
+                        if pos >= n:
+                            break
+                ch = text[pos]
+
+                if ch in OPENERS:
+                    idx = self.emit(PUNCT, pos, pos + 1) if collect else -1
+                    stack.append([ch, pos, 'code', tag, None, idx])
+                    pos += 1
+
+                elif ch in CLOSERS:
+                    idx = self.emit(PUNCT, pos, pos + 1) if collect else -1
+                    top = stack[-1] if stack else None
+                    if top is not None and (top[0] == CLOSERS[ch] or (ch == '}' and top[0] == '${')):
+                        if collect:
+                            self.pop_to(len(stack) - 1, idx)
+                        else:
+                            stack.pop()
+                        mode, tag = top[2], top[3]
+                    elif top is None:
+                        if self.error('unexpected', "unexpected '%s' with no matching opener" % ch, pos):
+                            break
+                    else:
+                        if self.error('mismatch', "'%s' does not close '%s'" % (ch, top[0]), pos, top[1]):
+                            break
+                        i = self.find_open(CLOSERS[ch])
+                        if i >= 0:
+                            entry = self.pop_to(i, idx)
+                            mode, tag = entry[2], entry[3]
+                    pos += 1
+
+                elif ch == '/':
+                    nxt = text[pos + 1:pos + 2]
+                    if nxt == '/':
+                        end = text.find('\n', pos)
+                        end = n if end < 0 else end
+                        self.emit(COMMENT, pos, end)
+                        pos = end
+                    elif nxt == '*':
+                        end = text.find('*/', pos + 2)
+                        if end < 0:
+                            if self.error('unterminated', 'unterminated block comment', pos):
+                                break
+                            end = n
+                        else:
+                            end += 2
+                        self.emit(COMMENT, pos, end)
+                        pos = end
+                    else:
+                        m = None
+                        if _expression_may_start(text, pos, True):
+                            m = _REGEX_RE.match(text, pos)
+                        if m:
+                            self.emit(REGEX, pos, m.end())
+                            pos = m.end()
+                        else:
+                            end = pos + 2 if nxt == '=' else pos + 1
+                            self.emit(PUNCT, pos, end)
+                            pos = end
+
+                elif ch == "'" or ch == '"':
+                    m = _STRING_RES[ch].match(text, pos)
+                    if m:
+                        self.emit(STRING, pos, m.end())
+                        pos = m.end()
+                    else:
+                        if self.error('unterminated', 'unterminated string literal', pos):
+                            break
+                        end = text.find('\n', pos)
+                        end = n if end < 0 else end
+                        self.emit(STRING, pos, end)
+                        pos = end
+
+                elif ch == '`':
+                    idx = self.emit(PUNCT, pos, pos + 1)
+                    self.push('`', pos, 'code', tag, None, idx)
+                    mode = 'template'
+                    pos += 1
+
+                elif ch == '<' and self.jsx and _expression_may_start(text, pos, False):
+                    new_mode, new_tag, pos = self.open_tag(pos, 'code', tag)
+                    if new_mode is None:
+                        pos = self.punct(pos)
+                    else:
+                        mode, tag = new_mode, new_tag
+
+                elif fast:
+                    pos += 1
+
+                else:
+                    pos = self.punct(pos)
+
+            elif mode == 'template':
+                m = _TEMPLATE_RE.match(text, pos)
+                end = m.end()
+                if end > pos:
+                    self.emit(TEMPLATE, pos, end)
+                if end >= n:
+                    pos = n
+                    break
+                if text[end] == '`':
+                    idx = self.emit(PUNCT, end, end + 1)
+                    entry = self.pop_to(len(self.stack) - 1, idx)
+                    mode, tag = entry[2], entry[3]
+                    pos = end + 1
+                else:
+                    idx = self.emit(PUNCT, end, end + 2)
+                    self.push('${', end, 'template', tag, None, idx)
+                    mode = 'code'
+                    pos = end + 2
+
+            elif mode == 'children':
+                m = _CHILD_RE.search(text, pos)
+                end = m.start() if m else n
+                if end > pos:
+                    self.emit(JSX_TEXT, pos, end)
+                pos = end
+                if not m:
+                    break
+                if text[pos] == '{':
+                    idx = self.emit(PUNCT, pos, pos + 1)
+                    self.push('{', pos, 'children', tag, None, idx)
+                    mode = 'code'
+                    pos += 1
+                elif text.startswith('</', pos):
+                    m = _JSX_CLOSE_RE.match(text, pos)
+                    if not m:
+                        if self.error('jsx', 'malformed JSX closing tag', pos):
+                            break
+                        pos += 2
+                        continue
+                    name = m.group(1) or ''
+                    idx = self.emit(JSX_CLOSE, pos, m.end(), name)
+                    top = self.stack[-1] if self.stack else None
+                    if top is not None and top[0] == '<' and top[4] == name:
+                        entry = self.pop_to(len(self.stack) - 1, idx)
+                        mode, tag = entry[2], entry[3]
+                    else:
+                        if top is not None and top[0] == '<':
+                            message = 'closing tag </%s> does not match <%s>' % (name, top[4])
+                            related = top[1]
+                        else:
+                            message = 'closing tag </%s> with no matching opening tag' % name
+                            related = None
+                        if self.error('jsx', message, pos, related):
+                            break
+                        i = self.find_open('<', name)
+                        if i >= 0:
+                            entry = self.pop_to(i, idx)
+                            mode, tag = entry[2], entry[3]
+                    pos = m.end()
+                else:
+                    new_mode, new_tag, new_pos = self.open_tag(pos, 'children', tag)
+                    if new_mode is None:
+                        self.emit(JSX_TEXT, pos, pos + 1)
+                        pos += 1
+                    else:
+                        mode, tag, pos = new_mode, new_tag, new_pos
+
+            else:  # mode == 'attr'
+                m = _WS_RE.match(text, pos)
+                if m:
+                    pos = m.end()
+                    if pos >= n:
+                        break
+                ch = text[pos]
+                if ch == '/' and not text.startswith('/>', pos):
+                    m = _JSX_TAG_COMMENT_RE.match(text, pos)
+                    if m:
+                        self.emit(COMMENT, pos, m.end())
+                        pos = m.end()
+                        continue
+                if ch == '/' and text.startswith('/>', pos):
+                    self.emit(JSX_SELF_CLOSE, pos, pos + 2)
+                    mode, tag = tag[2], tag[3]
+                    pos += 2
+                elif ch == '>':
+                    idx = self.emit(JSX_END, pos, pos + 1)
+                    self.push('<', tag[1], tag[2], tag[3], tag[0], tag[4])
+                    mode, tag = 'children', None
+                    pos += 1
+                elif ch == '{':
+                    idx = self.emit(PUNCT, pos, pos + 1)
+                    self.push('{', pos, 'attr', tag, None, idx)
+                    mode = 'code'
+                    pos += 1
+                else:
+                    m = _JSX_ATTR_RE.match(text, pos)
+                    if not m:
+                        if self.error('jsx', "unexpected '%s' inside JSX tag <%s>" % (ch, tag[0]), pos, tag[1]):
+                            break
+                        mode, tag = tag[2], tag[3]
+                        pos += 1
+                        continue
+                    self.emit(JSX_ATTR, pos, m.end())
+                    pos = m.end()
+                    m = _WS_RE.match(text, pos)
+                    if m:
+                        pos = m.end()
+                    if text.startswith('=', pos):
+                        pos += 1
+                        m = _WS_RE.match(text, pos)
+                        if m:
+                            pos = m.end()
+                        ch = text[pos:pos + 1]
+                        if ch in _JSX_ATTR_STRING_RES:
+                            m = _JSX_ATTR_STRING_RES[ch].match(text, pos)
+                            if not m:
+                                if self.error('unterminated', 'unterminated JSX attribute string', pos):
+                                    break
+                                pos = n
+                                continue
+                            self.emit(JSX_STRING, pos, m.end())
+                            pos = m.end()
+                        elif ch == '{':
+                            idx = self.emit(PUNCT, pos, pos + 1)
+                            self.push('{', pos, 'attr', tag, None, idx)
+                            mode = 'code'
+                            pos += 1
+                        elif ch == '<':
+                            new_mode, new_tag, new_pos = self.open_tag(pos, 'attr', tag)
+                            if new_mode is None:
+                                if self.error('jsx', 'invalid JSX attribute value', pos, tag[1]):
+                                    break
+                                pos += 1
+                            else:
+                                mode, tag, pos = new_mode, new_tag, new_pos
+
+        if not (self.stop_at_first and self.errors):
+            if mode == 'attr' and tag is not None:
+                self.error('unclosed', 'unterminated JSX opening tag <%s>' % tag[0], tag[1])
+            elif self.stack:
+                top = self.stack[-1]
+                if top[0] == '<':
+                    message = 'unclosed JSX element <%s>' % top[4]
+                elif top[0] == '`':
+                    message = 'unterminated template literal'
+                else:
+                    message = "unmatched '%s'" % top[0]
+                self.error('unclosed', message, top[1])
+        return self.errors
+
+    def punct(self, pos):
+        m = _TOKEN_RE.match(self.text, pos)
+        if m:
+            kind = m.lastgroup
+            self.emit(kind, pos, m.end())
+            return m.end()
+        self.emit(PUNCT, pos, pos + 1)
+        return pos + 1
+
+    def open_tag(self, pos, parent_mode, outer_tag):
+        """Try to open a JSX tag at pos; returns (mode, tag, pos) or (None, None, pos)."""
+        text = self.text
+        if text.startswith('<>', pos):
+            idx = self.emit(JSX_OPEN, pos, pos + 1, '')
+            self.emit(JSX_END, pos + 1, pos + 2)
+            self.push('<', pos, parent_mode, outer_tag, '', idx)
+            return 'children', None, pos + 2
+        m = _JSX_NAME_RE.match(text, pos + 1)
+        if not m or _GENERIC_ARROW_RE.match(text, m.end()):
+            return None, None, pos
+        idx = self.emit(JSX_OPEN, pos, m.end(), m.group(0))
+        return 'attr', (m.group(0), pos, parent_mode, outer_tag, idx), m.end()
+
+
+def tokenize(text, jsx=True):
+    """Tokenize text; returns Lexed(tokens, pairs, errors).
+
+    pairs maps the token index of every bracket, template delimiter and JSX
+    element opener to the index of its partner (both directions).
+    """
+    scanner = _Scanner(text, jsx, collect=True, stop_at_first=False)
+    errors = scanner.run()
+    return Lexed(scanner.tokens, scanner.pairs, errors)
+
+
+def first_problem(text, jsx=True):
+    """Return the first structural LexError in text, or None if it balances."""
+    errors = _Scanner(text, jsx, collect=False, stop_at_first=True).run()
+    return errors[0] if errors else None
+
+
+def strip_comments(lexed):
+    """Return (tokens, pairs) with comment tokens removed and pairs re-indexed."""
+    index_of = {}
+    tokens = []
+    for i, tok in enumerate(lexed.tokens):
+        if tok.kind != COMMENT:
+            index_of[i] = len(tokens)
+            tokens.append(tok)
+    pairs = {index_of[a]: index_of[b] for a, b in lexed.pairs.items()
+             if a in index_of and b in index_of}
+    return tokens, pairs
+
+
+def code_mask(tokens, length):
+    """Return a bytearray with 1 for offsets inside comments, strings, templates or regexes."""
+    mask = bytearray(length)
+    for tok in tokens:
+        if tok.kind in (COMMENT, STRING, TEMPLATE, REGEX, JSX_STRING, JSX_TEXT):
+            mask[tok.start:tok.end] = b'\x01' * (tok.end - tok.start)
+    return mask
+
+
+class LineIndex:
+    """Maps between character offsets and 1-based (line, column) positions.
+
+    text may also be bytes (or an mmap), giving byte offsets.
+    """
+
+    def __init__(self, text):
+        self.starts = [0]
+        newline = '\n' if isinstance(text, str) else b'\n'
+        find = text.find
+        i = find(newline)
+        while i >= 0:
+            self.starts.append(i + 1)
+            i = find(newline, i + 1)
+        self.length = len(text)
+
+    def position(self, offset):
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def offset(self, line, column=1):
+        if line < 1:
+            return 0
+        if line > len(self.starts):
+            return self.length
+        return min(self.starts[line - 1] + column - 1, self.length)
+
+    def line_span(self, line):
+        """Return (start, end) offsets of a 1-based line, excluding the newline."""
+        start = self.offset(line)
+        if line < len(self.starts):
+            return start, self.starts[line] - 1
+        return start, self.length